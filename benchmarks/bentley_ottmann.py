@@ -0,0 +1,53 @@
+'''
+scaling benchmark for the Bentley-Ottmann sweep (CheckSegmentIntersection)
+
+times the sweep on seeded random segments of growing size and fits the exponent of
+    time ~ ((n + k) * log(n)) ^ exponent
+an exponent close to 1 means the sweep runs in O((n + k) log n)
+
+usage: python benchmarks/bentley_ottmann.py [--sizes 250 500 1000 2000 4000] [--seed 0]
+'''
+import argparse
+from math import log
+from time import perf_counter
+
+from joemetry.intersection.bentleyottmann.intersection import CheckSegmentIntersection
+
+from datasets import random_segments
+
+
+def fit_exponent(xs: list, ys: list) -> float:
+    '''least-squares slope of log(ys) against log(xs)'''
+    log_x, log_y = [log(x) for x in xs], [log(y) for y in ys]
+    mean_x, mean_y = sum(log_x) / len(log_x), sum(log_y) / len(log_y)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(log_x, log_y))
+    variance   = sum((x - mean_x) ** 2 for x in log_x)
+    return covariance / variance
+
+
+def run(sizes: list, seed: int, repeat: int) -> None:
+    work, timings = [], []
+    print(f"{'n':>8} {'k':>8} {'seconds':>10} {'(n+k)log n':>12}")
+    for n in sizes:
+        segments = random_segments(n, seed)
+        best, found = float('inf'), None
+        for _ in range(repeat):
+            start = perf_counter()
+            found = CheckSegmentIntersection(segments)
+            best  = min(best, perf_counter() - start)
+
+        k = len(found) if found else 0
+        work.append((n + k) * log(n))
+        timings.append(best)
+        print(f"{n:>8} {k:>8} {best:>10.4f} {work[-1]:>12.0f}")
+
+    print(f"fitted exponent against (n+k)log n: {fit_exponent(work, timings):.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000, 4000])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.seed, args.repeat)
@@ -0,0 +1,110 @@
+'''
+seeded synthetic datasets for the benchmarks, the same (size, seed) always gives the same data
+
+besides the random ones there are the adversarial ones the algorithms are known to struggle with
+    collinear points  -> every orientation test is a tie & falls back to the exact predicate
+    grid segments     -> every horizontal segment crosses every vertical one, k = n^2 / 4 intersections
+    comb polygons     -> long thin teeth, nearly every vertex is reflex or blocks an ear
+'''
+import random
+from math import cos, sin, pi
+
+
+def random_points(n: int, seed: int) -> list:
+    '''n points uniformly inside the unit square'''
+    rng = random.Random(seed)
+    return [(rng.random(), rng.random()) for _ in range(n)]
+
+
+def collinear_points(n: int, seed: int) -> list:
+    '''n distinct points shuffled along the line y = 2x + 1, exact in floating point'''
+    rng = random.Random(seed)
+    xs = list(range(n))
+    rng.shuffle(xs)
+    return [(float(x), 2.0 * x + 1) for x in xs]
+
+
+def circle_points(n: int, seed: int) -> list:
+    '''n points on a circle in random order -> every point is on the convex hull'''
+    rng = random.Random(seed)
+    angles = [2 * pi * ind / n for ind in range(n)]
+    rng.shuffle(angles)
+    return [(cos(angle), sin(angle)) for angle in angles]
+
+
+def random_segments(n: int, seed: int, length: float = 0.05) -> list:
+    '''n short segments inside the unit square, stored left to right (few intersections)'''
+    rng = random.Random(seed)
+    segments = []
+    for _ in range(n):
+        x, y   = rng.random(), rng.random()
+        dx, dy = rng.uniform(0.1, 1) * length, rng.uniform(-1, 1) * length
+        segments.append(sorted([(x, y), (x + dx, y + dy)]))
+    return segments
+
+
+def grid_segments(n: int, seed: int) -> list:
+    '''n/2 nearly horizontal & n/2 nearly vertical segments spanning the unit square, each one crossing all of the other half'''
+    rng = random.Random(seed)
+    half = n // 2
+    segments = []
+    for ind in range(half):
+        y = (ind + 0.5) / half
+        segments.append([(0.0, y + rng.uniform(-0.1, 0.1) / half), (1.0, y + rng.uniform(-0.1, 0.1) / half)])
+    for ind in range(n - half):
+        x = (ind + 0.5) / (n - half)
+        segments.append(sorted([(x + rng.uniform(-0.1, 0.1) / half, -0.01), (x + rng.uniform(-0.1, 0.1) / half, 1.01)]))
+    rng.shuffle(segments)
+    return segments
+
+
+def segment_pairs(n: int, seed: int) -> list:
+    '''n pairs of random segments inside the unit square, about a quarter of them crossing'''
+    rng = random.Random(seed)
+    return [
+        (((rng.random(), rng.random()), (rng.random(), rng.random())), ((rng.random(), rng.random()), (rng.random(), rng.random())))
+        for _ in range(n)
+        ]
+
+
+def collinear_segment_pairs(n: int, seed: int) -> list:
+    '''n pairs of overlapping segments lying on the same line, every test is degenerate'''
+    points = collinear_points(4 * n, seed)
+    return [((points[ind], points[ind + 1]), (points[ind + 2], points[ind + 3])) for ind in range(0, 4 * n, 4)]
+
+
+def star_polygon(n: int, seed: int, center: tuple = (0.0, 0.0), radius: float = 1.0) -> list:
+    '''a simple star-shaped polygon of n vertices, anti-clockwise, with a random radius at every vertex'''
+    rng = random.Random(seed)
+    cx, cy = center
+    ring = []
+    for ind in range(n):
+        angle, distance = 2 * pi * ind / n, radius * rng.uniform(0.5, 1.0)
+        ring.append((cx + distance * cos(angle), cy + distance * sin(angle)))
+    return ring
+
+
+def convex_polygon(n: int, seed: int, center: tuple = (0.0, 0.0), radius: float = 1.0) -> list:
+    '''a regular n-gon turned by a random angle, anti-clockwise'''
+    offset = random.Random(seed).uniform(0, 2 * pi)
+    cx, cy = center
+    return [(cx + radius * cos(offset + 2 * pi * ind / n), cy + radius * sin(offset + 2 * pi * ind / n)) for ind in range(n)]
+
+
+def dented_polygon(n: int, seed: int) -> list:
+    '''the n-gon of convex_polygon with its last vertex pushed in halfway to the center -> the only reflex vertex is the last one'''
+    ring = convex_polygon(n, seed)
+    ring[-1] = (ring[-1][0] / 2, ring[-1][1] / 2)
+    return ring
+
+
+def comb_polygon(n: int, seed: int) -> list:
+    '''an anti-clockwise comb of about n vertices, its teeth are 100 times longer than they are wide'''
+    rng = random.Random(seed)
+    teeth = max((n - 2) // 4, 1)
+    ring = [(float(4 * teeth), 0.0)]
+    for tooth in range(teeth - 1, -1, -1):
+        x, height = 4.0 * tooth, 100.0 * rng.uniform(0.9, 1.1)
+        ring.extend([(x + 3, 1.0), (x + 3, height), (x + 1, height), (x + 1, 1.0)])
+    ring.append((0.0, 0.0))
+    return ring
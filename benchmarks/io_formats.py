@@ -0,0 +1,79 @@
+'''
+throughput benchmark for the streaming readers & writers of joemetry.io (WKT, WKB, hex WKB & GeoJSON)
+
+writes seeded random polygons in every format to an in-memory file, reads them back
+& reports the throughput of both ways in MB/s & vertices/s
+
+usage: python benchmarks/io_formats.py [--shapes 2000] [--vertices 64] [--seed 0]
+'''
+import io
+import argparse
+import random
+from math import cos, sin, pi
+from time import perf_counter
+
+from joemetry import Polygon, PointArray
+from joemetry.io import read_wkt, write_wkt, read_wkb, write_wkb, read_geojson, write_geojson
+from joemetry.io._geometry import to_parts, count_vertices
+
+
+FORMATS = {
+    'wkt'    : (io.StringIO, write_wkt, read_wkt),
+    'wkb'    : (io.BytesIO, write_wkb, read_wkb),
+    'hex wkb': (io.StringIO, lambda file, shapes: write_wkb(file, shapes, hex=True), lambda file, arrays: read_wkb(file, arrays, hex=True)),
+    'geojson': (io.StringIO, write_geojson, read_geojson),
+    }
+
+
+def random_polygons(n: int, vertices: int, seed: int) -> list:
+    '''n star-shaped polygons of about the given number of vertices scattered over a 1000 x 1000 square'''
+    rng = random.Random(seed)
+    polygons = []
+    for _ in range(n):
+        cx, cy = rng.uniform(0, 1000), rng.uniform(0, 1000)
+        size = rng.randint(max(vertices // 2, 3), vertices * 3 // 2 + 3)
+        ring = []
+        for ind in range(size):
+            angle, radius = 2 * pi * ind / size, rng.uniform(5, 10)
+            ring.append((cx + radius * cos(angle), cy + radius * sin(angle)))
+        polygons.append(Polygon(ring))
+    return polygons
+
+
+def run(shapes: int, vertices: int, seed: int, repeat: int, arrays: bool) -> None:
+    polygons = random_polygons(shapes, vertices, seed)
+    total = sum(count_vertices(*to_parts(polygon)) for polygon in polygons)
+    print(f"{shapes} polygons, {total} vertices (closing ones included)")
+    print(f"{'format':>8} {'MB':>8} {'write MB/s':>11} {'write vert/s':>13} {'read MB/s':>10} {'read vert/s':>12}")
+
+    for name, (buffer, write, read) in FORMATS.items():
+        best_write, best_read = float('inf'), float('inf')
+        for _ in range(repeat):
+            file = buffer()
+            start = perf_counter()
+            write(file, polygons)
+            best_write = min(best_write, perf_counter() - start)
+
+            data = file.getvalue()
+            file = buffer(data)
+            start = perf_counter()
+            count = sum(1 for _ in read(file, arrays=arrays))
+            best_read = min(best_read, perf_counter() - start)
+            assert count == shapes
+
+        megabytes = len(data) / 1e6
+        print(
+            f"{name:>8} {megabytes:>8.2f} {megabytes / best_write:>11.2f} {total / best_write:>13.0f} "
+            f"{megabytes / best_read:>10.2f} {total / best_read:>12.0f}"
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shapes', type=int, default=2000)
+    parser.add_argument('--vertices', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--arrays', action='store_true', help="read into PointArrays & array-backed polygons")
+    args = parser.parse_args()
+    run(args.shapes, args.vertices, args.seed, args.repeat, args.arrays)
@@ -0,0 +1,218 @@
+'''
+benchmark suite over the core algorithms of joemetry
+
+every case runs on seeded synthetic data (see datasets.py) at growing sizes & reports
+    ops/s     -> elements handled a second (points, vertices, segments or calls, see the case)
+    peak KB   -> the peak memory allocated during one run, measured by tracemalloc in a separate run
+    exponent  -> the least-squares slope of log(time) against log(n), ~1 for O(n), ~2 for O(n^2)
+
+a run that's over in less than --min-time is run again on fresh data until they add up to it,
+the time of a run is then their mean -> sub-millisecond cases aren't down to the timer's resolution
+
+the results can be saved as JSON & compared with an earlier run to catch regressions
+(the exit code is 1 when a case got slower than the tolerance allows)
+
+usage:
+    python benchmarks/suite.py                                   every case at 10^2, 10^3 & 10^4
+    python benchmarks/suite.py --full                            every case from 10^2 to 10^6 (up to its limit)
+    python benchmarks/suite.py --cases hull ear --sizes 100 1000 runs the cases whose name contains "hull" or "ear"
+    python benchmarks/suite.py --output after.json --compare before.json
+'''
+import sys
+import json
+import random
+import argparse
+import platform
+import tracemalloc
+from time import perf_counter, strftime
+from dataclasses import dataclass
+
+from joemetry import Point, Segment, Polygon
+from joemetry.intersection import GJK, ConvexShape, CheckSegmentIntersection
+from joemetry.triangulation import ear_clipping
+from joemetry.convex_hull import monotone_chain, quickhull
+
+import datasets
+from bentley_ottmann import fit_exponent
+
+
+@dataclass
+class Case:
+    '''
+    a benchmarked function & the data it runs on
+    setup: (n, seed) -> the argument of run, called before every run so cached results don't carry over (not timed)
+    run: the timed function
+    ops: the number of elements a run of size n handles, for ops/s
+    limit: the biggest size it's run at, past that a run takes minutes
+    '''
+    name : str
+    setup: object
+    run  : object
+    ops  : object = None
+    limit: int = 10 ** 6
+
+
+def _point_arithmetic(points: list) -> None:
+    origin = Point(0.5, 0.5)
+    for point in points:
+        moved = (point + origin) * 2 - origin
+        moved.dot(origin)
+        moved.cross(origin)
+
+
+def _intersect_pairs(pairs: list) -> None:
+    for first, second in pairs:
+        first.intersect_with(second)
+
+
+def _gjk_setup(n: int, seed: int) -> tuple:
+    # a prepared n-gon tested against 1000 others scattered around it, about half of them overlapping
+    # -> queried once beforehand, so what's timed is the warm-started queries & not the lazy preparation
+    rng = random.Random(seed)
+    shape = ConvexShape(datasets.convex_polygon(n, seed))
+    others = [
+        ConvexShape(datasets.convex_polygon(n, seed + ind, (rng.uniform(-3, 3), rng.uniform(-3, 3))))
+        for ind in range(1000)
+        ]
+    _gjk_queries((shape, others))
+    return shape, others
+
+
+def _gjk_queries(data: tuple) -> None:
+    shape, others = data
+    for other in others:
+        GJK(shape, other)
+
+
+def _segment_pairs(n: int, seed: int, generate=datasets.segment_pairs) -> list:
+    return [(Segment(*first), Segment(*second)) for first, second in generate(n, seed)]
+
+
+CASES = [
+    Case('point.arithmetic', lambda n, seed: [Point(*point) for point in datasets.random_points(n, seed)], _point_arithmetic),
+    Case('polygon.area.star', lambda n, seed: Polygon(datasets.star_polygon(n, seed)), lambda polygon: polygon.area),
+    Case('polygon.is_convex.convex', lambda n, seed: Polygon(datasets.convex_polygon(n, seed)), lambda polygon: polygon.is_convex),
+    Case('polygon.is_convex.dent', lambda n, seed: Polygon(datasets.dented_polygon(n, seed)), lambda polygon: polygon.is_convex),
+    Case('segment.intersect_with.random', _segment_pairs, _intersect_pairs),
+    Case(
+        'segment.intersect_with.collinear',
+        lambda n, seed: _segment_pairs(n, seed, datasets.collinear_segment_pairs), _intersect_pairs
+        ),
+    Case('bentley_ottmann.random', datasets.random_segments, CheckSegmentIntersection, limit=10 ** 5),
+    Case('bentley_ottmann.grid', datasets.grid_segments, CheckSegmentIntersection, limit=10 ** 3),
+    Case('gjk.convex', _gjk_setup, _gjk_queries, ops=lambda n: 1000, limit=10 ** 5),
+    Case('ear_clipping.star', datasets.star_polygon, ear_clipping, limit=10 ** 5),
+    Case('ear_clipping.comb', datasets.comb_polygon, ear_clipping, limit=10 ** 5),
+    Case('convex_hull.monotone_chain.random', datasets.random_points, monotone_chain),
+    Case('convex_hull.monotone_chain.collinear', datasets.collinear_points, monotone_chain),
+    Case('convex_hull.monotone_chain.circle', datasets.circle_points, monotone_chain),
+    Case('convex_hull.quickhull.random', datasets.random_points, quickhull),
+    Case('convex_hull.quickhull.circle', datasets.circle_points, quickhull),
+    ]
+
+
+def measure(case: Case, n: int, seed: int, repeat: int, min_time: float) -> dict:
+    '''
+    the best time out of the repeats & the peak memory of one more run,
+    every repeat runs the case (on fresh data) until it has taken min_time & its time is the mean of those runs
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        total, count = 0.0, 0
+        while total < min_time or not count:
+            data = case.setup(n, seed)
+            start = perf_counter()
+            case.run(data)
+            total += perf_counter() - start
+            count += 1
+        best = min(best, total / count)
+
+    # tracemalloc slows the run down, so the memory is measured on its own
+    data = case.setup(n, seed)
+    tracemalloc.start()
+    case.run(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ops = case.ops(n) if case.ops else n
+    return {'n': n, 'seconds': best, 'ops_per_s': ops / best if best else float('inf'), 'peak_kb': peak / 1024}
+
+
+def run(cases: list, sizes: list, seed: int, repeat: int, min_time: float, ignore_limits: bool) -> dict:
+    results = {}
+    print(f"{'case':<38} {'n':>8} {'seconds':>10} {'ops/s':>12} {'peak KB':>10}")
+    for case in cases:
+        rows = []
+        for n in sizes:
+            if n > case.limit and not ignore_limits:
+                print(f"{case.name:<38} {n:>8} {'skipped, over the limit of ' + str(case.limit):>34}")
+                continue
+            rows.append(measure(case, n, seed, repeat, min_time))
+            row = rows[-1]
+            print(f"{case.name:<38} {n:>8} {row['seconds']:>10.6f} {row['ops_per_s']:>12.0f} {row['peak_kb']:>10.1f}")
+
+        exponent = None
+        if len(rows) >= 2:
+            exponent = fit_exponent([row['n'] for row in rows], [max(row['seconds'], 1e-9) for row in rows])
+            print(f"{case.name:<38} fitted exponent: {exponent:.2f}")
+        results[case.name] = {'runs': rows, 'exponent': exponent}
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    '''the (case, n, ratio) of every run that's slower than the baseline's by more than the tolerance'''
+    regressions = []
+    print(f"\n{'case':<38} {'n':>8} {'ops/s ratio':>12}")
+    for name, result in results.items():
+        previous = {row['n']: row for row in baseline.get(name, {}).get('runs', [])}
+        for row in result['runs']:
+            if row['n'] not in previous:
+                continue
+            ratio = row['ops_per_s'] / previous[row['n']]['ops_per_s']
+            flag = '  <- regression' if ratio < 1 - tolerance else ''
+            print(f"{name:<38} {row['n']:>8} {ratio:>12.2f}{flag}")
+            if flag:
+                regressions.append((name, row['n'], ratio))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', nargs='+', default=[], help="only run the cases whose name contains one of these")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10 ** 2, 10 ** 3, 10 ** 4])
+    parser.add_argument('--full', action='store_true', help="run at every power of 10 from 10^2 to 10^6")
+    parser.add_argument('--ignore-limits', action='store_true', help="run every case at every size, however long it takes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--min-time', type=float, default=0.1, help="seconds a repeat runs a case for at the least, the quick ones are run several times")
+    parser.add_argument('--output', help="save the results as JSON")
+    parser.add_argument('--compare', help="a JSON file saved by an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="how much slower (as a fraction) counts as a regression")
+    parser.add_argument('--list', action='store_true', help="list the cases & exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print('\n'.join(f"{case.name} (up to {case.limit})" for case in CASES))
+        sys.exit(0)
+
+    cases = [case for case in CASES if not args.cases or any(part in case.name for part in args.cases)]
+    sizes = [10 ** power for power in range(2, 7)] if args.full else sorted(args.sizes)
+    results = run(cases, sizes, args.seed, args.repeat, args.min_time, args.ignore_limits)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'meta': {
+                    'time': strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                    'platform': platform.platform(), 'seed': args.seed, 'repeat': args.repeat,
+                    'min_time': args.min_time
+                    },
+                'results': results
+                }, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file)['results'], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            sys.exit(1)
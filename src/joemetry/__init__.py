@@ -1,3 +1,4 @@
 from .point import *
+from .point_array import *
 from .polygon import *
 from .segment import *
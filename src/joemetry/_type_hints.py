@@ -1,4 +1,4 @@
-from typing import List, Tuple, Union, Optional, TypeVar
+from typing import Any, List, Tuple, Union, Optional, TypeVar, Iterable, Iterator, Sequence, Callable
 
 
 Num  = Union[float, int]
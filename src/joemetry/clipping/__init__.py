@@ -0,0 +1,3 @@
+from .sutherland_hodgman import *
+from .overlay import *
+from .batch import *
@@ -0,0 +1,52 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from joemetry import Polygon, PointArray
+from joemetry._type_hints import *
+from .overlay import intersection
+from .sutherland_hodgman import clip_convex
+
+
+def clip_many(
+    polygons : List[Union[Polygon, PointArray, List[Coor]]],
+    window   : Union[Polygon, PointArray, List[Coor]],
+    processes: Optional[int] = 1,
+    chunksize: Optional[int] = None
+    ) -> List[List[Polygon]]:
+    '''
+    returns the part of every polygon inside of the window, as a list of pieces per polygon
+    -> the tiling case, lots of polygons cut by the same tile
+
+    the window is prepared once, convex polygons inside of a convex window go through Sutherland–Hodgman
+    & everything else through overlay, polygons whose boxes miss the window are skipped straight away
+    processes: the number of worker processes the polygons are spread over,
+               1 runs everything in this process, None uses one per cpu
+    chunksize: how many polygons are sent to a worker at once,
+               defaults to a few chunks per worker so the pickling overhead stays small
+    '''
+    window = window if isinstance(window, Polygon) else Polygon(window)
+    clip = partial(_clip, window=window, bounds=window.bounds, convex=window.is_convex)
+
+    if processes == 1 or len(polygons) < 2:
+        return [clip(polygon) for polygon in polygons]
+
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(len(polygons) // (4 * processes), 1)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(clip, polygons, chunksize=chunksize))
+
+
+def _clip(
+    polygon: Union[Polygon, PointArray, List[Coor]],
+    window : Polygon,
+    bounds : Tuple[float, float, float, float],
+    convex : bool
+    ) -> List[Polygon]:
+    polygon = polygon if isinstance(polygon, Polygon) else Polygon(polygon)
+    min_x, min_y, max_x, max_y = polygon.bounds
+    if min_x > bounds[2] or bounds[0] > max_x or min_y > bounds[3] or bounds[1] > max_y:
+        return []
+    if convex and polygon.is_convex:
+        return clip_convex(polygon, window)
+    return intersection(polygon, window)
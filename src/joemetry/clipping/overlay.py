@@ -0,0 +1,331 @@
+from array import array
+from math import atan2
+from joemetry import Polygon, PointArray
+from joemetry.predicates import orient2d
+from joemetry.point_in_polygon import PreparedPolygon
+from joemetry.utils import get_coordinates, get_signed_area
+from joemetry.intersection.batch import _bounding_boxes, _sweep_candidates
+from joemetry._type_hints import *
+from .sutherland_hodgman import clip_convex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+Vertex = Tuple[float, float]
+# a polygon, a ring of points, or a list of polygons -> outer rings anti-clockwise & holes clockwise (what overlay returns)
+Region = Union[Polygon, PointArray, List[Coor], List[Polygon]]
+
+# whether a spot inside of (subject, clip) is inside of the result
+OPERATIONS = {
+    'intersection'        : lambda subject, clip: subject and clip,
+    'union'               : lambda subject, clip: subject or clip,
+    'difference'          : lambda subject, clip: subject and not clip,
+    'symmetric_difference': lambda subject, clip: subject != clip,
+    }
+
+
+def overlay(subject: Region, clip: Region, operation: str) -> List[Polygon]:
+    '''
+    returns the result of a boolean operation between 2 regions as a list of polygons
+    operation: "intersection", "union", "difference" (subject - clip) or "symmetric_difference"
+
+    the regions are polygons (either winding) or lists of polygons with the outer rings anti-clockwise & the holes clockwise,
+    the result uses the same convention -> a polygon with a clockwise orientation is a hole of the one around it,
+    so the result of one operation can be fed straight into the next one
+    the rings have to be simple (no self-intersections), but the boundaries of the 2 regions can touch,
+    overlap & share vertices/edges, a hole touching its outer ring at a single vertex
+    comes out as one ring pinched at that vertex
+
+    [PROCESS]:
+
+        1) the edges of both regions are swept (sorted on x, like the broad phase of batch_intersections)
+           to find the pairs that could touch, every touching pair is split at the spot they meet,
+           worked out with exact orientation tests -> crossings, T-junctions & overlapping (collinear) stretches
+
+        2) the split edges are merged where both regions share them, and every edge is classified by
+           what's on either side of it -> inside of/outside of both regions
+           for an edge of a region that's which way it goes, otherwise whether it's inside of the other region,
+           which only flips where the ring crosses the other boundary -> the point-in-polygon test (with the edges
+           bucketed, see PreparedPolygon) is only run at the start of every ring & after the spots where the boundaries touch
+
+        3) an edge is part of the result when the operation holds on one side of it & not the other,
+           it's pointed so that the result is on its left
+
+        4) the edges are chained into rings, turning as far left as possible wherever several meet
+           -> regions that only touch at a vertex come out as separate rings
+
+    O((n + k) log n) for n edges & k touching pairs (along with the pairs of edges whose boxes overlap)
+    '''
+    if operation not in OPERATIONS:
+        raise ValueError(f"{operation} is not a valid operation")
+    inside = OPERATIONS[operation]
+    subject_rings, clip_rings = _rings(subject), _rings(clip)
+
+    # the shortcuts -> nothing overlaps, or 2 convex polygons being intersected
+    if not subject_rings or not clip_rings or not _boxes_overlap(_bounds(subject_rings), _bounds(clip_rings)):
+        result = [ring for ring, keep in [(subject_rings, inside(True, False)), (clip_rings, inside(False, True))] if keep]
+        return [Polygon(ring) for rings in result for ring in rings]
+    if operation == 'intersection' and len(subject_rings) == 1 == len(clip_rings):
+        subject_polygon, clip_polygon = Polygon(subject_rings[0]), Polygon(clip_rings[0])
+        if subject_polygon.is_convex and clip_polygon.is_convex:
+            return clip_convex(subject_polygon, clip_polygon)
+
+    segments, spans = [], []
+    for owner, rings in enumerate([subject_rings, clip_rings]):
+        for ring in rings:
+            segments.extend((ring[ind - 1], ring[ind], owner) for ind in range(len(ring)))
+            spans.append((owner, len(ring)))
+    pieces, crossings, contacts = _split(segments)
+
+    # every piece of boundary once -> (lower end, upper end): [the winding of the subject's edges, of the clip's edges]
+    # +1 for an edge going from the lower end to the upper one (region on its left), -1 the other way around
+    shared = {}
+    # whether the edges of each region are inside of the other region, walking around the rings
+    # -> it only changes where the ring crosses the other region's boundary, so the point-in-polygon test is only needed
+    #    at the start of a ring & after the spots where it touches the other boundary
+    tests = [_region_test(subject_rings), _region_test(clip_rings)]
+    status = [{}, {}]
+    position = 0
+    for owner, length in spans:
+        inside_other, test, known = None, tests[1 - owner], status[owner]
+        for points in pieces[position:position + length]:
+            for ind in range(len(points) - 1):
+                start, end = points[ind], points[ind + 1]
+                key, direction = ((start, end), 1) if start < end else ((end, start), -1)
+                counts = shared.get(key)
+                if counts is None:
+                    counts = shared[key] = [0, 0]
+                counts[owner] += direction
+
+                crossed = crossings.get(start, 0)
+                if start in contacts or crossed > 1:
+                    inside_other = None
+                elif crossed and inside_other is not None:
+                    inside_other = not inside_other
+                if inside_other is None:
+                    inside_other = test(((start[0] + end[0]) / 2, (start[1] + end[1]) / 2))
+                known[key] = inside_other
+        position += length
+
+    result = {}
+    for key, counts in shared.items():
+        sides = []
+        for owner in [0, 1]:
+            if counts[owner]:
+                sides.append((counts[owner] > 0, counts[owner] < 0))
+                continue
+            inside_region = status[1 - owner].get(key)
+            if inside_region is None:
+                start, end = key
+                inside_region = tests[owner](((start[0] + end[0]) / 2, (start[1] + end[1]) / 2))
+            sides.append((inside_region, inside_region))
+
+        left, right = inside(sides[0][0], sides[1][0]), inside(sides[0][1], sides[1][1])
+        if left == right:
+            continue
+        start, end = key
+        if left:
+            result.setdefault(start, []).append(end)
+        else:
+            result.setdefault(end, []).append(start)
+
+    polygons = []
+    for ring in _chain(result):
+        ring = _drop_straight(ring)
+        if len(ring) >= 3 and get_signed_area(ring) != 0:
+            polygons.append(Polygon(ring))
+    return polygons
+
+
+def intersection(subject: Region, clip: Region) -> List[Polygon]:
+    '''the part of the subject inside of the clip, see overlay'''
+    return overlay(subject, clip, 'intersection')
+
+
+def union(subject: Region, clip: Region) -> List[Polygon]:
+    '''everything inside of either region, see overlay'''
+    return overlay(subject, clip, 'union')
+
+
+def difference(subject: Region, clip: Region) -> List[Polygon]:
+    '''the part of the subject outside of the clip, see overlay'''
+    return overlay(subject, clip, 'difference')
+
+
+def symmetric_difference(subject: Region, clip: Region) -> List[Polygon]:
+    '''everything inside of exactly one of the regions, see overlay'''
+    return overlay(subject, clip, 'symmetric_difference')
+
+
+def _rings(region: Region) -> List[List[Vertex]]:
+    # a single ring is turned anti-clockwise, the rings of a list of polygons are kept as they are
+    if isinstance(region, (list, tuple)) and region and isinstance(region[0], Polygon):
+        rings = [_dedup(get_coordinates(polygon)) for polygon in region]
+        return [ring for ring in rings if len(ring) >= 3]
+
+    ring = _dedup(get_coordinates(region))
+    if len(ring) < 3:
+        return []
+    if get_signed_area(ring) < 0:
+        ring.reverse()
+    return [ring]
+
+
+def _dedup(ring: List[Vertex]) -> List[Vertex]:
+    # repeated vertices (the closing one too) make zero length edges
+    return [point for ind, point in enumerate(ring) if point != ring[ind - 1]] if len(ring) > 1 else ring
+
+
+def _bounds(rings: List[List[Vertex]]) -> Tuple[float, float, float, float]:
+    xs = [x for ring in rings for x, _ in ring]
+    ys = [y for ring in rings for _, y in ring]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _boxes_overlap(first: Tuple[float, ...], second: Tuple[float, ...]) -> bool:
+    return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
+
+
+def _region_test(rings: List[List[Vertex]]) -> Callable[[Vertex], bool]:
+    # even-odd over the rings -> a point inside of a hole is inside of 2 rings
+    prepared = [(PreparedPolygon(ring), _bounds([ring])) for ring in rings]
+
+    def test(point: Vertex) -> bool:
+        inside = False
+        for ring, (min_x, min_y, max_x, max_y) in prepared:
+            if min_x <= point[0] <= max_x and min_y <= point[1] <= max_y and ring.contains(point):
+                inside = not inside
+        return inside
+    return test
+
+
+def _split(segments: List[Tuple[Vertex, Vertex, int]]) -> Tuple[List[List[Vertex]], dict, set]:
+    # splits every segment wherever another one touches it, so edges only meet at their ends
+    # returns the points along every segment (its ends included), how many times the boundaries
+    # of the 2 regions cross at each crossing, and the other spots where they meet
+    columns = [[segment[0][0] for segment in segments], [segment[0][1] for segment in segments],
+               [segment[1][0] for segment in segments], [segment[1][1] for segment in segments]]
+    columns = [np.array(column, dtype=np.float64) if np is not None else array('d', column) for column in columns]
+    first, second = _sweep_candidates(*_bounding_boxes(*columns))
+    if np is not None:
+        first, second = first.tolist(), second.tolist()
+
+    splits = [[] for _ in segments]
+    crossings, contacts = {}, set()
+    for i, j in zip(first, second):
+        p, q, first_owner = segments[i]
+        r, s, second_owner = segments[j]
+        on_first, on_second, crossing, touching = _touching(p, q, r, s)
+        splits[i].extend(on_first)
+        splits[j].extend(on_second)
+        if first_owner != second_owner:
+            if crossing is not None:
+                crossings[crossing] = crossings.get(crossing, 0) + 1
+            contacts.update(touching)
+
+    pieces = []
+    for (start, end, _), points in zip(segments, splits):
+        if points:
+            # sorted by how far along the segment they are -> a computed crossing can be an ulp off the segment,
+            # sorting them like the ends are (on (x, y)) could then put them out of order along it
+            dx, dy = end[0] - start[0], end[1] - start[1]
+            points = sorted(set(points), key=lambda point: (point[0] - start[0]) * dx + (point[1] - start[1]) * dy)
+            points = [start] + [point for point in points if point != start and point != end] + [end]
+        else:
+            points = [start, end]
+        pieces.append(points)
+    return pieces, crossings, contacts
+
+
+def _touching(p: Vertex, q: Vertex, r: Vertex, s: Vertex) -> Tuple[List[Vertex], List[Vertex], Optional[Vertex], List[Vertex]]:
+    # where segment pq & segment rs meet -> (the split points on pq, the ones on rs,
+    # the spot where they cross each other (both pass right through it), the other spots where they touch)
+    o1, o2 = orient2d(p, q, r), orient2d(p, q, s)
+    if o1 == 0 and o2 == 0:
+        # collinear -> the ends of either one inside of the other
+        on_first, on_second = [point for point in (r, s) if _between(p, q, point)], [point for point in (p, q) if _between(r, s, point)]
+        touching = on_first + on_second + [point for point in (p, q) if point == r or point == s]
+        return on_first, on_second, None, touching
+    if (o1 > 0 and o2 > 0) or (o1 < 0 and o2 < 0):
+        return [], [], None, []
+    o3, o4 = orient2d(r, s, p), orient2d(r, s, q)
+    if (o3 > 0 and o4 > 0) or (o3 < 0 and o4 < 0):
+        return [], [], None, []
+
+    # an end of one segment on the other one
+    if o1 == 0:
+        return ([r] if r != p and r != q else []), [], None, [r]
+    if o2 == 0:
+        return ([s] if s != p and s != q else []), [], None, [s]
+    if o3 == 0:
+        return [], ([p] if p != r and p != s else []), None, [p]
+    if o4 == 0:
+        return [], ([q] if q != r and q != s else []), None, [q]
+
+    ratio = o3 / (o3 - o4)
+    x, y = p[0] + (q[0] - p[0]) * ratio, p[1] + (q[1] - p[1]) * ratio
+    # the crossing goes right onto a vertical/horizontal segment, instead of an ulp to the side of it
+    for start, end in ((p, q), (r, s)):
+        if start[0] == end[0]:
+            x = start[0]
+        if start[1] == end[1]:
+            y = start[1]
+    point = (x, y)
+    return [point], [point], point, []
+
+
+def _between(start: Vertex, end: Vertex, point: Vertex) -> bool:
+    # for a point on the line through start & end, whether it's strictly between them
+    return min(start, end) < point < max(start, end)
+
+
+def _chain(outgoing: dict) -> List[List[Vertex]]:
+    # links the directed edges into rings, leaving every vertex along the sharpest left turn
+    # -> the edges pair up the same way whichever one a ring is started from
+    following = {}
+    for vertex, targets in outgoing.items():
+        for target in targets:
+            candidates = outgoing.get(target)
+            if not candidates:
+                # only for self-intersecting input, the edges don't close up into rings
+                continue
+            if len(candidates) == 1:
+                following[(vertex, target)] = (target, candidates[0])
+                continue
+            dx, dy = target[0] - vertex[0], target[1] - vertex[1]
+
+            def turn(other: Vertex) -> float:
+                ox, oy = other[0] - target[0], other[1] - target[1]
+                return atan2(dx * oy - dy * ox, dx * ox + dy * oy)
+            following[(vertex, target)] = (target, max(candidates, key=turn))
+
+    rings, used = [], set()
+    for edge in following:
+        if edge in used:
+            continue
+        ring = []
+        while edge not in used:
+            used.add(edge)
+            ring.append(edge[0])
+            edge = following.get(edge)
+            if edge is None:
+                break
+        rings.append(ring)
+    return rings
+
+
+def _drop_straight(ring: List[Vertex]) -> List[Vertex]:
+    # the splitting leaves vertices in the middle of straight edges
+    kept = []
+    for point in ring:
+        kept.append(point)
+        while len(kept) >= 3 and orient2d(kept[-3], kept[-2], kept[-1]) == 0:
+            del kept[-2]
+    while len(kept) >= 3 and orient2d(kept[-2], kept[-1], kept[0]) == 0:
+        kept.pop()
+    while len(kept) >= 3 and orient2d(kept[-1], kept[0], kept[1]) == 0:
+        kept.pop(0)
+    return kept
@@ -0,0 +1,56 @@
+from joemetry import Polygon, PointArray
+from joemetry.predicates import orient2d
+from joemetry.utils import get_coordinates, get_signed_area
+from joemetry._type_hints import *
+
+
+def clip_convex(subject: Union[Poly, PointArray], window: Union[Poly, PointArray]) -> List[Polygon]:
+    '''
+    returns the part of the subject inside of a convex window (Sutherland–Hodgman), as a list of 0 or 1 polygon
+    O(n * m) for a subject of n vertices & a window of m vertices, the window isn't checked for being convex
+
+    a concave subject clipped into several pieces comes out as one polygon,
+    with the pieces joined by zero width bridges along the window's edges -> use overlay for those
+
+    [PROCESS]:
+
+        1) go around the window anti-clockwise, every edge of it cuts the plane in half
+
+        2) walk the subject & keep what's on the inner side of the edge,
+           adding the crossing whenever the walk goes from one side to the other
+
+        3) the polygon left after the last edge is the result
+    '''
+    window = get_coordinates(window)
+    if get_signed_area(window) < 0:
+        window.reverse()
+
+    output = get_coordinates(subject)
+    for ind in range(len(window)):
+        if not output:
+            break
+        a, b = window[ind - 1], window[ind]
+        current, output = output, []
+        previous = current[-1]
+        previous_side = orient2d(a, b, previous)
+        for point in current:
+            side = orient2d(a, b, point)
+            if side >= 0:
+                if previous_side < 0:
+                    output.append(_crossing(previous, point, previous_side, side))
+                output.append(point)
+            elif previous_side >= 0:
+                if previous_side > 0:
+                    output.append(_crossing(previous, point, previous_side, side))
+            previous, previous_side = point, side
+
+    output = [point for ind, point in enumerate(output) if point != output[ind - 1]]
+    if len(output) < 3 or get_signed_area(output) == 0:
+        return []
+    return [Polygon(output)]
+
+
+def _crossing(start: Tuple[float, float], end: Tuple[float, float], start_side: float, end_side: float) -> Tuple[float, float]:
+    # where the edge from start to end crosses the window's edge, from how far each end is from it
+    ratio = start_side / (start_side - end_side)
+    return (start[0] + (end[0] - start[0]) * ratio, start[1] + (end[1] - start[1]) * ratio)
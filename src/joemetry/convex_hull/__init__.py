@@ -0,0 +1,5 @@
+from .monotone_chain import *
+from .quickhull import *
+from .chan import *
+from .batch import *
+from .dynamic import *
@@ -0,0 +1,38 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from joemetry import PointArray
+from joemetry._type_hints import *
+from .monotone_chain import monotone_chain
+from .quickhull import quickhull
+from .chan import chan
+
+
+ENGINES = {'monotone_chain': monotone_chain, 'quickhull': quickhull, 'chan': chan}
+
+
+def hulls_of_many(
+    point_sets: List[Union[PointArray, List[Coor]]],
+    engine    : Optional[str] = 'monotone_chain',
+    processes : Optional[int] = 1,
+    chunksize : Optional[int] = None
+    ) -> List[List[int]]:
+    '''
+    returns the hull of every point set, as indices into its own points
+    engine: "monotone_chain", "quickhull" or "chan"
+    processes: the number of worker processes the point sets are spread over,
+               1 runs everything in this process, None uses one per cpu
+    chunksize: how many point sets are sent to a worker at once,
+               defaults to a few chunks per worker so the pickling overhead stays small
+    '''
+    if engine not in ENGINES:
+        raise ValueError(f"{engine} is not a valid engine")
+    hull = ENGINES[engine]
+
+    if processes == 1 or len(point_sets) < 2:
+        return [hull(points) for points in point_sets]
+
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(len(point_sets) // (4 * processes), 1)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(hull, point_sets, chunksize=chunksize))
@@ -0,0 +1,152 @@
+from joemetry import PointArray
+from joemetry.predicates import orient2d
+from joemetry.utils import get_coordinates
+from joemetry._type_hints import *
+from .monotone_chain import _hull_of_sorted
+from .quickhull import _outside_of_extremes
+
+
+def chan(points: Union[PointArray, List[Coor]]) -> List[int]:
+    '''
+    returns the indices of the points on the convex hull, anti-clockwise,
+    starting from the lowest-leftmost point (collinear points on the hull edges are left out)
+
+    output sensitive -> O(n log h), worth it over monotone_chain when the hull is a small part of the points
+
+    [PROCESS]:
+
+        0) throw away the points inside of the quadrilateral of the extreme points, same as quickhull
+
+        1) guess the size of the hull, m = 4, 16, 256, ... (squaring every round)
+
+        2) split the points into groups of m & get the hull of each group with the monotone chain
+
+        3) gift wrap around the group hulls, the next vertex from each group hull
+           is found with a binary search for the tangent -> O(log m) per group per step
+
+        4) if the wrap didn't close within m steps the guess was too small, go back to 1)
+    '''
+    coords = get_coordinates(points)
+    total  = len(coords)
+    if total < 3:
+        return _hull_of_sorted(coords, sorted(range(total), key=coords.__getitem__))
+
+    candidates = _outside_of_extremes(coords, coords)
+    remaining  = [coords[ind] for ind in candidates]
+
+    guess = 4
+    while True:
+        guess = min(guess, len(remaining))
+        hull  = _wrap(remaining, guess)
+        if hull is not None:
+            return [candidates[ind] for ind in hull]
+        guess *= guess
+
+
+def _wrap(coords: List[Tuple[float, float]], size: int) -> Optional[List[int]]:
+    # gift wrapping over the hulls of groups of 'size' points, None if the hull has more than 'size' vertices
+    groups = []
+    for start in range(0, len(coords), size):
+        group = sorted(range(start, min(start + size, len(coords))), key=coords.__getitem__)
+        groups.append(_hull_of_sorted(coords, group))
+
+    # the lowest-leftmost point is the first vertex of its group hull
+    group = min(range(len(groups)), key=lambda ind: coords[groups[ind][0]])
+    position = 0
+    hull = []
+
+    for _ in range(size):
+        current = groups[group][position]
+        hull.append(current)
+        point = coords[current]
+
+        # the next vertex of its own group is the candidate from there
+        own = groups[group]
+        best = (group, (position + 1) % len(own))
+        for other in range(len(groups)):
+            if other == group:
+                continue
+            candidate = (other, _tangent(coords, groups[other], point))
+            if _is_further_right(coords, point, groups, candidate, best):
+                best = candidate
+
+        group, position = best
+        if coords[groups[group][position]] == coords[hull[0]]:
+            return hull
+
+    return None
+
+
+def _is_further_right(coords, point, groups, candidate, best) -> bool:
+    # the candidate is a better next vertex -> it's to the right of point -> best, or further away on the same line
+    best = coords[groups[best[0]][best[1]]]
+    candidate = coords[groups[candidate[0]][candidate[1]]]
+    if candidate == point:
+        return False
+    if best == point:
+        return True
+    turn = orient2d(point, best, candidate)
+    if turn != 0:
+        return turn < 0
+    return _distance(point, candidate) > _distance(point, best)
+
+
+def _distance(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+def _tangent(coords: List[Tuple[float, float]], hull: List[int], point: Tuple[float, float]) -> int:
+    # position of the vertex of the (anti-clockwise) hull that the whole hull is left of, seen from the point
+    total = len(hull)
+    turn  = lambda ind, other: orient2d(point, coords[hull[ind % total]], coords[hull[other % total]])
+
+    # binary search over the 2 chains the tangent splits the hull into
+    low, high = 0, total
+    low_before, low_after = turn(0, -1), turn(0, 1)
+    found = None
+    while low < high:
+        mid = (low + high) // 2
+        mid_before, mid_after, mid_side = turn(mid, mid - 1), turn(mid, mid + 1), turn(low, mid)
+        if mid_before >= 0 and mid_after >= 0:
+            found = mid
+            break
+        if (mid_side > 0 and (low_after < 0 or (low_before > 0) == (low_after > 0))) or (mid_side < 0 and mid_before < 0):
+            high = mid
+        else:
+            low = mid + 1
+            low_before, low_after = -mid_after, turn(low, low + 1)
+
+    if found is None:
+        found = low % total
+    # the search can get lost when the point is on the hull or collinear with its edges -> fall back on a scan
+    if turn(found, found - 1) < 0 or turn(found, found + 1) < 0:
+        found = _scan_tangent(coords, hull, point)
+    return _furthest_on_tangent(coords, hull, point, found)
+
+
+def _furthest_on_tangent(coords, hull, point, position) -> int:
+    # the hulls have no collinear vertices, so at most the next vertex is on the tangent line too
+    total = len(hull)
+    if coords[hull[position]] == point:
+        return (position + 1) % total if total > 1 else position
+    after = (position + 1) % total
+    if orient2d(point, coords[hull[position]], coords[hull[after]]) == 0 and \
+       _distance(point, coords[hull[after]]) > _distance(point, coords[hull[position]]):
+        return after
+    return position
+
+
+def _scan_tangent(coords, hull, point) -> int:
+    best = 0
+    for position in range(1, len(hull)):
+        candidate = coords[hull[position]]
+        current = coords[hull[best]]
+        if candidate == point:
+            continue
+        if current == point:
+            best = position
+            continue
+        turn = orient2d(point, current, candidate)
+        if turn < 0 or (turn == 0 and _distance(point, candidate) > _distance(point, current)):
+            best = position
+    return best
@@ -0,0 +1,305 @@
+from bisect import bisect_left, insort
+from joemetry.predicates import orient2d
+from joemetry._type_hints import *
+from .chan import _tangent
+
+
+# the lower chain only keeps anti-clockwise turns, the upper chain clockwise ones (both go left to right)
+LOWER, UPPER = 1, -1
+
+# the size the blocks of sorted points are split back to
+_BLOCK_SIZE = 512
+
+
+class DynamicConvexHull:
+    '''
+    convex hull of a set of points that changes over time
+
+    the hull is kept as its lower & upper chain, both sorted left to right (by x, then y),
+    so a point is placed with a bisection and only its neighbours on the chain are checked/popped
+        - insert: O(log n) to find its spot + the vertices it knocks off the chain (each is removed once)
+        - remove: O(log n) for a point inside of the hull, a hull vertex is taken out of its chain
+                  & only the span between its 2 neighbours is rebuilt, from the points that lie between them
+                  -> O(log n + k), k the points in that x-range (the whole set only when it was the last point of a chain)
+        - contains, extreme & tangent: O(log n) bisections over the chains
+
+    the chains are plain sorted lists (a hull is small next to its points),
+    every distinct point is also kept sorted in a _SortedPoints, for the repairs after a removal
+    the chains are only built on the first call that needs them, so the points given upfront are sorted once
+    '''
+
+    __slots__ = ['_points', '_sorted', '_lower', '_upper', '_stale']
+
+
+    def __init__(self, points: Optional[Iterable[Coor]] = ()):
+        # every point with its multiplicity
+        self._points = {}
+        for point in points:
+            point = (float(point[0]), float(point[1]))
+            self._points[point] = self._points.get(point, 0) + 1
+        self._sorted = _SortedPoints(sorted(self._points))
+        self._stale  = True
+
+
+    def insert(self, point: Coor) -> None:
+        point = (float(point[0]), float(point[1]))
+        count = self._points.get(point, 0)
+        self._points[point] = count + 1
+        if count:
+            return
+        self._sorted.add(point)
+        if not self._stale:
+            _insert_into_chain(self._lower, point, LOWER)
+            _insert_into_chain(self._upper, point, UPPER)
+
+
+    def remove(self, point: Coor) -> None:
+        point = (float(point[0]), float(point[1]))
+        count = self._points.get(point)
+        if count is None:
+            raise ValueError(f"{point} is not one of the points of the hull")
+
+        if count > 1:
+            self._points[point] = count - 1
+            return
+        del self._points[point]
+        self._sorted.discard(point)
+        if not self._stale:
+            self._repair(self._lower, point, LOWER)
+            self._repair(self._upper, point, UPPER)
+
+
+    def hull(self) -> List[Tuple[float, float]]:
+        '''returns the vertices of the hull, anti-clockwise from the lowest-leftmost point'''
+        lower, upper = self._chains()
+        if len(lower) == 1:
+            return lower[:]
+        return lower[:-1] + upper[:0:-1]
+
+
+    def contains(self, point: Coor) -> bool:
+        '''whether the point is inside of the hull or on its boundary'''
+        lower, upper = self._chains()
+        if not lower:
+            return False
+        point = (float(point[0]), float(point[1]))
+        return _inner_side(lower, point, LOWER) and _inner_side(upper, point, UPPER)
+
+
+    def extreme(self, direction: Coor) -> Tuple[float, float]:
+        '''returns the hull vertex furthest along the direction'''
+        lower, upper = self._chains()
+        if not lower:
+            raise ValueError("the hull is empty")
+        dx, dy = direction[0], direction[1]
+        return max(_extreme_on_chain(lower, dx, dy), _extreme_on_chain(upper, dx, dy), key=lambda p: dx * p[0] + dy * p[1])
+
+
+    def tangent(self, point: Coor) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        '''
+        returns the 2 hull vertices touched by the tangents from a point outside of the hull
+        -> (the vertex the whole hull is left of, seen from the point, the vertex the whole hull is right of)
+        '''
+        if self.contains(point):
+            raise ValueError(f"{point} is not outside of the hull")
+        point = (float(point[0]), float(point[1]))
+        lower, upper = self._chains()
+
+        view = _HullView(lower, upper, False)
+        right = view[_tangent(view, range(len(view)), point)]
+        # mirrored left to right, the hull is reversed into anti-clockwise order again & the other tangent becomes the 'right' one
+        view = _HullView(lower, upper, True)
+        left = view[_tangent(view, range(len(view)), (-point[0], point[1]))]
+        return right, (-left[0], left[1])
+
+
+    def _chains(self) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        if self._stale:
+            points = list(self._sorted)
+            self._lower = _build_chain(points, LOWER)
+            self._upper = _build_chain(points, UPPER)
+            self._stale = False
+        return self._lower, self._upper
+
+
+    def _repair(self, chain: List[Tuple[float, float]], point: Tuple[float, float], side: int) -> None:
+        # a removed vertex of the chain -> its neighbours stay on the hull, the chain in between
+        # is rebuilt from the points between them (every point is between the ends when it was an end of the chain)
+        index = _find(chain, point)
+        if index is None:
+            return
+        if not self._points:
+            chain.clear()
+            return
+        start = index - 1 if index > 0 else index
+        stop  = index + 2 if index + 1 < len(chain) else index + 1
+        left  = chain[index - 1] if index > 0 else self._sorted.first()
+        right = chain[index + 1] if index + 1 < len(chain) else self._sorted.last()
+
+        # the new span can only go through points on the outer side of the line between the neighbours,
+        # most of the points in between are well inside -> dropped with a float test that leaves a wide margin
+        (x1, y1), (x2, y2) = left, right
+        dx, dy = x2 - x1, y2 - y1
+        outer = [
+            other for other in self._sorted.irange(left, right)
+            if side * (dx * (other[1] - y1) - dy * (other[0] - x1)) <= 1e-12 * (abs(dx * (other[1] - y1)) + abs(dy * (other[0] - x1)))
+            ]
+        chain[start:stop] = _build_chain([left] + outer + [right] if left != right else [left], side)
+
+
+    def __len__(self) -> int:
+        return sum(self._points.values())
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(points={len(self)}, hull={len(self.hull())})"
+
+
+class _SortedPoints:
+    '''
+    distinct points sorted by x, then y, in blocks of at most _BLOCK_SIZE (like the sweep status)
+    -> adding/discarding a point is a bisection & a memmove inside of a single block
+    '''
+
+    __slots__ = ['_blocks', '_maxes']
+
+
+    def __init__(self, points: List[Tuple[float, float]]):
+        # points: already sorted & distinct
+        self._blocks = [points[ind:ind + _BLOCK_SIZE] for ind in range(0, len(points), _BLOCK_SIZE)]
+        self._maxes  = [block[-1] for block in self._blocks]
+
+
+    def add(self, point: Tuple[float, float]) -> None:
+        blocks, maxes = self._blocks, self._maxes
+        if not blocks:
+            blocks.append([point])
+            maxes.append(point)
+            return
+        index = min(bisect_left(maxes, point), len(blocks) - 1)
+        block = blocks[index]
+        insort(block, point)
+        maxes[index] = block[-1]
+        if len(block) > 2 * _BLOCK_SIZE:
+            blocks.insert(index + 1, block[_BLOCK_SIZE:])
+            del block[_BLOCK_SIZE:]
+            maxes[index] = block[-1]
+            maxes.insert(index + 1, blocks[index + 1][-1])
+
+
+    def discard(self, point: Tuple[float, float]) -> None:
+        blocks, maxes = self._blocks, self._maxes
+        index = bisect_left(maxes, point)
+        block = blocks[index]
+        del block[bisect_left(block, point)]
+        if block:
+            maxes[index] = block[-1]
+        else:
+            del blocks[index], maxes[index]
+
+
+    def irange(self, low: Tuple[float, float], high: Tuple[float, float]) -> Iterator[Tuple[float, float]]:
+        '''the points strictly between low and high'''
+        blocks, maxes = self._blocks, self._maxes
+        first, last = bisect_left(maxes, low), bisect_left(maxes, high)
+        for index in range(first, min(last + 1, len(blocks))):
+            block = blocks[index]
+            start = bisect_left(block, low) if index == first else 0
+            stop  = bisect_left(block, high) if index == last else len(block)
+            yield from block[start + (start < len(block) and block[start] == low):stop]
+
+
+    def first(self) -> Tuple[float, float]:
+        return self._blocks[0][0]
+
+
+    def last(self) -> Tuple[float, float]:
+        return self._blocks[-1][-1]
+
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        for block in self._blocks:
+            yield from block
+
+
+class _HullView:
+    '''the anti-clockwise hull as an indexable sequence over the 2 chains, optionally mirrored left to right'''
+
+    __slots__ = ['_lower', '_upper', '_mirror', '_length']
+
+
+    def __init__(self, lower: List[Tuple[float, float]], upper: List[Tuple[float, float]], mirror: bool):
+        self._lower, self._upper, self._mirror = lower, upper, mirror
+        self._length = max(len(lower) + len(upper) - 2, 1)
+
+
+    def __getitem__(self, index: int) -> Tuple[float, float]:
+        if self._mirror:
+            index = self._length - 1 - index
+        lower = self._lower
+        point = lower[index] if index < len(lower) - 1 or len(lower) == 1 else self._upper[len(lower) + len(self._upper) - 2 - index]
+        return (-point[0], point[1]) if self._mirror else point
+
+
+    def __len__(self) -> int:
+        return self._length
+
+
+def _build_chain(points: List[Tuple[float, float]], side: int) -> List[Tuple[float, float]]:
+    # one pass of the monotone chain over the sorted points
+    chain = []
+    for point in points:
+        while len(chain) >= 2 and side * orient2d(chain[-2], chain[-1], point) <= 0:
+            chain.pop()
+        chain.append(point)
+    return chain
+
+
+def _find(chain: List[Tuple[float, float]], point: Tuple[float, float]) -> Optional[int]:
+    index = bisect_left(chain, point)
+    return index if index < len(chain) and chain[index] == point else None
+
+
+def _insert_into_chain(chain: List[Tuple[float, float]], point: Tuple[float, float], side: int) -> None:
+    index = bisect_left(chain, point)
+    if index < len(chain) and chain[index] == point:
+        return
+    # a point that isn't past the edge it falls on (inside of the hull or on its boundary) doesn't change the chain
+    if 0 < index < len(chain) and side * orient2d(chain[index - 1], point, chain[index]) <= 0:
+        return
+
+    # knock off the neighbours that don't make a convex turn with the new point anymore
+    left, right = index, index
+    while left >= 2 and side * orient2d(chain[left - 2], chain[left - 1], point) <= 0:
+        left -= 1
+    while right + 1 < len(chain) and side * orient2d(point, chain[right], chain[right + 1]) <= 0:
+        right += 1
+    chain[left:right] = [point]
+
+
+def _inner_side(chain: List[Tuple[float, float]], point: Tuple[float, float], side: int) -> bool:
+    # on the inner side of the edge of the chain the point falls on (above the lower chain / below the upper one)
+    index = bisect_left(chain, point)
+    if index < len(chain) and chain[index] == point:
+        return True
+    if index == 0 or index == len(chain):
+        return False
+    return side * orient2d(chain[index - 1], chain[index], point) >= 0
+
+
+def _extreme_on_chain(chain: List[Tuple[float, float]], dx: float, dy: float) -> Tuple[float, float]:
+    # the edges of a chain turn one way only, so going along the chain
+    # the projection onto the direction goes up then down, or down then up -> never up, down & up again
+    along = lambda ind: dx * (chain[ind + 1][0] - chain[ind][0]) + dy * (chain[ind + 1][1] - chain[ind][1])
+    if len(chain) == 1 or along(0) <= 0:
+        return max(chain[0], chain[-1], key=lambda p: dx * p[0] + dy * p[1])
+
+    # the first edge going back against the direction
+    low, high = 0, len(chain) - 1
+    while low < high:
+        mid = (low + high) // 2
+        if along(mid) > 0:
+            low = mid + 1
+        else:
+            high = mid
+    return chain[low]
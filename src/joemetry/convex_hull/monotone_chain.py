@@ -0,0 +1,57 @@
+from joemetry import PointArray
+from joemetry.predicates import orient2d
+from joemetry.utils import get_coordinates
+from joemetry._type_hints import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def monotone_chain(points: Union[PointArray, List[Coor]]) -> List[int]:
+    '''
+    returns the indices of the points on the convex hull, anti-clockwise,
+    starting from the lowest-leftmost point (collinear points on the hull edges are left out)
+
+    the points are sorted once (as indices, the coordinates are never copied around),
+    then the lower & upper hull are built in a single output list used as a stack
+    '''
+    coords = get_coordinates(points)
+    return _hull_of_sorted(coords, _sorted_indices(points, coords))
+
+
+def _sorted_indices(points: Union[PointArray, List[Coor]], coords: List[Tuple[float, float]]) -> List[int]:
+    # sorted by x, then y
+    if np is not None and isinstance(points, PointArray):
+        return np.lexsort((points.ys, points.xs)).tolist()
+    return sorted(range(len(coords)), key=coords.__getitem__)
+
+
+def _hull_of_sorted(coords: List[Tuple[float, float]], order: List[int]) -> List[int]:
+    # Andrew's monotone chain over the sorted indices
+    if not order:
+        return []
+
+    hull = []
+    for ind in order:
+        point = coords[ind]
+        # pop every vertex that doesn't make an anti-clockwise turn with the current point
+        while len(hull) >= 2 and orient2d(coords[hull[-2]], coords[hull[-1]], point) <= 0:
+            hull.pop()
+        if not hull or coords[hull[-1]] != point:
+            hull.append(ind)
+
+    # the upper hull goes back over the points, but can't pop into the lower hull
+    lower_size = len(hull)
+    for ind in reversed(order[:-1]):
+        point = coords[ind]
+        while len(hull) > lower_size and orient2d(coords[hull[-2]], coords[hull[-1]], point) <= 0:
+            hull.pop()
+        if coords[hull[-1]] != point:
+            hull.append(ind)
+
+    # the last vertex is the starting one again
+    if len(hull) > 1 and coords[hull[-1]] == coords[hull[0]]:
+        hull.pop()
+    return hull
@@ -0,0 +1,134 @@
+from joemetry import PointArray
+from joemetry.predicates import orient2d
+from joemetry.utils import get_coordinates
+from joemetry._type_hints import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def quickhull(points: Union[PointArray, List[Coor]]) -> List[int]:
+    '''
+    returns the indices of the points on the convex hull, anti-clockwise,
+    starting from the lowest-leftmost point (collinear points on the hull edges are left out)
+
+    [PROCESS]:
+
+        1) throw away every point inside of the quadrilateral made by the extreme points on both axes,
+           for uniformly spread points that's most of them before any recursion happens
+
+        2) split the rest on the line between the leftmost & rightmost point
+
+        3) for every edge, find the point furthest out of it -> it's on the hull,
+           the points inside of the triangle it makes with the edge are dropped,
+           the ones outside of the 2 new edges are passed on to them
+    '''
+    coords = get_coordinates(points)
+    if not coords:
+        return []
+
+    leftmost  = min(range(len(coords)), key=coords.__getitem__)
+    rightmost = max(range(len(coords)), key=coords.__getitem__)
+    if coords[leftmost] == coords[rightmost]:
+        return [leftmost]
+
+    candidates = _outside_of_extremes(coords, points)
+    if np is not None and isinstance(points, PointArray):
+        xs, ys = np.asarray(points.xs), np.asarray(points.ys)
+        furthest = lambda start, end, group: _furthest_vectorized(xs, ys, start, end, group)
+        outside  = lambda start, end, group: _outside_vectorized(coords, xs, ys, start, end, group)
+    else:
+        furthest = lambda start, end, group: _furthest(coords, start, end, group)
+        outside  = lambda start, end, group: _outside(coords, start, end, group)
+
+    # the lower chain goes left to right and the upper chain right to left, both with the outside to their right
+    hull = []
+    for start, end in [(leftmost, rightmost), (rightmost, leftmost)]:
+        hull.append(start)
+        # depth first & in order -> the part of the chain before the apex, the apex, the part after it
+        stack = [(start, end, outside(start, end, candidates))]
+        while stack:
+            start, end, group = stack.pop()
+            if start is None:
+                hull.append(end)
+                continue
+            if len(group) == 0:
+                continue
+            apex = furthest(start, end, group)
+            stack.append((apex, end, outside(apex, end, group)))
+            stack.append((None, apex, None))
+            stack.append((start, apex, outside(start, apex, group)))
+
+    return _drop_collinear(coords, hull)
+
+
+def _drop_collinear(coords: List[Tuple[float, float]], hull: List[int]) -> List[int]:
+    # a point lying exactly on a hull edge can be picked as an apex when the distances tie
+    if len(hull) < 3:
+        return hull
+    return [
+        ind for position, ind in enumerate(hull)
+        if orient2d(coords[hull[position - 1]], coords[ind], coords[hull[(position + 1) % len(hull)]]) != 0
+        ]
+
+
+def _outside_of_extremes(coords: List[Tuple[float, float]], points: Union[PointArray, List[Coor]]) -> List[int]:
+    # Akl-Toussaint heuristic -> the points strictly inside of the extreme quadrilateral can't be on the hull
+    total  = len(coords)
+    corner = [
+        min(range(total), key=coords.__getitem__),
+        min(range(total), key=lambda ind: (coords[ind][1], -coords[ind][0])),
+        max(range(total), key=coords.__getitem__),
+        max(range(total), key=lambda ind: (coords[ind][1], -coords[ind][0])),
+        ]
+    quad = [coords[ind] for ind in corner]
+
+    if np is not None and isinstance(points, PointArray):
+        xs, ys = np.asarray(points.xs), np.asarray(points.ys)
+        inside = np.ones(total, dtype=bool)
+        for ind in range(4):
+            (x1, y1), (x2, y2) = quad[ind], quad[(ind + 1) % 4]
+            cross = (x2 - x1) * (ys - y1) - (y2 - y1) * (xs - x1)
+            # only trust the float sign well away from the edge
+            inside &= cross > 1e-12 * (abs(x2 - x1) + abs(y2 - y1)) * (np.abs(xs - x1) + np.abs(ys - y1))
+        return np.flatnonzero(~inside)
+
+    return [
+        ind for ind, point in enumerate(coords)
+        if not all(orient2d(quad[side], quad[(side + 1) % 4], point) > 0 for side in range(4))
+        ]
+
+
+def _outside(coords: List[Tuple[float, float]], start: int, end: int, group: Sequence[int]) -> List[int]:
+    # the points strictly to the right of start -> end
+    end, start = coords[end], coords[start]
+    return [ind for ind in group if orient2d(end, start, coords[ind]) > 0]
+
+
+def _furthest(coords: List[Tuple[float, float]], start: int, end: int, group: Sequence[int]) -> int:
+    (x1, y1), (x2, y2) = coords[start], coords[end]
+    dx, dy = x2 - x1, y2 - y1
+    # ties are broken on the position along the edge, so a point collinear with the apex isn't picked
+    return max(group, key=lambda ind: (dy * (coords[ind][0] - x1) - dx * (coords[ind][1] - y1), coords[ind]))
+
+
+def _outside_vectorized(coords, xs, ys, start: int, end: int, group):
+    group = np.asarray(group)
+    (x1, y1), (x2, y2) = coords[end], coords[start]
+    px, py = xs[group], ys[group]
+    cross  = (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)
+    scale  = (abs(x2 - x1) + abs(y2 - y1)) * (np.abs(px - x1) + np.abs(py - y1))
+    # the float sign is only checked exactly for the points close to the line
+    unsure = np.flatnonzero(np.abs(cross) <= 1e-12 * scale)
+    keep   = cross > 0
+    for ind in unsure.tolist():
+        keep[ind] = orient2d(coords[end], coords[start], coords[int(group[ind])]) > 0
+    return group[keep]
+
+
+def _furthest_vectorized(xs, ys, start: int, end: int, group) -> int:
+    x1, y1, x2, y2 = xs[start], ys[start], xs[end], ys[end]
+    distance = (y2 - y1) * (xs[group] - x1) - (x2 - x1) * (ys[group] - y1)
+    return int(group[np.argmax(distance)])
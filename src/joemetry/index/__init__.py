@@ -0,0 +1,3 @@
+from .kdtree import *
+from .rtree import *
+from .spatial_hash import *
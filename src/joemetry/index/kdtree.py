@@ -0,0 +1,296 @@
+from array import array
+from heapq import heappush, heappop, heapreplace
+from math import sqrt, inf
+from joemetry import PointArray
+from joemetry.utils import get_coordinates
+from joemetry._type_hints import *
+
+
+class KDTree:
+    '''
+    static 2d-tree over a set of points, for radius, k-nearest & pair queries
+
+    points: Points, (x, y) tuples or a PointArray, every query returns indices into them
+    leaf_size: the most points a leaf holds, smaller leaves prune more but make a deeper tree
+
+    the tree is kept in flat arrays
+        xs, ys:  the coordinates of the points, reordered so that every node owns a contiguous run of them
+        indices: the index of the given point at every position
+        starts, ends: the run of positions a node owns
+        lefts, rights: the child nodes (-1 for leaves), the root is node 0
+        boxes: the tight bounding box of every node (4 floats each)
+
+    [PROCESS]:
+
+        1) sort the points on x & on y, once
+
+        2) split the points of a node on the axis their box is widest along, at the median
+           -> the middle of the run sorted on that axis, the other run is split the same way keeping its order
+           so every level is a linear pass instead of a sort, O(n log n) for the whole tree
+           (the box of a node is read off the ends of both runs too)
+
+        3) repeat on both halves until a node has no more than leaf_size points
+    '''
+
+    __slots__ = ['leaf_size', 'xs', 'ys', 'indices', 'starts', 'ends', 'lefts', 'rights', 'boxes']
+
+
+    def __init__(self, points: Union[List[Coor], PointArray], leaf_size: Optional[int] = 16):
+        if leaf_size < 1:
+            raise ValueError("a leaf needs room for at least 1 point")
+        self.leaf_size = leaf_size
+        coords = get_coordinates(points)
+        xs, ys = [x for x, _ in coords], [y for _, y in coords]
+        order = list(range(len(coords)))
+
+        self.starts, self.ends = array('q'), array('q')
+        self.lefts, self.rights = array('q'), array('q')
+        self.boxes = array('d')
+
+        # (node, start, end, run sorted on x, run sorted on y)
+        # -> the nodes are numbered in the order they're made, so a parent is always before its children
+        stack = [(self._add_node(0, len(order)), 0, len(order), sorted(order, key=xs.__getitem__), sorted(order, key=ys.__getitem__))] if order else []
+        while stack:
+            node, start, end, by_x, by_y = stack.pop()
+            box = (xs[by_x[0]], ys[by_y[0]], xs[by_x[-1]], ys[by_y[-1]])
+            self.boxes[4 * node:4 * node + 4] = array('d', box)
+            if end - start <= leaf_size:
+                order[start:end] = by_x
+                continue
+
+            mid = (start + end) // 2
+            if box[2] - box[0] >= box[3] - box[1]:
+                left_x, right_x = by_x[:mid - start], by_x[mid - start:]
+                lower = set(left_x)
+                left_y, right_y = [ind for ind in by_y if ind in lower], [ind for ind in by_y if ind not in lower]
+            else:
+                left_y, right_y = by_y[:mid - start], by_y[mid - start:]
+                lower = set(left_y)
+                left_x, right_x = [ind for ind in by_x if ind in lower], [ind for ind in by_x if ind not in lower]
+
+            left, right = self._add_node(start, mid), self._add_node(mid, end)
+            self.lefts[node], self.rights[node] = left, right
+            stack.append((right, mid, end, right_x, right_y))
+            stack.append((left, start, mid, left_x, left_y))
+
+        self.indices = array('q', order)
+        self.xs = array('d', (xs[ind] for ind in order))
+        self.ys = array('d', (ys[ind] for ind in order))
+
+
+    def _add_node(self, start: int, end: int) -> int:
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lefts.append(-1)
+        self.rights.append(-1)
+        self.boxes.extend((0.0, 0.0, 0.0, 0.0))
+        return len(self.starts) - 1
+
+
+    def _box_distance_sq(self, node: int, x: float, y: float) -> float:
+        boxes, base = self.boxes, 4 * node
+        dx = max(boxes[base] - x, 0.0, x - boxes[base + 2])
+        dy = max(boxes[base + 1] - y, 0.0, y - boxes[base + 3])
+        return dx * dx + dy * dy
+
+
+    def query_radius(self, center: Coor, radius: float) -> List[int]:
+        '''returns the indices of the points within the radius of the center (the boundary counts)'''
+        if not self.starts:
+            return []
+        x, y = float(center[0]), float(center[1])
+        radius_sq = radius * radius
+        xs, ys, indices, boxes = self.xs, self.ys, self.indices, self.boxes
+        starts, ends, lefts, rights = self.starts, self.ends, self.lefts, self.rights
+
+        found, stack = [], [0]
+        while stack:
+            node = stack.pop()
+            if self._box_distance_sq(node, x, y) > radius_sq:
+                continue
+            # the whole box is inside of the circle -> no need to check the points one by one
+            base = 4 * node
+            far_x = max(x - boxes[base], boxes[base + 2] - x)
+            far_y = max(y - boxes[base + 1], boxes[base + 3] - y)
+            if far_x * far_x + far_y * far_y <= radius_sq:
+                found.extend(indices[starts[node]:ends[node]])
+            elif lefts[node] == -1:
+                for pos in range(starts[node], ends[node]):
+                    dx, dy = xs[pos] - x, ys[pos] - y
+                    if dx * dx + dy * dy <= radius_sq:
+                        found.append(indices[pos])
+            else:
+                stack.append(rights[node])
+                stack.append(lefts[node])
+        return found
+
+
+    def knn(
+        self,
+        point          : Coor,
+        k              : Optional[int] = 1,
+        return_distance: Optional[bool] = False
+        ) -> Union[List[int], List[Tuple[int, float]]]:
+        '''
+        returns the indices of the k points closest to the point, closest first
+        return_distance: return (index, distance) pairs instead
+        '''
+        if k < 1 or not self.starts:
+            return []
+        x, y = float(point[0]), float(point[1])
+        xs, ys, indices = self.xs, self.ys, self.indices
+        starts, ends, lefts, rights = self.starts, self.ends, self.lefts, self.rights
+
+        # the k best so far as a max heap of (-distance², -position), nodes come off a min heap on their box distance
+        best, nodes = [], [(self._box_distance_sq(0, x, y), 0)]
+        while nodes:
+            distance_sq, node = heappop(nodes)
+            if len(best) == k and distance_sq > -best[0][0]:
+                break
+            if lefts[node] != -1:
+                for child in (lefts[node], rights[node]):
+                    heappush(nodes, (self._box_distance_sq(child, x, y), child))
+                continue
+
+            for pos in range(starts[node], ends[node]):
+                dx, dy = xs[pos] - x, ys[pos] - y
+                entry = (-(dx * dx + dy * dy), -pos)
+                if len(best) < k:
+                    heappush(best, entry)
+                elif entry > best[0]:
+                    heapreplace(best, entry)
+
+        best.sort(reverse=True)
+        if return_distance:
+            return [(indices[-pos], sqrt(-distance_sq)) for distance_sq, pos in best]
+        return [indices[-pos] for _, pos in best]
+
+
+    def query_ball_pairs(self, radius: float) -> List[Tuple[int, int]]:
+        '''
+        returns every pair of points no further apart than the radius as (i, j) with i < j
+        the tree is walked against itself -> pairs of nodes whose boxes are too far apart are skipped whole
+        '''
+        if not self.starts:
+            return []
+        radius_sq = radius * radius
+        xs, ys, indices, boxes = self.xs, self.ys, self.indices, self.boxes
+        starts, ends, lefts, rights = self.starts, self.ends, self.lefts, self.rights
+
+        def apart_sq(first: int, second: int) -> float:
+            a, b = 4 * first, 4 * second
+            dx = max(boxes[a] - boxes[b + 2], 0.0, boxes[b] - boxes[a + 2])
+            dy = max(boxes[a + 1] - boxes[b + 3], 0.0, boxes[b + 1] - boxes[a + 3])
+            return dx * dx + dy * dy
+
+        pairs, stack = [], [(0, 0)]
+        while stack:
+            first, second = stack.pop()
+            if first != second and apart_sq(first, second) > radius_sq:
+                continue
+
+            first_leaf, second_leaf = lefts[first] == -1, lefts[second] == -1
+            if first_leaf and second_leaf:
+                for pos in range(starts[first], ends[first]):
+                    x, y = xs[pos], ys[pos]
+                    # a node against itself -> only the positions after pos, so every pair comes up once
+                    for other in range(pos + 1 if first == second else starts[second], ends[second]):
+                        dx, dy = xs[other] - x, ys[other] - y
+                        if dx * dx + dy * dy <= radius_sq:
+                            i, j = indices[pos], indices[other]
+                            pairs.append((i, j) if i < j else (j, i))
+            elif first == second:
+                left, right = lefts[first], rights[first]
+                stack.extend([(left, left), (right, right), (left, right)])
+            elif not first_leaf and (second_leaf or ends[first] - starts[first] >= ends[second] - starts[second]):
+                stack.extend([(lefts[first], second), (rights[first], second)])
+            else:
+                stack.extend([(first, lefts[second]), (first, rights[second])])
+        return pairs
+
+
+    def query_radius_many(self, centers: Union[List[Coor], PointArray], radius: float) -> List[List[int]]:
+        '''query_radius for every center'''
+        return [self.query_radius(center, radius) for center in get_coordinates(centers)]
+
+
+    def knn_many(
+        self,
+        points         : Union[List[Coor], PointArray],
+        k              : Optional[int] = 1,
+        return_distance: Optional[bool] = False
+        ) -> List[Union[List[int], List[Tuple[int, float]]]]:
+        '''knn for every point'''
+        return [self.knn(point, k, return_distance) for point in get_coordinates(points)]
+
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(points={len(self.indices)}, nodes={len(self.starts)}, leaf_size={self.leaf_size})"
+
+
+def closest_pair(points: Union[List[Coor], PointArray]) -> Tuple[int, int, float]:
+    '''
+    returns the indices of the two closest points & the distance between them as (i, j, distance) with i < j
+
+    [PROCESS]:
+
+        1) sort the points on x & split them in half at the median
+
+        2) find the closest pair of both halves, d being the smaller distance of the two
+
+        3) only the points within d of the dividing line can make a closer pair across it,
+           and going up that strip sorted on y, every point only has to be checked against the few after it
+           (the halves come back sorted on y, so the strip is a merge away -> O(n log n))
+    '''
+    coords = get_coordinates(points)
+    if len(coords) < 2:
+        raise ValueError("a closest pair needs at least 2 points")
+    order = sorted(range(len(coords)), key=lambda ind: coords[ind])
+
+    def solve(start: int, end: int) -> Tuple[float, int, int, List[int]]:
+        # returns (distance², i, j, the points of order[start:end] sorted on y)
+        if end - start <= 3:
+            best = (inf, -1, -1)
+            for first in range(start, end):
+                for second in range(first + 1, end):
+                    i, j = order[first], order[second]
+                    distance_sq = (coords[i][0] - coords[j][0]) ** 2 + (coords[i][1] - coords[j][1]) ** 2
+                    if distance_sq < best[0]:
+                        best = (distance_sq, i, j)
+            return (*best, sorted(order[start:end], key=lambda ind: coords[ind][1]))
+
+        mid = (start + end) // 2
+        divide = coords[order[mid]][0]
+        left, right = solve(start, mid), solve(mid, end)
+        best = min(left[:3], right[:3])
+
+        merged, a, b = [], left[3], right[3]
+        ia = ib = 0
+        while ia < len(a) and ib < len(b):
+            if coords[a[ia]][1] <= coords[b[ib]][1]:
+                merged.append(a[ia])
+                ia += 1
+            else:
+                merged.append(b[ib])
+                ib += 1
+        merged.extend(a[ia:])
+        merged.extend(b[ib:])
+
+        strip = [ind for ind in merged if (coords[ind][0] - divide) ** 2 < best[0]]
+        for first, i in enumerate(strip):
+            x, y = coords[i]
+            for j in strip[first + 1:]:
+                dy = coords[j][1] - y
+                if dy * dy >= best[0]:
+                    break
+                distance_sq = (coords[j][0] - x) ** 2 + dy * dy
+                if distance_sq < best[0]:
+                    best = (distance_sq, i, j)
+        return (*best, merged)
+
+    distance_sq, i, j, _ = solve(0, len(coords))
+    return (i, j, sqrt(distance_sq)) if i < j else (j, i, sqrt(distance_sq))
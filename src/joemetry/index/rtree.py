@@ -0,0 +1,248 @@
+from array import array
+from heapq import heappush, heappop
+from math import ceil, sqrt
+from joemetry import PointArray
+from joemetry.utils import get_bounds
+from joemetry._type_hints import *
+
+
+Box = Tuple[float, float, float, float]
+Item = Union[Coor, Seg, Poly, PointArray, Box]
+
+# the header of the serialized tree -> node capacity, number of items, number of nodes (int64 each)
+_HEADER = 3
+
+
+class RTree:
+    '''
+    static R-tree, bulk loaded with Sort-Tile-Recursive packing
+
+    items: polygons, segments, points, PointArrays or (min_x, min_y, max_x, max_y) boxes,
+           only their bounding boxes are kept, every query returns indices into the given items
+    node_capacity: the number of children per node
+
+    the tree is a handful of flat arrays, the items come first, then the nodes level by level with the root last
+        boxes:   4 floats per entry -> min_x, min_y, max_x, max_y
+        starts, ends: the range of entries a node's children are in (-1 for the items)
+        indices: the index of the item for every item entry
+    so there are no node objects, and the tree pickles/serializes (to_bytes & from_buffer) as a few buffers
+
+    [PROCESS]:
+
+        1) sort the entries of a level on the x-coordinate of their center
+           & cut them into sqrt(number of nodes) vertical slices
+
+        2) sort every slice on the y-coordinate & pack runs of node_capacity entries into a node
+
+        3) repeat on the new nodes until there's a single node left -> the root
+    '''
+
+    __slots__ = ['node_capacity', 'boxes', 'starts', 'ends', 'indices']
+
+
+    def __init__(self, items: Iterable[Item] = (), node_capacity: Optional[int] = 16):
+        if node_capacity < 2:
+            raise ValueError("a node needs room for at least 2 children")
+        self.node_capacity = node_capacity
+        self.boxes   = array('d')
+        self.starts  = array('q')
+        self.ends    = array('q')
+        self.indices = array('q')
+
+        boxes = [get_bounds(item) for item in items]
+        if not boxes:
+            return
+
+        # the items are packed the same way as the nodes, so they're reordered too
+        level = self._pack(list(range(len(boxes))), boxes)
+        for ind in level:
+            self.boxes.extend(boxes[ind])
+            self.starts.append(-1)
+            self.ends.append(-1)
+            self.indices.append(ind)
+
+        start, end = 0, len(level)
+        while end - start > 1:
+            nodes = []
+            for first in range(start, end, node_capacity):
+                last = min(first + node_capacity, end)
+                nodes.append((first, last, self._union(first, last)))
+
+            order = self._pack(list(range(len(nodes))), [node[2] for node in nodes])
+            start = end
+            for ind in order:
+                first, last, box = nodes[ind]
+                self.boxes.extend(box)
+                self.starts.append(first)
+                self.ends.append(last)
+            end = len(self.starts)
+
+
+    def _pack(self, entries: List[int], boxes: List[Box]) -> List[int]:
+        # sort tile -> the order the entries are grouped into nodes in
+        capacity = self.node_capacity
+        num_nodes = ceil(len(entries) / capacity)
+        slice_size = ceil(sqrt(num_nodes)) * capacity
+
+        center_x = lambda ind: boxes[ind][0] + boxes[ind][2]
+        center_y = lambda ind: boxes[ind][1] + boxes[ind][3]
+        entries.sort(key=center_x)
+        packed = []
+        for first in range(0, len(entries), slice_size):
+            packed.extend(sorted(entries[first:first + slice_size], key=center_y))
+        return packed
+
+
+    def _union(self, first: int, last: int) -> Box:
+        boxes = self.boxes
+        return (
+            min(boxes[4 * ind] for ind in range(first, last)),
+            min(boxes[4 * ind + 1] for ind in range(first, last)),
+            max(boxes[4 * ind + 2] for ind in range(first, last)),
+            max(boxes[4 * ind + 3] for ind in range(first, last)),
+            )
+
+
+    @property
+    def bounds(self) -> Optional[Box]:
+        '''the box around every item'''
+        if not self.starts:
+            return None
+        root = len(self.starts) - 1
+        return tuple(self.boxes[4 * root:4 * root + 4])
+
+
+    def query(self, box: Item) -> List[int]:
+        '''returns the indices of the items whose boxes overlap (or touch) the box, or the bounds of the shape given'''
+        return list(self.iter_query(box))
+
+
+    def query_point(self, point: Coor) -> List[int]:
+        '''returns the indices of the items whose boxes contain the point'''
+        return list(self.iter_query((point[0], point[1], point[0], point[1])))
+
+
+    def iter_query(self, box: Item) -> Iterator[int]:
+        '''lazily yields the indices of the items whose boxes overlap the box, depth first'''
+        if not self.starts:
+            return
+        min_x, min_y, max_x, max_y = get_bounds(box)
+        boxes, starts, ends, indices = self.boxes, self.starts, self.ends, self.indices
+
+        stack = [len(starts) - 1]
+        while stack:
+            node = stack.pop()
+            base = 4 * node
+            if boxes[base] > max_x or boxes[base + 1] > max_y or boxes[base + 2] < min_x or boxes[base + 3] < min_y:
+                continue
+            if starts[node] == -1:
+                yield indices[node]
+            else:
+                stack.extend(range(ends[node] - 1, starts[node] - 1, -1))
+
+
+    def nearest(
+        self,
+        point   : Coor,
+        k       : Optional[int] = 1,
+        distance: Optional[Callable[[int, Tuple[float, float]], float]] = None
+        ) -> List[int]:
+        '''
+        returns the indices of the k items closest to the point, closest first
+        distance: the exact distance from item i to the point, the distance to the box of the item is used otherwise
+                  (it has to be at least the distance to the box, like any distance to something inside of it)
+        '''
+        nearest = []
+        for ind, _ in self.iter_nearest(point, distance):
+            nearest.append(ind)
+            if len(nearest) == k:
+                break
+        return nearest
+
+
+    def iter_nearest(
+        self,
+        point   : Coor,
+        distance: Optional[Callable[[int, Tuple[float, float]], float]] = None
+        ) -> Iterator[Tuple[int, float]]:
+        '''
+        lazily yields (index, distance) for every item, closest first
+        best first search -> nodes & items share one heap keyed on their distance to the point
+        '''
+        if not self.starts:
+            return
+        x, y = float(point[0]), float(point[1])
+        boxes, starts, ends, indices = self.boxes, self.starts, self.ends, self.indices
+
+        def box_distance(node: int) -> float:
+            base = 4 * node
+            dx = max(boxes[base] - x, 0.0, x - boxes[base + 2])
+            dy = max(boxes[base + 1] - y, 0.0, y - boxes[base + 3])
+            return sqrt(dx * dx + dy * dy)
+
+        # entries are (distance, is_node, entry) -> at the same distance the items come out before the nodes
+        root = len(starts) - 1
+        heap = [(box_distance(root), 1, root)]
+        while heap:
+            dist, is_node, entry = heappop(heap)
+            if not is_node:
+                yield indices[entry], dist
+                continue
+            if starts[entry] == -1:
+                # an item -> goes back in with its exact distance, it can't be closer than its box
+                exact = distance(indices[entry], (x, y)) if distance is not None else dist
+                heappush(heap, (exact, 0, entry))
+                continue
+            for child in range(starts[entry], ends[entry]):
+                heappush(heap, (box_distance(child), 1, child))
+
+
+    def to_bytes(self) -> bytes:
+        '''serializes the tree into one buffer, from_buffer reads it back without copying'''
+        header = array('q', [self.node_capacity, len(self.indices), len(self.starts)])
+        return header.tobytes() + self.boxes.tobytes() + self.starts.tobytes() + self.ends.tobytes() + self.indices.tobytes()
+
+
+    @classmethod
+    def from_buffer(cls, buffer: Union[bytes, bytearray, memoryview, 'mmap']) -> 'RTree':
+        '''
+        wraps a buffer made by to_bytes (a file read/memory-mapped into memory works too),
+        the arrays of the tree become views on the buffer -> nothing is copied
+        '''
+        view = memoryview(buffer)
+        node_capacity, num_items, num_nodes = view[:8 * _HEADER].cast('q')
+        offset = 8 * _HEADER
+
+        def take(typecode: str, count: int) -> memoryview:
+            nonlocal offset
+            part = view[offset:offset + 8 * count].cast(typecode)
+            offset += 8 * count
+            return part
+
+        tree = cls.__new__(cls)
+        tree.node_capacity = node_capacity
+        tree.boxes   = take('d', 4 * num_nodes)
+        tree.starts  = take('q', num_nodes)
+        tree.ends    = take('q', num_nodes)
+        tree.indices = take('q', num_items)
+        return tree
+
+
+    def __getstate__(self) -> bytes:
+        return self.to_bytes()
+
+
+    def __setstate__(self, state: bytes) -> None:
+        tree = RTree.from_buffer(state)
+        self.node_capacity = tree.node_capacity
+        # unpickled trees own their arrays
+        self.boxes, self.starts = array('d', tree.boxes), array('q', tree.starts)
+        self.ends, self.indices = array('q', tree.ends), array('q', tree.indices)
+
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(items={len(self.indices)}, nodes={len(self.starts) - len(self.indices)})"
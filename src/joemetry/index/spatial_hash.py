@@ -0,0 +1,234 @@
+from dataclasses import dataclass
+from math import floor, sqrt
+from statistics import median
+from joemetry import Point, Segment, Polygon
+from joemetry.utils import get_bounds
+from joemetry._type_hints import *
+
+
+Box = Tuple[float, float, float, float]
+Item = Union[Point, Segment, Polygon, Coor, Box]
+
+
+@dataclass
+class HashStats:
+    '''
+    how full the cells of a SpatialHash are
+
+    items: the number of items
+    cells: the number of cells holding at least one item
+    entries: the number of (item, cell) references -> an item spanning 4 cells counts 4 times
+    max_occupancy: the most items in one cell
+    mean_occupancy: entries / cells
+    shared_cells: the cells holding more than one item
+    collisions: the pairs of items sharing a cell, counted per cell -> what a query pays for the cell size
+    '''
+
+    items         : int   = 0
+    cells         : int   = 0
+    entries       : int   = 0
+    max_occupancy : int   = 0
+    mean_occupancy: float = 0.0
+    shared_cells  : int   = 0
+    collisions    : int   = 0
+
+
+class SpatialHash:
+    '''
+    uniform grid over the plane, only the cells with something in them are stored (in a dict keyed on (column, row))
+    meant for things that move -> nothing is rebuilt, an item is just taken out of its old cells & put into the new ones
+
+    items: Points, Segments, Polygons, (x, y) tuples or (min_x, min_y, max_x, max_y) boxes,
+           every item is filed under the cells its bounding box covers, the same way Point.__floor__ snaps a point
+    cell_size: the width/height of a cell, worked out from the items given if it's not set (see auto_cell_size)
+
+        - insert/move/remove: O(cells covered by the item), O(1) for points & anything smaller than a cell
+        - move: free when the item stays in the same cells
+        - query_box/query_radius: O(cells covered by the query + the items in them)
+    '''
+
+    __slots__ = ['cell_size', '_cells', '_items', '_boxes', '_ranges', '_next_handle']
+
+
+    def __init__(self, items: Optional[Iterable[Item]] = (), cell_size: Optional[float] = None):
+        items = list(items)
+        if cell_size is None:
+            cell_size = auto_cell_size([get_bounds(item) for item in items])
+        if cell_size <= 0:
+            raise ValueError(f"the cell size has to be positive, not {cell_size}")
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        self._items = {}
+        self._boxes = {}
+        # the cells an item is in -> (first column, first row, last column, last row)
+        self._ranges = {}
+        self._next_handle = 0
+        for item in items:
+            self.insert(item)
+
+
+    def _cell_range(self, box: Box) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (floor(box[0] / size), floor(box[1] / size), floor(box[2] / size), floor(box[3] / size))
+
+
+    def _file(self, handle: int, cells: Tuple[int, int, int, int]) -> None:
+        table = self._cells
+        for column in range(cells[0], cells[2] + 1):
+            for row in range(cells[1], cells[3] + 1):
+                bucket = table.get((column, row))
+                if bucket is None:
+                    table[(column, row)] = {handle}
+                else:
+                    bucket.add(handle)
+
+
+    def _unfile(self, handle: int, cells: Tuple[int, int, int, int]) -> None:
+        table = self._cells
+        for column in range(cells[0], cells[2] + 1):
+            for row in range(cells[1], cells[3] + 1):
+                bucket = table[(column, row)]
+                bucket.discard(handle)
+                if not bucket:
+                    del table[(column, row)]
+
+
+    def insert(self, item: Item) -> int:
+        '''add an item to the grid, returns the handle it's reported with'''
+        handle = self._next_handle
+        self._next_handle += 1
+        box = get_bounds(item)
+        cells = self._cell_range(box)
+        self._items[handle], self._boxes[handle], self._ranges[handle] = item, box, cells
+        self._file(handle, cells)
+        return handle
+
+
+    def move(self, handle: int, item: Optional[Item] = None) -> None:
+        '''
+        refile an item after it moved
+        item: the item at its new place, if it's not given the item is assumed to have been moved in place
+        '''
+        if item is None:
+            item = self._items[handle]
+        box = get_bounds(item)
+        cells = self._cell_range(box)
+        old = self._ranges[handle]
+        self._items[handle], self._boxes[handle] = item, box
+        if cells != old:
+            self._unfile(handle, old)
+            self._file(handle, cells)
+            self._ranges[handle] = cells
+
+
+    def remove(self, handle: int) -> None:
+        self._unfile(handle, self._ranges.pop(handle))
+        del self._items[handle], self._boxes[handle]
+
+
+    def query_box(self, box: Union[Box, Item]) -> List[int]:
+        '''returns the handles of the items whose boxes overlap (or touch) the box, or the bounds of the shape given'''
+        min_x, min_y, max_x, max_y = box = get_bounds(box)
+        found = set()
+        for handle in self._candidates(self._cell_range(box)):
+            other = self._boxes[handle]
+            if other[0] <= max_x and min_x <= other[2] and other[1] <= max_y and min_y <= other[3]:
+                found.add(handle)
+        return list(found)
+
+
+    def query_radius(self, center: Coor, radius: float) -> List[int]:
+        '''returns the handles of the items whose boxes are within the radius of the center (exact for points)'''
+        x, y = float(center[0]), float(center[1])
+        radius_sq = radius * radius
+        found = set()
+        for handle in self._candidates(self._cell_range((x - radius, y - radius, x + radius, y + radius))):
+            box = self._boxes[handle]
+            dx = max(box[0] - x, 0.0, x - box[2])
+            dy = max(box[1] - y, 0.0, y - box[3])
+            if dx * dx + dy * dy <= radius_sq:
+                found.add(handle)
+        return list(found)
+
+
+    def neighbours(self, handle: int) -> List[int]:
+        '''returns the handles of the other items whose boxes overlap the box of the item'''
+        found = self.query_box(self._boxes[handle])
+        found.remove(handle)
+        return found
+
+
+    def _candidates(self, cells: Tuple[int, int, int, int]) -> Iterator[int]:
+        # a query covering more cells than there are occupied ones goes over the occupied cells instead
+        table = self._cells
+        first_column, first_row, last_column, last_row = cells
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > len(table):
+            for (column, row), bucket in table.items():
+                if first_column <= column <= last_column and first_row <= row <= last_row:
+                    yield from bucket
+            return
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                bucket = table.get((column, row))
+                if bucket is not None:
+                    yield from bucket
+
+
+    def rehash(self, cell_size: Optional[float] = None) -> None:
+        '''refile every item with a new cell size, worked out from the items again if it's not given'''
+        boxes = self._boxes
+        if cell_size is None:
+            cell_size = auto_cell_size(list(boxes.values()))
+        if cell_size <= 0:
+            raise ValueError(f"the cell size has to be positive, not {cell_size}")
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        for handle, box in boxes.items():
+            cells = self._ranges[handle] = self._cell_range(box)
+            self._file(handle, cells)
+
+
+    def stats(self) -> HashStats:
+        occupancy = [len(bucket) for bucket in self._cells.values()]
+        if not occupancy:
+            return HashStats(items=len(self._items))
+        return HashStats(
+            items          = len(self._items),
+            cells          = len(occupancy),
+            entries        = sum(occupancy),
+            max_occupancy  = max(occupancy),
+            mean_occupancy = sum(occupancy) / len(occupancy),
+            shared_cells   = sum(1 for count in occupancy if count > 1),
+            collisions     = sum(count * (count - 1) // 2 for count in occupancy),
+            )
+
+
+    def __getitem__(self, handle: int) -> Item:
+        return self._items[handle]
+
+
+    def __contains__(self, handle: int) -> bool:
+        return handle in self._items
+
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(items={len(self._items)}, cells={len(self._cells)}, cell_size={self.cell_size})"
+
+
+def auto_cell_size(boxes: List[Box]) -> float:
+    '''
+    picks a cell size for a set of (min_x, min_y, max_x, max_y) boxes
+    -> the bigger of the median size of the boxes (so most items cover at most 4 cells)
+       and the spacing of the items spread evenly over their extent (so there's about one item per cell)
+    '''
+    if not boxes:
+        return 1.0
+    extent = median(max(box[2] - box[0], box[3] - box[1]) for box in boxes)
+    width  = max(box[2] for box in boxes) - min(box[0] for box in boxes)
+    height = max(box[3] for box in boxes) - min(box[1] for box in boxes)
+    spacing = sqrt(width * height / len(boxes)) if width and height else max(width, height) / len(boxes)
+    return max(extent, spacing) or 1.0
@@ -0,0 +1,194 @@
+'''
+opt-in instrumentation of the hot paths, off unless something is listening
+
+    with instrument.recording() as stats:
+        CheckSegmentIntersection(lines)
+    stats.counts['bentley_ottmann']   -> {'start_events': ..., 'end_events': ..., 'intersection_events': ...}
+    stats.peaks['bentley_ottmann']    -> {'active_queue': ...}
+
+    instrument.add_hook(export)       -> export(report) is called after every instrumented call, see Probe.report
+
+what's recorded
+    bentley_ottmann -> the events handled by type & the peak size of the activeQueue, phases: setup, sweep
+    gjk             -> iterations & support calls
+    ear_clipping    -> ear tests (vertices looked at as an ear) & ears clipped, phases: setup, clipping
+    every call      -> the Points made during it & how long it took (total), the recording also counts every Point made while it's on
+
+when nothing is listening an instrumented function only pays for probe() returning None & a None check
+on its events, Points are only counted while instrumentation is on (Point.__init__ is swapped for a counting one)
+the state is global -> not meant for use from several threads at once
+'''
+from time import perf_counter
+from contextlib import contextmanager
+from joemetry._type_hints import *
+from .point import Point
+
+
+_recordings = []
+_hooks      = []
+_active     = False
+
+# Points made while instrumentation was on
+_points     = 0
+_point_init = Point.__init__
+
+
+def _counting_init(self, x: float, y: float) -> None:
+    global _points
+    _points += 1
+    _point_init(self, x, y)
+
+
+class Probe:
+    '''the counters, peaks & phase timings of a single call of an instrumented algorithm'''
+
+    __slots__ = ['name', 'counts', 'peaks', 'timings', '_start', '_mark', '_points']
+
+
+    def __init__(self, name: str):
+        self.name     = name
+        self.counts   = {}
+        self.peaks    = {}
+        self.timings  = {}
+        self._points  = _points
+        self._start   = self._mark = perf_counter()
+
+
+    def count(self, name: str, amount: Optional[int] = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+
+    def peak(self, name: str, value: Num) -> None:
+        '''keeps the biggest value it's given'''
+        if value > self.peaks.get(name, value - 1):
+            self.peaks[name] = value
+
+
+    def phase(self, name: str) -> None:
+        '''the time since the last phase ended (or since the call started) goes to this phase'''
+        now = perf_counter()
+        self.timings[name] = self.timings.get(name, 0.0) + now - self._mark
+        self._mark = now
+
+
+    def report(self) -> dict:
+        '''{'name', 'counts', 'peaks', 'timings' (seconds, with the 'total'), 'points' (Points made)}'''
+        return {
+            'name'   : self.name,
+            'counts' : dict(self.counts),
+            'peaks'  : dict(self.peaks),
+            'timings': dict(self.timings, total=perf_counter() - self._start),
+            'points' : _points - self._points
+            }
+
+
+    def finish(self) -> None:
+        '''hands the report to the recordings & hooks listening, the probe shouldn't be used after that'''
+        report = self.report()
+        for recording in _recordings:
+            recording.add(report)
+        for hook in list(_hooks):
+            hook(report)
+
+
+class Recording:
+    '''
+    what the instrumented calls reported while it was on, summed per algorithm
+    counts, timings: {algorithm: {name: total}}, the counts also have the 'points' made in the calls
+    peaks: {algorithm: {name: biggest}}
+    calls: {algorithm: number of calls}
+    points: every Point made while it was on, inside an instrumented call or not
+    '''
+
+    __slots__ = ['counts', 'peaks', 'timings', 'calls', 'callback', '_start', '_end']
+
+
+    def __init__(self, callback: Optional[Callable[[dict], Any]] = None):
+        self.counts   = {}
+        self.peaks    = {}
+        self.timings  = {}
+        self.calls    = {}
+        self.callback = callback
+        self._start   = self._end = _points
+
+
+    @property
+    def points(self) -> int:
+        # still recording -> counted up to now
+        return (_points if self in _recordings else self._end) - self._start
+
+
+    def add(self, report: dict) -> None:
+        name = report['name']
+        self.calls[name] = self.calls.get(name, 0) + 1
+        for total, values in ((self.counts.setdefault(name, {}), report['counts']), (self.timings.setdefault(name, {}), report['timings'])):
+            for key, value in values.items():
+                total[key] = total.get(key, 0) + value
+        peaks = self.peaks.setdefault(name, {})
+        for key, value in report['peaks'].items():
+            peaks[key] = max(peaks.get(key, value), value)
+        self.counts[name]['points'] = self.counts[name].get('points', 0) + report['points']
+        if self.callback is not None:
+            self.callback(report)
+
+
+    def per(self, name: str, counter: str, unit: str) -> float:
+        '''one counter of an algorithm divided by another, like recording.per('ear_clipping', 'ear_tests', 'ears')'''
+        counts = self.counts.get(name, {})
+        return counts.get(counter, 0) / counts[unit] if counts.get(unit) else 0.0
+
+
+    def report(self) -> dict:
+        return {'counts': self.counts, 'peaks': self.peaks, 'timings': self.timings, 'calls': self.calls, 'points': self.points}
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(calls={self.calls}, points={self.points})"
+
+
+@contextmanager
+def recording(callback: Optional[Callable[[dict], Any]] = None) -> Iterator[Recording]:
+    '''
+    turns instrumentation on for the block & yields the Recording everything is summed into
+    callback: also called with the report of every instrumented call made in the block (see Probe.report)
+    recordings can be nested, each one gets what was called while it was on
+    '''
+    current = Recording(callback)
+    _recordings.append(current)
+    _update()
+    try:
+        yield current
+    finally:
+        current._end = _points
+        _recordings.remove(current)
+        _update()
+
+
+def add_hook(hook: Callable[[dict], Any]) -> None:
+    '''calls hook(report) after every instrumented call from now on (see Probe.report), until it's removed'''
+    _hooks.append(hook)
+    _update()
+
+
+def remove_hook(hook: Callable[[dict], Any]) -> None:
+    _hooks.remove(hook)
+    _update()
+
+
+def enabled() -> bool:
+    return _active
+
+
+def probe(name: str) -> Optional[Probe]:
+    '''the probe for a call of an instrumented algorithm, None when nothing is listening'''
+    return Probe(name) if _active else None
+
+
+def _update() -> None:
+    # turns instrumentation (and the counting of Points) on when something starts listening & off when the last one stops
+    global _active
+    active = bool(_recordings or _hooks)
+    if active == _active:
+        return
+    _active = active
+    Point.__init__ = _counting_init if active else _point_init
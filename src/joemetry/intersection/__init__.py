@@ -0,0 +1,6 @@
+from .batch import *
+from .bentleyottmann import *
+from .convex_shape import *
+from .epa import *
+from .gjk import *
+from .sweep_and_prune import *
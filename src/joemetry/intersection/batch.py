@@ -0,0 +1,260 @@
+from array import array
+from joemetry._type_hints import *
+from joemetry import PointArray
+from joemetry.predicates import orient2d, _ORIENT2D_ERRBOUND, _TINY
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+Intersection = Tuple[int, int, Tuple[float, float]]
+
+# the most grid cells a single box is bucketed into, bigger boxes are tested against every box instead
+_MAX_CELLS = 16
+
+
+def batch_intersections(
+    segments: Union[List[Seg], PointArray],
+    mode    : Optional[str] = 'sweep',
+    red_blue: Optional[Union[List[Seg], PointArray]] = None
+    ) -> List[Intersection]:
+    '''
+    returns every intersecting pair of segments as (i, j, (x, y)), with i < j
+
+    segments: a list of segments/pair of points, or a PointArray of consecutive (start, end) pairs
+    mode: the broad phase used to pick the candidate pairs
+          "sweep": sort the bounding boxes on the x-axis and sweep over them
+          "grid":  bucket the bounding boxes into a uniform grid
+    red_blue: a second set of segments, only pairs made of one segment from each set are tested
+              -> i indexes "segments" and j indexes "red_blue"
+
+    candidate pairs are then tested all at once (vectorized when numpy is installed) with exact orientation tests,
+    touching pairs are reported, parallel/collinear pairs are not, same as Segment.intersect_with
+    '''
+    if mode not in ['sweep', 'grid']:
+        raise ValueError(f"{mode} is not a valid mode")
+
+    columns = _segment_columns(segments)
+    num_red = len(columns[0])
+    if red_blue is not None:
+        columns = tuple(_concat(red, blue) for red, blue in zip(columns, _segment_columns(red_blue)))
+
+    boxes = _bounding_boxes(*columns)
+    if mode == 'sweep':
+        first, second = _sweep_candidates(*boxes)
+    else:
+        first, second = _grid_candidates(*boxes)
+
+    if red_blue is not None:
+        first, second = _red_blue_pairs(first, second, num_red)
+
+    return _narrow_phase(columns, first, second, num_red if red_blue is not None else 0)
+
+
+def _segment_columns(segments: Union[List[Seg], PointArray]) -> Tuple[Sequence[float], ...]:
+    # split the segments into 4 columns -> x1, y1, x2, y2
+    if not isinstance(segments, PointArray):
+        segments = PointArray(coor for segment in segments for coor in (segment[0], segment[1]))
+    if len(segments) % 2:
+        raise ValueError(f"a PointArray of {len(segments)} points cannot be split into (start, end) pairs")
+
+    data = segments.buffer
+    return data[0::4], data[1::4], data[2::4], data[3::4]
+
+
+def _concat(first: Sequence[float], second: Sequence[float]) -> Sequence[float]:
+    if np is not None:
+        return np.concatenate((first, second))
+    return array('d', first) + array('d', second)
+
+
+def _bounding_boxes(x1, y1, x2, y2) -> Tuple[Sequence[float], ...]:
+    if np is not None:
+        return np.minimum(x1, x2), np.minimum(y1, y2), np.maximum(x1, x2), np.maximum(y1, y2)
+    return (
+        array('d', map(min, x1, x2)), array('d', map(min, y1, y2)),
+        array('d', map(max, x1, x2)), array('d', map(max, y1, y2))
+        )
+
+
+def _sweep_candidates(min_x, min_y, max_x, max_y) -> Tuple[Sequence[int], Sequence[int]]:
+    # sort the boxes by their left edge, every box is paired with the boxes
+    # whose left edge falls between its own left and right edge, then the pairs are filtered on the y-axis
+    if np is not None:
+        order    = np.argsort(min_x, kind='stable')
+        sorted_x = min_x[order]
+        start    = np.arange(1, len(order))
+        stop     = np.searchsorted(sorted_x, max_x[order], side='right')[:-1]
+        counts   = np.maximum(stop - start, 0)
+
+        total  = int(counts.sum())
+        first  = np.repeat(np.arange(len(counts)), counts)
+        offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        first, second = order[first], order[first + 1 + offset]
+
+        overlap = (min_y[first] <= max_y[second]) & (min_y[second] <= max_y[first])
+        return first[overlap], second[overlap]
+
+    order = sorted(range(len(min_x)), key=min_x.__getitem__)
+    total = len(order)
+    first, second = [], []
+    for position, i in enumerate(order):
+        right, bottom, top = max_x[i], min_y[i], max_y[i]
+        position += 1
+        while position < total and min_x[order[position]] <= right:
+            j = order[position]
+            if min_y[j] <= top and bottom <= max_y[j]:
+                first.append(i)
+                second.append(j)
+            position += 1
+    return first, second
+
+
+def _grid_candidates(min_x, min_y, max_x, max_y) -> Tuple[Sequence[int], Sequence[int]]:
+    # bucket every box into the cells it covers, cell size is the median box extent
+    # a pair that shares several cells is only reported from the cell holding the corner
+    # of their overlap -> no set is needed to deduplicate them
+    # a box that would cover more than _MAX_CELLS cells (a long segment among short ones) isn't bucketed,
+    # it goes into the overflow & is tested against every other box instead of filling (length / size)^2 cells
+    total = len(min_x)
+    if total < 2:
+        return [], []
+    boxes = min_x, min_y, max_x, max_y
+    if np is not None:
+        min_x, min_y, max_x, max_y = min_x.tolist(), min_y.tolist(), max_x.tolist(), max_y.tolist()
+
+    extents = sorted(max(max_x[i] - min_x[i], max_y[i] - min_y[i]) for i in range(total))
+    size    = extents[total // 2] or extents[-1] or 1.0
+    origin_x, origin_y = min(min_x), min(min_y)
+
+    cells, overflow = {}, []
+    for i in range(total):
+        cell_x1, cell_x2 = int((min_x[i] - origin_x) // size), int((max_x[i] - origin_x) // size)
+        cell_y1, cell_y2 = int((min_y[i] - origin_y) // size), int((max_y[i] - origin_y) // size)
+        if (cell_x2 - cell_x1 + 1) * (cell_y2 - cell_y1 + 1) > _MAX_CELLS:
+            overflow.append(i)
+            continue
+        for cell_x in range(cell_x1, cell_x2 + 1):
+            for cell_y in range(cell_y1, cell_y2 + 1):
+                cells.setdefault((cell_x, cell_y), []).append(i)
+
+    first, second = [], []
+    for (cell_x, cell_y), members in cells.items():
+        for position, i in enumerate(members):
+            for j in members[position + 1:]:
+                if min_x[j] > max_x[i] or min_x[i] > max_x[j] or min_y[j] > max_y[i] or min_y[i] > max_y[j]:
+                    continue
+                corner_x = int((max(min_x[i], min_x[j]) - origin_x) // size)
+                corner_y = int((max(min_y[i], min_y[j]) - origin_y) // size)
+                if corner_x == cell_x and corner_y == cell_y:
+                    first.append(i)
+                    second.append(j)
+
+    if np is not None:
+        first, second = np.array(first, dtype=np.intp), np.array(second, dtype=np.intp)
+        if overflow:
+            extra_first, extra_second = _overflow_pairs(overflow, *boxes)
+            first, second = np.concatenate((first, extra_first)), np.concatenate((second, extra_second))
+        return first, second
+
+    extra_first, extra_second = _overflow_pairs(overflow, min_x, min_y, max_x, max_y)
+    return first + extra_first, second + extra_second
+
+
+def _overflow_pairs(overflow: List[int], min_x, min_y, max_x, max_y) -> Tuple[Sequence[int], Sequence[int]]:
+    # every overflowing box against every box it overlaps, a pair of 2 overflowing boxes only once
+    oversized = set(overflow)
+    if np is not None:
+        first, second, ordered = [], [], np.array(overflow, dtype=np.intp)
+        for position, i in enumerate(overflow):
+            hit = (min_x <= max_x[i]) & (min_x[i] <= max_x) & (min_y <= max_y[i]) & (min_y[i] <= max_y)
+            hit[ordered[:position + 1]] = False
+            others = np.flatnonzero(hit)
+            first.append(np.full(len(others), i, dtype=np.intp))
+            second.append(others)
+        return np.concatenate(first), np.concatenate(second)
+
+    first, second = [], []
+    for i in overflow:
+        left, bottom, right, top = min_x[i], min_y[i], max_x[i], max_y[i]
+        for j in range(len(min_x)):
+            if j == i or (j < i and j in oversized):
+                continue
+            if min_x[j] > right or left > max_x[j] or min_y[j] > top or bottom > max_y[j]:
+                continue
+            first.append(i)
+            second.append(j)
+    return first, second
+
+
+def _red_blue_pairs(first: Sequence[int], second: Sequence[int], num_red: int) -> Tuple[Sequence[int], Sequence[int]]:
+    # keep the pairs made of one red & one blue segment, with the red one first
+    if np is not None:
+        first, second = np.minimum(first, second), np.maximum(first, second)
+        mixed = (first < num_red) & (second >= num_red)
+        return first[mixed], second[mixed]
+
+    pairs = [(min(i, j), max(i, j)) for i, j in zip(first, second)]
+    pairs = [(i, j) for i, j in pairs if i < num_red <= j]
+    return [i for i, _ in pairs], [j for _, j in pairs]
+
+
+def _narrow_phase(columns, first, second, blue_offset: int) -> List[Intersection]:
+    # the same exact orientation tests as Segment.intersect_with, for all of the candidate pairs at once
+    x1, y1, x2, y2 = columns
+    if np is not None:
+        first, second = np.asarray(first, dtype=np.intp), np.asarray(second, dtype=np.intp)
+        if not blue_offset:
+            first, second = np.minimum(first, second), np.maximum(first, second)
+
+        px, py, rx, ry = x1[first], y1[first], x2[first], y2[first]
+        qx, qy, sx, sy = x1[second], y1[second], x2[second], y2[second]
+
+        # which side of the other segment both ends of a segment are on
+        side_start  = _orient_columns(qx, qy, sx, sy, px, py)
+        side_end    = _orient_columns(qx, qy, sx, sy, rx, ry)
+        other_start = _orient_columns(px, py, rx, ry, qx, qy)
+        other_end   = _orient_columns(px, py, rx, ry, sx, sy)
+
+        hit = ~(((side_start > 0) & (side_end > 0)) | ((side_start < 0) & (side_end < 0)) | ((side_start == 0) & (side_end == 0)))
+        hit &= ~(((other_start > 0) & (other_end > 0)) | ((other_start < 0) & (other_end < 0)))
+
+        side_start, side_end = side_start[hit], side_end[hit]
+        ratio  = side_start / (side_start - side_end)
+        px, py = px[hit], py[hit]
+        xs, ys = (px + (rx[hit] - px) * ratio).tolist(), (py + (ry[hit] - py) * ratio).tolist()
+        pairs  = zip(first[hit].tolist(), (second[hit] - blue_offset).tolist(), zip(xs, ys))
+        return sorted(pairs)
+
+    intersections = []
+    for i, j in zip(first, second):
+        if not blue_offset and i > j:
+            i, j = j, i
+        p, r, q, s = (x1[i], y1[i]), (x2[i], y2[i]), (x1[j], y1[j]), (x2[j], y2[j])
+
+        side_start, side_end = orient2d(q, s, p), orient2d(q, s, r)
+        if (side_start > 0 and side_end > 0) or (side_start < 0 and side_end < 0) or side_start == side_end == 0:
+            continue
+        other_start, other_end = orient2d(p, r, q), orient2d(p, r, s)
+        if (other_start > 0 and other_end > 0) or (other_start < 0 and other_end < 0):
+            continue
+
+        ratio = side_start / (side_start - side_end)
+        intersections.append((i, j - blue_offset, (p[0] + (r[0] - p[0]) * ratio, p[1] + (r[1] - p[1]) * ratio)))
+
+    return sorted(intersections)
+
+
+def _orient_columns(ax, ay, bx, by, cx, cy) -> 'np.ndarray':
+    # orient2d over whole columns -> the same static filter, vectorized,
+    # only the determinants it can't vouch for go through the scalar (exact) predicate
+    det_left, det_right = (ax - cx) * (by - cy), (ay - cy) * (bx - cx)
+    det = det_left - det_right
+    unsure = np.abs(det) < _ORIENT2D_ERRBOUND * (np.abs(det_left) + np.abs(det_right))
+    tiny = (np.abs(det_left) < _TINY) & (np.abs(det_right) < _TINY)
+    unsure |= tiny & (((ax != cx) & (by != cy)) | ((ay != cy) & (bx != cx)))
+    for ind in np.flatnonzero(unsure).tolist():
+        det[ind] = orient2d((ax[ind], ay[ind]), (bx[ind], by[ind]), (cx[ind], cy[ind]))
+    return det
@@ -1 +1,2 @@
-from .intersection import BentlyOttmann
\ No newline at end of file
+from .intersection import CheckSegmentIntersection
+from .shamos_hoey import first_intersection, segments_touch
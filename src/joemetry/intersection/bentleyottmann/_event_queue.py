@@ -0,0 +1,63 @@
+from heapq import heappush, heappop
+from itertools import count
+from joemetry._type_hints import *
+from ._point_type import PointType, INTERSECTION
+
+
+class EventQueue:
+    '''
+    a binary heap of sweep events, ordered by plain tuple keys -> (x, kind, y, tiebreak)
+    x is the sort_index of the event, the x of its position except for an intersection clamped onto its lines
+
+    the tiebreak is a running counter, so two keys are never equal
+    and the heap never has to fall back to comparing the events themselves,
+    i.e. no PointType.__lt__/__gt__ is called while pushing or popping
+
+    intersection events are deduplicated by the pair of lines involved (2 segments only cross once),
+    the same crossing can be discovered more than once when two segments become neighbours again
+    '''
+
+    __slots__ = ['_heap', '_counter', '_seen']
+
+
+    def __init__(self):
+        self._heap    = []
+        self._counter = count()
+        self._seen    = set()
+
+
+    def push(self, event: PointType) -> bool:
+        '''push an event into the queue, returns False if it's a duplicated intersection'''
+        x, y = event.sort_index, event.position[1]
+        if event.kind == INTERSECTION:
+            key = self._intersection_key(event)
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+
+        heappush(self._heap, (x, event.kind, y, next(self._counter), event))
+        return True
+
+
+    def forget(self, event: PointType) -> None:
+        '''allow an intersection event to be pushed again, i.e when it was popped before it could be handled'''
+        self._seen.discard(self._intersection_key(event))
+
+
+    def _intersection_key(self, event: PointType) -> tuple:
+        line_a, line_b = id(event.lines[0]), id(event.lines[1])
+        return (min(line_a, line_b), max(line_a, line_b))
+
+
+    def pop(self) -> PointType:
+        '''pop the event with the smallest (x, kind, y) key'''
+        return heappop(self._heap)[-1]
+
+
+    @property
+    def isempty(self) -> bool:
+        return not self._heap
+
+
+    def __len__(self) -> int:
+        return len(self._heap)
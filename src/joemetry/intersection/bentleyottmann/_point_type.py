@@ -3,6 +3,11 @@ from joemetry import Segment
 from joemetry._type_hints import *
 
 
+# the kind of an event, used in the EventQueue's sort key
+# at the same x: starting points are handled first, then intersections, then ending points
+START, INTERSECTION, END = 0, 1, 2
+
+
 @dataclass
 class PointType:
 
@@ -58,14 +63,21 @@ class StartingPointType(PointType):
 
     line: Segment
 
+    kind = START
+
 
 @dataclass
 class EndingPointType(PointType):
 
     line: Segment
 
+    kind = END
+
 
 @dataclass
 class IntersectingPointType(PointType): 
 
-    points: Tuple[PointType, PointType]
+    # the two segments crossing at this point
+    lines: Tuple[Segment, Segment]
+
+    kind = INTERSECTION
@@ -0,0 +1,196 @@
+from bisect import bisect_left
+from joemetry._type_hints import *
+from ._point_type import PointType
+
+
+# a block is split in 2 once it holds more points than this
+_BLOCK_SIZE = 512
+# the gap left between neighbouring ranks/block keys when they're (re)spread
+_SPACING = 1 << 32
+
+
+class _Block:
+    '''a run of neighbouring points of the status & their ranks, which only have to increase inside the block'''
+
+    __slots__ = ['points', 'ranks', 'key']
+
+
+    def __init__(self, key: int):
+        self.points = []
+        self.ranks  = []
+        self.key    = key
+
+
+class SweepStatus:
+    '''
+    the activeQueue of the sweep -> the starting points of every segment crossing the sweep line,
+    ordered bottom to top by the y-coordinate of their line at the current position of the sweep line
+
+    the order of the lines only changes at intersections, where the sweep swaps the lines of two points,
+    so a new point can be placed with a bisection on y-at-sweep_x
+
+    the points are kept in blocks of at most _BLOCK_SIZE (like a B-tree with a single level) ->
+    insertion/deletion only moves the points of one block, instead of every point above it
+
+    the points never move past each other (the lines are swapped, not the points),
+    so every point gets a rank inside its block & every block a key, both kept increasing bottom to top
+    (block, rank) is the handle of a point -> finding it again is an exact O(log n) bisection on the keys & ranks,
+    it doesn't depend on the y of lines that cross each other right at sweep_x
+
+    a position inside the status is a (block index, index inside the block) tuple, given by insert & index,
+    it stays valid until the next insertion or deletion
+
+    the end coordinates & slope of every line are cached on insertion, keyed by id(line),
+    so the bisection doesn't go through Segment/Point attribute lookups
+    '''
+
+    __slots__ = ['sweep_x', '_lines', '_blocks', '_keys', '_handles', '_size']
+
+
+    def __init__(self):
+        self.sweep_x  = 0.0
+        self._lines   = {}
+        self._blocks  = []
+        # the key of every block, in the same order as _blocks
+        self._keys    = []
+        # the (block, rank) of every point, keyed by id(point)
+        self._handles = {}
+        self._size    = 0
+
+
+    def insert(self, point: PointType) -> Tuple[int, int]:
+        '''insert a starting point into the status, returns the position it was inserted at'''
+        start, end = point.line.start, point.line.end
+        slope = (end.y - start.y) / (end.x - start.x) if end.x != start.x else float('inf')
+        self._lines[id(point.line)] = (start.x, start.y, end.x, end.y, slope)
+
+        # the new line goes above every line that is lower at sweep_x,
+        # lines sharing its starting point are ordered by their slope -> the order they'll have right after sweep_x
+        y, lines, blocks = self.y_at(point.line), self._lines, self._blocks
+
+        def lower(other: PointType) -> bool:
+            other_y = self.y_at(other.line)
+            return other_y < y or (other_y == y and lines[id(other.line)][4] < slope)
+
+        if not blocks:
+            blocks.append(_Block(0))
+            self._keys.append(0)
+
+        # the first block that doesn't end below the new line, then the spot inside of it
+        low, high = 0, len(blocks) if blocks[0].points else 0
+        while low < high:
+            mid = (low + high) // 2
+            if lower(blocks[mid].points[-1]):
+                low = mid + 1
+            else:
+                high = mid
+        block_index = min(low, len(blocks) - 1)
+        block = blocks[block_index]
+
+        points = block.points
+        low, high = 0, len(points)
+        while low < high:
+            mid = (low + high) // 2
+            if lower(points[mid]):
+                low = mid + 1
+            else:
+                high = mid
+
+        rank = self._rank_between(block, low)
+        points.insert(low, point)
+        block.ranks.insert(low, rank)
+        self._handles[id(point)] = (block, rank)
+        self._size += 1
+
+        if len(points) > _BLOCK_SIZE:
+            self._split(block_index)
+            if low >= len(block.points):
+                return block_index + 1, low - len(block.points)
+        return block_index, low
+
+
+    def delete(self, point: PointType, position: Optional[Tuple[int, int]] = None) -> None:
+        '''take a point out of the status, its position can be given if it's already known'''
+        block_index, index = self.index(point) if position is None else position
+        block = self._blocks[block_index]
+        del block.points[index]
+        del block.ranks[index]
+        if not block.points:
+            del self._blocks[block_index]
+            del self._keys[block_index]
+        del self._handles[id(point)]
+        self._lines.pop(id(point.line), None)
+        self._size -= 1
+
+
+    def index(self, point: PointType) -> Tuple[int, int]:
+        '''returns the position of a point that's inside the status, without looking at any line'''
+        block, rank = self._handles[id(point)]
+        return bisect_left(self._keys, block.key), bisect_left(block.ranks, rank)
+
+
+    def below(self, position: Tuple[int, int]) -> Optional[PointType]:
+        block_index, index = position
+        if index > 0:
+            return self._blocks[block_index].points[index - 1]
+        return self._blocks[block_index - 1].points[-1] if block_index > 0 else None
+
+
+    def above(self, position: Tuple[int, int]) -> Optional[PointType]:
+        block_index, index = position
+        points = self._blocks[block_index].points
+        if index + 1 < len(points):
+            return points[index + 1]
+        return self._blocks[block_index + 1].points[0] if block_index + 1 < len(self._blocks) else None
+
+
+    def y_at(self, line: 'Segment') -> float:
+        '''the y-coordinate of the line where it crosses the sweep line'''
+        x1, y1, x2, y2, slope = self._lines[id(line)]
+        if x1 == x2:
+            return y1
+        return y1 + (self.sweep_x - x1) * slope
+
+
+    def _rank_between(self, block: _Block, index: int) -> int:
+        # a rank for a point about to be inserted at the index of the block, between the ranks of the points around it
+        ranks = block.ranks
+        if not ranks:
+            return 0
+        if index == 0:
+            return ranks[0] - _SPACING
+        if index == len(ranks):
+            return ranks[-1] + _SPACING
+        if ranks[index] - ranks[index - 1] < 2:
+            # no rank left in between -> spread the whole block out again, it's at most _BLOCK_SIZE points
+            for ind, point in enumerate(block.points):
+                ranks[ind] = ind * _SPACING
+                self._handles[id(point)] = (block, ranks[ind])
+        return (ranks[index - 1] + ranks[index]) // 2
+
+
+    def _split(self, block_index: int) -> None:
+        # move the upper half of a full block into a new block right above it
+        blocks, keys = self._blocks, self._keys
+        if block_index + 1 < len(keys) and keys[block_index + 1] - keys[block_index] < 2:
+            for ind, block in enumerate(blocks):
+                block.key = keys[ind] = ind * _SPACING
+        key = (keys[block_index] + keys[block_index + 1]) // 2 if block_index + 1 < len(keys) else keys[block_index] + _SPACING
+
+        block, upper = blocks[block_index], _Block(key)
+        half = len(block.points) // 2
+        upper.points, upper.ranks = block.points[half:], block.ranks[half:]
+        del block.points[half:], block.ranks[half:]
+        for point, rank in zip(upper.points, upper.ranks):
+            self._handles[id(point)] = (upper, rank)
+        blocks.insert(block_index + 1, upper)
+        keys.insert(block_index + 1, key)
+
+
+    @property
+    def isempty(self) -> bool:
+        return not self._size
+
+
+    def __len__(self) -> int:
+        return self._size
@@ -1,7 +1,12 @@
-from binarytree import AVL
-from joemetry import Segment, Point
+from joemetry import Segment, Point, instrument
 from joemetry._type_hints import *
-from ._point_type import StartingPointType, EndingPointType, IntersectingPointType
+from ._point_type import StartingPointType, EndingPointType, IntersectingPointType, START, INTERSECTION, END
+from ._event_queue import EventQueue
+from ._status import SweepStatus
+
+
+# what the events are counted as by joemetry.instrument
+_EVENT_NAMES = {START: 'start_events', INTERSECTION: 'intersection_events', END: 'end_events'}
 
 
 class CheckSegmentIntersection:
@@ -22,21 +27,22 @@ class CheckSegmentIntersection:
 
             2) populate the 'eventQueue' with the vectorized line, using the x-axis of point as the sort index
                -> this includes both the starting and ending point of the line
+               -> the queue is a heap of (x, kind, y, tiebreak) tuples, see EventQueue
 
             3) enter and while loop and get the minimum value/point from the eventQueue
+               -> move the sweep line of the 'activeQueue' to the x-axis of the point,
+                  the 'activeQueue' is ordered by the y-axis of every line at the sweep line
             
             4) check the type of the point
 
                i) if the point is a starting point:
-                  - change the sort index of the point to be based on the y-axis
+                  - insert it into the 'activeQueue'
 
                   - get the closest point that is above and below the point
 
                   - check whether both the upper and lower point interscect with the point
                     -> add it to the 'eventQueue' if it does
 
-                  - insert it into the 'activeQueue'
-
                ii) if the point is an ending point:
                   - get the closest point that is above and below the point
 
@@ -47,7 +53,7 @@ class CheckSegmentIntersection:
 
                iii) if the point is an intersecting point:
                   - determine which point is above and which point is down
-                    -> using their starting point as comparison
+                    -> using their position in the 'activeQueue', skip it for now if they aren't neighbours
 
                   - get the line that is above the upper point and the line that is below the lower point //
                     get the 'other neighbour' for both of those points
@@ -66,124 +72,155 @@ class CheckSegmentIntersection:
     '''
 
     def __new__(cls,
-        lines: S, 
+        lines: List[Seg], 
         getLine: Optional[bool]=False
-        ) -> Union[List[C], List[S], None]:
+        ) -> Union[List[Coor], List[Seg], None]:
         return super().__new__(cls)(lines, getLine)
 
 
     def __call__(self, 
-        lines: S, 
+        lines: List[Seg], 
         getLine: Optional[bool]=False
-        ) -> Union[List[C], List[S], None]:
+        ) -> Union[List[Coor], List[Seg], None]:
+
+        # None unless joemetry.instrument is recording
+        self.probe = instrument.probe('bentley_ottmann')
 
         # data structure for storing all the points
-        # activeQueue: y-axis sorted
-        # eventQueue:  x-axis sorted
-        self.eventQueue  = AVL()
-        self.activeQueue = AVL()
+        # activeQueue: y-axis sorted, at the current position of the sweep line
+        # eventQueue:  x-axis sorted binary heap
+        self.eventQueue  = EventQueue()
+        self.activeQueue = SweepStatus()
+
+        # the point that currently owns each segment inside the activeQueue, keyed by id(segment)
+        # the owner changes whenever two segments swap lines at an intersection,
+        # keeping track of it here lets an ending point find its node without scanning the activeQueue
+        self.segment_nodes = {}
 
         # store the intersected lines & points
         self.intersected_points = set()
         self.intersected_lines  = []
 
         # initialize the event queue with the x-axis as the sorting index
+        # -> every line goes from its lower (x, y) end to its upper one, so its start is always handled before its end
         for line in lines:
-            vec_line = Segment(*line)
-            self.eventQueue.insert(StartingPointType(line[0][0], line[0],vec_line))
-            self.eventQueue.insert(EndingPointType(line[1][0], line[1], vec_line))
-
-        return self.sweep(getLine)
-
-
-    def sweep(self, getLine: Optional[bool]=False) -> Union[List[C], List[S], None]:
+            start, end = sorted(((float(line[0][0]), float(line[0][1])), (float(line[1][0]), float(line[1][1]))))
+            vec_line = Segment(start, end)
+            self.eventQueue.push(StartingPointType(start[0], start, vec_line))
+            self.eventQueue.push(EndingPointType(end[0], end, vec_line))
+
+        if self.probe is None:
+            return self.sweep(getLine)
+        self.probe.phase('setup')
+        result = self.sweep(getLine)
+        self.probe.phase('sweep')
+        self.probe.finish()
+        return result
+
+
+    def sweep(self, getLine: Optional[bool]=False) -> Union[List[Coor], List[Seg], None]:
+        probe = self.probe
         while not self.eventQueue.isempty:
 
-            current_point = self.eventQueue.pop(key='min')
-            # change the sorting index to y-axis 
-            # -> to get the correct set of points when it's passed into the activeQueue 
-            current_point.sort_index = current_point.position[1]
-        
-            if not isinstance(current_point, IntersectingPointType):
+            current_point = self.eventQueue.pop()
+            # move the sweep line to the current point
+            # -> the activeQueue compares the lines by their y-axis at this position
+            self.activeQueue.sweep_x = current_point.sort_index
 
-                # get the point that is 'above' or 'below' the current point, based on the y-axis
-                lower_point = self.activeQueue.find_lt(current_point)
-                upper_point = self.activeQueue.find_gt(current_point)
+            if probe is not None:
+                probe.count(_EVENT_NAMES[current_point.kind])
 
-                if isinstance(current_point, StartingPointType):
-                    self.handle_starting_point(current_point, upper_point, lower_point)
-                    continue
+            if current_point.kind == START:
+                self.handle_starting_point(current_point)
+                if probe is not None:
+                    probe.peak('active_queue', len(self.activeQueue))
+                continue
 
-                self.handle_ending_point(current_point, upper_point, lower_point)
+            if current_point.kind == INTERSECTION:
+                self.handle_intersecting_point(current_point)
                 continue
 
-            self.handle_intersecting_point(current_point)
-            continue
+            self.handle_ending_point(current_point)
 
         if self.intersected_points != set():
             return (self.intersected_points, self.intersected_lines) if getLine else self.intersected_points
 
         return None
-        
 
-    def handle_starting_point(self, current_point, upper_point, lower_point):
-        # if there's a segment below the current point, check if they intersect
-        if upper_point:
-            intersect_up = current_point.line.intersect_with(upper_point.line)
-            if intersect_up:
-                self.eventQueue.insert(IntersectingPointType(intersect_up[0], intersect_up.astuple(), (upper_point, current_point)))
 
-        # if there's a segment above the current point, check if they intersect
-        if lower_point:
-            intersect_down = current_point.line.intersect_with(lower_point.line)
-            if intersect_down:
-                self.eventQueue.insert(IntersectingPointType(intersect_down[0], intersect_down.astuple(), (current_point, lower_point)))
+    def check_intersection(self, upper_point, lower_point):
+        '''add the intersection of the lines of both points to the eventQueue, if there's any'''
+        if upper_point is None or lower_point is None:
+            return
+        upper_line, lower_line = upper_point.line, lower_point.line
+        intersection = upper_line.intersect_with(lower_line)
+        if intersection:
+            # the computed crossing can be an ulp past the end of a line (a vertical one especially),
+            # the event goes at an x both lines are still in the activeQueue at -> the overlap of their x-ranges
+            x = min(max(intersection.x, upper_line.start.x, lower_line.start.x), upper_line.end.x, lower_line.end.x)
+            self.eventQueue.push(IntersectingPointType(x, intersection.astuple(), (upper_line, lower_line)))
+        
+
+    def handle_starting_point(self, current_point):
+        position = self.activeQueue.insert(current_point)
+        self.segment_nodes[id(current_point.line)] = current_point
 
-        self.activeQueue.insert(current_point)
+        # check whether the segments right above and below the current point intersect with it
+        self.check_intersection(self.activeQueue.above(position), current_point)
+        self.check_intersection(current_point, self.activeQueue.below(position))
 
 
-    def handle_ending_point(self, current_point, upper_point, lower_point):
-        # check whather the line segment that's below and above it intersect
-        if lower_point and upper_point:
-            intersect_up_down = upper_point.line.intersect_with(lower_point.line)
+    def handle_ending_point(self, current_point):
+        # the node that owns the ending segment might not be the one it was inserted with
+        # -> use the owner's neighbours, they're the segments that become adjacent once it's removed
+        owner = self.segment_nodes.pop(id(current_point.line), None)
+        if owner is None:
+            return
 
-            if intersect_up_down:
-                self.eventQueue.insert(IntersectingPointType(intersect_up_down[0], intersect_up_down.astuple(), (upper_point, lower_point)))
+        position = self.activeQueue.index(owner)
+        upper_point, lower_point = self.activeQueue.above(position), self.activeQueue.below(position)
 
-        # remove the node with the line segment from the activeQueue 
-        # doing it like this since the 'owner' of the line is swapped for each intersection point
-        # ____________________________________________________________________________
-        # might change this, add it as a feature or something in the delete method
-        for node in self.activeQueue:
-            if node.value.line == current_point.line:
-                self.activeQueue.delete(node.value)
+        # remove the node with the line segment from the activeQueue
+        # and check whether the line segment that's below and above it intersect
+        self.activeQueue.delete(owner, position)
+        self.check_intersection(upper_point, lower_point)
 
 
     def handle_intersecting_point(self, current_point):
+        line_a, line_b = current_point.lines
+        point_a = self.segment_nodes.get(id(line_a))
+        point_b = self.segment_nodes.get(id(line_b))
+        if point_a is None or point_b is None:
+            return
+
         # get the upper and lower point of the intersection
-        up_point   = max(current_point.points)
-        down_point = min(current_point.points)
+        # only neighbours can be swapped -> when more than 2 lines cross at the same spot,
+        # wait for the pair to become adjacent, it'll be rediscovered by the swaps in between
+        position_a, position_b = self.activeQueue.index(point_a), self.activeQueue.index(point_b)
+        if self.activeQueue.above(position_a) is point_b:
+            up_position, down_position, up_point, down_point = position_b, position_a, point_b, point_a
+        elif self.activeQueue.above(position_b) is point_a:
+            up_position, down_position, up_point, down_point = position_a, position_b, point_a, point_b
+        else:
+            self.eventQueue.forget(current_point)
+            return
 
         self.intersected_points.add(current_point.position)
         self.intersected_lines.append((up_point.line, down_point.line))
 
         # get the neighbour of both of those points
         # -> the point that is even higher than the upper point
-        # -> the point that is even lower thatn the upper point
-        neigh_up   = self.activeQueue.find_gt(up_point)
-        neigh_down = self.activeQueue.find_lt(down_point)
+        # -> the point that is even lower thatn the lower point
+        neigh_up   = self.activeQueue.above(up_position)
+        neigh_down = self.activeQueue.below(down_position)
 
         # swap the line of the two intersecting points
         up_point.line, down_point.line = down_point.line, up_point.line
-        
+        self.segment_nodes[id(up_point.line)]   = up_point
+        self.segment_nodes[id(down_point.line)] = down_point
+
         # check whether lower point's line intersects with the line of neighbour of upper point 
-        if neigh_up:
-            intersect_up = neigh_up.line.intersect_with(up_point.line)
-            if intersect_up:
-                self.eventQueue.insert(IntersectingPointType(intersect_up[0], intersect_up.astuple(), (neigh_up, down_point)))
-        
+        self.check_intersection(neigh_up, up_point)
+
         # check whether upper point's line intersects with the line of neighbour of lower point 
-        if neigh_down:
-            intersect_down = neigh_down.line.intersect_with(down_point.line)
-            if intersect_down:
-                self.eventQueue.insert(IntersectingPointType(intersect_down[0], intersect_down.astuple(), (neigh_down, up_point)))
+        self.check_intersection(down_point, neigh_down)
@@ -0,0 +1,79 @@
+from joemetry import Segment
+from joemetry.predicates import orient2d
+from joemetry._type_hints import *
+from ._point_type import StartingPointType, EndingPointType, START
+from ._event_queue import EventQueue
+from ._status import SweepStatus
+
+
+def first_intersection(
+    segments: List[Seg],
+    ignore  : Optional[Callable[[int, int], bool]] = None
+    ) -> Optional[Tuple[int, int]]:
+    '''
+    returns the first pair of segments found touching each other as (i, j) with i < j, None if none of them do
+    O(n log n) (Shamos–Hoey), the sweep stops right at the first pair it finds instead of going through the crossings
+    ignore: a function of (i, j) telling which pairs are allowed to touch, like the neighbouring edges of a polygon
+
+    uses the same events, event queue & status as CheckSegmentIntersection, minus the intersection events ->
+    the status never has to be reordered, since the sweep is over as soon as 2 segments meet
+
+    [PROCESS]:
+
+        1) every segment goes from its lower (x, y) end to its upper one, both ends go into the event queue
+
+        2) a starting segment is inserted into the status & tested against the segments right below & above it
+
+        3) an ending segment is taken out, & the segments that were below & above it are tested against each other
+
+        4) the leftmost point where 2 segments meet is always found by one of those tests,
+           since the 2 segments (or one of them & another segment through the same point) are neighbours right before it
+    '''
+    queue, status = EventQueue(), SweepStatus()
+    lines, starts = {}, {}
+    for ind, segment in enumerate(segments):
+        start, end = sorted(((float(segment[0][0]), float(segment[0][1])), (float(segment[1][0]), float(segment[1][1]))))
+        line = Segment(start, end)
+        lines[id(line)] = (ind, start, end)
+        queue.push(StartingPointType(start[0], start, line))
+        queue.push(EndingPointType(end[0], end, line))
+
+    def meeting(lower: Optional[StartingPointType], upper: Optional[StartingPointType]) -> Optional[Tuple[int, int]]:
+        if lower is None or upper is None:
+            return None
+        i, p, q = lines[id(lower.line)]
+        j, r, s = lines[id(upper.line)]
+        i, j = min(i, j), max(i, j)
+        if ignore is not None and ignore(i, j):
+            return None
+        return (i, j) if segments_touch(p, q, r, s) else None
+
+    while not queue.isempty:
+        event = queue.pop()
+        status.sweep_x = event.sort_index
+
+        if event.kind == START:
+            position = status.insert(event)
+            starts[id(event.line)] = event
+            found = meeting(status.below(position), event) or meeting(event, status.above(position))
+        else:
+            start = starts.pop(id(event.line))
+            position = status.index(start)
+            found = meeting(status.below(position), status.above(position))
+            status.delete(start, position)
+
+        if found is not None:
+            return found
+    return None
+
+
+def segments_touch(p: Tuple[float, float], q: Tuple[float, float], r: Tuple[float, float], s: Tuple[float, float]) -> bool:
+    '''whether segment pq & segment rs have any point in common, exact (orient2d), end points & overlaps included'''
+    o1, o2 = orient2d(p, q, r), orient2d(p, q, s)
+    if o1 == 0 and o2 == 0:
+        # collinear -> do they overlap along their line
+        return max(min(p, q), min(r, s)) <= min(max(p, q), max(r, s))
+    if (o1 > 0 and o2 > 0) or (o1 < 0 and o2 < 0):
+        return False
+    o3, o4 = orient2d(r, s, p), orient2d(r, s, q)
+    return not ((o3 > 0 and o4 > 0) or (o3 < 0 and o4 < 0))
@@ -0,0 +1,120 @@
+from bisect import bisect_left
+from math import atan2
+from joemetry import PointArray
+from joemetry.utils import get_coordinates
+from joemetry.convex_hull import monotone_chain
+from joemetry._type_hints import *
+
+
+class ConvexShape:
+    '''
+    a convex polygon prepared for repeated support queries (GJK/EPA)
+    build it once & pass it to GJK instead of the polygon, the vertices & bounding box are cached on it
+
+    vertices: the convex hull of the given points, anti-clockwise with no collinear vertices
+    bounds: (min_x, min_y, max_x, max_y)
+    center: the center of the bounding box, same as Polygon.center
+
+    a support query hill-climbs from the vertex returned by the last query,
+    GJK's directions don't change much between iterations/frames so that's a step or two most of the time
+    when the climb gets too long (big shapes, direction flipped) it jumps to the vertex found by
+    a binary search over the angles of the edge normals instead -> O(log n) worst case
+    '''
+
+    __slots__ = ['vertices', 'bounds', 'center', '_last', '_normal_angles', '_angle_offset']
+
+
+    def __init__(self, shape: Union[Poly, PointArray, List[Coor], 'ConvexShape']):
+        if isinstance(shape, ConvexShape):
+            coords = shape.vertices
+        else:
+            coords = get_coordinates(shape)
+        if not coords:
+            raise ValueError("cannot make a convex shape out of no points")
+
+        self.vertices = [coords[ind] for ind in monotone_chain(coords)]
+        xs, ys = [x for x, _ in self.vertices], [y for _, y in self.vertices]
+        self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        self.center = ((self.bounds[0] + self.bounds[2]) / 2, (self.bounds[1] + self.bounds[3]) / 2)
+        self._last  = 0
+        # only worked out once a climb runs too long
+        self._normal_angles = None
+        self._angle_offset  = 0
+
+
+    def support(self, direction: Coor) -> Tuple[float, float]:
+        '''returns the vertex furthest along the direction'''
+        vertices = self.vertices
+        total = len(vertices)
+        if total == 1:
+            return vertices[0]
+
+        dx, dy = direction[0], direction[1]
+        ind = self._climb(self._last, dx, dy, total if total <= 16 else total.bit_length() + 2)
+        if ind is None:
+            ind = self._climb(self._search(dx, dy), dx, dy, total)
+        self._last = ind
+        return vertices[ind]
+
+
+    def translate_ip(self, dx: float, dy: float) -> None:
+        '''moves the shape, the support angles don't change so nothing has to be prepared again'''
+        self.vertices = [(x + dx, y + dy) for x, y in self.vertices]
+        min_x, min_y, max_x, max_y = self.bounds
+        self.bounds = (min_x + dx, min_y + dy, max_x + dx, max_y + dy)
+        self.center = (self.center[0] + dx, self.center[1] + dy)
+
+
+    def _climb(self, ind: int, dx: float, dy: float, limit: int) -> Optional[int]:
+        # the projection onto the direction only has one peak going around a convex polygon,
+        # so walk up whichever neighbour is higher until neither is, None if that takes more than 'limit' steps
+        vertices = self.vertices
+        total = len(vertices)
+        x, y = vertices[ind]
+        best = dx * x + dy * y
+
+        x, y = vertices[(ind + 1) % total]
+        step = 1
+        if dx * x + dy * y <= best:
+            x, y = vertices[ind - 1]
+            if dx * x + dy * y <= best:
+                return ind
+            step = -1
+
+        for _ in range(limit):
+            following = (ind + step) % total
+            x, y = vertices[following]
+            projection = dx * x + dy * y
+            if projection <= best:
+                return ind
+            ind, best = following, projection
+        return None
+
+
+    def _search(self, dx: float, dy: float) -> int:
+        # vertex i is the support for the directions between the outward normals of the edges on both sides of it,
+        # the normals of an anti-clockwise polygon go around anti-clockwise -> sorted once rotated to start at the smallest
+        if self._normal_angles is None:
+            vertices, total = self.vertices, len(self.vertices)
+            angles = []
+            for ind in range(total):
+                (x1, y1), (x2, y2) = vertices[ind], vertices[(ind + 1) % total]
+                angles.append(atan2(x1 - x2, y2 - y1))
+            offset = min(range(total), key=angles.__getitem__)
+            self._normal_angles = angles[offset:] + angles[:offset]
+            self._angle_offset  = offset
+
+        position = bisect_left(self._normal_angles, atan2(dy, dx))
+        return (self._angle_offset + position) % len(self.vertices)
+
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return iter(self.vertices)
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(vertices={len(self.vertices)}, bounds={self.bounds})"
@@ -0,0 +1,284 @@
+from dataclasses import dataclass
+from heapq import heappush, heappop
+from math import sqrt
+from joemetry.predicates import orient2d
+from joemetry._type_hints import *
+from .convex_shape import ConvexShape
+from .gjk import GJK, _prepare
+
+
+Vector = Tuple[float, float]
+# a vertex of the minkowski difference along with the points of both shapes it came from -> (a - b, a, b)
+SupportPoint = Tuple[Vector, Vector, Vector]
+
+
+@dataclass
+class Contact:
+    '''
+    the result of collide
+
+    colliding: whether the shapes overlap (touching counts)
+    distance: the gap between the shapes, or how deep they overlap when colliding
+    normal: unit vector pointing from shape1 towards shape2,
+            moving shape2 by normal * distance makes colliding shapes touch
+    point1, point2: the closest (or deepest) points of shape1 & shape2
+    '''
+
+    colliding: bool
+    distance : float
+    normal   : Vector
+    point1   : Vector
+    point2   : Vector
+
+
+def EPA(
+    shape1   : Union[Poly, ConvexShape],
+    shape2   : Union[Poly, ConvexShape],
+    simplex  : Optional[List[Vector]] = None,
+    tolerance: Optional[float] = 1e-9
+    ) -> Tuple[float, Vector]:
+    '''
+    returns the penetration depth & contact normal of two overlapping convex shapes
+    -> moving shape2 by normal * depth separates them
+    simplex: the simplex GJK(shape1, shape2, return_simplex=True) ended with, GJK is run if it's not given
+
+    [PROCESS]:
+
+        1) start from the simplex around the origin, as a polygon of edges (start, end, prev, next)
+
+        2) pop the edge closest to the origin off a heap & find the support point along its normal
+
+        3) if the support point isn't further out than the edge, the edge is on the boundary
+           of the minkowski difference -> done
+           otherwise the edges the support point can see are replaced by 2 edges through it
+    '''
+    shape1, shape2 = _prepare(shape1), _prepare(shape2)
+    if simplex is None:
+        overlapping, simplex = GJK(shape1, shape2, return_simplex=True)
+        if not overlapping:
+            raise ValueError("the shapes don't overlap")
+
+    support = _support_function(shape1, shape2)
+    # the shape points of the given simplex are unknown, only the depth & normal are returned here
+    points = [(point, point, (0.0, 0.0)) for point in simplex]
+    depth, normal, _, _ = _expand(support, points, len(shape1) + len(shape2), tolerance)
+    return depth, normal
+
+
+def collide(
+    shape1   : Union[Poly, ConvexShape],
+    shape2   : Union[Poly, ConvexShape],
+    tolerance: Optional[float] = 1e-9
+    ) -> Contact:
+    '''
+    tests two convex shapes in one go -> whether they overlap, by how much (or how far apart they are)
+    and the witness points on both shapes
+
+    runs the distance version of GJK, which keeps the closest point of the simplex to the origin,
+    if the simplex ends up around the origin it's handed straight over to EPA
+    '''
+    shape1, shape2 = _prepare(shape1), _prepare(shape2)
+    support = _support_function(shape1, shape2)
+    max_iterations = len(shape1) + len(shape2) + 8
+
+    direction = (shape1.center[0] - shape2.center[0], shape1.center[1] - shape2.center[1])
+    simplex = [support((-direction[0], -direction[1]) if direction != (0, 0) else (1.0, 0.0))]
+    closest, weights = simplex[0][0], [1.0]
+
+    for _ in range(max_iterations):
+        length_sq = closest[0] * closest[0] + closest[1] * closest[1]
+        if length_sq == 0:
+            break
+
+        new = support((-closest[0], -closest[1]))
+        # the new point doesn't get any closer to the origin -> closest is the closest point of the minkowski difference
+        progress = length_sq - (closest[0] * new[0][0] + closest[1] * new[0][1])
+        if progress <= tolerance * length_sq or any(new[0] == point[0] for point in simplex):
+            distance = sqrt(length_sq)
+            point1, point2 = _witness(simplex, weights)
+            return Contact(False, distance, (-closest[0] / distance, -closest[1] / distance), point1, point2)
+
+        simplex.append(new)
+        simplex, closest, weights = _closest_on_simplex(simplex)
+        if closest is None:
+            break
+
+    # the origin is inside of (or on) the simplex
+    depth, normal, point1, point2 = _expand(support, simplex, max_iterations, tolerance)
+    return Contact(True, depth, normal, point1, point2)
+
+
+def _support_function(shape1: ConvexShape, shape2: ConvexShape) -> Callable[[Vector], SupportPoint]:
+    def support(direction: Vector) -> SupportPoint:
+        a = shape1.support(direction)
+        b = shape2.support((-direction[0], -direction[1]))
+        return ((a[0] - b[0], a[1] - b[1]), a, b)
+    return support
+
+
+def _witness(simplex: List[SupportPoint], weights: List[float]) -> Tuple[Vector, Vector]:
+    # the closest point of the simplex is a weighted sum of its vertices, the same weights give the points on the shapes
+    point1 = (sum(w * a[0] for w, (_, a, _) in zip(weights, simplex)), sum(w * a[1] for w, (_, a, _) in zip(weights, simplex)))
+    point2 = (sum(w * b[0] for w, (_, _, b) in zip(weights, simplex)), sum(w * b[1] for w, (_, _, b) in zip(weights, simplex)))
+    return point1, point2
+
+
+def _closest_on_segment(start: Vector, end: Vector) -> Tuple[float, Vector]:
+    # the parameter (0 -> start, 1 -> end) of the closest point to the origin & the point itself
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else min(max(-(start[0] * dx + start[1] * dy) / length_sq, 0.0), 1.0)
+    return t, (start[0] + t * dx, start[1] + t * dy)
+
+
+def _closest_on_simplex(simplex: List[SupportPoint]) -> Tuple[List[SupportPoint], Optional[Vector], List[float]]:
+    # reduces the simplex to the vertices spanning the closest point to the origin,
+    # the closest point is None when the origin is inside of the triangle
+    if len(simplex) == 3:
+        a, b, c = (point[0] for point in simplex)
+        sides = orient2d(a, b, (0, 0)), orient2d(b, c, (0, 0)), orient2d(c, a, (0, 0))
+        if all(side >= 0 for side in sides) or all(side <= 0 for side in sides):
+            return simplex, None, []
+
+        # the closest point is on one of the edges
+        best = None
+        for first, second in [(0, 1), (1, 2), (2, 0)]:
+            t, point = _closest_on_segment(simplex[first][0], simplex[second][0])
+            distance = point[0] * point[0] + point[1] * point[1]
+            if best is None or distance < best[0]:
+                best = (distance, first, second, t, point)
+        _, first, second, t, point = best
+        simplex = [simplex[first], simplex[second]]
+    else:
+        t, point = _closest_on_segment(simplex[0][0], simplex[1][0])
+
+    if t == 0:
+        return [simplex[0]], simplex[0][0], [1.0]
+    if t == 1:
+        return [simplex[1]], simplex[1][0], [1.0]
+    # the origin is on the segment
+    if orient2d(simplex[0][0], simplex[1][0], (0, 0)) == 0:
+        return simplex, None, []
+    return simplex, point, [1 - t, t]
+
+
+def _expand(
+    support       : Callable[[Vector], SupportPoint],
+    simplex       : List[SupportPoint],
+    max_iterations: int,
+    tolerance     : float
+    ) -> Tuple[float, Vector, Vector, Vector]:
+    # EPA itself -> returns the depth, normal & the witness points
+    points = _initial_polygon(support, simplex)
+    if len(points) < 3:
+        # the minkowski difference is flat (or a point) -> the shapes only touch
+        normal = _flat_normal(points)
+        return 0.0, normal, points[0][1], points[0][2]
+
+    # the polygon as a ring of edges -> edge i goes from vertex start[i] to vertex end[i]
+    start, end, prev, following, normals, alive = [], [], [], [], [], []
+    heap = []
+
+    def add_edge(first: int, second: int) -> int:
+        (x1, y1), (x2, y2) = points[first][0], points[second][0]
+        nx, ny = y2 - y1, x1 - x2
+        length = sqrt(nx * nx + ny * ny)
+        if length:
+            nx, ny = nx / length, ny / length
+        edge = len(start)
+        start.append(first)
+        end.append(second)
+        prev.append(-1)
+        following.append(-1)
+        normals.append((nx, ny))
+        alive.append(True)
+        heappush(heap, (max(nx * x1 + ny * y1, 0.0), edge))
+        return edge
+
+    total = len(points)
+    for ind in range(total):
+        add_edge(ind, (ind + 1) % total)
+    for ind in range(total):
+        following[ind], prev[ind] = (ind + 1) % total, (ind - 1) % total
+
+    for _ in range(max_iterations):
+        distance, edge = heappop(heap)
+        while not alive[edge]:
+            distance, edge = heappop(heap)
+
+        nx, ny = normals[edge]
+        new = support((nx, ny))
+        (x, y) = new[0]
+        if nx * x + ny * y - distance <= tolerance * (1 + distance) or any(new[0] == point[0] for point in points):
+            break
+
+        # every edge the new point is in front of goes -> walk out both ways from the closest edge
+        points.append(new)
+        vertex = len(points) - 1
+        visible = lambda other: normals[other][0] * (x - points[start[other]][0][0]) + normals[other][1] * (y - points[start[other]][0][1]) > 0
+        first, last = edge, edge
+        while prev[first] != last and visible(prev[first]):
+            first = prev[first]
+        while following[last] != first and visible(following[last]):
+            last = following[last]
+
+        removed = first
+        while True:
+            alive[removed] = False
+            if removed == last:
+                break
+            removed = following[removed]
+
+        before, after = prev[first], following[last]
+        left, right = add_edge(start[first], vertex), add_edge(vertex, end[last])
+        prev[left], following[left] = before, right
+        prev[right], following[right] = left, after
+        following[before], prev[after] = left, right
+    else:
+        # out of iterations -> the edge popped last was just removed, use the closest one still on the polygon
+        distance, edge = heappop(heap)
+        while not alive[edge]:
+            distance, edge = heappop(heap)
+
+    # the deepest point is the projection of the origin onto the closest edge
+    first, second = points[start[edge]], points[end[edge]]
+    t, _ = _closest_on_segment(first[0], second[0])
+    point1 = (first[1][0] + t * (second[1][0] - first[1][0]), first[1][1] + t * (second[1][1] - first[1][1]))
+    point2 = (first[2][0] + t * (second[2][0] - first[2][0]), first[2][1] + t * (second[2][1] - first[2][1]))
+    return distance, normals[edge], point1, point2
+
+
+def _initial_polygon(support: Callable[[Vector], SupportPoint], simplex: List[SupportPoint]) -> List[SupportPoint]:
+    # grow the simplex into an anti-clockwise triangle, GJK can stop with fewer points when the shapes just touch
+    points = []
+    for point in simplex:
+        if all(point[0] != other[0] for other in points):
+            points.append(point)
+
+    if len(points) == 1:
+        for direction in [(1.0, 0.0), (-1.0, 0.0), (0.0, 1.0), (0.0, -1.0)]:
+            new = support(direction)
+            if new[0] != points[0][0]:
+                points.append(new)
+                break
+
+    if len(points) == 2:
+        (x1, y1), (x2, y2) = points[0][0], points[1][0]
+        for direction in [(y2 - y1, x1 - x2), (y1 - y2, x2 - x1)]:
+            new = support(direction)
+            if orient2d(points[0][0], points[1][0], new[0]) != 0:
+                points.append(new)
+                break
+
+    if len(points) == 3 and orient2d(points[0][0], points[1][0], points[2][0]) < 0:
+        points[1], points[2] = points[2], points[1]
+    return points
+
+
+def _flat_normal(points: List[SupportPoint]) -> Vector:
+    # any unit vector perpendicular to the flat minkowski difference
+    if len(points) < 2:
+        return (1.0, 0.0)
+    (x1, y1), (x2, y2) = points[0][0], points[1][0]
+    length = sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    return ((y2 - y1) / length, (x1 - x2) / length)
@@ -1,55 +1,113 @@
+from joemetry import instrument
 from joemetry._type_hints import *
-from joemetry.utils import get_support
-from joemetry import Polygon, Point
+from joemetry.predicates import orient2d
+from .convex_shape import ConvexShape
 
 
-def GJK(shape1: Poly = None, shape2: Poly = None) -> bool:
+def GJK(
+	shape1        : Union[Poly, ConvexShape] = None,
+	shape2        : Union[Poly, ConvexShape] = None,
+	return_simplex: Optional[bool] = False
+	) -> Union[bool, Tuple[bool, List[Tuple[float, float]]]]:
+	'''
+	checks whether two convex shapes overlap (touching counts)
+	pass ConvexShape's to skip preparing the shapes on every call,
+	their support queries also warm start from the previous call
 
-	def handle_simplex(simplex: List[Point], direction: Point) -> bool:
+	return_simplex: also return the last simplex (points of the minkowski difference shape1 - shape2)
+	                -> (overlapping, simplex), the simplex of overlapping shapes can be passed on to EPA
+	'''
+
+	def support(direction: Tuple[float, float]) -> Tuple[float, float]:
+		# the support point of the minkowski difference shape1 - shape2
+		nonlocal support_calls
+		if probe is not None:
+			support_calls += 1
+		x1, y1 = shape1.support(direction)
+		x2, y2 = shape2.support((-direction[0], -direction[1]))
+		return (x1 - x2, y1 - y2)
+
+	def handle_simplex(simplex: List[Tuple[float, float]]) -> Union[bool, Tuple[float, float]]:
 		if len(simplex) == 2:
-			return line_case(simplex, direction)
-		return triangle_case(simplex, direction)
+			return line_case(simplex)
+		return triangle_case(simplex)
 
-	def line_case(simplex: List[Point], direction: Point) -> bool:
+	def line_case(simplex: List[Tuple[float, float]]) -> Tuple[float, float]:
 		B, A = simplex
-		AB, AO = (B - A), (-A)
-		ABperp = AB.get_perpendicular(AO)
-		direction.update(ABperp)
-		return False
+		return perpendicular((B[0] - A[0], B[1] - A[1]), (-A[0], -A[1]))
 
-	def triangle_case(simplex: List[Point], direction: Point) -> bool:
-		A, B, C = simplex
-		AB, AC, AO = (B - A), (C - A), (-A)
-		ABperp = AB.get_perpendicular(-AC)
-		ACperp = AC.get_perpendicular(-AB)
+	def triangle_case(simplex: List[Tuple[float, float]]) -> Union[bool, Tuple[float, float]]:
+		# A is the newest point, the origin can't be outside of the old edge BC
+		C, B, A = simplex
+		AB, AC = (B[0] - A[0], B[1] - A[1]), (C[0] - A[0], C[1] - A[1])
 
-		if ABperp.dot(AO) > 0: 	
+		# the origin is outside of an edge if it's on the opposite side of the edge from the third vertex
+		# the orientation tests are exact, so an origin sitting right on an edge still counts as a collision
+		if opposite_sides(A, B, C):
 			simplex.remove(C)
-			direction.update(ABperp)
-			return False
+			return perpendicular(AB, (-AC[0], -AC[1]))
 
-		elif ACperp.dot(AO) > 0: 
+		elif opposite_sides(A, C, B):
 			simplex.remove(B)
-			direction.update(ACperp)
-			return False
-			
+			return perpendicular(AC, (-AB[0], -AB[1]))
+
 		return True
 
-	shape1, shape2 = Polygon(shape1), Polygon(shape2)
-	direction = shape2.center - shape1.center
-	simplex = [get_support(shape1, shape2, direction)]
-	direction = -simplex[0]
+	def perpendicular(vector: Tuple[float, float], ref_point: Tuple[float, float]) -> Tuple[float, float]:
+		# the perpendicular of the vector that points the same way as ref_point
+		x, y = vector[1], -vector[0]
+		if x * ref_point[0] + y * ref_point[1] < 0:
+			return (-x, -y)
+		return (x, y)
+
+	def opposite_sides(A: Tuple[float, float], B: Tuple[float, float], C: Tuple[float, float]) -> bool:
+		side_origin, side_C = orient2d(A, B, (0, 0)), orient2d(A, B, C)
+		return (side_origin > 0 and side_C < 0) or (side_origin < 0 and side_C > 0)
+
+	def finish(overlapping: bool) -> Union[bool, Tuple[bool, List[Tuple[float, float]]]]:
+		if probe is not None:
+			probe.count('iterations', iterations)
+			probe.count('support_calls', support_calls)
+			probe.finish()
+		return (overlapping, simplex) if return_simplex else overlapping
+
+	# None unless joemetry.instrument is recording
+	probe, iterations, support_calls = instrument.probe('gjk'), 0, 0
+
+	shape1, shape2 = _prepare(shape1), _prepare(shape2)
+	direction = (shape2.center[0] - shape1.center[0], shape2.center[1] - shape1.center[1])
+	simplex = [support(direction)]
+	direction = (-simplex[0][0], -simplex[0][1])
+	if direction == (0, 0):
+		return finish(True)
 
 	while True:
 
-		support_point = get_support(shape1, shape2, direction)
+		if probe is not None:
+			iterations += 1
+		support_point = support(direction)
+
+		if direction[0] * support_point[0] + direction[1] * support_point[1] < 0:
+			return finish(False)
 
-		if direction.dot(support_point) < 0:
-			return False
+		# no progress -> the origin is right on the boundary of the minkowski difference, or just outside of it
+		if support_point in simplex:
+			return finish(_on_segment(simplex))
 
 		simplex.append(support_point)
 
-		if handle_simplex(simplex, direction):
-			return True
+		direction = handle_simplex(simplex)
+		if direction is True:
+			return finish(True)
 
 
+def _prepare(shape: Union[Poly, ConvexShape]) -> ConvexShape:
+	return shape if isinstance(shape, ConvexShape) else ConvexShape(shape)
+
+
+def _on_segment(simplex: List[Tuple[float, float]]) -> bool:
+	# whether the origin is on the segment/point the simplex was reduced to
+	A, B = simplex[0], simplex[-1]
+	if orient2d(A, B, (0, 0)) != 0:
+		return False
+	return A[0] * B[0] + A[1] * B[1] <= 0
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from time import perf_counter
+from joemetry import Polygon
+from joemetry._type_hints import *
+from .convex_shape import ConvexShape
+from .epa import Contact, collide
+from .gjk import GJK
+
+
+@dataclass
+class FrameStats:
+    '''what the last CollisionWorld.step did'''
+
+    bodies            : int   = 0
+    swaps             : int   = 0
+    candidate_pairs   : int   = 0
+    narrow_phase_calls: int   = 0
+    collisions        : int   = 0
+    broad_phase_time  : float = 0.0
+    narrow_phase_time : float = 0.0
+
+
+class CollisionWorld:
+    '''
+    finds the colliding pairs among many moving convex shapes, frame after frame
+
+    broad phase (sweep & prune):
+        the 2 endpoints of every bounding box on the sweep axis are kept in one sorted list between frames,
+        things only move a little per frame, so re-sorting it with an insertion sort is close to O(n)
+        a sweep over the sorted endpoints then pairs up the boxes overlapping on the sweep axis,
+        and only the ones overlapping on the other axis too become candidates
+
+    narrow phase:
+        collide (GJK + EPA), or just GJK when the contacts aren't needed, on the candidate pairs only
+
+    the bodies are Polygons or ConvexShapes, their bounds are read every frame,
+    polygons are prepared into ConvexShapes once per frame, and only if they're in a candidate pair
+    '''
+
+    __slots__ = ['stats', '_axis', '_bodies', '_next_handle', '_endpoints', '_keys', '_bounds', '_added']
+
+
+    def __init__(self, axis: Optional[str] = 'x'):
+        if axis not in ['x', 'y']:
+            raise ValueError(f"{axis} is not a valid axis")
+        self.stats = FrameStats()
+        self._axis = 0 if axis == 'x' else 1
+        self._bodies = {}
+        self._next_handle = 0
+        # endpoint codes -> 2 * handle for the lower end of a box, 2 * handle + 1 for its upper end
+        self._endpoints = []
+        self._keys = {}
+        self._bounds = {}
+        # bodies added since the last frame have no place in the sorted order yet
+        self._added = False
+
+
+    def add(self, shape: Union[Polygon, ConvexShape]) -> int:
+        '''add a body to the world, returns the handle it's reported with'''
+        handle = self._next_handle
+        self._next_handle += 1
+        self._bodies[handle] = shape
+        self._endpoints.extend((2 * handle, 2 * handle + 1))
+        self._added = True
+        return handle
+
+
+    def remove(self, handle: int) -> None:
+        del self._bodies[handle]
+        self._bounds.pop(handle, None)
+        self._keys.pop(2 * handle, None)
+        self._keys.pop(2 * handle + 1, None)
+        self._endpoints = [code for code in self._endpoints if code >> 1 != handle]
+
+
+    def candidate_pairs(self) -> List[Tuple[int, int]]:
+        '''runs the broad phase on the current positions of the bodies, returns the pairs of handles whose boxes overlap'''
+        start = perf_counter()
+        self._update_endpoints()
+        pairs = self._sweep()
+        self.stats.broad_phase_time = perf_counter() - start
+        self.stats.bodies = len(self._bodies)
+        self.stats.candidate_pairs = len(pairs)
+        return pairs
+
+
+    def step(self, contacts: Optional[bool] = True) -> List[Tuple[int, int, Union[Contact, bool]]]:
+        '''
+        returns the colliding pairs of the current frame as (handle1, handle2, contact)
+        contacts: run collide for the depth/normal/witness points, otherwise only GJK is run & contact is True
+        '''
+        self.stats = FrameStats()
+        pairs = self.candidate_pairs()
+
+        start = perf_counter()
+        prepared, collisions = {}, []
+        for first, second in pairs:
+            shape1, shape2 = self._prepared(first, prepared), self._prepared(second, prepared)
+            if contacts:
+                contact = collide(shape1, shape2)
+                if contact.colliding:
+                    collisions.append((first, second, contact))
+            elif GJK(shape1, shape2):
+                collisions.append((first, second, True))
+
+        self.stats.narrow_phase_calls = len(pairs)
+        self.stats.collisions = len(collisions)
+        self.stats.narrow_phase_time = perf_counter() - start
+        return collisions
+
+
+    def _prepared(self, handle: int, prepared: dict) -> ConvexShape:
+        shape = prepared.get(handle)
+        if shape is None:
+            shape = self._bodies[handle]
+            shape = prepared[handle] = shape if isinstance(shape, ConvexShape) else ConvexShape(shape)
+        return shape
+
+
+    def _update_endpoints(self) -> None:
+        axis, keys, bounds = self._axis, self._keys, self._bounds
+        for handle, shape in self._bodies.items():
+            box = bounds[handle] = shape.bounds
+            # lower ends go before upper ends at the same position -> touching boxes overlap
+            keys[2 * handle] = (box[axis], 0)
+            keys[2 * handle + 1] = (box[axis + 2], 1)
+
+        # new endpoints are all at the end of the list, timsort handles that better than an insertion sort
+        endpoints, swaps = self._endpoints, 0
+        if self._added:
+            endpoints.sort(key=keys.__getitem__)
+            self._added = False
+
+        # insertion sort -> about one comparison per endpoint when the bodies barely moved since the last frame
+        for ind in range(1, len(endpoints)):
+            code = endpoints[ind]
+            key  = keys[code]
+            position = ind
+            while position > 0 and keys[endpoints[position - 1]] > key:
+                endpoints[position] = endpoints[position - 1]
+                position -= 1
+            endpoints[position] = code
+            swaps += ind - position
+        self.stats.swaps = swaps
+
+
+    def _sweep(self) -> List[Tuple[int, int]]:
+        # the other axis is checked for every pair overlapping on the sweep axis
+        other, bounds = 1 - self._axis, self._bounds
+        active, pairs = {}, []
+        for code in self._endpoints:
+            handle = code >> 1
+            if code & 1:
+                del active[handle]
+                continue
+            box = bounds[handle]
+            low, high = box[other], box[other + 2]
+            for active_handle in active:
+                active_box = bounds[active_handle]
+                if active_box[other] <= high and low <= active_box[other + 2]:
+                    pairs.append((active_handle, handle) if active_handle < handle else (handle, active_handle))
+            active[handle] = None
+        return pairs
+
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(bodies={len(self._bodies)})"
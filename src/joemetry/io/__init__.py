@@ -0,0 +1,4 @@
+from .columnar import *
+from .wkt import *
+from .wkb import *
+from .geojson import *
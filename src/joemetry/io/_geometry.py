@@ -0,0 +1,134 @@
+from joemetry import Point, Segment, Polygon, PointArray
+from joemetry.point_in_polygon import point_in_polygon
+from joemetry.utils import get_coordinates, get_signed_area
+from joemetry._type_hints import *
+
+
+# the shapes are passed between joemetry & the formats as GeoJSON-like (type, coordinates) pairs ->
+#   "Point"              -> (x, y), None if it's empty
+#   "LineString"         -> [(x, y), ...]
+#   "Polygon"            -> [ring, ...], closed rings, the outer one first
+#   "MultiPoint"         -> [(x, y), ...]
+#   "MultiLineString"    -> [line, ...]
+#   "MultiPolygon"       -> [polygon, ...]
+#   "GeometryCollection" -> [(type, coordinates), ...]
+KINDS = ['Point', 'LineString', 'Polygon', 'MultiPoint', 'MultiLineString', 'MultiPolygon', 'GeometryCollection']
+
+Geometry = Union[Point, Segment, Polygon, PointArray, List[Any], None]
+
+
+def to_parts(shape: Geometry) -> Tuple[str, Any]:
+    '''
+    returns the (type, coordinates) of a shape
+    a list of polygons is a region like the ones clipping returns (outer rings anti-clockwise, holes clockwise)
+    -> every hole goes with the smallest outer ring around it & the region is a Polygon or a MultiPolygon
+    '''
+    if isinstance(shape, Point):
+        return 'Point', (shape.x, shape.y)
+    if isinstance(shape, Segment):
+        return 'LineString', [(shape.start.x, shape.start.y), (shape.end.x, shape.end.y)]
+    if isinstance(shape, PointArray):
+        return 'LineString', list(shape.coords())
+    if isinstance(shape, Polygon):
+        return 'Polygon', [_closed(get_coordinates(shape))]
+    if isinstance(shape, (tuple, list)) and len(shape) == 2 and isinstance(shape[0], (int, float)):
+        return 'Point', (float(shape[0]), float(shape[1]))
+
+    items = list(shape)
+    if items and all(isinstance(item, Point) or isinstance(item, (tuple, list)) and len(item) == 2 and isinstance(item[0], (int, float)) for item in items):
+        return 'MultiPoint', [(float(item[0]), float(item[1])) for item in items]
+    if items and all(isinstance(item, (Segment, PointArray)) for item in items):
+        return 'MultiLineString', [to_parts(item)[1] for item in items]
+    if items and all(isinstance(item, Polygon) for item in items):
+        polygons = _group_region([get_coordinates(item) for item in items])
+        if len(polygons) == 1:
+            return 'Polygon', polygons[0]
+        return 'MultiPolygon', polygons
+    return 'GeometryCollection', [to_parts(item) for item in items]
+
+
+def from_parts(kind: str, coordinates: Any, arrays: Optional[bool] = False) -> Geometry:
+    '''
+    returns the joemetry shape of a (type, coordinates) pair
+        Point           -> Point
+        LineString      -> Segment (2 points) or PointArray
+        Polygon         -> Polygon, or a list of Polygons when it has holes (outer ring anti-clockwise, holes clockwise)
+        Multi...        -> a list of the above, the polygons of a MultiPolygon all go in one list (a region)
+    arrays: make PointArrays & array-backed polygons instead -> a point is a PointArray of 1 point, a segment one of 2
+    empty geometries come out as None
+    '''
+    if coordinates is None:
+        return None
+    if kind == 'Point':
+        return PointArray([coordinates]) if arrays else Point(*coordinates)
+    if kind == 'LineString':
+        if len(coordinates) == 2 and not arrays:
+            return Segment(*coordinates)
+        return PointArray(coordinates)
+    if kind == 'Polygon':
+        polygons = [_ring_polygon(ring, ind == 0, arrays) for ind, ring in enumerate(coordinates)]
+        polygons = [polygon for polygon in polygons if polygon is not None]
+        if not polygons:
+            return None
+        return polygons[0] if len(polygons) == 1 else polygons
+    if kind == 'MultiPoint':
+        return PointArray(coordinates) if arrays else [Point(*point) for point in coordinates]
+    if kind == 'MultiLineString':
+        return [from_parts('LineString', line, arrays) for line in coordinates]
+    if kind == 'MultiPolygon':
+        region = []
+        for polygon in coordinates:
+            polygon = from_parts('Polygon', polygon, arrays)
+            if polygon is not None:
+                region.extend(polygon if isinstance(polygon, list) else [polygon])
+        return region
+    if kind == 'GeometryCollection':
+        return [from_parts(*part, arrays=arrays) for part in coordinates]
+    raise ValueError(f"{kind} is not a supported geometry type")
+
+
+def count_vertices(kind: str, coordinates: Any) -> int:
+    '''the number of (x, y) in a (type, coordinates) pair'''
+    if coordinates is None:
+        return 0
+    if kind == 'Point':
+        return 1
+    if kind in ('LineString', 'MultiPoint'):
+        return len(coordinates)
+    if kind in ('Polygon', 'MultiLineString'):
+        return sum(len(part) for part in coordinates)
+    if kind == 'MultiPolygon':
+        return sum(len(ring) for polygon in coordinates for ring in polygon)
+    return sum(count_vertices(*part) for part in coordinates)
+
+
+def _closed(ring: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    return ring + ring[:1] if ring and ring[0] != ring[-1] else ring
+
+
+def _ring_polygon(ring: List[Tuple[float, float]], outer: bool, arrays: bool) -> Optional[Polygon]:
+    # a closed ring into a polygon anti-clockwise if it's the outer ring & clockwise if it's a hole
+    ring = list(ring[:-1] if len(ring) > 1 and ring[0] == ring[-1] else ring)
+    if len(ring) < 3:
+        return None
+    if (get_signed_area(ring) > 0) != outer:
+        ring.reverse()
+    return Polygon(PointArray(ring) if arrays else ring)
+
+
+def _group_region(rings: List[List[Tuple[float, float]]]) -> List[List[List[Tuple[float, float]]]]:
+    # anti-clockwise rings are outer rings, the clockwise ones go in the smallest outer ring holding them
+    outers = [ring for ring in rings if get_signed_area(ring) > 0]
+    holes  = [ring for ring in rings if get_signed_area(ring) <= 0]
+    if not outers:
+        return [[_closed(ring)] for ring in holes]
+
+    outers.sort(key=get_signed_area)
+    polygons = [[_closed(ring)] for ring in outers]
+    for hole in holes:
+        owner = next((ind for ind, outer in enumerate(outers) if point_in_polygon(hole[0], outer)), None)
+        if owner is None:
+            polygons.append([_closed(hole)])
+        else:
+            polygons[owner].append(_closed(hole))
+    return polygons
@@ -0,0 +1,426 @@
+import os
+import sys
+import mmap
+import struct
+import shutil
+from array import array
+from typing import BinaryIO
+from itertools import chain
+from joemetry import Point, Polygon, PointArray
+from joemetry._type_hints import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# magic, version, number of shapes, rings & points, then where the coordinate, ring & shape blocks start
+_HEADER  = struct.Struct('=8s7q')
+_MAGIC   = b'JOEMTRY\x00'
+_VERSION = 1
+
+Shape = TypeVar('Shape', Poly, PointArray, List[Poly])
+
+
+class ColumnarWriter:
+    '''
+    writes shapes into the columnar format, one after the other, without holding on to their coordinates
+
+        header           -> the counts & the offsets of the 3 blocks below (64 bytes)
+        coordinate block -> float64 [x0, y0, x1, y1, ...] of every point of every shape, back to back
+        ring offsets     -> int64, where every ring starts in the coordinate block (in points), plus where the last one ends
+        shape offsets    -> int64, where every shape starts in the ring offsets, plus where the last one ends
+
+    a shape is a polygon, a PointArray or a list of points (1 ring), or a list of those (an outer ring & its holes...)
+    the coordinates go straight to the file, only the offsets (8 bytes a ring) are kept until close() writes them out
+
+    file: a path or a seekable binary file
+    append: add onto the shapes already in the file instead of overwriting it
+
+    a path is written through a temporary file next to it, which only replaces the file once close() is done
+    -> the file at the path stays readable (& keeps its shapes) while the writer is open,
+       and if it's never closed or the with block raises, nothing changes
+    a file object given is written in place
+    '''
+
+    __slots__ = ['file', '_path', '_temporary', '_ring_offsets', '_shape_offsets']
+
+
+    def __init__(self, file: Union[str, os.PathLike, BinaryIO], append: Optional[bool] = False):
+        self._path = self._temporary = None
+        self._ring_offsets  = array('q', [0])
+        self._shape_offsets = array('q', [0])
+
+        if isinstance(file, (str, os.PathLike)):
+            self._path = os.fspath(file)
+            directory, name = os.path.split(os.path.abspath(self._path))
+            # a hidden file next to the real one -> on the same filesystem, so replacing it is atomic
+            self._temporary = os.path.join(directory, f'.{name}.{os.getpid()}.{id(self):x}.tmp')
+            self.file = open(self._temporary, 'x+b')
+            try:
+                if os.path.exists(self._path):
+                    shutil.copymode(self._path, self._temporary)
+                if append and os.path.exists(self._path):
+                    # the shapes already there are copied over, everything past their coordinates is written again on close
+                    with open(self._path, 'rb') as existing:
+                        if self._read_offsets(existing):
+                            existing.seek(0)
+                            _copy(existing, self.file, _HEADER.size + 16 * self._ring_offsets[-1])
+                            return
+            except BaseException:
+                self.discard()
+                raise
+            self.file.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0, 0, _HEADER.size, _HEADER.size, _HEADER.size))
+            return
+
+        self.file = file
+        if append and self._read_offsets(file):
+            # only the offsets are read back, the new coordinates are written over them
+            file.seek(_HEADER.size + 16 * self._ring_offsets[-1])
+            file.truncate()
+            return
+        file.seek(0)
+        file.truncate()
+        file.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0, 0, _HEADER.size, _HEADER.size, _HEADER.size))
+
+
+    def _read_offsets(self, file: BinaryIO) -> bool:
+        # reads the offsets of the shapes in the file, False if it's empty
+        size = file.seek(0, os.SEEK_END)
+        if not size:
+            return False
+        file.seek(0)
+        _, _, num_shapes, num_rings, num_points, coordinates_offset, rings_offset, shapes_offset = _check_header(file.read(_HEADER.size), size)
+        if coordinates_offset != _HEADER.size:
+            raise ValueError("the coordinates don't follow the header, the file can't be appended to")
+        file.seek(rings_offset)
+        ring_offsets = array('q', file.read(8 * (num_rings + 1)))
+        file.seek(shapes_offset)
+        shape_offsets = array('q', file.read(8 * (num_shapes + 1)))
+        _check_offsets(ring_offsets, shape_offsets, num_points, num_rings)
+        self._ring_offsets, self._shape_offsets = ring_offsets, shape_offsets
+        return True
+
+
+    def write(self, shape: Shape) -> int:
+        '''appends a shape to the file, returns its index'''
+        rings = [shape] if _is_ring(shape) else list(shape)
+        for ring in rings:
+            data = _ring_bytes(ring)
+            self.file.write(data)
+            self._ring_offsets.append(self._ring_offsets[-1] + len(data) // 16)
+        self._shape_offsets.append(len(self._ring_offsets) - 1)
+        return len(self._shape_offsets) - 2
+
+
+    def write_many(self, shapes: Iterable[Shape]) -> None:
+        '''appends every shape of an iterable (a generator works too, it's consumed one shape at a time)'''
+        for shape in shapes:
+            self.write(shape)
+
+
+    def close(self) -> None:
+        '''writes the offsets & the header, a file given as a path is only replaced once they're written'''
+        if self.file is None:
+            return
+        file = self.file
+        rings_offset = file.tell()
+        num_points = self._ring_offsets[-1]
+        file.write(self._ring_offsets.tobytes())
+        shapes_offset = file.tell()
+        file.write(self._shape_offsets.tobytes())
+
+        file.seek(0)
+        file.write(_HEADER.pack(
+            _MAGIC, _VERSION, len(self._shape_offsets) - 1, len(self._ring_offsets) - 1, num_points,
+            _HEADER.size, rings_offset, shapes_offset
+            ))
+        file.seek(0, os.SEEK_END)
+        file.flush()
+        if self._path is not None:
+            os.fsync(file.fileno())
+            file.close()
+            os.replace(self._temporary, self._path)
+        self.file = None
+
+
+    def discard(self) -> None:
+        '''
+        drops everything written since the writer was opened on a path, the file is left as it was
+        (a file object given is written in place, so there's nothing to drop)
+        '''
+        if self.file is None or self._path is None:
+            return
+        self.file.close()
+        os.remove(self._temporary)
+        self.file = None
+
+
+    def __len__(self) -> int:
+        return len(self._shape_offsets) - 1
+
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+
+    def __exit__(self, error_type: Optional[type], *_) -> None:
+        if error_type is not None and self._path is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+class ColumnarReader:
+    '''
+    reads a file of the columnar format through mmap -> opening it doesn't read it, the os pages in what's looked at
+
+    the coordinates of a shape come out as views on the mapped file (nothing is copied, they're read-only),
+    reader[i] is a LazyPolygon that only turns into a Polygon when it's used like one
+
+    source: a path, or a buffer already holding the file (bytes, mmap...)
+    the mapping is released by close(), or once the last view on it is gone if there are still some around
+    '''
+
+    __slots__ = [
+        '_file', '_map', 'num_shapes', 'num_rings', 'num_points',
+        'coordinates', 'ring_offsets', 'shape_offsets'
+        ]
+
+
+    def __init__(self, source: Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap]):
+        self._file = None
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(source, 'rb')
+            source = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._map = source
+
+        view = memoryview(source)
+        _, _, num_shapes, num_rings, num_points, coordinates_offset, rings_offset, shapes_offset = _check_header(view[:_HEADER.size], view.nbytes)
+
+        self.num_shapes, self.num_rings, self.num_points = num_shapes, num_rings, num_points
+        if np is not None:
+            self.coordinates   = np.frombuffer(source, dtype=np.float64, count=2 * num_points, offset=coordinates_offset)
+            self.ring_offsets  = np.frombuffer(source, dtype=np.int64, count=num_rings + 1, offset=rings_offset)
+            self.shape_offsets = np.frombuffer(source, dtype=np.int64, count=num_shapes + 1, offset=shapes_offset)
+        else:
+            self.coordinates   = view[coordinates_offset:coordinates_offset + 16 * num_points].cast('d')
+            self.ring_offsets  = view[rings_offset:rings_offset + 8 * (num_rings + 1)].cast('q')
+            self.shape_offsets = view[shapes_offset:shapes_offset + 8 * (num_shapes + 1)].cast('q')
+        _check_offsets(self.ring_offsets, self.shape_offsets, num_points, num_rings)
+
+
+    def rings(self, index: int) -> List[PointArray]:
+        '''returns the rings of a shape as PointArrays viewing the file'''
+        index = self._check(index)
+        offsets, data = self.ring_offsets, self.coordinates
+        return [
+            PointArray.from_buffer(data[2 * int(offsets[ring]):2 * int(offsets[ring + 1])], copy=False)
+            for ring in range(int(self.shape_offsets[index]), int(self.shape_offsets[index + 1]))
+            ]
+
+
+    def coords(self, index: int) -> Sequence[float]:
+        '''returns the coordinates of every ring of a shape, as one flat float64 view'''
+        index = self._check(index)
+        start = int(self.ring_offsets[int(self.shape_offsets[index])])
+        end   = int(self.ring_offsets[int(self.shape_offsets[index + 1])])
+        return self.coordinates[2 * start:2 * end]
+
+
+    def bounds(self, index: int) -> Tuple[float, float, float, float]:
+        '''the bounding box of a shape, worked out on the view'''
+        return PointArray.from_buffer(self.coords(index), copy=False).bounds()
+
+
+    def _check(self, index: int) -> int:
+        if index < 0:
+            index += self.num_shapes
+        if not 0 <= index < self.num_shapes:
+            raise IndexError(f"shape index out of range")
+        return index
+
+
+    def close(self) -> None:
+        self.coordinates = self.ring_offsets = self.shape_offsets = None
+        if isinstance(self._map, mmap.mmap) and self._file is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # views handed out are still alive, the mapping goes once they do
+                pass
+            self._file.close()
+        self._map = self._file = None
+
+
+    def __getitem__(self, index: int) -> 'LazyPolygon':
+        return LazyPolygon(self, self._check(index))
+
+
+    def __iter__(self) -> Iterator['LazyPolygon']:
+        return (LazyPolygon(self, index) for index in range(self.num_shapes))
+
+
+    def __len__(self) -> int:
+        return self.num_shapes
+
+
+    def __enter__(self) -> 'ColumnarReader':
+        return self
+
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shapes={self.num_shapes}, rings={self.num_rings}, points={self.num_points})"
+
+
+class LazyPolygon:
+    '''
+    a polygon stored in a columnar file, made into a real Polygon the first time something only a Polygon has is used
+    the vertices, bounds & size are read straight off the file without making it
+    (a shape with several rings becomes the Polygon of its first ring, the others are in holes)
+    '''
+
+    __slots__ = ['_reader', '_index', '_polygon']
+
+
+    def __init__(self, reader: ColumnarReader, index: int):
+        self._reader  = reader
+        self._index   = index
+        self._polygon = None
+
+
+    @property
+    def rings(self) -> List[PointArray]:
+        return self._reader.rings(self._index)
+
+
+    @property
+    def vertex(self) -> PointArray:
+        '''the outer ring, as a view on the file'''
+        if self._polygon is not None:
+            return self._polygon.vertex
+        return self.rings[0]
+
+
+    @property
+    def num_vertex(self) -> int:
+        reader, ring = self._reader, int(self._reader.shape_offsets[self._index])
+        return int(reader.ring_offsets[ring + 1] - reader.ring_offsets[ring])
+
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        return self.vertex.bounds()
+
+
+    @property
+    def holes(self) -> List[Polygon]:
+        return [Polygon(ring) for ring in self.rings[1:]]
+
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._polygon is not None
+
+
+    def materialize(self) -> Polygon:
+        '''returns the Polygon, the coordinates are copied out of the file the first time'''
+        if self._polygon is None:
+            self._polygon = Polygon(self.rings[0])
+        return self._polygon
+
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.materialize(), name)
+
+
+    def __len__(self) -> int:
+        return self.num_vertex
+
+
+    def __iter__(self) -> Iterator[Point]:
+        return iter(self.vertex)
+
+
+    def __getitem__(self, index: int) -> Point:
+        return self.vertex[index]
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(index={self._index}, num_vertex={self.num_vertex}, materialized={self.is_materialized})"
+
+
+def write_columnar(file: Union[str, os.PathLike, BinaryIO], shapes: Iterable[Shape], append: Optional[bool] = False) -> int:
+    '''writes the shapes into a columnar file, returns how many shapes the file has'''
+    with ColumnarWriter(file, append) as writer:
+        writer.write_many(shapes)
+        return len(writer)
+
+
+def read_columnar(source: Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap]) -> ColumnarReader:
+    '''opens a columnar file, see ColumnarReader'''
+    return ColumnarReader(source)
+
+
+def _is_ring(shape: Shape) -> bool:
+    # a polygon, PointArray or list of points, as opposed to a list of those
+    if isinstance(shape, (Polygon, PointArray)):
+        return True
+    first = shape[0] if len(shape) else None
+    return first is None or isinstance(first, Point) or isinstance(first[0], (int, float))
+
+
+def _ring_bytes(ring: Union[Poly, PointArray]) -> bytes:
+    # the interleaved float64 coordinates of a ring, straight from the buffer when it's array-backed
+    if isinstance(ring, Polygon):
+        ring = ring.vertex
+    if isinstance(ring, PointArray):
+        return ring.buffer.tobytes()
+    return array('d', chain.from_iterable((point[0], point[1]) for point in ring)).tobytes()
+
+
+def _copy(source: BinaryIO, destination: BinaryIO, length: int) -> None:
+    # copies the first length bytes of source, a chunk at a time
+    while length > 0:
+        chunk = source.read(min(length, 1 << 20))
+        if not chunk:
+            raise ValueError("the file is shorter than its header says")
+        destination.write(chunk)
+        length -= len(chunk)
+
+
+def _check_header(data: Union[bytes, memoryview], size: int) -> Tuple[Any, ...]:
+    # the header, once its blocks are known to fit in the size of the file
+    header = _unpack_header(data)
+    _, _, num_shapes, num_rings, num_points, coordinates_offset, rings_offset, shapes_offset = header
+    if min(num_shapes, num_rings, num_points) < 0:
+        raise ValueError("the header of the file has negative counts, it's corrupt")
+    for offset, length in [(coordinates_offset, 16 * num_points), (rings_offset, 8 * (num_rings + 1)), (shapes_offset, 8 * (num_shapes + 1))]:
+        if offset < _HEADER.size or offset % 8 or offset + length > size:
+            raise ValueError("the header of the file points past its end, it's truncated or corrupt")
+    return header
+
+
+def _check_offsets(ring_offsets: Sequence[int], shape_offsets: Sequence[int], num_points: int, num_rings: int) -> None:
+    # the offsets have to end at the number of points & rings -> the quick check, they aren't all gone over
+    if ring_offsets[0] != 0 or ring_offsets[-1] != num_points or shape_offsets[0] != 0 or shape_offsets[-1] != num_rings:
+        raise ValueError("the offsets of the file don't add up to its number of points & rings, it's corrupt")
+
+
+def _unpack_header(data: Union[bytes, memoryview]) -> Tuple[Any, ...]:
+    if len(data) < _HEADER.size:
+        raise ValueError("the file is too short to be in the columnar format")
+    header = _HEADER.unpack(data)
+    magic, version = header[0], header[1]
+    if magic != _MAGIC:
+        raise ValueError("the file isn't in the columnar format")
+    if version != _VERSION:
+        if version == int.from_bytes(_VERSION.to_bytes(8, sys.byteorder), 'little' if sys.byteorder == 'big' else 'big'):
+            raise ValueError("the file was written on a machine with the other byte order")
+        raise ValueError(f"version {version} of the columnar format isn't supported")
+    return header
@@ -0,0 +1,263 @@
+import re
+import json
+import codecs
+from typing import TextIO, BinaryIO, Pattern
+from joemetry._type_hints import *
+from ._geometry import Geometry, to_parts, from_parts
+
+
+_SKIP    = re.compile(r'[\s,\x1e]*')
+_SPACE   = re.compile(r'\s*')
+_DECODER = json.JSONDecoder()
+
+
+class _JSONStream:
+    '''
+    decodes JSON values one at a time out of a text file read in chunks,
+    the text already decoded is dropped -> only the value being decoded is held in memory
+    '''
+
+    __slots__ = ['file', 'decoder', 'buffer', 'position', 'chunk_size', 'size', 'finished']
+
+
+    def __init__(self, file: Union[TextIO, BinaryIO], chunk_size: int):
+        self.file       = file
+        self.decoder    = codecs.getincrementaldecoder('utf-8')()
+        self.buffer     = ''
+        self.position   = 0
+        self.chunk_size = chunk_size
+        self.size       = chunk_size
+        self.finished   = False
+
+
+    def fill(self) -> bool:
+        '''reads another chunk, twice as big as the last one until something is decoded -> False at the end of the file'''
+        if self.finished:
+            return False
+        chunk = self.file.read(self.size)
+        if isinstance(chunk, bytes):
+            chunk = self.decoder.decode(chunk, final=not chunk)
+        self.buffer, self.position = self.buffer[self.position:] + chunk, 0
+        self.size *= 2
+        self.finished = not chunk
+        return True
+
+
+    def skip(self, pattern: Pattern = _SKIP) -> Optional[str]:
+        '''skips what matches the pattern, returns the next character (None at the end of the file)'''
+        while True:
+            self.position = pattern.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return None
+
+
+    def decode(self) -> Any:
+        '''decodes the value at the current position'''
+        while True:
+            try:
+                value, self.position = _DECODER.raw_decode(self.buffer, self.position)
+                self.size = self.chunk_size
+                return value
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+
+    def values(self) -> Iterator[Any]:
+        '''
+        yields the values of the file, with the features of a FeatureCollection yielded one by one
+        instead of the whole collection (its other members are dropped)
+        '''
+        while self.skip() is not None:
+            if self.buffer[self.position] == '{':
+                yield from self._object()
+            else:
+                yield self.decode()
+
+
+    def _object(self) -> Iterator[Any]:
+        '''
+        goes through the members of the object at the current position one by one, yields the object
+        or its features if its "type" turns out to be "FeatureCollection" before its "features" come up
+        (with "type" coming after them, the features are decoded all at once like any other member)
+        '''
+        self.position += 1
+        value, streamed = {}, False
+        character = self._next()
+        while character != '}':
+            if character != '"':
+                raise ValueError("expected a member name in the GeoJSON")
+            key = self.decode()
+            if self._next() != ':':
+                raise ValueError("expected ':' in the GeoJSON")
+            self.position += 1
+            if key == 'features' and self._next() == '[' and value.get('type') == 'FeatureCollection':
+                self.position += 1
+                yield from self._features()
+                streamed = True
+            else:
+                self._next()
+                value[key] = self.decode()
+            character = self._next()
+            if character == ',':
+                self.position += 1
+                character = self._next()
+            elif character != '}':
+                raise ValueError("expected ',' or '}' in the GeoJSON")
+        self.position += 1
+        if not streamed:
+            yield value
+
+
+    def _features(self) -> Iterator[Any]:
+        while True:
+            character = self.skip()
+            if character is None:
+                raise ValueError("the GeoJSON ends in the middle of a FeatureCollection")
+            if character == ']':
+                self.position += 1
+                return
+            yield self.decode()
+
+
+    def _next(self) -> str:
+        '''skips whitespace, returns the next character'''
+        character = self.skip(_SPACE)
+        if character is None:
+            raise ValueError("the GeoJSON ends in the middle of an object")
+        return character
+
+
+def read_geojson(
+    file      : Union[str, TextIO, BinaryIO],
+    arrays    : Optional[bool] = False,
+    properties: Optional[bool] = False,
+    chunk_size: Optional[int] = 1 << 16
+    ) -> Iterator[Union[Geometry, Tuple[Geometry, Optional[dict]]]]:
+    '''
+    yields the shapes of a GeoJSON file, see from_parts for what comes out
+    the file can hold a FeatureCollection, a Feature, a geometry, or a sequence of those (newline-delimited/RFC 8142)
+    file: a path or a file opened in text or binary mode (decoded as utf-8)
+    arrays: yield PointArrays & array-backed polygons instead of Points, Segments & polygons of Points
+    properties: yield (shape, properties) pairs, the properties of a bare geometry are None
+
+    a FeatureCollection is read a feature at a time -> only the feature being read is held in memory
+    '''
+    if isinstance(file, str):
+        with open(file, 'r', encoding='utf-8') as opened:
+            yield from read_geojson(opened, arrays, properties, chunk_size)
+        return
+
+    for value in _JSONStream(file, chunk_size).values():
+        for member in value if isinstance(value, list) else [value]:
+            yield from _shapes(member, arrays, properties)
+
+
+def from_geojson(data: Union[str, dict], arrays: Optional[bool] = False) -> Union[Geometry, List[Geometry]]:
+    '''returns the shape of a GeoJSON geometry or feature, or the list of shapes of a FeatureCollection'''
+    if isinstance(data, str):
+        data = json.loads(data)
+    shapes = list(_shapes(data, arrays, False))
+    return shapes if data.get('type') == 'FeatureCollection' else shapes[0]
+
+
+def to_geojson(shape: Geometry) -> dict:
+    '''returns the GeoJSON geometry of a shape (see to_parts)'''
+    return _geometry(*to_parts(shape))
+
+
+class GeoJSONWriter:
+    '''
+    writes a FeatureCollection a feature at a time, the features aren't held on to
+    file: a path or a file opened in text mode
+    '''
+
+    __slots__ = ['file', '_owned', '_count']
+
+
+    def __init__(self, file: Union[str, TextIO]):
+        self._owned = isinstance(file, str)
+        self.file   = open(file, 'w', encoding='utf-8') if self._owned else file
+        self._count = 0
+        self.file.write('{"type": "FeatureCollection", "features": [\n')
+
+
+    def write(self, shape: Geometry, properties: Optional[dict] = None) -> None:
+        feature = {'type': 'Feature', 'geometry': to_geojson(shape) if shape is not None else None, 'properties': properties}
+        self.file.write(',\n' if self._count else '')
+        self.file.write(json.dumps(feature))
+        self._count += 1
+
+
+    def close(self) -> None:
+        if self.file is None:
+            return
+        self.file.write('\n]}\n')
+        self.file.flush()
+        if self._owned:
+            self.file.close()
+        self.file = None
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    def __enter__(self) -> 'GeoJSONWriter':
+        return self
+
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def write_geojson(file: Union[str, TextIO], shapes: Iterable[Geometry], properties: Optional[Iterable[dict]] = None) -> int:
+    '''writes the shapes (with the properties going with them, if given) as a FeatureCollection, returns how many were written'''
+    with GeoJSONWriter(file) as writer:
+        if properties is None:
+            for shape in shapes:
+                writer.write(shape)
+        else:
+            for shape, extra in zip(shapes, properties):
+                writer.write(shape, extra)
+        return len(writer)
+
+
+def _shapes(value: dict, arrays: bool, properties: bool) -> Iterator[Union[Geometry, Tuple[Geometry, Optional[dict]]]]:
+    kind = value.get('type')
+    if kind == 'FeatureCollection':
+        for feature in value.get('features', []):
+            yield from _shapes(feature, arrays, properties)
+        return
+    if kind == 'Feature':
+        geometry = value.get('geometry')
+        shape = from_parts(*_parts(geometry), arrays=arrays) if geometry is not None else None
+        yield (shape, value.get('properties')) if properties else shape
+        return
+    shape = from_parts(*_parts(value), arrays=arrays)
+    yield (shape, None) if properties else shape
+
+
+def _parts(geometry: dict) -> Tuple[str, Any]:
+    # the (type, coordinates) of a GeoJSON geometry, the positions turned into (x, y) & anything after them dropped
+    kind = geometry['type']
+    if kind == 'GeometryCollection':
+        return kind, [_parts(member) for member in geometry['geometries']]
+    coordinates = geometry['coordinates']
+    if kind == 'Point':
+        return kind, (float(coordinates[0]), float(coordinates[1])) if coordinates else None
+    if kind in ('LineString', 'MultiPoint'):
+        return kind, [(float(x), float(y)) for x, y, *_ in coordinates]
+    if kind in ('Polygon', 'MultiLineString'):
+        return kind, [[(float(x), float(y)) for x, y, *_ in part] for part in coordinates]
+    if kind == 'MultiPolygon':
+        return kind, [[[(float(x), float(y)) for x, y, *_ in ring] for ring in polygon] for polygon in coordinates]
+    raise ValueError(f"{kind} is not a supported geometry type")
+
+
+def _geometry(kind: str, value: Any) -> dict:
+    if kind == 'GeometryCollection':
+        return {'type': kind, 'geometries': [_geometry(*part) for part in value]}
+    return {'type': kind, 'coordinates': value if value is not None else []}
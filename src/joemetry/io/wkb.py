@@ -0,0 +1,161 @@
+import sys
+import struct
+from io import BytesIO
+from array import array
+from typing import BinaryIO, TextIO
+from joemetry._type_hints import *
+from ._geometry import Geometry, KINDS, to_parts, from_parts
+
+
+# the flags of the extended (PostGIS) WKB, the ISO one adds 1000/2000/3000 to the type instead
+_EWKB_Z, _EWKB_M, _EWKB_SRID = 0x80000000, 0x40000000, 0x20000000
+_CODES = {kind: code for code, kind in enumerate(KINDS, 1)}
+_UINT = {'<': struct.Struct('<I'), '>': struct.Struct('>I')}
+_NATIVE = '<' if sys.byteorder == 'little' else '>'
+
+
+class _Stream:
+    '''reads exact numbers of bytes out of a binary file, for parsing it a piece at a time'''
+
+    __slots__ = ['file']
+
+
+    def __init__(self, file: BinaryIO):
+        self.file = file
+
+
+    def read(self, size: int) -> bytes:
+        data = self.file.read(size)
+        while len(data) < size:
+            more = self.file.read(size - len(data))
+            if not more:
+                raise ValueError("the WKB ends in the middle of a geometry")
+            data += more
+        return data
+
+
+def read_wkb(file: Union[str, BinaryIO, TextIO], arrays: Optional[bool] = False, hex: Optional[bool] = False) -> Iterator[Geometry]:
+    '''
+    yields the shapes of a stream of WKB geometries, see from_parts for what comes out
+    file: a path or a binary file of WKB geometries one after the other,
+          or (hex set to True) a text file of hex-encoded WKB one a line, like the ones databases dump
+    arrays: yield PointArrays & array-backed polygons instead of Points, Segments & polygons of Points
+
+    a geometry is read a piece at a time (a ring's coordinates are read in one go) -> only the geometry being read is in memory
+    both byte orders & the ISO & extended (PostGIS) flavours are read, z/m values are skipped
+    '''
+    if isinstance(file, str):
+        with open(file, 'r' if hex else 'rb') as opened:
+            yield from read_wkb(opened, arrays, hex)
+        return
+
+    if hex:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield from_wkb(bytes.fromhex(line.decode() if isinstance(line, bytes) else line), arrays)
+        return
+
+    stream = _Stream(file)
+    while True:
+        first = file.read(1)
+        if not first:
+            return
+        yield from_parts(*_parse(stream, first[0]), arrays=arrays)
+
+
+def from_wkb(data: Union[bytes, bytearray, memoryview, str], arrays: Optional[bool] = False) -> Geometry:
+    '''returns the shape of a single WKB geometry, hex strings are decoded first'''
+    if isinstance(data, str):
+        data = bytes.fromhex(data)
+    stream = _Stream(BytesIO(data))
+    return from_parts(*_parse(stream, stream.read(1)[0]), arrays=arrays)
+
+
+def to_wkb(shape: Geometry, byteorder: Optional[str] = 'little') -> bytes:
+    '''returns the (2D, ISO) WKB of a shape (see to_parts)'''
+    if byteorder not in ('little', 'big'):
+        raise ValueError(f"{byteorder} is not a valid byte order")
+    chunks = []
+    _pack(chunks, *to_parts(shape), '<' if byteorder == 'little' else '>')
+    return b''.join(chunks)
+
+
+def write_wkb(file: Union[str, BinaryIO, TextIO], shapes: Iterable[Geometry], hex: Optional[bool] = False) -> int:
+    '''
+    writes the shapes as WKB one after the other, as they come out of the iterable, returns how many were written
+    hex: write them hex-encoded one a line, into a text file
+    '''
+    if isinstance(file, str):
+        with open(file, 'w' if hex else 'wb') as opened:
+            return write_wkb(opened, shapes, hex)
+    count = 0
+    for shape in shapes:
+        data = to_wkb(shape)
+        file.write(data.hex() + '\n' if hex else data)
+        count += 1
+    return count
+
+
+def _parse(stream: _Stream, order: int) -> Tuple[str, Any]:
+    # the (type, coordinates) of the geometry whose byte order byte was just read
+    endian = '<' if order == 1 else '>'
+    uint = _UINT[endian]
+    code, = uint.unpack(stream.read(4))
+
+    dimensions = 2 + bool(code & _EWKB_Z) + bool(code & _EWKB_M)
+    if code & _EWKB_SRID:
+        stream.read(4)
+    code &= 0x0FFFFFFF
+    dimensions += (0, 1, 1, 2)[code // 1000]
+    kind = KINDS[code % 1000 - 1]
+
+    def coordinates(size: int) -> List[Tuple[float, float]]:
+        values = array('d', stream.read(8 * dimensions * size))
+        if endian != _NATIVE:
+            values.byteswap()
+        return list(zip(values[0::dimensions], values[1::dimensions]))
+
+    def count() -> int:
+        return uint.unpack(stream.read(4))[0]
+
+    if kind == 'Point':
+        x, y = coordinates(1)[0]
+        # an empty point is written as NaN NaN
+        return kind, None if x != x and y != y else (x, y)
+    if kind == 'LineString':
+        return kind, coordinates(count())
+    if kind == 'Polygon':
+        return kind, [coordinates(count()) for _ in range(count())]
+
+    parts = [_parse(stream, stream.read(1)[0]) for _ in range(count())]
+    if kind == 'GeometryCollection':
+        return kind, parts
+    parts = [value for _, value in parts if value is not None]
+    return kind, parts
+
+
+def _pack(chunks: List[bytes], kind: str, value: Any, endian: str) -> None:
+    uint = _UINT[endian]
+    chunks.append((b'\x01' if endian == '<' else b'\x00') + uint.pack(_CODES[kind]))
+
+    def coordinates(points: List[Tuple[float, float]]) -> bytes:
+        values = array('d', (number for point in points for number in point))
+        if endian != _NATIVE:
+            values.byteswap()
+        return values.tobytes()
+
+    if kind == 'Point':
+        chunks.append(coordinates([value if value is not None else (float('nan'), float('nan'))]))
+    elif value is None:
+        chunks.append(uint.pack(0))
+    elif kind == 'LineString':
+        chunks.append(uint.pack(len(value)) + coordinates(value))
+    elif kind == 'Polygon':
+        chunks.append(uint.pack(len(value)))
+        chunks.extend(uint.pack(len(ring)) + coordinates(ring) for ring in value)
+    else:
+        chunks.append(uint.pack(len(value)))
+        member = {'MultiPoint': 'Point', 'MultiLineString': 'LineString', 'MultiPolygon': 'Polygon'}.get(kind)
+        for part in value:
+            _pack(chunks, *((member, part) if member else part), endian)
@@ -0,0 +1,199 @@
+import re
+import codecs
+from typing import TextIO, BinaryIO
+from joemetry._type_hints import *
+from ._geometry import Geometry, to_parts, from_parts
+
+
+_HEAD  = re.compile(r'\s*(?:SRID=-?\d+\s*;\s*)?([A-Za-z]+)\s*(?:(ZM|Z|M)\s*)?', re.IGNORECASE)
+_PAREN = re.compile(r'[()]')
+# the start of an EWKT SRID=...; prefix cut off by the end of a chunk
+_SRID  = re.compile(r'\s*S(?:R(?:I(?:D(?:=-?\d*\s*;?\s*)?)?)?)?', re.IGNORECASE)
+_SPACE = re.compile(r'\s*')
+_NAMES = {
+    'POINT': 'Point', 'LINESTRING': 'LineString', 'POLYGON': 'Polygon', 'MULTIPOINT': 'MultiPoint',
+    'MULTILINESTRING': 'MultiLineString', 'MULTIPOLYGON': 'MultiPolygon', 'GEOMETRYCOLLECTION': 'GeometryCollection'
+    }
+_KEYWORDS = {kind: name for name, kind in _NAMES.items()}
+
+
+def read_wkt(
+    file      : Union[str, TextIO, BinaryIO],
+    arrays    : Optional[bool] = False,
+    chunk_size: Optional[int] = 1 << 16
+    ) -> Iterator[Geometry]:
+    '''
+    yields the shapes of a stream of WKT geometries (one after the other, usually one a line), see from_parts for what comes out
+    file: a path or a file opened in text or binary mode (decoded as utf-8)
+    arrays: yield PointArrays & array-backed polygons instead of Points, Segments & polygons of Points
+
+    the file is read chunk_size characters at a time & a geometry is parsed as soon as its closing bracket is read
+    -> only the geometry being read is held in memory (the chunks read grow while a big geometry doesn't fit in them)
+    '''
+    if isinstance(file, str):
+        with open(file, 'r', encoding='utf-8') as opened:
+            yield from read_wkt(opened, arrays, chunk_size)
+        return
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer, size = '', chunk_size
+    while True:
+        chunk = file.read(size)
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk, final=not chunk)
+        buffer += chunk
+
+        position = 0
+        while True:
+            end = _geometry_end(buffer, position)
+            if end is None:
+                break
+            yield from_parts(*parse_wkt(buffer, position)[:2], arrays=arrays)
+            position = end
+        buffer = buffer[position:]
+
+        if not chunk:
+            if buffer.strip():
+                raise ValueError(f"the WKT ends in the middle of a geometry: {buffer[:50]!r}")
+            return
+        # a geometry bigger than the chunks -> read more at once, so it's not rescanned over & over
+        size = chunk_size if position else size * 2
+
+
+def from_wkt(text: str, arrays: Optional[bool] = False) -> Geometry:
+    '''returns the shape of a single WKT geometry'''
+    return from_parts(*parse_wkt(text)[:2], arrays=arrays)
+
+
+def to_wkt(shape: Geometry) -> str:
+    '''returns the WKT of a shape (see to_parts), the coordinates are written so they read back exactly'''
+    return _format(*to_parts(shape))
+
+
+def write_wkt(file: Union[str, TextIO], shapes: Iterable[Geometry]) -> int:
+    '''writes the shapes as WKT one a line, as they come out of the iterable, returns how many were written'''
+    if isinstance(file, str):
+        with open(file, 'w', encoding='utf-8') as opened:
+            return write_wkt(opened, shapes)
+    count = 0
+    for shape in shapes:
+        file.write(to_wkt(shape))
+        file.write('\n')
+        count += 1
+    return count
+
+
+def parse_wkt(text: str, position: Optional[int] = 0) -> Tuple[str, Any, int]:
+    '''returns the (type, coordinates) of the WKT geometry starting at the position, and where it ends'''
+    head = _HEAD.match(text, position)
+    kind = _NAMES.get(head.group(1).upper()) if head else None
+    if kind is None:
+        raise ValueError(f"no WKT geometry at {text[position:position + 50]!r}")
+    position = head.end()
+
+    if text[position:position + 5].upper() == 'EMPTY':
+        return kind, None, position + 5
+    if kind == 'GeometryCollection':
+        parts, position = _collection(text, position)
+        return kind, parts, position
+
+    value, position = _nested(text, position)
+    if kind == 'Point':
+        value = value[0]
+    elif kind == 'MultiPoint':
+        # both MULTIPOINT (1 2, 3 4) & MULTIPOINT ((1 2), (3 4)) are valid
+        value = [point[0] if isinstance(point, list) else point for point in value]
+    return kind, value, position
+
+
+def _collection(text: str, position: int) -> Tuple[List[Tuple[str, Any]], int]:
+    position = _expect(text, position, '(')
+    parts = []
+    while True:
+        kind, value, position = parse_wkt(text, position)
+        parts.append((kind, value))
+        position = _SPACE.match(text, position).end()
+        if text[position] == ')':
+            return parts, position + 1
+        position = _expect(text, position, ',')
+
+
+def _nested(text: str, position: int) -> Tuple[list, int]:
+    # a bracketed list -> either of coordinates or of more bracketed lists
+    position = _expect(text, position, '(')
+    position = _SPACE.match(text, position).end()
+    if text[position] != '(':
+        end = text.index(')', position)
+        return _coordinates(text[position:end]), end + 1
+
+    items = []
+    while True:
+        item, position = _nested(text, position)
+        items.append(item)
+        position = _SPACE.match(text, position).end()
+        if text[position] == ')':
+            return items, position + 1
+        position = _SPACE.match(text, _expect(text, position, ',')).end()
+
+
+def _coordinates(text: str) -> List[Tuple[float, float]]:
+    coordinates = []
+    for coordinate in text.split(','):
+        values = coordinate.split()
+        coordinates.append((float(values[0]), float(values[1])))
+    return coordinates
+
+
+def _expect(text: str, position: int, character: str) -> int:
+    position = _SPACE.match(text, position).end()
+    if position >= len(text) or text[position] != character:
+        raise ValueError(f"expected {character!r} in the WKT at {text[position:position + 50]!r}")
+    return position + 1
+
+
+def _geometry_end(text: str, position: int) -> Optional[int]:
+    # where the geometry starting at the position ends, None if it isn't all in the text yet
+    head = _HEAD.match(text, position)
+    if head is None or head.end() == len(text):
+        return None
+    if head.group(1).upper() not in _NAMES:
+        if _SRID.fullmatch(text, position):
+            return None
+        raise ValueError(f"no WKT geometry at {text[position:position + 50]!r}")
+    start = head.end()
+    if text[start:start + 5].upper() == 'EMPTY':
+        return start + 5
+    if text[start] != '(':
+        if len(text) - start < 5 and 'EMPTY'.startswith(text[start:].upper()):
+            return None
+        raise ValueError(f"no WKT geometry at {text[position:position + 50]!r}")
+
+    depth = 0
+    for bracket in _PAREN.finditer(text, start):
+        depth += 1 if bracket.group() == '(' else -1
+        if depth == 0:
+            return bracket.end()
+    return None
+
+
+def _format(kind: str, value: Any) -> str:
+    keyword = _KEYWORDS[kind]
+    if value is None:
+        return f"{keyword} EMPTY"
+    if kind == 'GeometryCollection':
+        return f"{keyword} ({', '.join(_format(*part) for part in value)})"
+    if kind == 'Point':
+        return f"{keyword} ({_sequence([value])})"
+    if kind in ('LineString', 'MultiPoint'):
+        return f"{keyword} ({_sequence(value)})"
+    if kind in ('Polygon', 'MultiLineString'):
+        return f"{keyword} ({_rings(value)})"
+    return f"{keyword} ({', '.join(f'({_rings(polygon)})' for polygon in value)})"
+
+
+def _rings(rings: List[List[Tuple[float, float]]]) -> str:
+    return ', '.join(f"({_sequence(ring)})" for ring in rings)
+
+
+def _sequence(coordinates: List[Tuple[float, float]]) -> str:
+    return ', '.join(f"{x!r} {y!r}" for x, y in coordinates)
@@ -1,6 +1,7 @@
 from math import sin, cos, radians, sqrt, ceil, floor, acos
 from dataclasses import dataclass
 from joemetry._type_hints import *
+from joemetry.predicates import orient2d
 
 
 @dataclass
@@ -32,7 +33,10 @@ class Point:
 
     @classmethod
     def convert(cls, coordinates: List[Coor]) -> List['Point']:
-        '''convert a list of tuple into Points'''
+        '''convert a list of tuple (or a PointArray) into Points'''
+        from .point_array import PointArray
+        if isinstance(coordinates, PointArray):
+            return coordinates.to_points()
         if not all(isinstance(c, tuple) for c in coordinates):
             raise TypeError(f"the given data type must be tuples containing float/int")
         return [cls(*point) for point in coordinates]
@@ -122,7 +126,7 @@ class Point:
         #            = (original_y)(cos(new_angle)) + (original_x)(sin(new_angle))
         #
         # translated -> original (in this case)
-        angle  = radians(angle)
+        angle  = radians(angle) * -1 if clockwise else radians(angle)
         cosine, sine = cos(angle), sin(angle)
         translated_x = self.x - origin[0]
         translated_y = self.y - origin[1]
@@ -130,7 +134,7 @@ class Point:
         dx = origin[0] + (translated_x * cosine - translated_y * sine)
         dy = origin[1] + (translated_y * cosine + translated_x * sine)
 
-        return Point(dx, dy) * -1 if clockwise else Point(dx, dy)
+        return Point(dx, dy)
 
 
     def rotate_ip(self, 
@@ -189,16 +193,13 @@ class Point:
         return angle * -1 if clockwise else angle
 
 
-    def in_polygon(self, polygon: List[Coor]) -> bool:
+    def in_polygon(self, polygon: Union[List[Coor], 'Polygon']) -> bool:
         '''
-        returns a True if "this" point is inside of a polygon and vice versa
-        uses the cross product to determine the whereabouts of the point
+        returns a True if "this" point is inside of a polygon (or on its boundary) and vice versa
+        any simple polygon works, convex or not & in either winding (see joemetry.point_in_polygon)
         '''
-        if self in polygon: 
-            return True
-        total_vertex = len(polygon)
-        cross_check  = [(polygon[(ind + 1) % total_vertex]).cross(self, origin=point) for ind, point in enumerate(polygon)]
-        return all(map(lambda cross_product: cross_product <= 0, cross_check))
+        from .point_in_polygon import point_in_polygon
+        return point_in_polygon(self, polygon)
 
 
     def in_circle(self, center: Coor, radius: float) -> bool:
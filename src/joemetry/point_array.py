@@ -0,0 +1,400 @@
+from math import sin, cos, radians, sqrt
+from array import array
+from itertools import chain
+from joemetry._type_hints import *
+from .point import Point
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class PointArray:
+    '''
+    a flat, contiguous float64 buffer of (x, y) pairs -> [x0, y0, x1, y1, ...]
+    backed by numpy when it's installed and by array('d') otherwise
+
+    the batched operations mirror the ones on Point,
+    but run over the whole buffer in one go instead of dispatching per point
+
+    indexing hands out Points copied out of the buffer -> changing one (points[0].x += 1) doesn't change the array,
+    assign the point back instead (points[0] = (x, y))
+    '''
+
+    __slots__ = ['_data']
+
+
+    def __init__(self, coordinates: Optional[Iterable[Coor]] = ()):
+        if isinstance(coordinates, PointArray):
+            self._data = _copy_buffer(coordinates._data)
+        elif np is not None and isinstance(coordinates, np.ndarray):
+            self._data = np.array(coordinates, dtype=np.float64).reshape(-1)
+        elif np is not None:
+            self._data = np.fromiter(chain.from_iterable(coordinates), dtype=np.float64)
+        else:
+            self._data = array('d', chain.from_iterable(coordinates))
+
+        if len(self._data) % 2:
+            raise ValueError(f"a {type(self).__name__} needs an even number of coordinates")
+
+
+    @classmethod
+    def from_buffer(cls, buffer: Iterable[float], copy: Optional[bool] = True) -> 'PointArray':
+        '''
+        build a PointArray from an interleaved [x0, y0, x1, y1, ...] buffer
+        copy: wrap the buffer as-is when set to False (numpy arrays, memoryviews, array('d'))
+        '''
+        points = cls.__new__(cls)
+        if not copy:
+            if np is not None and not isinstance(buffer, np.ndarray):
+                buffer = np.frombuffer(buffer, dtype=np.float64)
+            points._data = buffer
+        elif np is not None:
+            points._data = np.array(buffer, dtype=np.float64).reshape(-1)
+        else:
+            points._data = array('d', buffer)
+
+        if len(points._data) % 2:
+            raise ValueError(f"a {cls.__name__} needs an even number of coordinates")
+        return points
+
+
+    @classmethod
+    def convert(cls, coordinates: List[Coor]) -> 'PointArray':
+        '''convert a list of tuples/points into a PointArray'''
+        if not all(isinstance(c, (tuple, Point)) for c in coordinates):
+            raise TypeError(f"the given data type must be tuples containing float/int")
+        return cls(coordinates)
+
+
+    @property
+    def buffer(self) -> Sequence[float]:
+        '''the underlying interleaved float64 buffer, no copy is made'''
+        return self._data
+
+
+    @property
+    def xs(self) -> Sequence[float]:
+        return self._data[0::2]
+
+
+    @property
+    def ys(self) -> Sequence[float]:
+        return self._data[1::2]
+
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        '''returns (min_x, min_y, max_x, max_y) of the points in the array'''
+        if not len(self):
+            raise ValueError(f"cannot get the bounds of an empty {type(self).__name__}")
+        xs, ys = self.xs, self.ys
+        if np is not None:
+            return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+        return min(xs), min(ys), max(xs), max(ys)
+
+
+    @property
+    def lengths(self) -> Sequence[float]:
+        '''returns the length of every point in the array'''
+        if np is not None:
+            return np.hypot(self.xs, self.ys)
+        return array('d', [sqrt(x * x + y * y) for x, y in self.coords()])
+
+
+    def to_points(self) -> List[Point]:
+        '''materialize the array into a list of Points'''
+        return [Point(x, y) for x, y in self.coords()]
+
+
+    def coords(self) -> Iterator[Tuple[float, float]]:
+        '''iterate over the array as (x, y) tuples without creating any Point'''
+        data = self._data
+        if np is not None:
+            return zip(data[0::2].tolist(), data[1::2].tolist())
+        return zip(data[0::2], data[1::2])
+
+
+    def copy(self) -> 'PointArray':
+        return PointArray(self)
+
+
+    def roll(self, shift: int) -> 'PointArray':
+        '''returns a PointArray where the point at index i came from index (i - shift)'''
+        if not len(self):
+            return self.copy()
+        split = (-shift % len(self)) * 2
+        data  = self._data
+        if np is not None:
+            return PointArray.from_buffer(np.concatenate((data[split:], data[:split])), copy=False)
+        return PointArray.from_buffer(array('d', data[split:]) + array('d', data[:split]), copy=False)
+
+
+    def append(self, point: Coor) -> None:
+        self.insert(len(self), point)
+
+
+    def insert(self, index: int, point: Coor) -> None:
+        '''inserts a point before the given index, same rules as list.insert'''
+        index = _clamp_index(index, len(self))
+        if np is not None:
+            self._data = np.insert(self._data, index * 2, (float(point[0]), float(point[1])))
+        else:
+            self._data[index * 2:index * 2] = array('d', (point[0], point[1]))
+
+
+    def pop(self, index: Optional[int] = -1) -> Point:
+        '''remove the point at the given index and return it as a Point'''
+        index = range(len(self))[index]
+        point = self[index]
+        if np is not None:
+            self._data = np.delete(self._data, (index * 2, index * 2 + 1))
+        else:
+            del self._data[index * 2:index * 2 + 2]
+        return point
+
+
+    def cross(self, other: Union[Coor, 'PointArray'], origin: Optional[Union[Coor, 'PointArray']] = (0, 0)) -> Sequence[float]:
+        '''
+        returns the cross product of every point in this array with another point,
+        or pairwise with every point of another PointArray of the same length
+        origin: use this tuple/point/PointArray as the relative origin of both points
+        '''
+        (x1, y1), (x2, y2) = self._relative_to(origin), _operand(other, origin, len(self))
+        if np is not None:
+            return x1 * y2 - y1 * x2
+        return array('d', [(a * d) - (b * c) for a, b, c, d in zip(x1, y1, x2, y2)])
+
+
+    def dot(self, other: Union[Coor, 'PointArray'], origin: Optional[Union[Coor, 'PointArray']] = (0, 0)) -> Sequence[float]:
+        '''
+        returns the dot product of every point in this array with another point,
+        or pairwise with every point of another PointArray of the same length
+        origin: use this tuple/point/PointArray as the relative origin of both points
+        '''
+        (x1, y1), (x2, y2) = self._relative_to(origin), _operand(other, origin, len(self))
+        if np is not None:
+            return x1 * x2 + y1 * y2
+        return array('d', [(a * c) + (b * d) for a, b, c, d in zip(x1, y1, x2, y2)])
+
+
+    def rotate(self,
+        angle    : Num,
+        origin   : Optional[Coor] = (0,0),
+        clockwise: Optional[bool] = True
+        ) -> 'PointArray':
+        '''
+        returns a PointArray with every point rotated to the given angle
+        angle: 0-360 degree
+        origin: relative origin for the roatation
+        clockwise: it's pretty self-explanatory, init?
+        '''
+        points = self.copy()
+        points.rotate_ip(angle, origin, clockwise)
+        return points
+
+
+    def rotate_ip(self,
+        angle    : Num,
+        origin   : Optional[Coor] = (0,0),
+        clockwise: Optional[bool] = True
+        ) -> None:
+        '''
+        rotates every point in this array to the given angle
+        the sine and cosine are only computed once for the whole array
+        '''
+        angle        = radians(angle) * -1 if clockwise else radians(angle)
+        cosine, sine = cos(angle), sin(angle)
+        ox, oy       = float(origin[0]), float(origin[1])
+        tx, ty       = self._relative_to(origin)
+
+        if np is not None:
+            self._data[0::2] = ox + (tx * cosine - ty * sine)
+            self._data[1::2] = oy + (ty * cosine + tx * sine)
+            return
+
+        data = self._data
+        for ind, (x, y) in enumerate(zip(tx, ty)):
+            data[ind * 2]     = ox + (x * cosine - y * sine)
+            data[ind * 2 + 1] = oy + (y * cosine + x * sine)
+
+
+    def normalize(self) -> 'PointArray':
+        '''returns a PointArray of unit vectors, zero-length points are left at the origin'''
+        points = self.copy()
+        points.scale_to_length(1)
+        return points
+
+
+    def scale_to_length(self, length: Num) -> None:
+        '''reposition every point to match the given length, zero-length points are left as they are'''
+        if np is not None:
+            lengths = np.hypot(self.xs, self.ys)
+            ratio   = np.divide(length, lengths, out=np.ones_like(lengths), where=lengths != 0)
+            self._data *= np.repeat(ratio, 2)
+            return
+
+        data = self._data
+        for ind, (x, y) in enumerate(self.coords()):
+            if x == 0 and y == 0: continue
+            ratio = length / sqrt(x * x + y * y)
+            data[ind * 2]     = x * ratio
+            data[ind * 2 + 1] = y * ratio
+
+
+    def _relative_to(self, origin: Union[Coor, 'PointArray']) -> Tuple[Sequence[float], Sequence[float]]:
+        # returns the x and y columns of this array translated by the origin
+        if isinstance(origin, PointArray):
+            if len(origin) != len(self):
+                raise ValueError(f"cannot broadcast a {type(self).__name__} of length {len(origin)} to {len(self)}")
+            if np is not None:
+                return self.xs - origin.xs, self.ys - origin.ys
+            return [a - b for a, b in zip(self.xs, origin.xs)], [a - b for a, b in zip(self.ys, origin.ys)]
+
+        ox, oy = float(origin[0]), float(origin[1])
+        if np is not None:
+            return self.xs - ox, self.ys - oy
+        return [x - ox for x in self.xs], [y - oy for y in self.ys]
+
+
+    def __len__(self) -> int:
+        return len(self._data) // 2
+
+
+    def __iter__(self) -> Iterator[Point]:
+        return (Point(x, y) for x, y in self.coords())
+
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Point, 'PointArray']:
+        if isinstance(index, slice):
+            return PointArray(list(self.coords())[index])
+        index = range(len(self))[index]
+        return Point(self._data[index * 2], self._data[index * 2 + 1])
+
+
+    def __setitem__(self, index: int, val: Coor) -> None:
+        index = range(len(self))[index]
+        self._data[index * 2], self._data[index * 2 + 1] = float(val[0]), float(val[1])
+
+
+    def __contains__(self, point: Coor) -> bool:
+        return (float(point[0]), float(point[1])) in self.coords()
+
+
+    def __eq__(self, other: 'PointArray') -> bool:
+        if not isinstance(other, PointArray):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self._data, other._data))
+
+
+    def __add__(self, other: Union[Coor, 'PointArray']) -> 'PointArray':
+        if isinstance(other, (Point, tuple, PointArray)):
+            x, y = _operand(other, (0, 0), len(self))
+            return _from_columns(self.xs, self.ys, x, y, lambda a, b: a + b)
+        raise TypeError(f'addition with an invalid type: {type(other)}!')
+
+
+    def __sub__(self, other: Union[Coor, 'PointArray']) -> 'PointArray':
+        if isinstance(other, (Point, tuple, PointArray)):
+            x, y = _operand(other, (0, 0), len(self))
+            return _from_columns(self.xs, self.ys, x, y, lambda a, b: a - b)
+        raise TypeError(f'subtraction with an invalid type: {type(other)}!')
+
+
+    def __mul__(self, val: Num) -> 'PointArray':
+        '''contract/extend every point's position by the given scale factor'''
+        if not isinstance(val, (float, int)):
+            raise TypeError(f"cannot multiply {type(self).__name__} by '{type(val).__name__}'")
+        if np is not None:
+            return PointArray.from_buffer(self._data * val, copy=False)
+        return PointArray.from_buffer(array('d', [coor * val for coor in self._data]), copy=False)
+
+
+    def __truediv__(self, val: Num) -> 'PointArray':
+        '''contract/extend every point's position by the given scale factor'''
+        if not isinstance(val, (float, int)):
+            raise TypeError(f"cannot divide {type(self).__name__} by '{type(val).__name__}'")
+        return self * (1 / val)
+
+
+    def __floordiv__(self, val: Num) -> 'PointArray':
+        '''contract/extend every point's position by the given scale factor'''
+        if not isinstance(val, (float, int)):
+            raise TypeError(f"cannot divide(floor) {type(self).__name__} by '{type(val).__name__}'")
+        if np is not None:
+            return PointArray.from_buffer(self._data // val, copy=False)
+        return PointArray.from_buffer(array('d', [coor // val for coor in self._data]), copy=False)
+
+
+    def __neg__(self) -> 'PointArray':
+        return self * -1
+
+
+    def __copy__(self) -> 'PointArray':
+        return self.copy()
+
+
+    def __getstate__(self) -> Tuple[float, ...]:
+        return tuple(self._data)
+
+
+    def __setstate__(self, state: Tuple[float, ...]) -> None:
+        self._data = PointArray.from_buffer(state)._data
+
+
+    def __repr__(self):
+        coords = ', '.join(f"({round(x, 2)}, {round(y, 2)})" for x, y in list(self.coords())[:6])
+        return f"PointArray([{coords}{', ...' if len(self) > 6 else ''}], length={len(self)})"
+
+
+def _copy_buffer(data: Sequence[float]) -> Sequence[float]:
+    if np is not None:
+        return np.array(data, dtype=np.float64)
+    return array('d', data)
+
+
+def _clamp_index(index: int, length: int) -> int:
+    # mimic the way list.insert treats out-of-range/negative indices
+    if index < 0:
+        index = max(length + index, 0)
+    return min(index, length)
+
+
+def _operand(
+    other : Union[Coor, PointArray],
+    origin: Union[Coor, PointArray],
+    length: int
+    ) -> Tuple[Sequence[float], Sequence[float]]:
+    # returns the x and y columns of the right hand side of an operation
+    # a single point is broadcasted to the length of the array
+    if isinstance(other, PointArray):
+        if len(other) != length:
+            raise ValueError(f"cannot broadcast a PointArray of length {len(other)} to {length}")
+        return other._relative_to(origin)
+
+    if isinstance(origin, PointArray):
+        if np is not None:
+            return float(other[0]) - origin.xs, float(other[1]) - origin.ys
+        return [other[0] - x for x in origin.xs], [other[1] - y for y in origin.ys]
+
+    x, y = float(other[0]) - float(origin[0]), float(other[1]) - float(origin[1])
+    if np is not None:
+        return x, y
+    return [x] * length, [y] * length
+
+
+def _from_columns(
+    xs1: Sequence[float], ys1: Sequence[float],
+    xs2: Sequence[float], ys2: Sequence[float],
+    operator: Callable[[float, float], float]
+    ) -> PointArray:
+    # apply an elementwise operator to two sets of columns and interleave the result back
+    if np is not None:
+        data = np.empty(len(xs1) * 2, dtype=np.float64)
+        data[0::2], data[1::2] = operator(xs1, xs2), operator(ys1, ys2)
+        return PointArray.from_buffer(data, copy=False)
+
+    data = array('d', bytes(len(xs1) * 16))
+    data[0::2] = array('d', map(operator, xs1, xs2))
+    data[1::2] = array('d', map(operator, ys1, ys2))
+    return PointArray.from_buffer(data, copy=False)
@@ -0,0 +1,288 @@
+from math import floor
+from joemetry import Polygon, PointArray
+from joemetry.predicates import orient2d
+from joemetry.utils import get_coordinates, get_signed_area
+from joemetry._type_hints import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+RULES = ['evenodd', 'nonzero']
+
+
+def point_in_convex_polygon(point: Coor, polygon: Union[Poly, PointArray]) -> bool:
+    '''
+    returns True if the point is inside of a convex polygon (or on its boundary), in O(log n)
+    either winding works, the polygon isn't checked for being convex
+
+    [PROCESS]:
+
+        1) fan the polygon out from its first vertex, the point has to be between the first & last edge of the fan
+
+        2) binary search for the wedge (v0, vi, vi+1) the point falls in
+
+        3) the point is inside if it's inside of that triangle
+    '''
+    vertices = polygon.vertex if isinstance(polygon, Polygon) else polygon
+    total = len(vertices)
+    if total < 3:
+        return False
+
+    # the winding only has to be known for the fan, so the first turn that isn't collinear settles it
+    first = vertices[0]
+    sign = 0
+    for ind in range(1, total - 1):
+        turn = orient2d(first, vertices[ind], vertices[ind + 1])
+        if turn:
+            sign = 1 if turn > 0 else -1
+            break
+    if sign == 0:
+        return False
+    return _in_fan(point, lambda ind: vertices[ind if sign > 0 or ind == 0 else total - ind], total)
+
+
+def winding_number(point: Coor, polygon: Union[Poly, PointArray]) -> int:
+    '''
+    returns how many times the polygon winds anti-clockwise around the point (negative for clockwise)
+    0 means outside, the number is meaningless for a point right on the boundary
+    '''
+    coords = get_coordinates(polygon)
+    winding, _ = _winding(float(point[0]), float(point[1]), coords, range(len(coords)))
+    return winding
+
+
+def point_in_polygon(point: Coor, polygon: Union[Poly, PointArray], rule: Optional[str] = 'evenodd') -> bool:
+    '''
+    returns True if the point is inside of the polygon or on its boundary, any polygon (concave, either winding)
+    rule: 'evenodd' -> an odd number of crossings (the crossing number)
+          'nonzero' -> a non-zero winding number, the two only differ for self-intersecting polygons
+    O(n), use PreparedPolygon for repeated queries against the same polygon
+    '''
+    if rule not in RULES:
+        raise ValueError(f"{rule} is not a valid rule")
+    coords = get_coordinates(polygon)
+    winding, boundary = _winding(float(point[0]), float(point[1]), coords, range(len(coords)))
+    return boundary or _inside(winding, rule)
+
+
+class PreparedPolygon:
+    '''
+    a polygon prepared for many point-in-polygon queries
+
+    polygon: the polygon/ring of points, either winding
+    rule: 'evenodd' or 'nonzero', see point_in_polygon
+
+    the bounding box is cut into horizontal buckets (as many as there are edges),
+    the ray cast from a point only crosses edges spanning its y, which all cover its bucket
+    -> a query only goes over the few edges around one bucket instead of all of them
+    convex polygons are tested with the O(log n) fan search instead
+
+    the buckets are the leaves of a segment tree, an edge is filed under the few nodes whose buckets
+    together make up the ones it spans (no more than 2 per level), and a bucket's edges are the ones on its path to the root
+    -> a long edge isn't copied into every bucket it crosses, so the polygon is prepared in O(n log n) even when
+       most edges span most of the buckets (combs, spirals)
+
+    contains_many runs node by node, all the points under a node against all of its edges at once when numpy is installed,
+    the points too close to an edge for the float cross products to be trusted are redone with the exact predicates
+    '''
+
+    __slots__ = ['coords', 'rule', 'convex', 'bounds', '_nodes', '_leaves', '_bucket_height', '_node_arrays']
+
+
+    def __init__(self, polygon: Union[Poly, PointArray], rule: Optional[str] = 'evenodd'):
+        if rule not in RULES:
+            raise ValueError(f"{rule} is not a valid rule")
+        coords = get_coordinates(polygon)
+        if len(coords) < 3:
+            raise ValueError("a polygon needs at least 3 points")
+        if get_signed_area(coords) < 0:
+            coords.reverse()
+        self.coords = coords
+        self.rule = rule
+        self.convex = _is_convex(coords)
+        xs, ys = [x for x, _ in coords], [y for _, y in coords]
+        self.bounds = (min(xs), min(ys), max(xs), max(ys))
+
+        # edge i goes from coords[i] to coords[i + 1]
+        # node 1 is the root, node i has the children 2i & 2i + 1, bucket b is the leaf _leaves + b
+        total = len(coords)
+        min_y, max_y = self.bounds[1], self.bounds[3]
+        self._bucket_height = (max_y - min_y) / total or 1.0
+        self._leaves = 1 << (total - 1).bit_length()
+        self._nodes = {}
+        for ind in range(total):
+            y1, y2 = coords[ind][1], coords[(ind + 1) % total][1]
+            low, high = self._bucket(min(y1, y2)) + self._leaves, self._bucket(max(y1, y2)) + self._leaves + 1
+            while low < high:
+                if low & 1:
+                    self._nodes.setdefault(low, []).append(ind)
+                    low += 1
+                if high & 1:
+                    high -= 1
+                    self._nodes.setdefault(high, []).append(ind)
+                low, high = low >> 1, high >> 1
+        # the edges of every node as numpy columns, only made for contains_many
+        self._node_arrays = None
+
+
+    def _bucket(self, y: float) -> int:
+        return min(max(floor((y - self.bounds[1]) / self._bucket_height), 0), len(self.coords) - 1)
+
+
+    def _edges(self, bucket: int) -> Iterator[int]:
+        # the edges that could span a y in the bucket -> the ones filed on its path up to the root
+        nodes, node = self._nodes, bucket + self._leaves
+        while node:
+            edges = nodes.get(node)
+            if edges is not None:
+                yield from edges
+            node >>= 1
+
+
+    def contains(self, point: Coor) -> bool:
+        '''whether the point is inside of the polygon or on its boundary'''
+        x, y = float(point[0]), float(point[1])
+        min_x, min_y, max_x, max_y = self.bounds
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        if self.convex:
+            return _in_fan((x, y), self.coords.__getitem__, len(self.coords))
+        winding, boundary = _winding(x, y, self.coords, self._edges(self._bucket(y)))
+        return boundary or _inside(winding, self.rule)
+
+
+    def contains_many(self, points: Union[List[Coor], PointArray]) -> Sequence[bool]:
+        '''
+        contains for every point, returns a numpy bool array when numpy is installed & a list otherwise
+        points: Points, (x, y) tuples, a PointArray or a (n, 2) numpy array
+        '''
+        if np is None:
+            return [self.contains(point) for point in get_coordinates(points)]
+
+        if isinstance(points, PointArray):
+            xs, ys = points.xs, points.ys
+        else:
+            coords = points if isinstance(points, np.ndarray) else get_coordinates(points)
+            coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+            xs, ys = coords[:, 0], coords[:, 1]
+
+        min_x, min_y, max_x, max_y = self.bounds
+        result = np.zeros(len(xs), dtype=bool)
+        candidates = np.nonzero((xs >= min_x) & (xs <= max_x) & (ys >= min_y) & (ys <= max_y))[0]
+        if not len(candidates):
+            return result
+
+        # sort the candidates by bucket -> the points under a node are a run of them
+        buckets = np.clip(np.floor((ys[candidates] - min_y) / self._bucket_height), 0, len(self.coords) - 1).astype(np.int64)
+        order = np.argsort(buckets, kind='stable')
+        candidates, buckets = candidates[order], buckets[order]
+        px, py = xs[candidates][None, :], ys[candidates][None, :]
+
+        nodes, arrays = self._columns()
+        # the buckets under node i -> i shifted left until it's a leaf
+        shifts = self._leaves.bit_length() - np.array([node.bit_length() for node in nodes], dtype=np.int64)
+        firsts = (np.array(nodes, dtype=np.int64) << shifts) - self._leaves
+        starts = np.searchsorted(buckets, firsts, side='left')
+        ends = np.searchsorted(buckets, firsts + (1 << shifts), side='left')
+
+        winding = np.zeros(len(candidates), dtype=np.int64)
+        unsure = np.zeros(len(candidates), dtype=bool)
+        for (ax, ay, bx, by), start, end in zip(arrays, starts, ends):
+            if start == end:
+                continue
+            x, y = px[:, start:end], py[:, start:end]
+            # orient2d(a, b, p) of every edge against every point, edges along the rows
+            left, right = (bx - ax) * (y - ay), (by - ay) * (x - ax)
+            cross = left - right
+            upward, downward = (ay <= y) & (y < by), (by <= y) & (y < ay)
+            winding[start:end] += (upward & (cross > 0)).sum(axis=0) - (downward & (cross < 0)).sum(axis=0)
+            unsure[start:end] |= ((np.abs(cross) <= 2.0 ** -48 * (np.abs(left) + np.abs(right))) & (np.minimum(ay, by) <= y) & (y <= np.maximum(ay, by))).any(axis=0)
+
+        result[candidates] = winding % 2 == 1 if self.rule == 'evenodd' else winding != 0
+        for ind in candidates[unsure]:
+            result[ind] = self.contains((xs[ind], ys[ind]))
+        return result
+
+
+    def _columns(self) -> Tuple[List[int], List[tuple]]:
+        # the nodes holding edges & the (start x, start y, end x, end y) columns of their edges
+        if self._node_arrays is None:
+            coords, total = self.coords, len(self.coords)
+            nodes, arrays = sorted(self._nodes), []
+            for node in nodes:
+                edges = self._nodes[node]
+                starts = np.array([coords[ind] for ind in edges], dtype=np.float64).reshape(-1, 2)
+                ends = np.array([coords[(ind + 1) % total] for ind in edges], dtype=np.float64).reshape(-1, 2)
+                arrays.append((starts[:, :1], starts[:, 1:], ends[:, :1], ends[:, 1:]))
+            self._node_arrays = (nodes, arrays)
+        return self._node_arrays
+
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(vertices={len(self.coords)}, convex={self.convex}, rule='{self.rule}')"
+
+
+def _inside(winding: int, rule: str) -> bool:
+    return winding % 2 == 1 if rule == 'evenodd' else winding != 0
+
+
+def _winding(x: float, y: float, coords: List[Tuple[float, float]], edges: Iterable[int]) -> Tuple[int, bool]:
+    # the winding number of the ring around (x, y) over the given edges & whether the point is on one of them
+    # an edge counts if it crosses the horizontal ray going right from the point, its lower end included & upper end not
+    total, point = len(coords), (x, y)
+    winding = 0
+    for ind in edges:
+        (x1, y1), (x2, y2) = a, b = coords[ind], coords[(ind + 1) % total]
+        if (y1 > y) == (y2 > y):
+            # doesn't cross the ray, but the point could still be on it
+            if (y1 == y or y2 == y) and min(x1, x2) <= x <= max(x1, x2) and orient2d(a, b, point) == 0:
+                return winding, True
+            continue
+
+        turn = orient2d(a, b, point)
+        if turn == 0:
+            return winding, True
+        if y1 <= y and turn > 0:
+            winding += 1
+        elif y2 <= y and turn < 0:
+            winding -= 1
+    return winding, False
+
+
+def _in_fan(point: Coor, vertex: Callable[[int], Coor], total: int) -> bool:
+    # vertex(i) gives the anti-clockwise vertices of a convex polygon
+    first = vertex(0)
+    if orient2d(first, vertex(1), point) < 0 or orient2d(first, vertex(total - 1), point) > 0:
+        return False
+
+    # the last fan edge (v0, vi) the point isn't right of
+    low, high = 1, total - 2
+    while low < high:
+        mid = (low + high + 1) // 2
+        if orient2d(first, vertex(mid), point) >= 0:
+            low = mid
+        else:
+            high = mid - 1
+    a, b = vertex(low), vertex(low + 1)
+    return orient2d(a, b, point) >= 0 and orient2d(b, first, point) >= 0
+
+
+def _is_convex(coords: List[Tuple[float, float]]) -> bool:
+    # every turn the same way & the edges only go around once -> dx & dy both change sign no more than twice
+    total = len(coords)
+    turns = [orient2d(coords[ind - 1], coords[ind], coords[(ind + 1) % total]) for ind in range(total)]
+    if not (all(turn >= 0 for turn in turns) or all(turn <= 0 for turn in turns)):
+        return False
+
+    for axis in [0, 1]:
+        signs = [coords[(ind + 1) % total][axis] > coords[ind][axis] for ind in range(total) if coords[(ind + 1) % total][axis] != coords[ind][axis]]
+        if sum(1 for ind in range(len(signs)) if signs[ind] != signs[ind - 1]) > 2:
+            return False
+    return True
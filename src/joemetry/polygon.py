@@ -1,19 +1,70 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, FrozenInstanceError
+from math import sqrt
 from joemetry._type_hints import *
 from .point import Point
+from .predicates import orient2d
+from .point_array import PointArray, np
 
 
-# INTERSECT, STRETCHING(maybe?), translation?, CIRCLE
+# STRETCHING(maybe?), translation?, CIRCLE
 @dataclass
 class Polygon:
+    '''
+    the derived quantities (area, centroid, bounds, convexity, orientation, perimeter...) are worked out on first access
+    & cached, the cache is cleared by add_vertex, pop_vertex, __setitem__, rotate_ip, transform_ip, enlarge & by assigning to vertex
+    -> moving a vertex through the Point itself (polygon[0].x += 1) isn't seen, call invalidate() after doing that
 
-    vertex: List[Union[tuple, Point]] = field(default_factory=list)
+    frozen: make the polygon immutable -> the mutating methods raise FrozenInstanceError & the polygon is hashable,
+            so it can be used as a dict key or shared between threads
+            the vertices are kept in a read-only PointArray (the Points it gives out are copies), whatever they were given as
+
+    polygons are equal when their vertices are, whether they're kept as Points or in a PointArray
+    '''
+
+    vertex: Union[List[Union[tuple, Point]], PointArray] = field(default_factory=list)
+    frozen: bool = field(default=False, repr=False, compare=False)
+    _cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
 
 
     def __post_init__(self):
         if len(self.vertex) < 3:
             raise TypeError(f'a polygon must consist of at least 3 points, dummy')
-        self.vertex = [Point(*vertex) for vertex in self.vertex]
+        # an array-backed polygon keeps its vertices in the buffer instead of as Points
+        if self.frozen:
+            vertex = _read_only(PointArray(self.vertex))
+        elif isinstance(self.vertex, PointArray):
+            vertex = self.vertex.copy()
+        else:
+            vertex = [Point(*vertex) for vertex in self.vertex]
+        object.__setattr__(self, 'vertex', vertex)
+
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # the fields can't be reassigned once a frozen polygon is made
+        if self.__dict__.get('frozen') and '_cache' in self.__dict__:
+            raise FrozenInstanceError(f"cannot assign to field '{name}' of a frozen {type(self).__name__}")
+        if name == 'vertex' and '_cache' in self.__dict__:
+            self._cache.clear()
+        object.__setattr__(self, name, value)
+
+
+    def _cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        cache = self._cache
+        if name not in cache:
+            cache[name] = compute()
+        return cache[name]
+
+
+    def _modified(self) -> None:
+        # called by every method changing the vertices in place
+        if self.frozen:
+            raise FrozenInstanceError(f"cannot modify a frozen {type(self).__name__}")
+        self._cache.clear()
+
+
+    def invalidate(self) -> None:
+        '''clear the cached quantities, for when the vertices were moved without going through the polygon'''
+        self._modified()
 
 
     @property
@@ -21,66 +72,216 @@ class Polygon:
         return len(self.vertex)
     
 
+    @property
+    def signed_area(self) -> float:
+        '''returns the area of the polygon using the shoelacing equation, positive if it's anti-clockwise'''
+        return self._cached('signed_area', self._signed_area)
+
+
+    def _signed_area(self) -> float:
+        if isinstance(self.vertex, PointArray):
+            return float(sum(self.vertex.roll(1).cross(self.vertex))) * 0.5
+
+        area = 0.0
+        previous = self.vertex[-1]
+        for point in self.vertex:
+            area += previous.x * point.y - previous.y * point.x
+            previous = point
+        return area * 0.5
+
+
     @property
     def area(self) -> float:
         '''returns the area of the polygon using the shoelacing equation'''
-        area = 0
-        for i in range(self.num_vertex):
-            j = (i + 1) % self.num_vertex
-            area += self.vertex[i].x * self.vertex[j].y
-            area -= self.vertex[i].y * self.vertex[j].x
-        return round(abs(area * 0.5), 2)
+        return round(abs(self.signed_area), 2)
+
+
+    @property
+    def orientation(self) -> int:
+        '''1 if the vertices go anti-clockwise, -1 if they go clockwise & 0 if the polygon has no area'''
+        area = self.signed_area
+        return (area > 0) - (area < 0)
+
+
+    @property
+    def perimeter(self) -> float:
+        '''returns the total length of the edges of the polygon'''
+        return self._cached('perimeter', self._perimeter)
+
+
+    def _perimeter(self) -> float:
+        perimeter = 0.0
+        previous = self.vertex[-1]
+        for point in self.vertex:
+            perimeter += sqrt((point.x - previous.x) ** 2 + (point.y - previous.y) ** 2)
+            previous = point
+        return perimeter
+
+
+    @property
+    def centroid(self) -> Point:
+        '''returns the center of mass of the polygon (the average of the vertices if it has no area)'''
+        return Point(*self._cached('centroid', self._centroid))
+
+
+    def _centroid(self) -> Tuple[float, float]:
+        area = self.signed_area
+        if area == 0:
+            return (sum(point.x for point in self.vertex) / self.num_vertex, sum(point.y for point in self.vertex) / self.num_vertex)
+
+        center_x = center_y = 0.0
+        previous = self.vertex[-1]
+        for point in self.vertex:
+            cross = previous.x * point.y - point.x * previous.y
+            center_x += (previous.x + point.x) * cross
+            center_y += (previous.y + point.y) * cross
+            previous = point
+        return (center_x / (6 * area), center_y / (6 * area))
 
 
     @property
     def center(self) -> Point:
         '''returns the center of the polygon using the bounding box of it as reference'''
-        bottomleft, topright = self.bounding_box
-        center_x = bottomleft.x + ((topright.x - bottomleft.x) / 2)
-        center_y = bottomleft.y + ((topright.y - bottomleft.y) / 2)
-        return Point(center_x, center_y)
+        min_x, min_y, max_x, max_y = self.bounds
+        return Point(min_x + ((max_x - min_x) / 2), min_y + ((max_y - min_y) / 2))
 
 
     @property
     def is_convex(self) -> bool:
         '''check whethr "this" polygon is a convex polygon'''
+        return self._cached('is_convex', self._is_convex)
+
+
+    def _is_convex(self) -> bool:
         if self.num_vertex == 3: 
             return True
+        # the turns at the vertices all go the same way as the polygon (a flat polygon is taken as clockwise)
+        side = 1 if self.orientation <= 0 else -1
+
+        if isinstance(self.vertex, PointArray):
+            # the cross product at every vertex, from its left neighbour to its right neighbour
+            # anything within the rounding error of the batched products is settled by the exact orient2d
+            cross_check = self.vertex.roll(1).cross(self.vertex.roll(-1), origin=self.vertex)
+            min_x, min_y, max_x, max_y = self.bounds
+            magnitude = max(abs(min_x), abs(min_y), abs(max_x), abs(max_y))
+            tolerance = 2.0 ** -48 * magnitude * magnitude
+            for ind, cross_product in enumerate(cross_check):
+                if side * cross_product < -tolerance:
+                    return False
+                if side * cross_product <= tolerance:
+                    center_point = self.vertex[ind]
+                    if side * orient2d(center_point, self.vertex[ind - 1], self.vertex[(ind + 1) % self.num_vertex]) < 0:
+                        return False
+            return True
 
         for ind, center_point in enumerate(self.vertex):
             center_to_right = self.vertex[(ind + 1) % self.num_vertex] 
             center_to_left  = self.vertex[(ind - 1) % self.num_vertex] 
 
-            if center_to_left.cross(center_to_right, origin=center_point) < 0:
+            if side * orient2d(center_point, center_to_left, center_to_right) < 0:
                 return False 
 
         return True
 
 
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        '''returns (min_x, min_y, max_x, max_y) of the polygon'''
+        return self._cached('bounds', self._bounds)
+
+
+    def _bounds(self) -> Tuple[float, float, float, float]:
+        if isinstance(self.vertex, PointArray):
+            return self.vertex.bounds()
+        x_coords = [point.x for point in self.vertex]
+        y_coords = [point.y for point in self.vertex]
+        return min(x_coords), min(y_coords), max(x_coords), max(y_coords)
+
+
     @property
     def bounding_box(self) -> Tuple[Point, Point]:
-        x_coords   = [point.x for point in self.vertex]
-        y_coords   = [point.y for point in self.vertex]
-        topright   = max(x_coords), max(y_coords)
-        bottomleft = min(x_coords), min(y_coords)
-        return Point(*bottomleft), Point(*topright)
+        min_x, min_y, max_x, max_y = self.bounds
+        return Point(min_x, min_y), Point(max_x, max_y)
+
+
+    def contains(self, point: Coor) -> bool:
+        '''returns True if the point is inside of "this" polygon or on its boundary'''
+        from .point_in_polygon import point_in_polygon
+        return point_in_polygon(point, self)
+
+
+    def contains_many(self, points: Union[List[Coor], PointArray], rule: Optional[str] = 'evenodd') -> Sequence[bool]:
+        '''returns whether every point is inside of "this" polygon (or on its boundary), vectorized when numpy is installed'''
+        return self.prepared(rule).contains_many(points)
+
+
+    def prepared(self, rule: Optional[str] = 'evenodd') -> 'PreparedPolygon':
+        '''returns "this" polygon prepared for many point-in-polygon queries, cached like the other derived quantities'''
+        def prepare() -> 'PreparedPolygon':
+            from .point_in_polygon import PreparedPolygon
+            return PreparedPolygon(self, rule)
+        return self._cached(('prepared', rule), prepare)
+
+
+    def intersection(self, other: Union['Polygon', List['Polygon']]) -> List['Polygon']:
+        '''returns the overlap of "this" polygon & the other one, see joemetry.clipping.overlay'''
+        from .clipping import intersection
+        return intersection(self, other)
+
+
+    def union(self, other: Union['Polygon', List['Polygon']]) -> List['Polygon']:
+        '''returns the region covered by either polygon, holes come out as clockwise polygons'''
+        from .clipping import union
+        return union(self, other)
+
+
+    def difference(self, other: Union['Polygon', List['Polygon']]) -> List['Polygon']:
+        '''returns the part of "this" polygon outside of the other one, holes come out as clockwise polygons'''
+        from .clipping import difference
+        return difference(self, other)
+
+
+    def symmetric_difference(self, other: Union['Polygon', List['Polygon']]) -> List['Polygon']:
+        '''returns the region covered by exactly one of the polygons, holes come out as clockwise polygons'''
+        from .clipping import symmetric_difference
+        return symmetric_difference(self, other)
+
+
+    def is_simple(self) -> bool:
+        '''whether "this" polygon's edges only meet their neighbours, in O(n log n), see joemetry.validity'''
+        from .validity import is_simple
+        return self._cached('is_simple', lambda: is_simple(self))
+
+
+    def self_intersections(self) -> List[Tuple[int, int, Tuple[float, float]]]:
+        '''returns every pair of edges of "this" polygon touching each other as (i, j, (x, y)), edge i starting at vertex i'''
+        from .validity import self_intersections
+        return self_intersections(self)
+
+
+    def simplify(self, tolerance: float, method: Optional[str] = 'douglas_peucker', preserve_topology: Optional[bool] = True) -> 'Polygon':
+        '''returns a simplified copy of "this" polygon, see joemetry.simplify'''
+        from .simplify import simplify
+        return simplify(self, tolerance, method, preserve_topology)
 
 
     @classmethod
     def convert(cls, polygons: List[List[Coor]]) -> List['Polygon']:
-        '''convert a list of list of points into a list of polygons'''
-        if not all(isinstance(c, (tuple, list)) for c in polygons):
+        '''convert a list of list of points (or of PointArrays) into a list of polygons'''
+        if not all(isinstance(c, (tuple, list, PointArray)) for c in polygons):
             raise TypeError(f"the given data type must be tuples containing float/int")
         return [cls(poly) for poly in polygons]
 
 
     def add_vertex(self, point: Coor, index: Optional[int] = -1) -> None:
         '''adds a new vertex into the polygon with the given index'''
+        self._modified()
         self.vertex.insert(index, Point(*point)) 
 
 
     def pop_vertex(self, index: Optional[int] = -1) -> None:
         '''reomve a vertex from the polygon with the given index'''
+        self._modified()
         self.vertex.pop(index)
 
 
@@ -95,7 +296,8 @@ class Polygon:
         origin: relative origin for the roatation
         clockwise: it's pretty self-explanatory, init?
         '''
-        return Polygon([point.rotate(angle, origin, clockwise) for point in self.vertex])
+        from .transform import Affine
+        return Affine.rotation(angle, origin, clockwise)(self)
 
 
     def rotate_ip(self, 
@@ -109,12 +311,24 @@ class Polygon:
         origin: relative origin for the roatation
         clockwise: it's pretty self-explanatory, init?
         '''
-        [point.rotate_ip(angle, origin, clockwise) for point in self.vertex]
+        from .transform import Affine
+        Affine.rotation(angle, origin, clockwise)(self, inplace=True)
+
+
+    def transform(self, matrix: 'Affine') -> 'Polygon':
+        '''returns a polygon with every vertex put through the affine transform, see joemetry.transform'''
+        return matrix(self)
+
+
+    def transform_ip(self, matrix: 'Affine') -> None:
+        '''puts every vertex of this polygon through the affine transform, in one pass over the vertices'''
+        matrix(self, inplace=True)
 
 
     def enlarge(self, scale_factor: Num):
         '''enlarge/shrink "this" polygon by the given scale factor'''
-        self.vertex = [point * scale_factor for point in self.vertex]
+        from .transform import Affine
+        Affine.scaling(scale_factor)(self, inplace=True)
 
 
     def enlarge_to(self, target_area: Num):
@@ -125,13 +339,16 @@ class Polygon:
         '''enlarge/shrink "this" polygon by the given scale factor'''
         if not isinstance(scale_factor, (float, int)):
             raise TypeError(f"cannot multiply {type(self).__name__} by '{type(scale_factor).__name__}'")
-        return Polygon([point * scale_factor for point in self.vertex])
+        from .transform import Affine
+        return Affine.scaling(scale_factor)(self)
 
 
     def __truediv__(self, scale_factor: Num):
         '''enlarge/shrink "this" polygon by the given scale factor'''
         if not isinstance(scale_factor, (float, int)):
             raise TypeError(f"cannot divide {type(self).__name__} by '{type(scale_factor).__name__}'")
+        if isinstance(self.vertex, PointArray):
+            return Polygon(self.vertex / scale_factor)
         return Polygon([point / scale_factor for point in self.vertex])
 
 
@@ -139,6 +356,8 @@ class Polygon:
         '''enlarge/shrink "this" polygon by the given scale factor'''
         if not isinstance(scale_factor, (float, int)):
             raise TypeError(f"cannot divide(floor) {type(self).__name__} by '{type(scale_factor).__name__}'")
+        if isinstance(self.vertex, PointArray):
+            return Polygon(self.vertex // scale_factor)
         return Polygon([point // scale_factor for point in self.vertex])
 
 
@@ -147,10 +366,39 @@ class Polygon:
 
 
     def __getitem__(self, index):
+        '''
+        the vertex at the index, an array-backed polygon gives out a copy
+        -> polygon[0].x += 1 is lost on it, set the vertex through the polygon instead (polygon[0] = (x, y))
+        '''
         return self.vertex[index]
 
 
     def __setitem__(self, index, value):
+        self._modified()
         self.vertex[index] = Point(*value)
 
 
+    def __eq__(self, other: 'Polygon') -> bool:
+        if not isinstance(other, Polygon):
+            return NotImplemented
+        return self.num_vertex == other.num_vertex and self._coords() == other._coords()
+
+
+    def __hash__(self):
+        if not self.frozen:
+            raise TypeError(f"unhashable type: '{type(self).__name__}' (only frozen polygons are hashable)")
+        return self._cached('hash', lambda: hash(tuple(self._coords())))
+
+
+    def _coords(self) -> List[Tuple[float, float]]:
+        if isinstance(self.vertex, PointArray):
+            return list(self.vertex.coords())
+        return [(point.x, point.y) for point in self.vertex]
+
+
+def _read_only(vertex: PointArray) -> PointArray:
+    # numpy arrays can be flagged read-only, an array('d') can't -> its bytes are wrapped in a read-only memoryview instead
+    if np is not None:
+        vertex.buffer.flags.writeable = False
+        return vertex
+    return PointArray.from_buffer(memoryview(vertex.buffer.tobytes()).cast('d'), copy=False)
@@ -0,0 +1,114 @@
+from fractions import Fraction
+from joemetry._type_hints import *
+
+
+# the filters follow Shewchuk's static error bounds for the plain floating point determinants
+# -> if the float result is bigger than the bound, its sign is guaranteed to be right
+# otherwise the determinant is recomputed exactly with fractions (floats are exact rationals)
+_EPSILON            = 2.0 ** -53
+_ORIENT2D_ERRBOUND  = (3.0 + 16.0 * _EPSILON) * _EPSILON
+_INCIRCLE_ERRBOUND  = (10.0 + 96.0 * _EPSILON) * _EPSILON
+# the bounds assume nothing underflows, below this the products lose their precision (or become 0) -> exact
+_TINY               = 2.0 ** -900
+
+
+# how many times each predicate had to fall back to exact arithmetic
+exact_fallbacks = {'orient2d': 0, 'incircle': 0}
+
+
+def reset_stats() -> None:
+    '''reset the exact fallback counters'''
+    for predicate in exact_fallbacks:
+        exact_fallbacks[predicate] = 0
+
+
+def orient2d(a: Coor, b: Coor, c: Coor) -> float:
+    '''
+    returns a positive value if a, b, c make an anti-clockwise turn,
+    a negative value if they make a clockwise turn and 0 if they're collinear
+    the sign is always exact, the same as b.cross(c, origin=a) when there's no rounding error
+    '''
+    acx, acy = a[0] - c[0], a[1] - c[1]
+    bcx, bcy = b[0] - c[0], b[1] - c[1]
+    det_left, det_right = acx * bcy, acy * bcx
+    det = det_left - det_right
+
+    if -_TINY < det_left < _TINY and -_TINY < det_right < _TINY and ((acx and bcy) or (acy and bcx)):
+        return _orient2d_exact(a, b, c)
+
+    # when both products have opposite signs (or one is 0) the subtraction can't cancel out
+    if det_left > 0:
+        if det_right <= 0:
+            return det
+        det_sum = det_left + det_right
+    elif det_left < 0:
+        if det_right >= 0:
+            return det
+        det_sum = -det_left - det_right
+    else:
+        return det
+
+    if abs(det) >= _ORIENT2D_ERRBOUND * det_sum:
+        return det
+    return _orient2d_exact(a, b, c)
+
+
+def incircle(a: Coor, b: Coor, c: Coor, d: Coor) -> float:
+    '''
+    returns a positive value if d lies inside of the circle passing through a, b and c,
+    a negative value if it's outside and 0 if it's on the circle
+    a, b, c have to be in anti-clockwise order, the sign flips otherwise
+    '''
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+
+    bdx_cdy, cdx_bdy = bdx * cdy, cdx * bdy
+    cdx_ady, adx_cdy = cdx * ady, adx * cdy
+    adx_bdy, bdx_ady = adx * bdy, bdx * ady
+    a_lift = adx * adx + ady * ady
+    b_lift = bdx * bdx + bdy * bdy
+    c_lift = cdx * cdx + cdy * cdy
+
+    det = (a_lift * (bdx_cdy - cdx_bdy)
+         + b_lift * (cdx_ady - adx_cdy)
+         + c_lift * (adx_bdy - bdx_ady))
+
+    permanent = ((abs(bdx_cdy) + abs(cdx_bdy)) * a_lift
+               + (abs(cdx_ady) + abs(adx_cdy)) * b_lift
+               + (abs(adx_bdy) + abs(bdx_ady)) * c_lift)
+
+    if abs(det) > _INCIRCLE_ERRBOUND * permanent and permanent > _TINY:
+        return det
+    return _incircle_exact(a, b, c, d)
+
+
+def _orient2d_exact(a: Coor, b: Coor, c: Coor) -> float:
+    exact_fallbacks['orient2d'] += 1
+    ax, ay, bx, by, cx, cy = map(Fraction, (a[0], a[1], b[0], b[1], c[0], c[1]))
+    return _signed((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def _incircle_exact(a: Coor, b: Coor, c: Coor, d: Coor) -> float:
+    exact_fallbacks['incircle'] += 1
+    dx, dy = Fraction(d[0]), Fraction(d[1])
+    adx, ady = Fraction(a[0]) - dx, Fraction(a[1]) - dy
+    bdx, bdy = Fraction(b[0]) - dx, Fraction(b[1]) - dy
+    cdx, cdy = Fraction(c[0]) - dx, Fraction(c[1]) - dy
+    det = ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+         + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+         + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+    return _signed(det)
+
+
+def _signed(det: Fraction) -> float:
+    # the exact determinant as a float with the same sign,
+    # float() alone rounds a tiny one to 0.0 & raises on a huge one
+    if not det:
+        return 0.0
+    sign = 1.0 if det > 0 else -1.0
+    try:
+        value = float(det)
+    except OverflowError:
+        return sign * float('inf')
+    return value or sign * 5e-324
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from joemetry._type_hints import *
 from .point import *
+from .predicates import orient2d
+from .point_array import PointArray
 
 
 @dataclass
@@ -53,7 +55,15 @@ class Segment:
 
     @classmethod
     def convert(cls, segments: List[Tuple[Coor, Coor]]) -> List['Segment']:
-        '''converts either a list of tuple of point objects or a list of tuple of tuple of 2 float into segment objects'''
+        '''
+        converts either a list of tuple of point objects or a list of tuple of tuple of 2 float into segment objects
+        a PointArray is read as consecutive (start, end) pairs -> [start_0, end_0, start_1, end_1, ...]
+        '''
+        if isinstance(segments, PointArray):
+            if len(segments) % 2:
+                raise ValueError(f"a PointArray of {len(segments)} points cannot be split into (start, end) pairs")
+            coords = segments.coords()
+            return [cls(start, end) for start, end in zip(coords, coords)]
         if not all(isinstance(c, (tuple, list)) for c in segments):
             raise TypeError(f"the given data type must be tuples containing float/int")
         return [cls(*seg) for seg in segments]
@@ -138,20 +148,24 @@ class Segment:
     def intersect_with(self, other: 'Segment') -> Coor:
         '''
         returns either None or an intersecting point of both segment 
-        '''
-        start = other.start - self.start
-        end_1, end_2 = self.end - self.start, other.end - other.start
-
-        determinant = end_1.cross(end_2)
-        if determinant == 0: return None
-
-        check_1 = (start).cross(end_2) / determinant
-        check_2 = (start).cross(end_1) / determinant
-
-        if (0 <= check_1 <= 1) and (0 <= check_2 <= 1):
-            return round(self.start + (self.end - self.start) * check_1, 2)
-
-        return None
+        uses exact orientation tests, so touching/near-degenerate segments are classified correctly
+        collinear segments are never reported as intersecting
+        '''
+        # which side of the other segment both ends of this segment are on and vice versa
+        side_start = orient2d(other.start, other.end, self.start)
+        side_end   = orient2d(other.start, other.end, self.end)
+        if (side_start > 0 and side_end > 0) or (side_start < 0 and side_end < 0):
+            return None
+        if side_start == side_end == 0:
+            return None
+
+        other_start = orient2d(self.start, self.end, other.start)
+        other_end   = orient2d(self.start, self.end, other.end)
+        if (other_start > 0 and other_end > 0) or (other_start < 0 and other_end < 0):
+            return None
+
+        ratio = side_start / (side_start - side_end)
+        return self.start + (self.end - self.start) * ratio
 
 
     def __mul__(self, scale_factor: Num):
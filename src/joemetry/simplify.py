@@ -0,0 +1,283 @@
+from heapq import heapify, heappush, heappop
+from itertools import islice
+from joemetry import Polygon, PointArray
+from joemetry.utils import get_coordinates
+from joemetry.intersection.batch import batch_intersections
+from joemetry._type_hints import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+METHODS = ['douglas_peucker', 'visvalingam_whyatt']
+
+# spans shorter than this are searched in plain python, numpy's call overhead isn't worth it below that
+_VECTORIZE_FROM = 64
+
+
+def douglas_peucker(points: Union[List[Coor], PointArray], tolerance: float, closed: Optional[bool] = False) -> List[int]:
+    '''
+    returns the indices of the points kept by Douglas–Peucker, in order
+    tolerance: the furthest a dropped point can be from the simplified line
+    closed: the points are a ring (a polygon) -> the first point is joined back onto the last one
+
+    [PROCESS]:
+
+        1) keep both ends, the ring is treated as a line going round & back to its first point
+
+        2) find the point of the span furthest from the segment joining its ends (vectorized for long spans)
+
+        3) if it's further than the tolerance, keep it & do the same for both halves
+           the spans waiting to be looked at are kept on a stack instead of recursing -> no recursion limit
+
+    O(n log n) when the kept points split the spans somewhere near their middle, but O(n²) when they keep
+    landing near an end, which periodic traces (a zigzag, a trace going round & round) do a lot
+    -> simplify_stream bounds that by the buffer size, O(n * buffer_size) at worst
+    '''
+    coords = get_coordinates(points)
+    total = len(coords)
+    if total < 3:
+        return list(range(total))
+    if closed:
+        coords.append(coords[0])
+
+    xs, ys = _columns(coords)
+    keep = bytearray(len(coords))
+    keep[0] = keep[-1] = 1
+    stack = [(0, len(coords) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        index, distance = _furthest(xs, ys, first, last)
+        if distance > tolerance * tolerance:
+            keep[index] = 1
+            stack.append((index, last))
+            stack.append((first, index))
+
+    kept = [ind for ind in range(total) if keep[ind]]
+    if closed and len(kept) < 3:
+        kept = _at_least_a_triangle(coords[:-1], kept)
+    return kept
+
+
+def visvalingam_whyatt(points: Union[List[Coor], PointArray], tolerance: float, closed: Optional[bool] = False) -> List[int]:
+    '''
+    returns the indices of the points kept by Visvalingam–Whyatt, in order, in O(n log n)
+    tolerance: the smallest area a kept point can make with its neighbours (its "effective area")
+    closed: the points are a ring (a polygon), no point is fixed & at least 3 are kept
+
+    [PROCESS]:
+
+        1) every point goes into a heap keyed on the area of the triangle it makes with its neighbours
+
+        2) pop the point with the smallest area & unlink it, its 2 neighbours get new areas
+           (never smaller than the area just removed, so the removal order stays the same as the areas')
+           the heap entries of points whose area changed are left in it & skipped once they're popped
+
+        3) stop once the smallest area is over the tolerance
+    '''
+    coords = get_coordinates(points)
+    total = len(coords)
+    if total < 3:
+        return list(range(total))
+
+    if closed:
+        previous = [(ind - 1) % total for ind in range(total)]
+        following = [(ind + 1) % total for ind in range(total)]
+        movable = range(total)
+    else:
+        previous = list(range(-1, total - 1))
+        following = list(range(1, total + 1))
+        movable = range(1, total - 1)
+
+    area = [0.0] * total
+    for ind in movable:
+        area[ind] = _triangle_area(coords[previous[ind]], coords[ind], coords[following[ind]])
+    heap = [(area[ind], ind) for ind in movable]
+    heapify(heap)
+
+    removed = bytearray(total)
+    remaining, minimum = total, 3 if closed else 2
+    while heap and remaining > minimum:
+        value, ind = heappop(heap)
+        if removed[ind] or value != area[ind]:
+            continue
+        if value >= tolerance:
+            break
+        removed[ind] = 1
+        remaining -= 1
+        before, after = previous[ind], following[ind]
+        following[before], previous[after] = after, before
+
+        for neighbour in (before, after):
+            if closed or 0 < neighbour < total - 1:
+                area[neighbour] = max(_triangle_area(coords[previous[neighbour]], coords[neighbour], coords[following[neighbour]]), value)
+                heappush(heap, (area[neighbour], neighbour))
+    return [ind for ind in range(total) if not removed[ind]]
+
+
+ENGINES = {'douglas_peucker': douglas_peucker, 'visvalingam_whyatt': visvalingam_whyatt}
+
+
+def simplify(
+    shape            : Union[Polygon, PointArray, List[Coor]],
+    tolerance        : float,
+    method           : Optional[str] = 'douglas_peucker',
+    preserve_topology: Optional[bool] = True
+    ) -> Union[Polygon, PointArray, List[Tuple[float, float]]]:
+    '''
+    returns a simplified copy of a polygon (as a Polygon), a PointArray or a line (as a list of (x, y))
+    method: "douglas_peucker" (tolerance is a distance) or "visvalingam_whyatt" (tolerance is an area)
+    preserve_topology: make sure the simplified shape doesn't cross itself where the original didn't
+
+    topology is kept by checking the simplified edges against each other with batch_intersections,
+    every edge crossing another one (other than its neighbours) gets back the original point furthest from it,
+    and that's repeated until nothing crosses
+    '''
+    if method not in ENGINES:
+        raise ValueError(f"{method} is not a valid method")
+    closed = isinstance(shape, Polygon)
+    coords = get_coordinates(shape)
+    kept = ENGINES[method](coords, tolerance, closed)
+    if preserve_topology:
+        kept = _untangle(coords, kept, closed)
+
+    simplified = [coords[ind] for ind in kept]
+    if closed:
+        return Polygon(PointArray(simplified) if isinstance(shape.vertex, PointArray) else simplified)
+    if isinstance(shape, PointArray):
+        return PointArray(simplified)
+    return simplified
+
+
+def simplify_stream(
+    points     : Iterable[Coor],
+    tolerance  : float,
+    method     : Optional[str] = 'douglas_peucker',
+    buffer_size: Optional[int] = 4096
+    ) -> Iterator[Tuple[float, float]]:
+    '''
+    simplifies a line coming in as an iterator (a GPS trace being read...) & yields the points it keeps as they're settled
+    only buffer_size points are held at a time, however long the line is
+
+    the buffer is simplified whenever it fills up, the points kept up to the 2nd to last one are final & yielded,
+    the rest stays in the buffer to be simplified again with the points coming after it
+    (or up to the last one, when the 2nd to last is in the first half of the buffer -> a long straight stretch)
+
+    the output isn't always what simplifying the whole line at once gives, the buffer boundaries can keep extra points,
+    what is guaranteed is the same as for the whole line, but for every output segment on its own:
+        douglas_peucker: every dropped point is within tolerance of the output segment joining the kept points around it
+        visvalingam_whyatt: every dropped point had an effective area under the tolerance in its buffer
+    the first & last points are always kept
+    '''
+    if method not in ENGINES:
+        raise ValueError(f"{method} is not a valid method")
+    if buffer_size < 3:
+        raise ValueError("the buffer needs room for at least 3 points")
+    engine = ENGINES[method]
+    points = iter(points)
+
+    buffer = []
+    while True:
+        buffer.extend((float(point[0]), float(point[1])) for point in islice(points, buffer_size - len(buffer)))
+        if len(buffer) < buffer_size:
+            break
+
+        kept = engine(buffer, tolerance)
+        # whatever comes after the 2nd to last kept point can still change, unless that's most of the buffer
+        carry = kept[-2] if kept[-2] >= buffer_size // 2 else kept[-1]
+        for ind in kept:
+            if ind >= carry:
+                break
+            yield buffer[ind]
+        buffer = buffer[carry:]
+
+    for ind in engine(buffer, tolerance) if buffer else []:
+        yield buffer[ind]
+
+
+def _columns(coords: List[Tuple[float, float]]) -> Tuple[Sequence[float], Sequence[float]]:
+    if np is not None:
+        array = np.asarray(coords, dtype=np.float64)
+        return array[:, 0], array[:, 1]
+    return [x for x, _ in coords], [y for _, y in coords]
+
+
+def _furthest(xs: Sequence[float], ys: Sequence[float], first: int, last: int) -> Tuple[int, float]:
+    # the point between first & last furthest from the segment joining them, with its squared distance
+    ax, ay, bx, by = xs[first], ys[first], xs[last], ys[last]
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+
+    if np is not None and last - first > _VECTORIZE_FROM:
+        px, py = xs[first + 1:last] - ax, ys[first + 1:last] - ay
+        t = np.clip((px * dx + py * dy) / length_sq, 0.0, 1.0) if length_sq else 0.0
+        distances = (px - t * dx) ** 2 + (py - t * dy) ** 2
+        index = int(np.argmax(distances))
+        return first + 1 + index, float(distances[index])
+
+    best, best_index = -1.0, first + 1
+    for ind in range(first + 1, last):
+        px, py = xs[ind] - ax, ys[ind] - ay
+        t = min(max((px * dx + py * dy) / length_sq, 0.0), 1.0) if length_sq else 0.0
+        distance = (px - t * dx) ** 2 + (py - t * dy) ** 2
+        if distance > best:
+            best, best_index = distance, ind
+    return best_index, best
+
+
+def _triangle_area(a: Tuple[float, float], b: Tuple[float, float], c: Tuple[float, float]) -> float:
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])) * 0.5
+
+
+def _at_least_a_triangle(coords: List[Tuple[float, float]], kept: List[int]) -> List[int]:
+    # a ring simplified down to fewer than 3 points gets back the points furthest out until it's a triangle again
+    kept = set(kept) or {0}
+    while len(kept) < min(3, len(coords)):
+        anchors = [coords[ind] for ind in kept]
+        kept.add(max(
+            (ind for ind in range(len(coords)) if ind not in kept),
+            key=lambda ind: min((coords[ind][0] - x) ** 2 + (coords[ind][1] - y) ** 2 for x, y in anchors)
+            ))
+    return sorted(kept)
+
+
+def _untangle(coords: List[Tuple[float, float]], kept: List[int], closed: bool) -> List[int]:
+    # puts original points back into the simplified edges crossing other ones, until none do
+    total = len(coords)
+    kept = sorted(kept)
+    while len(kept) >= 3:
+        edges = list(zip(kept, kept[1:] + kept[:1])) if closed else list(zip(kept, kept[1:]))
+        segments = [(coords[start], coords[end]) for start, end in edges]
+        count = len(edges)
+
+        crossing = set()
+        for i, j, _ in batch_intersections(segments):
+            # neighbouring edges always meet at the vertex they share
+            if j - i == 1 or (closed and i == 0 and j == count - 1):
+                continue
+            crossing.update((i, j))
+        if not crossing:
+            break
+
+        added = set()
+        for edge in crossing:
+            start, end = edges[edge]
+            span = range(start + 1, end) if start < end else [ind % total for ind in range(start + 1, end + total)]
+            if span:
+                added.add(max(span, key=lambda ind: _segment_distance_sq(coords[ind], coords[start], coords[end])))
+        if not added:
+            break
+        kept = sorted(set(kept) | added)
+    return kept
+
+
+def _segment_distance_sq(point: Tuple[float, float], start: Tuple[float, float], end: Tuple[float, float]) -> float:
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    px, py = point[0] - start[0], point[1] - start[1]
+    length_sq = dx * dx + dy * dy
+    t = min(max((px * dx + py * dy) / length_sq, 0.0), 1.0) if length_sq else 0.0
+    return (px - t * dx) ** 2 + (py - t * dy) ** 2
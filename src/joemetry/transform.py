@@ -0,0 +1,222 @@
+from math import sin, cos, radians
+from dataclasses import dataclass
+from joemetry import Point, Segment, Polygon, PointArray
+from joemetry._type_hints import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+Shape = TypeVar('Shape', Coor, Seg, Poly, PointArray, List[Any])
+
+
+@dataclass(frozen=True)
+class Affine:
+    '''
+    a 2D affine transform, stored as the top 2 rows of its 3x3 matrix ->
+
+        | a  b  c |        x' = a * x + b * y + c
+        | d  e  f |        y' = d * x + e * y + f
+        | 0  0  1 |
+
+    transforms are chained into a single matrix (rotate, then scale, then translate... is still one pass over the points)
+    & the sine/cosine of a rotation are worked out once, when the transform is made
+
+        move = Affine.rotation(30, origin=(5, 5)).scale(2).translate(1, 0)
+        move(polygon)                 -> a transformed copy
+        move(polygon, inplace=True)   -> transforms the polygon itself
+
+    the angles follow Point.rotate -> degrees, clockwise unless told otherwise
+    '''
+
+    __slots__ = ['a', 'b', 'c', 'd', 'e', 'f']
+
+    a: float
+    b: float
+    c: float
+    d: float
+    e: float
+    f: float
+
+
+    @classmethod
+    def identity(cls) -> 'Affine':
+        return cls(1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+
+
+    @classmethod
+    def translation(cls, dx: Num, dy: Num) -> 'Affine':
+        return cls(1.0, 0.0, float(dx), 0.0, 1.0, float(dy))
+
+
+    @classmethod
+    def rotation(cls, angle: Num, origin: Optional[Coor] = (0, 0), clockwise: Optional[bool] = True) -> 'Affine':
+        '''
+        angle: 0-360 degree
+        origin: relative origin for the rotation
+        '''
+        angle        = radians(angle) * -1 if clockwise else radians(angle)
+        cosine, sine = cos(angle), sin(angle)
+        ox, oy       = float(origin[0]), float(origin[1])
+        return cls(cosine, -sine, ox - ox * cosine + oy * sine, sine, cosine, oy - ox * sine - oy * cosine)
+
+
+    @classmethod
+    def scaling(cls, sx: Num, sy: Optional[Num] = None, origin: Optional[Coor] = (0, 0)) -> 'Affine':
+        '''scales by sx along the x-axis & sy along the y-axis (sx too if it's not given), away from the origin'''
+        sx = float(sx)
+        sy = sx if sy is None else float(sy)
+        ox, oy = float(origin[0]), float(origin[1])
+        return cls(sx, 0.0, ox - ox * sx, 0.0, sy, oy - oy * sy)
+
+
+    @classmethod
+    def shearing(cls, sx: Num, sy: Optional[Num] = 0, origin: Optional[Coor] = (0, 0)) -> 'Affine':
+        '''x' = x + sx * y, y' = y + sy * x, relative to the origin'''
+        sx, sy = float(sx), float(sy)
+        ox, oy = float(origin[0]), float(origin[1])
+        return cls(1.0, sx, -sx * oy, sy, 1.0, -sy * ox)
+
+
+    def translate(self, dx: Num, dy: Num) -> 'Affine':
+        '''returns this transform followed by a translation'''
+        return Affine.translation(dx, dy) @ self
+
+
+    def rotate(self, angle: Num, origin: Optional[Coor] = (0, 0), clockwise: Optional[bool] = True) -> 'Affine':
+        '''returns this transform followed by a rotation'''
+        return Affine.rotation(angle, origin, clockwise) @ self
+
+
+    def scale(self, sx: Num, sy: Optional[Num] = None, origin: Optional[Coor] = (0, 0)) -> 'Affine':
+        '''returns this transform followed by a scaling'''
+        return Affine.scaling(sx, sy, origin) @ self
+
+
+    def shear(self, sx: Num, sy: Optional[Num] = 0, origin: Optional[Coor] = (0, 0)) -> 'Affine':
+        '''returns this transform followed by a shearing'''
+        return Affine.shearing(sx, sy, origin) @ self
+
+
+    @property
+    def determinant(self) -> float:
+        return self.a * self.e - self.b * self.d
+
+
+    @property
+    def is_identity(self) -> bool:
+        return self == Affine.identity()
+
+
+    @property
+    def matrix(self) -> Tuple[Tuple[float, float, float], ...]:
+        '''the full 3x3 matrix, row by row'''
+        return ((self.a, self.b, self.c), (self.d, self.e, self.f), (0.0, 0.0, 1.0))
+
+
+    def inverse(self) -> 'Affine':
+        '''returns the transform undoing this one'''
+        determinant = self.determinant
+        if determinant == 0:
+            raise ValueError(f"{self} can't be inverted, it flattens everything onto a line")
+        a, b, d, e = self.e / determinant, -self.b / determinant, -self.d / determinant, self.a / determinant
+        return Affine(a, b, -(a * self.c + b * self.f), d, e, -(d * self.c + e * self.f))
+
+
+    def apply(self, shape: Shape, inplace: Optional[bool] = False) -> Optional[Shape]:
+        '''
+        transforms a point, segment, polygon, PointArray or a list of any of those
+        returns the transformed copy, or None if inplace is set (tuples can't be changed in place, they're returned either way)
+        '''
+        if isinstance(shape, PointArray):
+            points = shape if inplace else shape.copy()
+            self._transform_buffer(points.buffer)
+            return None if inplace else points
+
+        if isinstance(shape, Polygon):
+            if inplace:
+                shape._modified()
+                self.apply(shape.vertex, inplace=True)
+                return None
+            vertex = self.apply(shape.vertex)
+            return Polygon(vertex if isinstance(vertex, PointArray) else list(vertex))
+
+        if isinstance(shape, Point):
+            x, y = self.transform_xy(shape.x, shape.y)
+            if inplace:
+                shape.x, shape.y = x, y
+                return None
+            return Point(x, y)
+
+        if isinstance(shape, Segment):
+            if inplace:
+                self.apply(shape.start, inplace=True)
+                self.apply(shape.end, inplace=True)
+                return None
+            return Segment(self.apply(shape.start), self.apply(shape.end))
+
+        if len(shape) == 2 and isinstance(shape[0], (int, float)):
+            return self.transform_xy(shape[0], shape[1])
+
+        transformed = [self.apply(item, inplace) for item in shape]
+        if not inplace:
+            return type(shape)(transformed) if isinstance(shape, tuple) else transformed
+        if isinstance(shape, list):
+            # tuples inside of a list are swapped for their transformed copies
+            for ind, item in enumerate(transformed):
+                if item is not None:
+                    shape[ind] = item
+            return None
+        return type(shape)(item if item is not None else original for item, original in zip(transformed, shape))
+
+
+    __call__ = apply
+
+
+    def transform_xy(self, x: Num, y: Num) -> Tuple[float, float]:
+        '''transforms a single (x, y)'''
+        return (self.a * x + self.b * y + self.c, self.d * x + self.e * y + self.f)
+
+
+    def transform_columns(self, xs: Sequence[float], ys: Sequence[float]) -> Tuple[Sequence[float], Sequence[float]]:
+        '''transforms separate x & y columns (numpy arrays are done in one vectorized pass)'''
+        a, b, c, d, e, f = self.a, self.b, self.c, self.d, self.e, self.f
+        if np is not None and isinstance(xs, np.ndarray):
+            return a * xs + b * ys + c, d * xs + e * ys + f
+        return [a * x + b * y + c for x, y in zip(xs, ys)], [d * x + e * y + f for x, y in zip(xs, ys)]
+
+
+    def _transform_buffer(self, data: Sequence[float]) -> None:
+        # transforms an interleaved [x0, y0, x1, y1, ...] buffer in place
+        a, b, c, d, e, f = self.a, self.b, self.c, self.d, self.e, self.f
+        if np is not None and isinstance(data, np.ndarray):
+            xs = data[0::2].copy()
+            ys = data[1::2]
+            data[0::2] = a * xs + b * ys + c
+            data[1::2] = d * xs + e * ys + f
+            return
+
+        for ind in range(0, len(data), 2):
+            x, y = data[ind], data[ind + 1]
+            data[ind]     = a * x + b * y + c
+            data[ind + 1] = d * x + e * y + f
+
+
+    def __matmul__(self, other: 'Affine') -> 'Affine':
+        '''self @ other -> the transform doing other first, then self'''
+        if not isinstance(other, Affine):
+            return NotImplemented
+        return Affine(
+            self.a * other.a + self.b * other.d, self.a * other.b + self.b * other.e, self.a * other.c + self.b * other.f + self.c,
+            self.d * other.a + self.e * other.d, self.d * other.b + self.e * other.e, self.d * other.c + self.e * other.f + self.f
+            )
+
+
+    def __iter__(self) -> Iterator[float]:
+        return iter((self.a, self.b, self.c, self.d, self.e, self.f))
+
+
+    def __repr__(self):
+        return f"Affine(a={round(self.a, 4)}, b={round(self.b, 4)}, c={round(self.c, 4)}, d={round(self.d, 4)}, e={round(self.e, 4)}, f={round(self.f, 4)})"
@@ -0,0 +1,3 @@
+from .ear_clipping import *
+from .monotone import *
+from .delaunay import *
@@ -0,0 +1,391 @@
+from array import array
+from dataclasses import dataclass
+from joemetry.predicates import orient2d, incircle
+from joemetry.utils import get_coordinates, get_circumcircles
+from joemetry._type_hints import *
+from joemetry import PointArray
+
+
+__all__ = ['Delaunay', 'Voronoi', 'delaunay_triangulation']
+
+
+# the vertex 'at infinity' -> every hull edge gets a ghost triangle (hull edge + INFINITE),
+# so points outside of the hull are inserted the same way as points inside of it
+INFINITE = -1
+
+# side of the grid the points are snapped to before sorting them along the hilbert curve
+_HILBERT_SIZE = 1 << 16
+
+
+def delaunay_triangulation(points: Union[PointArray, List[Coor]]) -> List[Tuple[int, int, int]]:
+    '''returns the delaunay triangles of the points as anti-clockwise triples of indices'''
+    return Delaunay(points).triangle_indices()
+
+
+class Delaunay:
+    '''
+    delaunay triangulation of a set of points, in expected O(n log n)
+
+    the result is stored as flat index arrays:
+        triangles: 3 vertex indices per triangle, anti-clockwise
+        halfedges: halfedges[e] is the index of the twin of half-edge e, -1 for an edge on the hull
+                   (half-edge e goes from triangles[e] to triangles[next_halfedge(e)])
+        hull:      the indices of the points on the convex hull, anti-clockwise
+
+    duplicate points are skipped and don't appear in any triangle
+
+    [PROCESS]:
+
+        1) sort the points along a hilbert curve, so consecutive points are close to each other
+
+        2) insert the points one by one (Bowyer-Watson):
+           - walk from the last created triangle towards the point to find the triangle containing it
+           - grow the cavity of triangles whose circumcircle contains the point
+           - connect the boundary of the cavity to the point
+
+        3) drop the ghost triangles & compact the rest into the flat arrays
+    '''
+
+    __slots__ = ['points', 'triangles', 'halfedges', 'hull', '_vertex', '_neighbour', '_alive']
+
+
+    def __init__(self, points: Union[PointArray, List[Coor]]):
+        self.points    = get_coordinates(points)
+        self.triangles = array('l')
+        self.halfedges = array('l')
+        self.hull      = array('l')
+
+        # the working triangulation -> 3 vertices & 3 neighbours per triangle,
+        # neighbour i is across the edge opposite of vertex i
+        self._vertex    = []
+        self._neighbour = []
+        self._alive     = []
+
+        order = self._insertion_order()
+        if order is None:
+            return
+
+        last = self._first_triangle(*order[:3])
+        for ind in order[3:]:
+            last = self._insert(ind, last)
+
+        self._compact()
+        self._vertex, self._neighbour, self._alive = [], [], []
+
+
+    @staticmethod
+    def next_halfedge(edge: int) -> int:
+        return edge - 2 if edge % 3 == 2 else edge + 1
+
+
+    @staticmethod
+    def prev_halfedge(edge: int) -> int:
+        return edge + 2 if edge % 3 == 0 else edge - 1
+
+
+    def triangle_indices(self) -> List[Tuple[int, int, int]]:
+        '''returns the triangles as anti-clockwise triples of indices'''
+        triangles = self.triangles
+        return [(triangles[ind], triangles[ind + 1], triangles[ind + 2]) for ind in range(0, len(triangles), 3)]
+
+
+    def edges(self) -> List[Tuple[int, int]]:
+        '''returns every edge of the triangulation once, as a pair of indices'''
+        triangles, halfedges = self.triangles, self.halfedges
+        return [
+            (triangles[edge], triangles[self.next_halfedge(edge)])
+            for edge in range(len(triangles)) if edge > halfedges[edge]
+            ]
+
+
+    def incoming_halfedges(self) -> array:
+        '''
+        returns one half-edge ending at each point, -1 for points without any (duplicates)
+        for a point on the hull, the half-edge is the hull edge ending at it
+        '''
+        triangles, halfedges = self.triangles, self.halfedges
+        incoming = array('l', [-1]) * len(self.points)
+        for edge in range(len(triangles)):
+            end = triangles[self.next_halfedge(edge)]
+            if halfedges[edge] == -1 or incoming[end] == -1:
+                incoming[end] = edge
+        return incoming
+
+
+    def triangles_around(self, start: int) -> List[int]:
+        '''
+        returns the triangles around the end point of the half-edge, in anti-clockwise order
+        the start should come from incoming_halfedges so the walk covers every triangle of a hull point
+        '''
+        if start == -1:
+            return []
+        around, edge = [], start
+        while True:
+            around.append(edge // 3)
+            edge = self.halfedges[self.next_halfedge(edge)]
+            if edge == -1 or edge == start:
+                return around[::-1]
+
+
+    def neighbours(self, ind: int) -> List[int]:
+        '''returns the points connected to the given point, in anti-clockwise order'''
+        neighbours = []
+        start = self.incoming_halfedges()[ind]
+        for triangle in self.triangles_around(start):
+            corner = self.triangles[3 * triangle:3 * triangle + 3].index(ind)
+            neighbours.append(self.triangles[3 * triangle + (corner + 1) % 3])
+        if neighbours and self.halfedges[start] == -1:
+            neighbours.append(self.triangles[start])
+        return neighbours
+
+
+    def circumcircles(self) -> Tuple[PointArray, Sequence[float]]:
+        '''returns the centers & radii of the circumcircles of all the triangles'''
+        points = self.points
+        return get_circumcircles(PointArray(points[ind] for ind in self.triangles))
+
+
+    def voronoi(self) -> 'Voronoi':
+        '''returns the voronoi diagram, the dual of the triangulation'''
+        centers, _ = self.circumcircles()
+        incoming   = self.incoming_halfedges()
+        regions, unbounded = [], []
+        for ind in range(len(self.points)):
+            regions.append(self.triangles_around(incoming[ind]))
+            unbounded.append(incoming[ind] != -1 and self.halfedges[incoming[ind]] == -1)
+
+        ridges = []
+        for edge, twin in enumerate(self.halfedges):
+            if edge > twin:
+                ridges.append((self.triangles[edge], self.triangles[self.next_halfedge(edge)], edge // 3, twin // 3 if twin != -1 else -1))
+
+        return Voronoi(centers, regions, unbounded, ridges)
+
+
+    def _insertion_order(self) -> Optional[List[int]]:
+        # hilbert order, with the first 3 points moved to make a proper (non-collinear) triangle
+        points = self.points
+        if len(points) < 3:
+            return None
+
+        min_x, min_y = min(x for x, _ in points), min(y for _, y in points)
+        extent = max(max(x for x, _ in points) - min_x, max(y for _, y in points) - min_y) or 1.0
+        scale  = (_HILBERT_SIZE - 1) / extent
+        keys   = [_hilbert_index(int((x - min_x) * scale), int((y - min_y) * scale)) for x, y in points]
+        order  = sorted(range(len(points)), key=keys.__getitem__)
+
+        first = points[order[0]]
+        second = next((pos for pos in range(1, len(order)) if points[order[pos]] != first), None)
+        if second is None:
+            return None
+        order[1], order[second] = order[second], order[1]
+
+        second = points[order[1]]
+        third = next((pos for pos in range(2, len(order)) if orient2d(first, second, points[order[pos]]) != 0), None)
+        if third is None:
+            return None
+        order[2], order[third] = order[third], order[2]
+        return order
+
+
+    def _new_triangle(self, a: int, b: int, c: int) -> int:
+        # ghost triangles always keep INFINITE as their last vertex
+        if a == INFINITE:
+            a, b, c = b, c, a
+        elif b == INFINITE:
+            a, b, c = c, a, b
+        self._vertex.extend((a, b, c))
+        self._neighbour.extend((-1, -1, -1))
+        self._alive.append(True)
+        return len(self._alive) - 1
+
+
+    def _first_triangle(self, a: int, b: int, c: int) -> int:
+        points = self.points
+        if orient2d(points[a], points[b], points[c]) < 0:
+            b, c = c, b
+
+        triangle = self._new_triangle(a, b, c)
+        # the ghost across every edge, walked the other way so it's anti-clockwise too
+        ghosts = [self._new_triangle(c, b, INFINITE), self._new_triangle(a, c, INFINITE), self._new_triangle(b, a, INFINITE)]
+        self._neighbour[0:3] = ghosts
+        for ghost in ghosts:
+            self._link(ghost, triangle)
+        for ghost in ghosts:
+            for other in ghosts:
+                if other != ghost:
+                    self._link(ghost, other)
+        return triangle
+
+
+    def _link(self, triangle: int, other: int) -> None:
+        # point the neighbour of the triangle across the edge shared with the other triangle at it
+        vertex = self._vertex
+        shared = set(vertex[3 * other:3 * other + 3])
+        for corner in range(3):
+            if vertex[3 * triangle + (corner + 1) % 3] in shared and vertex[3 * triangle + (corner + 2) % 3] in shared:
+                self._neighbour[3 * triangle + corner] = other
+                return
+
+
+    def _conflicts(self, triangle: int, point: Tuple[float, float]) -> bool:
+        # the point is inside of the circumcircle of the triangle,
+        # for a ghost triangle the 'circle' is the open half-plane outside of its hull edge (+ the edge itself)
+        points = self.points
+        a, b, c = self._vertex[3 * triangle:3 * triangle + 3]
+        if c != INFINITE:
+            return incircle(points[a], points[b], points[c], point) > 0
+
+        a, b = points[a], points[b]
+        turn = orient2d(a, b, point)
+        if turn != 0:
+            return turn > 0
+        return (point[0] - a[0]) * (point[0] - b[0]) + (point[1] - a[1]) * (point[1] - b[1]) < 0
+
+
+    def _locate(self, point: Tuple[float, float], triangle: int) -> int:
+        # visibility walk -> step over any edge the point is on the other side of,
+        # ends in the triangle containing the point, or in a ghost if the point is outside of the hull
+        points, vertex, neighbour = self.points, self._vertex, self._neighbour
+        if vertex[3 * triangle + 2] == INFINITE:
+            triangle = neighbour[3 * triangle + 2]
+
+        # start testing from a different edge every step, a fixed order can cycle on degenerate input
+        start = 0
+        while vertex[3 * triangle + 2] != INFINITE:
+            base = 3 * triangle
+            for step in range(3):
+                corner = (start + step) % 3
+                edge_start, edge_end = vertex[base + (corner + 1) % 3], vertex[base + (corner + 2) % 3]
+                if orient2d(points[edge_start], points[edge_end], point) < 0:
+                    triangle = neighbour[base + corner]
+                    break
+            else:
+                return triangle
+            start += 1
+        return triangle
+
+
+    def _insert(self, ind: int, last: int) -> int:
+        points, vertex, neighbour = self.points, self._vertex, self._neighbour
+        point = points[ind]
+
+        start = self._locate(point, last)
+        if any(corner != INFINITE and points[corner] == point for corner in vertex[3 * start:3 * start + 3]):
+            return start
+
+        # grow the cavity from the triangle containing the point
+        cavity, stack = {start}, [start]
+        while stack:
+            triangle = stack.pop()
+            for other in neighbour[3 * triangle:3 * triangle + 3]:
+                if other not in cavity and self._conflicts(other, point):
+                    cavity.add(other)
+                    stack.append(other)
+
+        # fan the boundary of the cavity around the point
+        new_triangles, starting_at, ending_at = [], {}, {}
+        for triangle in cavity:
+            self._alive[triangle] = False
+            base = 3 * triangle
+            for corner in range(3):
+                outside = neighbour[base + corner]
+                if outside in cavity:
+                    continue
+                edge_start, edge_end = vertex[base + (corner + 1) % 3], vertex[base + (corner + 2) % 3]
+                new = self._new_triangle(edge_start, edge_end, ind)
+                new_triangles.append((new, edge_start, edge_end, outside, triangle))
+                starting_at[edge_start], ending_at[edge_end] = new, new
+
+        for new, edge_start, edge_end, outside, old in new_triangles:
+            # the neighbours of (start, end, point) -> across (start, end) is the outside,
+            # across (end, point) the new triangle starting at end & across (point, start) the one ending at start
+            # ghosts were rotated, so the corners are looked up instead of assumed
+            base = 3 * new
+            corners = vertex[base:base + 3]
+            neighbour[base + corners.index(ind)] = outside
+            neighbour[base + corners.index(edge_start)] = starting_at[edge_end]
+            neighbour[base + corners.index(edge_end)] = ending_at[edge_start]
+
+            outside_base = 3 * outside
+            for corner in range(3):
+                if neighbour[outside_base + corner] == old:
+                    neighbour[outside_base + corner] = new
+                    break
+
+        return new_triangles[-1][0]
+
+
+    def _compact(self) -> None:
+        vertex, neighbour = self._vertex, self._neighbour
+        real = [
+            triangle for triangle, alive in enumerate(self._alive)
+            if alive and vertex[3 * triangle + 2] != INFINITE
+            ]
+        position = {triangle: new for new, triangle in enumerate(real)}
+
+        triangles = self.triangles
+        for triangle in real:
+            triangles.extend(vertex[3 * triangle:3 * triangle + 3])
+
+        # half-edge k of a triangle goes from corner k to corner k + 1 -> it's opposite of corner k + 2
+        halfedges = self.halfedges
+        hull_next = {}
+        for triangle in real:
+            base = 3 * triangle
+            for corner in range(3):
+                other = neighbour[base + (corner + 2) % 3]
+                if other not in position:
+                    halfedges.append(-1)
+                    hull_next[vertex[base + corner]] = vertex[base + (corner + 1) % 3]
+                    continue
+                edge_start = vertex[base + corner]
+                other_corner = vertex[3 * other:3 * other + 3].index(edge_start)
+                halfedges.append(3 * position[other] + (other_corner + 2) % 3)
+
+        # the hull edges of the triangles are anti-clockwise
+        if hull_next:
+            start = min(hull_next, key=lambda ind: self.points[ind])
+            ind = start
+            while True:
+                self.hull.append(ind)
+                ind = hull_next[ind]
+                if ind == start:
+                    break
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(points={len(self.points)}, triangles={len(self.triangles) // 3})"
+
+
+@dataclass
+class Voronoi:
+    '''
+    voronoi diagram of the points of a delaunay triangulation
+
+    vertices:  the circumcenters of the delaunay triangles, vertex i belongs to triangle i
+    regions:   for every point, the voronoi vertices around it in anti-clockwise order
+    unbounded: whether the region of the point goes off to infinity (the point is on the hull)
+    ridges:    (point_a, point_b, vertex_a, vertex_b) for every pair of neighbouring points,
+               the ridge between their regions goes from vertex_a to vertex_b, vertex_b is -1 for an infinite ridge
+    '''
+
+    vertices : PointArray
+    regions  : List[List[int]]
+    unbounded: List[bool]
+    ridges   : List[Tuple[int, int, int, int]]
+
+
+def _hilbert_index(x: int, y: int) -> int:
+    # the distance along the hilbert curve filling the _HILBERT_SIZE grid
+    index, size = 0, _HILBERT_SIZE // 2
+    while size:
+        rx = 1 if x & size else 0
+        ry = 1 if y & size else 0
+        index += size * size * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x, y = _HILBERT_SIZE - 1 - x, _HILBERT_SIZE - 1 - y
+            x, y = y, x
+        size //= 2
+    return index
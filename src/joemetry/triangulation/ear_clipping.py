@@ -1,32 +1,139 @@
-from vector2D import Vector2D as vec
-from typing import List, Tuple
+from math import sqrt
+from joemetry import instrument
+from joemetry.predicates import orient2d
+from joemetry.utils import get_coordinates, get_signed_area
+from joemetry._type_hints import *
 
 
-Point = Tuple[int, int]
+Triangle = Tuple[int, int, int]
 
 
-def ear_clipping(polygon: List[Point]) -> List[List[Point]]:
-    if len(polygon) > 3:
-        polygon = vec.convert(polygon)
-        total_triangles = len(polygon) - 2
+def ear_clipping(polygon: Union[Poly, 'PointArray', List[Coor]]) -> List[Triangle]:
+    '''
+    triangulates a simple polygon by clipping its ears
+    returns the triangles as anti-clockwise triples of indices into the given vertices
 
-        triangles = []
-        while len(triangles) < total_triangles:
-            for ind, center_point in enumerate(polygon):
-                right_point = polygon[(ind + 1) % len(polygon)]
-                left_point  = polygon[(ind - 1) % len(polygon)] 
+    - the polygon is kept as a doubly linked list (prev/next index arrays),
+      so removing an ear is O(1) instead of a list.pop
+    - only reflex vertices can block an ear, they're kept in a set that shrinks as
+      their neighbours are clipped away (a convex vertex never turns reflex)
+    - the reflex vertices are bucketed into a uniform grid,
+      so an ear test only looks at the reflex vertices around the candidate triangle
+    '''
+    # None unless joemetry.instrument is recording
+    probe  = instrument.probe('ear_clipping')
+    coords = get_coordinates(polygon)
+    total  = len(coords)
+    if total < 3:
+        if probe is not None:
+            probe.finish()
+        return []
 
-                if left_point.cross(right_point, origin=center_point) > 0: 
-                    temp_triangle = (left_point, center_point, right_point)
-                    check_triangle_validity = lambda point: point not in temp_triangle and point.in_polygon(temp_triangle)
-    
-                    if not any(filter(check_triangle_validity, polygon)):
-                        triangles.append(temp_triangle)
-                        polygon.pop(ind)
+    # walk the polygon anti-clockwise, whichever way the vertices were given
+    order = list(range(total))
+    if get_signed_area(coords) < 0:
+        order.reverse()
+    prev_vertex, next_vertex = [0] * total, [0] * total
+    for ind in range(total):
+        prev_vertex[order[ind]], next_vertex[order[ind - 1]] = order[ind - 1], order[ind]
 
-        return triangles
+    is_reflex = lambda ind: orient2d(coords[prev_vertex[ind]], coords[ind], coords[next_vertex[ind]]) < 0
+    reflex    = {ind for ind in order if is_reflex(ind)}
+    grid      = _ReflexGrid(coords, reflex)
 
-    return polygon
+    triangles = []
+    remaining = total
+    current   = order[0]
+    # number of vertices visited since the last ear was clipped
+    # -> a full lap without an ear means the input isn't simple (or is numerically degenerate)
+    stalled = 0
+    if probe is not None:
+        probe.phase('setup')
 
-         
+    while remaining > 3:
+        left, right = prev_vertex[current], next_vertex[current]
+        if probe is not None:
+            probe.count('ear_tests')
 
+        if current in reflex or not _is_ear(coords, left, current, right, reflex, grid):
+            stalled += 1
+            if stalled <= remaining:
+                current = right
+                continue
+
+        triangles.append((left, current, right))
+        next_vertex[left], prev_vertex[right] = right, left
+        remaining -= 1
+        stalled    = 0
+
+        # the neighbours lost a reflex neighbour, they might have become convex
+        for neighbour in (left, right):
+            if neighbour in reflex and not is_reflex(neighbour):
+                reflex.discard(neighbour)
+
+        # skip past the right neighbour, clipping it next would only grow a fan of thin triangles around 'left'
+        current = next_vertex[right]
+
+    triangles.append((prev_vertex[current], current, next_vertex[current]))
+    if probe is not None:
+        probe.count('ears', len(triangles))
+        probe.phase('clipping')
+        probe.finish()
+    return triangles
+
+
+def _is_ear(
+    coords : List[Tuple[float, float]],
+    left   : int,
+    center : int,
+    right  : int,
+    reflex : set,
+    grid   : '_ReflexGrid'
+    ) -> bool:
+    # an ear is a convex vertex whose triangle doesn't contain any other (reflex) vertex
+    a, b, c = coords[left], coords[center], coords[right]
+    min_x, max_x = min(a[0], b[0], c[0]), max(a[0], b[0], c[0])
+    min_y, max_y = min(a[1], b[1], c[1]), max(a[1], b[1], c[1])
+    for ind in grid.query(a, b, c):
+        if ind not in reflex or ind == left or ind == center or ind == right:
+            continue
+        point = coords[ind]
+        if point == a or point == b or point == c:
+            continue
+        if not (min_x <= point[0] <= max_x and min_y <= point[1] <= max_y):
+            continue
+        if orient2d(a, b, point) >= 0 and orient2d(b, c, point) >= 0 and orient2d(c, a, point) >= 0:
+            return False
+    return True
+
+
+class _ReflexGrid:
+    '''uniform grid of the reflex vertices, about one vertex per cell'''
+
+    __slots__ = ['_cells', '_size', '_origin']
+
+
+    def __init__(self, coords: List[Tuple[float, float]], reflex: set):
+        min_x = min(x for x, _ in coords)
+        min_y = min(y for _, y in coords)
+        width  = max(x for x, _ in coords) - min_x
+        height = max(y for _, y in coords) - min_y
+
+        self._origin = (min_x, min_y)
+        self._size   = max(width, height) / max(sqrt(len(reflex)), 1) or 1.0
+        self._cells  = {}
+        for ind in reflex:
+            self._cells.setdefault(self._cell(coords[ind]), []).append(ind)
+
+
+    def _cell(self, point: Tuple[float, float]) -> Tuple[int, int]:
+        return int((point[0] - self._origin[0]) // self._size), int((point[1] - self._origin[1]) // self._size)
+
+
+    def query(self, *triangle: Tuple[float, float]) -> Iterator[int]:
+        '''yields the vertices in the cells covered by the bounding box of the triangle'''
+        cell_x1, cell_y1 = self._cell((min(p[0] for p in triangle), min(p[1] for p in triangle)))
+        cell_x2, cell_y2 = self._cell((max(p[0] for p in triangle), max(p[1] for p in triangle)))
+        for cell_x in range(cell_x1, cell_x2 + 1):
+            for cell_y in range(cell_y1, cell_y2 + 1):
+                yield from self._cells.get((cell_x, cell_y), ())
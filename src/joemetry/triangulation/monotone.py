@@ -0,0 +1,280 @@
+from math import atan2
+from joemetry.predicates import orient2d
+from joemetry.utils import get_coordinates, get_signed_area
+from joemetry._type_hints import *
+
+
+Triangle = Tuple[int, int, int]
+
+
+# vertex types of the monotone partition sweep
+START, END, SPLIT, MERGE, REGULAR = range(5)
+
+# which side of a monotone piece a vertex is on
+LEFT, RIGHT = 0, 1
+
+
+def monotone_triangulation(polygon: Union[Poly, 'PointArray', List[Coor]]) -> List[Triangle]:
+    '''
+    triangulates a simple polygon in O(n log n)
+    returns the triangles as anti-clockwise triples of indices into the given vertices
+
+    [PROCESS]:
+
+        1) sweep a horizontal line from top to bottom and add a diagonal at every split & merge vertex,
+           this cuts the polygon into y-monotone pieces
+
+        2) walk the faces formed by the edges and diagonals to get the pieces
+
+        3) triangulate every piece with a single stack-based pass over its vertices
+    '''
+    coords = get_coordinates(polygon)
+    if len(coords) < 3:
+        return []
+
+    # work on the anti-clockwise ring, mapped back to the given indices at the end
+    order = list(range(len(coords)))
+    if get_signed_area(coords) < 0:
+        order.reverse()
+    ring = [coords[ind] for ind in order]
+
+    triangles = []
+    for piece in _monotone_pieces(ring, _monotone_diagonals(ring)):
+        triangles.extend(_triangulate_monotone(ring, piece))
+
+    return [(order[a], order[b], order[c]) for a, b, c in triangles]
+
+
+def _sweep_key(point: Tuple[float, float]) -> Tuple[float, float]:
+    # the order the sweep line meets the vertices in -> top to bottom, left to right on ties
+    return (-point[1], point[0])
+
+
+def _vertex_type(ring: List[Tuple[float, float]], ind: int) -> int:
+    before, point, after = ring[ind - 1], ring[ind], ring[(ind + 1) % len(ring)]
+    key = _sweep_key(point)
+    before_below, after_below = _sweep_key(before) > key, _sweep_key(after) > key
+    convex = orient2d(before, point, after) > 0
+
+    if before_below and after_below:
+        return START if convex else SPLIT
+    if not before_below and not after_below:
+        return END if convex else MERGE
+    return REGULAR
+
+
+def _monotone_diagonals(ring: List[Tuple[float, float]]) -> List[Tuple[int, int]]:
+    # the classic sweep -> every edge with the interior to its right is kept in the status,
+    # together with its 'helper', the lowest vertex seen so far that can see the edge
+    total     = len(ring)
+    types     = [_vertex_type(ring, ind) for ind in range(total)]
+    status    = _EdgeStatus(ring)
+    helper    = {}
+    diagonals = []
+
+    def connect_to_merge_helper(ind: int, edge: int) -> None:
+        if types[helper[edge]] == MERGE:
+            diagonals.append((ind, helper[edge]))
+
+    for ind in sorted(range(total), key=lambda ind: _sweep_key(ring[ind])):
+        status.sweep_y = ring[ind][1]
+        prev_edge = (ind - 1) % total
+        vertex_type = types[ind]
+
+        if vertex_type == START:
+            status.insert(ind)
+            helper[ind] = ind
+
+        elif vertex_type == END:
+            connect_to_merge_helper(ind, prev_edge)
+            status.delete(prev_edge)
+
+        elif vertex_type == SPLIT:
+            left_edge = status.left_of(ring[ind][0])
+            diagonals.append((ind, helper[left_edge]))
+            helper[left_edge] = ind
+            status.insert(ind)
+            helper[ind] = ind
+
+        elif vertex_type == MERGE:
+            connect_to_merge_helper(ind, prev_edge)
+            status.delete(prev_edge)
+            left_edge = status.left_of(ring[ind][0])
+            connect_to_merge_helper(ind, left_edge)
+            helper[left_edge] = ind
+
+        # regular vertex on the left side of the polygon -> the polygon goes downward and the interior is to its right
+        elif _sweep_key(ring[(ind + 1) % total]) > _sweep_key(ring[ind]):
+            connect_to_merge_helper(ind, prev_edge)
+            status.delete(prev_edge)
+            status.insert(ind)
+            helper[ind] = ind
+
+        else:
+            left_edge = status.left_of(ring[ind][0])
+            connect_to_merge_helper(ind, left_edge)
+            helper[left_edge] = ind
+
+    return diagonals
+
+
+def _monotone_pieces(ring: List[Tuple[float, float]], diagonals: List[Tuple[int, int]]) -> List[List[int]]:
+    # the polygon edges are only walked anti-clockwise and the diagonals both ways,
+    # so every walk traces one of the inner faces -> the monotone pieces
+    total = len(ring)
+    if not diagonals:
+        return [list(range(total))]
+
+    neighbours = [[(ind - 1) % total, (ind + 1) % total] for ind in range(total)]
+    for a, b in diagonals:
+        neighbours[a].append(b)
+        neighbours[b].append(a)
+
+    # sort the neighbours of every vertex with a diagonal anti-clockwise by angle
+    for ind, around in enumerate(neighbours):
+        if len(around) > 2:
+            x, y = ring[ind]
+            around.sort(key=lambda other: atan2(ring[other][1] - y, ring[other][0] - x))
+
+    half_edges = [(ind, (ind + 1) % total) for ind in range(total)]
+    half_edges += diagonals + [(b, a) for a, b in diagonals]
+    visited = set()
+    pieces  = []
+
+    for half_edge in half_edges:
+        if half_edge in visited:
+            continue
+        piece = []
+        origin, target = half_edge
+        while (origin, target) not in visited:
+            visited.add((origin, target))
+            piece.append(origin)
+            # keep the face on the left -> take the first neighbour clockwise from where we came from
+            around = neighbours[target]
+            origin, target = target, around[around.index(origin) - 1]
+        pieces.append(piece)
+
+    return pieces
+
+
+def _triangulate_monotone(ring: List[Tuple[float, float]], piece: List[int]) -> List[Triangle]:
+    total = len(piece)
+    if total == 3:
+        return [_anticlockwise(ring, *piece)]
+
+    positions = range(total)
+    top    = min(positions, key=lambda pos: _sweep_key(ring[piece[pos]]))
+    bottom = max(positions, key=lambda pos: _sweep_key(ring[piece[pos]]))
+
+    # going anti-clockwise from the top vertex walks down the left chain
+    chain = {}
+    pos = top
+    while pos != bottom:
+        chain[piece[pos]] = LEFT
+        pos = (pos + 1) % total
+    while pos != top:
+        chain[piece[pos]] = RIGHT
+        pos = (pos + 1) % total
+
+    vertices  = sorted(piece, key=lambda ind: _sweep_key(ring[ind]))
+    stack     = vertices[:2]
+    triangles = []
+
+    for position in range(2, total - 1):
+        current = vertices[position]
+        if chain[current] != chain[stack[-1]]:
+            # the current vertex sees every vertex on the stack
+            while len(stack) > 1:
+                triangles.append(_anticlockwise(ring, current, stack.pop(), stack[-1]))
+            stack = [vertices[position - 1], current]
+            continue
+
+        last = stack.pop()
+        while stack and _is_inside(ring, current, last, stack[-1], chain[current]):
+            triangles.append(_anticlockwise(ring, current, last, stack[-1]))
+            last = stack.pop()
+        stack.extend((last, current))
+
+    current = vertices[-1]
+    for ind in range(len(stack) - 1):
+        triangles.append(_anticlockwise(ring, current, stack[ind], stack[ind + 1]))
+
+    return triangles
+
+
+def _is_inside(ring: List[Tuple[float, float]], current: int, last: int, top: int, side: int) -> bool:
+    # the diagonal from the current vertex to the top of the stack is inside of the piece
+    # if the vertex in between bends away from the interior
+    turn = orient2d(ring[top], ring[current], ring[last])
+    return turn < 0 if side == LEFT else turn > 0
+
+
+def _anticlockwise(ring: List[Tuple[float, float]], a: int, b: int, c: int) -> Triangle:
+    return (a, c, b) if orient2d(ring[a], ring[b], ring[c]) < 0 else (a, b, c)
+
+
+class _EdgeStatus:
+    '''
+    the edges crossing the sweep line ordered left to right,
+    edges never cross in a simple polygon so the order only changes on insertion/deletion
+    an edge is identified by the index of its upper vertex -> edge i goes from ring[i] to ring[i + 1]
+    '''
+
+    __slots__ = ['sweep_y', '_ring', '_edges']
+
+
+    def __init__(self, ring: List[Tuple[float, float]]):
+        self.sweep_y = 0.0
+        self._ring   = ring
+        self._edges  = []
+
+
+    def x_at(self, edge: int) -> float:
+        '''the x-coordinate of the edge where it crosses the sweep line'''
+        (x1, y1), (x2, y2) = self._ring[edge], self._ring[(edge + 1) % len(self._ring)]
+        if y1 == y2:
+            return max(x1, x2)
+        return x1 + (self.sweep_y - y1) * (x2 - x1) / (y2 - y1)
+
+
+    def _slope(self, edge: int) -> float:
+        # how far right the edge moves for every unit the sweep line goes down
+        (x1, y1), (x2, y2) = self._ring[edge], self._ring[(edge + 1) % len(self._ring)]
+        return (x2 - x1) / (y1 - y2) if y1 != y2 else float('inf')
+
+
+    def _bisect(self, x: float, slope: Optional[float] = None) -> int:
+        # index of the first edge that is right of x (or on x & more to the right below the sweep line)
+        edges = self._edges
+        low, high = 0, len(edges)
+        while low < high:
+            mid = (low + high) // 2
+            other_x = self.x_at(edges[mid])
+            if other_x < x or (other_x == x and slope is not None and self._slope(edges[mid]) < slope):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+
+    def insert(self, edge: int) -> None:
+        self._edges.insert(self._bisect(self.x_at(edge), self._slope(edge)), edge)
+
+
+    def delete(self, edge: int) -> None:
+        edges = self._edges
+        index = self._bisect(self.x_at(edge))
+        for ind in (index, index - 1, index + 1):
+            if 0 <= ind < len(edges) and edges[ind] == edge:
+                del edges[ind]
+                return
+        edges.remove(edge)
+
+
+    def left_of(self, x: float) -> int:
+        '''returns the edge directly left of the given x on the sweep line'''
+        index = self._bisect(x)
+        if not index:
+            # inside of a simple polygon there's always an edge to the left of a split, merge or right-side vertex
+            raise ValueError(f"no edge left of x={x} at y={self.sweep_y}, the polygon isn't simple")
+        return self._edges[index - 1]
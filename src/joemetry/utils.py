@@ -1,24 +1,68 @@
-from math import sqrt, acos, sin, cos, radians
+from array import array
+from math import sqrt
 from joemetry._type_hints import *
-from joemetry import Point, Segment, Polygon
+from joemetry import Point, Segment, Polygon, PointArray
 
-# broke
-def get_circumcircle_of_triangle(triangle: List[Point], radius: bool = True) -> Union[Tuple[Point, float], Point]:
-    point_a, point_b, point_c = triangle
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-    angle_a = sin(2 * point_b.angle_to(point_c, point_a))
-    angle_b = sin(2 * point_c.angle_to(point_a, point_b))
-    angle_c = sin(2 * point_a.angle_to(point_b, point_c))
 
-    circumcenter_x = (point_a[0] * angle_a + point_b[0] * angle_b + point_c[0] * angle_c) / (angle_a + angle_b + angle_c)
-    circumcenter_y = (point_a[1] * angle_a + point_b[1] * angle_b + point_c[1] * angle_c) / (angle_a + angle_b + angle_c)
-    circumcenter   = (circumcenter_x, circumcenter_y)
-    
+def get_circumcircle_of_triangle(triangle: List[Coor], radius: bool = True) -> Union[Tuple[Tuple[float, float], float], Tuple[float, float]]:
+    '''
+    returns the center (and radius) of the circle passing through the 3 points of the triangle
+    the center is infinitely far away if the points are collinear
+    '''
+    (ax, ay), (bx, by), (cx, cy) = ((point[0], point[1]) for point in triangle[:3])
+    center_x, center_y = _circumcenter(ax, ay, bx, by, cx, cy)
     if radius:
-        circumradius = get_length(point_a - point_b) / angle_c
-        return circumcenter.astuple(), circumradius
-
-    return circumcenter
+        return (center_x, center_y), sqrt((center_x - ax) ** 2 + (center_y - ay) ** 2)
+    return center_x, center_y
+
+
+def get_circumcircles(triangles: Union[PointArray, List[List[Coor]]]) -> Tuple[PointArray, Sequence[float]]:
+    '''
+    returns the centers & radii of the circumcircles of many triangles at once
+    triangles: a list of triangles, or a PointArray of consecutive (a, b, c) triples
+    (vectorized when numpy is installed)
+    '''
+    if not isinstance(triangles, PointArray):
+        triangles = PointArray(coor for triangle in triangles for coor in list(triangle)[:3])
+    if len(triangles) % 3:
+        raise ValueError(f"a PointArray of {len(triangles)} points cannot be split into triangles")
+
+    data = triangles.buffer
+    ax, ay, bx, by, cx, cy = (data[ind::6] for ind in range(6))
+    if np is not None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            center_x, center_y = _circumcenter(ax, ay, bx, by, cx, cy)
+        radii = np.hypot(center_x - ax, center_y - ay)
+        centers = np.empty(2 * len(radii))
+        centers[0::2], centers[1::2] = center_x, center_y
+        return PointArray.from_buffer(centers, copy=False), radii
+
+    centers = [_circumcenter(*coors) for coors in zip(ax, ay, bx, by, cx, cy)]
+    radii   = array('d', (sqrt((x - a) ** 2 + (y - b) ** 2) for (x, y), a, b in zip(centers, ax, ay)))
+    return PointArray(centers), radii
+
+
+def _circumcenter(ax, ay, bx, by, cx, cy):
+    # the closed form of the circumcenter, worked out relative to a to keep the numbers small
+    # works on floats & numpy arrays alike
+    bx, by, cx, cy = bx - ax, by - ay, cx - ax, cy - ay
+    b_lift, c_lift = bx * bx + by * by, cx * cx + cy * cy
+    determinant = 2 * (bx * cy - by * cx)
+
+    if np is not None and isinstance(determinant, np.ndarray):
+        center_x = ax + (cy * b_lift - by * c_lift) / determinant
+        center_y = ay + (bx * c_lift - cx * b_lift) / determinant
+        center_x[determinant == 0], center_y[determinant == 0] = np.inf, np.inf
+        return center_x, center_y
+
+    if determinant == 0:
+        return float('inf'), float('inf')
+    return ax + (cy * b_lift - by * c_lift) / determinant, ay + (bx * c_lift - cx * b_lift) / determinant
 
 
 # broke
@@ -65,4 +109,46 @@ def get_center(polygon) -> Point:
     bottomleft, topright = get_bounding_box(polygon)
     center_x = bottomleft.x + ((topright.x - bottomleft.x) / 2)
     center_y = bottomleft.y + ((topright.y - bottomleft.y) / 2)
-    return center_x, center_y
\ No newline at end of file
+    return center_x, center_y
+
+def get_coordinates(shape: Union[Poly, PointArray, List[Coor]]) -> List[Tuple[float, float]]:
+    '''returns the vertices of a polygon/PointArray/list of points as a list of (x, y) tuples'''
+    if isinstance(shape, Polygon):
+        shape = shape.vertex
+    if isinstance(shape, PointArray):
+        return list(shape.coords())
+    return [(float(point[0]), float(point[1])) for point in shape]
+
+
+def get_signed_area(coordinates: List[Coor]) -> float:
+    '''returns the signed area of a ring of coordinates, positive if it's anti-clockwise'''
+    area = 0.0
+    for ind, (x1, y1) in enumerate(coordinates):
+        x2, y2 = coordinates[ind - 1]
+        area += (x2 * y1) - (x1 * y2)
+    return area * 0.5
+
+
+def get_bounds(shape: Union[Coor, Seg, Poly, PointArray]) -> Tuple[float, float, float, float]:
+    '''
+    returns the bounding box of a point/segment/polygon/PointArray as (min_x, min_y, max_x, max_y)
+    anything with a 'bounds' attribute (ConvexShape) and (min_x, min_y, max_x, max_y) tuples are passed through
+    '''
+    if isinstance(shape, Polygon):
+        return shape.bounds
+    if isinstance(shape, PointArray):
+        return shape.bounds()
+    if isinstance(shape, Point):
+        return (shape.x, shape.y, shape.x, shape.y)
+    if isinstance(shape, Segment):
+        shape = (shape.start, shape.end)
+    if hasattr(shape, 'bounds'):
+        return tuple(shape.bounds)
+
+    if isinstance(shape[0], (int, float)):
+        if len(shape) == 4:
+            return tuple(float(value) for value in shape)
+        x, y = float(shape[0]), float(shape[1])
+        return (x, y, x, y)
+    xs, ys = [point[0] for point in shape], [point[1] for point in shape]
+    return (float(min(xs)), float(min(ys)), float(max(xs)), float(max(ys)))
@@ -0,0 +1,125 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from joemetry import PointArray
+from joemetry.predicates import orient2d
+from joemetry.utils import get_coordinates
+from joemetry.intersection.batch import _bounding_boxes, _sweep_candidates
+from joemetry.intersection.bentleyottmann.shamos_hoey import first_intersection, segments_touch
+from joemetry._type_hints import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def is_simple(polygon: Union[Poly, PointArray]) -> bool:
+    '''
+    whether the polygon's edges only meet their 2 neighbours, at the vertex they share
+    O(n log n), stops at the first edges found touching (Shamos–Hoey, see first_intersection)
+    repeated vertices are skipped, an edge folding back over its neighbour (a zero width spike) isn't simple
+    '''
+    ring, _ = _ring(polygon)
+    if len(ring) < 3 or _spikes(ring):
+        return False
+    count = len(ring)
+    edges = [(ring[ind], ring[(ind + 1) % count]) for ind in range(count)]
+    return first_intersection(edges, lambda i, j: _neighbours(i, j, count)) is None
+
+
+def self_intersections(polygon: Union[Poly, PointArray]) -> List[Tuple[int, int, Tuple[float, float]]]:
+    '''
+    returns every pair of edges touching each other other than at the vertex they share, as (i, j, (x, y)) with i < j
+    edge i goes from vertex i to vertex i + 1, (x, y) is where they cross, or one of the spots where they touch
+
+    a simple polygon is found out by the same sweep as is_simple, in O(n log n)
+    the others have their edges paired up by their bounding boxes (like batch_intersections) & tested exactly
+    '''
+    ring, edge_of = _ring(polygon)
+    count = len(ring)
+    spikes = _spikes(ring)
+    edges = [(ring[ind], ring[(ind + 1) % count]) for ind in range(count)]
+    if count < 2 or (not spikes and first_intersection(edges, lambda i, j: _neighbours(i, j, count)) is None):
+        return []
+
+    columns = [[edge[0][0] for edge in edges], [edge[0][1] for edge in edges], [edge[1][0] for edge in edges], [edge[1][1] for edge in edges]]
+    columns = [np.array(column, dtype=np.float64) if np is not None else array('d', column) for column in columns]
+    first, second = _sweep_candidates(*_bounding_boxes(*columns))
+    if np is not None:
+        first, second = first.tolist(), second.tolist()
+
+    found = []
+    for i, j in zip(first, second):
+        i, j = min(i, j), max(i, j)
+        if _neighbours(i, j, count) or not segments_touch(*edges[i], *edges[j]):
+            continue
+        found.append((edge_of[i], edge_of[j], _meeting_point(*edges[i], *edges[j])))
+    for ind, point in spikes:
+        i, j = (ind - 1) % count, ind
+        found.append((min(edge_of[i], edge_of[j]), max(edge_of[i], edge_of[j]), point))
+    return sorted(found)
+
+
+def validate_many(
+    polygons : List[Union[Poly, PointArray]],
+    processes: Optional[int] = 1,
+    chunksize: Optional[int] = None
+    ) -> List[bool]:
+    '''
+    returns whether every polygon is simple, see is_simple
+    processes: the number of worker processes the polygons are spread over,
+               1 runs everything in this process, None uses one per cpu
+    chunksize: how many polygons are sent to a worker at once,
+               defaults to a few chunks per worker so the pickling overhead stays small
+    '''
+    if processes == 1 or len(polygons) < 2:
+        return [is_simple(polygon) for polygon in polygons]
+
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(len(polygons) // (4 * processes), 1)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(is_simple, polygons, chunksize=chunksize))
+
+
+def _ring(polygon: Union[Poly, PointArray]) -> Tuple[List[Tuple[float, float]], List[int]]:
+    # the vertices without the repeated ones, along with the index of the original edge each remaining edge starts
+    coords = get_coordinates(polygon)
+    total = len(coords)
+    kept = [ind for ind in range(total) if coords[ind] != coords[(ind + 1) % total]]
+    if not kept and total:
+        kept = [0]
+    return [coords[ind] for ind in kept], kept
+
+
+def _neighbours(i: int, j: int, count: int) -> bool:
+    return j - i == 1 or (i == 0 and j == count - 1)
+
+
+def _spikes(ring: List[Tuple[float, float]]) -> List[Tuple[int, Tuple[float, float]]]:
+    # the vertices where the ring doubles back over itself, with the end of the overlap closest to the vertex
+    spikes = []
+    count = len(ring)
+    for ind in range(count if count > 1 else 0):
+        before, vertex, after = ring[ind - 1], ring[ind], ring[(ind + 1) % count]
+        if orient2d(before, vertex, after) != 0:
+            continue
+        to_before, to_after = (before[0] - vertex[0], before[1] - vertex[1]), (after[0] - vertex[0], after[1] - vertex[1])
+        if to_before[0] * to_after[0] + to_before[1] * to_after[1] > 0:
+            closest = min((before, after), key=lambda point: (point[0] - vertex[0]) ** 2 + (point[1] - vertex[1]) ** 2)
+            spikes.append((ind, closest))
+    return spikes
+
+
+def _meeting_point(p: Tuple[float, float], q: Tuple[float, float], r: Tuple[float, float], s: Tuple[float, float]) -> Tuple[float, float]:
+    # a point the 2 segments have in common -> where they cross, or the end of one lying on the other
+    o3, o4 = orient2d(r, s, p), orient2d(r, s, q)
+    if o3 == 0 and o4 == 0:
+        return max(min(p, q), min(r, s))
+    o1, o2 = orient2d(p, q, r), orient2d(p, q, s)
+    for side, point in ((o3, p), (o4, q), (o1, r), (o2, s)):
+        if side == 0:
+            return point
+    ratio = o3 / (o3 - o4)
+    return (p[0] + (q[0] - p[0]) * ratio, p[1] + (q[1] - p[1]) * ratio)
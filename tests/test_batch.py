@@ -0,0 +1,115 @@
+import random
+from fractions import Fraction
+import pytest
+from joemetry import PointArray
+from joemetry.intersection import batch_intersections
+from joemetry.intersection.batch import _grid_candidates, _bounding_boxes, _segment_columns
+
+
+def exact_side(a, b, c):
+    # integers are exact, the float coordinates are small -> their determinant is only off by ~1e-13, below that it's redone with fractions
+    det = (a[0] - c[0]) * (b[1] - c[1]) - (a[1] - c[1]) * (b[0] - c[0])
+    if isinstance(det, float) and abs(det) < 1e-6:
+        (ax, ay), (bx, by), (cx, cy) = [(Fraction(x), Fraction(y)) for x, y in (a, b, c)]
+        det = (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+    return (det > 0) - (det < 0)
+
+
+def crossing(first, second):
+    # touching counts, collinear pairs don't -> the same as Segment.intersect_with
+    (p, q), (r, s) = first, second
+    o1, o2, o3, o4 = exact_side(r, s, p), exact_side(r, s, q), exact_side(p, q, r), exact_side(p, q, s)
+    if o1 == o2 == 0:
+        return False
+    return o1 * o2 <= 0 and o3 * o4 <= 0
+
+
+def brute_force(segments, red_blue=None):
+    if red_blue is None:
+        return {(i, j) for i in range(len(segments)) for j in range(i + 1, len(segments)) if crossing(segments[i], segments[j])}
+    return {(i, j) for i in range(len(segments)) for j in range(len(red_blue)) if crossing(segments[i], red_blue[j])}
+
+
+def random_segments(seed, n=150, long=0.05):
+    # mostly short segments & a few spanning the whole square, the ones the grid can't bucket
+    rng = random.Random(seed)
+    segments = []
+    for _ in range(n):
+        if rng.random() < long:
+            segments.append([(rng.uniform(0, 10), rng.uniform(0, 10)), (rng.uniform(0, 10), rng.uniform(0, 10))])
+            continue
+        x, y = rng.uniform(0, 10), rng.uniform(0, 10)
+        segments.append([(x, y), (x + rng.uniform(-2, 2), y + rng.uniform(-2, 2))])
+    return segments
+
+
+def grid_segments(seed, n=150):
+    # small integer coordinates -> lots of shared end points, T-junctions, collinear & vertical/horizontal segments
+    rng = random.Random(seed)
+    return [[(rng.randint(0, 6), rng.randint(0, 6)), (rng.randint(0, 6), rng.randint(0, 6))] for _ in range(n)]
+
+
+def pairs(found):
+    return {(i, j) for i, j, _ in found}
+
+
+@pytest.mark.parametrize('mode', ['sweep', 'grid'])
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_brute_force(mode, seed):
+    segments = random_segments(seed)
+    found = batch_intersections(segments, mode=mode)
+    assert pairs(found) == brute_force(segments)
+    for i, j, (x, y) in found:
+        for (x1, y1), (x2, y2) in (segments[i], segments[j]):
+            assert min(x1, x2) - 1e-9 <= x <= max(x1, x2) + 1e-9 and min(y1, y2) - 1e-9 <= y <= max(y1, y2) + 1e-9
+
+
+@pytest.mark.parametrize('mode', ['sweep', 'grid'])
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_brute_force_integer_grid(mode, seed):
+    segments = grid_segments(seed)
+    assert pairs(batch_intersections(segments, mode=mode)) == brute_force(segments)
+
+
+@pytest.mark.parametrize('mode', ['sweep', 'grid'])
+@pytest.mark.parametrize('seed', range(10))
+def test_red_blue_matches_brute_force(mode, seed):
+    red, blue = random_segments(seed, 100), grid_segments(seed, 80)
+    assert pairs(batch_intersections(red, mode=mode, red_blue=blue)) == brute_force(red, blue)
+
+
+@pytest.mark.parametrize('mode', ['sweep', 'grid'])
+def test_point_array_input(mode):
+    segments = random_segments(0)
+    points = PointArray(point for segment in segments for point in segment)
+    assert batch_intersections(points, mode=mode) == batch_intersections(segments, mode=mode)
+
+
+@pytest.mark.parametrize('mode', ['sweep', 'grid'])
+@pytest.mark.parametrize('seed', range(10))
+def test_near_degenerate_matches_brute_force(mode, seed):
+    # segments ending on (or an ulp off of) other segments & nearly collinear ones -> the float determinant can't tell
+    rng = random.Random(seed)
+    segments = random_segments(seed, 40)
+    for ind in range(40):
+        (x1, y1), (x2, y2) = segments[ind]
+        t = rng.random()
+        x, y = x1 + (x2 - x1) * t, y1 + (y2 - y1) * t
+        x, y = rng.choice((x, x + 1e-15, x - 1e-15)), rng.choice((y, y + 1e-15, y - 1e-15))
+        segments.append([(x, y), (x + rng.uniform(-1, 1), y + rng.uniform(-1, 1))] if rng.random() < 0.7 else [(x, y), (x2, y2)])
+    assert pairs(batch_intersections(segments, mode=mode)) == brute_force(segments)
+
+
+def test_long_segments_overflow_the_grid():
+    # 2 diagonals over 4000 tiny segments -> bucketing them would fill millions of cells
+    rng = random.Random(0)
+    segments = [[(x, y), (x + 1e-3, y + 1e-3)] for x, y in ((rng.random(), rng.random()) for _ in range(4000))]
+    segments += [[(0, 0), (1, 1)], [(0, 1), (1, 0)]]
+    first, second = _grid_candidates(*_bounding_boxes(*_segment_columns(segments)))
+    assert len(first) < 4 * len(segments)
+    assert (4000, 4001) in pairs(batch_intersections(segments, mode='grid'))
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        batch_intersections([], mode='quadtree')
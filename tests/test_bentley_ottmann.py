@@ -0,0 +1,119 @@
+import random
+from math import log2
+import pytest
+from joemetry import Segment
+from joemetry.intersection.bentleyottmann import CheckSegmentIntersection
+from joemetry.intersection.bentleyottmann._status import SweepStatus, _BLOCK_SIZE
+from joemetry.intersection.bentleyottmann._point_type import StartingPointType
+
+
+def _key(start, end):
+    return tuple(sorted((tuple(start), tuple(end))))
+
+
+def brute_force(lines):
+    segments = [Segment(*line) for line in lines]
+    return {
+        frozenset((_key(*lines[i]), _key(*lines[j])))
+        for i in range(len(lines)) for j in range(i + 1, len(lines))
+        if segments[i].intersect_with(segments[j]) is not None
+        }
+
+
+def sweep(lines):
+    found = CheckSegmentIntersection(lines, getLine=True)
+    if found is None:
+        return set()
+    return {
+        frozenset((_key(a.start.astuple(), a.end.astuple()), _key(b.start.astuple(), b.end.astuple())))
+        for a, b in found[1]
+        }
+
+
+def random_lines(seed, n=40, vertical=0.05, horizontal=0.0):
+    # the ends are in random order -> about half of the lines go right to left
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(n):
+        x, y = rng.uniform(0, 10), rng.uniform(0, 10)
+        kind = rng.random()
+        if kind < vertical:
+            lines.append([(x, y), (x, rng.uniform(0, 10))])
+        elif kind < vertical + horizontal:
+            lines.append([(x, y), (rng.uniform(0, 10), y)])
+        else:
+            lines.append([(x, y), (rng.uniform(0, 10), rng.uniform(0, 10))])
+    return lines
+
+
+def test_vertical_segment_crossed_an_ulp_past_its_x():
+    lines = [
+        [(0.4278902933945994, 7.8007648908355645), (7.77234681427713, 1.5939993976228117)],
+        [(3.3676501126574077, 2.7968570583305983), (3.3676501126574077, 9.157307962249636)]
+        ]
+    assert CheckSegmentIntersection(lines) is not None
+
+
+def test_right_to_left_segments():
+    lines = [[(4, 0), (0, 4)], [(0, 0), (4, 4)], [(4, 2), (0, 2)]]
+    assert sweep(lines) == brute_force(lines) and len(sweep(lines)) == 3
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_matches_brute_force(seed):
+    lines = random_lines(seed)
+    assert sweep(lines) == brute_force(lines)
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_matches_brute_force_axis_aligned(seed):
+    lines = random_lines(seed, vertical=0.3, horizontal=0.3)
+    assert sweep(lines) == brute_force(lines)
+
+
+def flatten(status):
+    return [point for block in status._blocks for point in block.points]
+
+
+def test_status_finds_points_by_their_handle(monkeypatch):
+    # half of the lines start at the same y -> inserted at the same few spots over & over, splitting blocks & running out of ranks
+    rng = random.Random(0)
+    status, inside = SweepStatus(), []
+    for _ in range(3000):
+        y = 0.5 if rng.random() < 0.5 else rng.random()
+        point = StartingPointType(0.0, (0.0, y), Segment((0.0, y), (1.0, y + rng.choice((-0.1, 0.0, 0.1)))))
+        block, index = status.insert(point)
+        assert status._blocks[block].points[index] is point
+        inside.append(point)
+        if rng.random() < 0.3:
+            status.delete(inside.pop(rng.randrange(len(inside))))
+
+    order = flatten(status)
+    assert [status.y_at(point.line) for point in order] == sorted(status.y_at(point.line) for point in order)
+    assert len(status) == len(inside) and all(len(block.points) <= _BLOCK_SIZE for block in status._blocks)
+
+    # finding & removing a point doesn't look at the lines at all -> it can't be thrown off by lines crossing at sweep_x
+    monkeypatch.setattr(SweepStatus, 'y_at', None)
+    for ind, point in enumerate(order):
+        position = status.index(point)
+        assert status.below(position) is (order[ind - 1] if ind else None)
+        assert status.above(position) is (order[ind + 1] if ind + 1 < len(order) else None)
+    for point in inside:
+        status.delete(point)
+    assert status.isempty
+
+
+def test_status_work_is_logarithmic(monkeypatch):
+    # every segment is in the activeQueue at once, each one's placed by a bisection & found again through its handle
+    calls = [0]
+    y_at = SweepStatus.y_at
+
+    def counting(self, line):
+        calls[0] += 1
+        return y_at(self, line)
+
+    monkeypatch.setattr(SweepStatus, 'y_at', counting)
+    n = 4000
+    lines = [[(ind / n, ind / n), (2 + ind / n, ind / n)] for ind in range(n)]
+    assert CheckSegmentIntersection(lines) is None
+    assert calls[0] <= n * (log2(n) + 3)
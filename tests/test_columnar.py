@@ -0,0 +1,168 @@
+import io
+import os
+import random
+import struct
+import pytest
+from joemetry import Polygon, PointArray
+from joemetry.io import ColumnarWriter, ColumnarReader, write_columnar, read_columnar
+
+
+def random_ring(rng, n=None):
+    return [(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(n or rng.randint(3, 30))]
+
+
+def random_shapes(seed, count=50):
+    # single rings as lists, polygons & PointArrays, and lists of rings (outer ring & holes)
+    rng = random.Random(seed)
+    shapes = []
+    for ind in range(count):
+        kind = ind % 4
+        if kind == 0:
+            shapes.append(random_ring(rng))
+        elif kind == 1:
+            shapes.append(Polygon(random_ring(rng)))
+        elif kind == 2:
+            shapes.append(PointArray(random_ring(rng)))
+        else:
+            shapes.append([random_ring(rng) for _ in range(rng.randint(1, 4))])
+    return shapes
+
+
+def as_rings(shape):
+    # the rings of a shape as lists of (x, y), how the reader should give them back
+    if isinstance(shape, Polygon):
+        shape = shape.vertex
+    if isinstance(shape, PointArray) or not isinstance(shape[0], list):
+        return [[(point[0], point[1]) for point in shape]]
+    return [as_rings(ring)[0] for ring in shape]
+
+
+def check(reader, shapes):
+    assert len(reader) == len(shapes)
+    assert reader.num_rings == sum(len(as_rings(shape)) for shape in shapes)
+    for ind, shape in enumerate(shapes):
+        rings = as_rings(shape)
+        assert [[(point.x, point.y) for point in ring] for ring in reader.rings(ind)] == rings
+        lazy = reader[ind]
+        assert len(lazy) == len(rings[0]) and not lazy.is_materialized
+        xs, ys = [x for x, _ in rings[0]], [y for _, y in rings[0]]
+        assert lazy.bounds == (min(xs), min(ys), max(xs), max(ys))
+        assert lazy.area == pytest.approx(Polygon(rings[0]).area) and lazy.is_materialized
+        assert [(point.x, point.y) for point in lazy.holes[0].vertex] == rings[1] if len(rings) > 1 else lazy.holes == []
+        assert list(reader.coords(ind)) == [value for ring in rings for point in ring for value in point]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'shapes.jcol'
+    shapes = random_shapes(0)
+    assert write_columnar(path, shapes) == len(shapes)
+    with read_columnar(path) as reader:
+        check(reader, shapes)
+    # the same bytes through a file object & straight from a buffer
+    buffer = io.BytesIO()
+    write_columnar(buffer, iter(shapes))
+    assert buffer.getvalue() == path.read_bytes()
+    check(ColumnarReader(buffer.getvalue()), shapes)
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.jcol'
+    assert write_columnar(path, []) == 0
+    with read_columnar(path) as reader:
+        assert len(reader) == 0 and list(reader) == []
+        with pytest.raises(IndexError):
+            reader[0]
+
+
+@pytest.mark.parametrize('use_path', [True, False])
+def test_append(tmp_path, use_path):
+    shapes = random_shapes(1, 60)
+    path = tmp_path / 'shapes.jcol'
+    target = path if use_path else open(path, 'w+b')
+    write_columnar(target, shapes[:20])
+    assert write_columnar(target, shapes[20:45], append=True) == 45
+    with ColumnarWriter(target, append=True) as writer:
+        assert len(writer) == 45
+        assert writer.write(shapes[45]) == 45
+        writer.write_many(shapes[46:])
+    if not use_path:
+        target.close()
+    with read_columnar(path) as reader:
+        check(reader, shapes)
+    # appending to a file that isn't there yet starts it
+    assert write_columnar(tmp_path / 'new.jcol', shapes[:3], append=True) == 3
+
+
+def test_open_writer_keeps_the_file_readable(tmp_path):
+    path = tmp_path / 'shapes.jcol'
+    shapes = random_shapes(2, 30)
+    write_columnar(path, shapes[:10])
+    before = path.read_bytes()
+
+    # abandoned without close -> the old shapes are all still there
+    writer = ColumnarWriter(path, append=True)
+    writer.write_many(shapes[10:])
+    assert path.read_bytes() == before
+    with read_columnar(path) as reader:
+        check(reader, shapes[:10])
+    writer.discard()
+    assert path.read_bytes() == before and os.listdir(tmp_path) == ['shapes.jcol']
+
+    # the same when the with block raises, overwriting too
+    for append in [True, False]:
+        with pytest.raises(RuntimeError):
+            with ColumnarWriter(path, append=append) as writer:
+                writer.write_many(shapes[10:])
+                raise RuntimeError
+        assert path.read_bytes() == before and os.listdir(tmp_path) == ['shapes.jcol']
+
+    # until it's closed
+    writer = ColumnarWriter(path)
+    writer.write_many(shapes[10:])
+    with read_columnar(path) as reader:
+        check(reader, shapes[:10])
+    writer.close()
+    with read_columnar(path) as reader:
+        check(reader, shapes[10:])
+    assert os.listdir(tmp_path) == ['shapes.jcol']
+
+
+def corrupt(data, **fields):
+    # the file with some header fields swapped out
+    names = ['magic', 'version', 'num_shapes', 'num_rings', 'num_points', 'coordinates_offset', 'rings_offset', 'shapes_offset']
+    header = dict(zip(names, struct.unpack('=8s7q', data[:64])))
+    header.update(fields)
+    return struct.pack('=8s7q', *(header[name] for name in names)) + data[64:]
+
+
+def test_corrupt_files(tmp_path):
+    buffer = io.BytesIO()
+    write_columnar(buffer, random_shapes(3, 10))
+    data = buffer.getvalue()
+    num_points = struct.unpack('=8s7q', data[:64])[4]
+
+    bad = [
+        data[:40],                                          # shorter than the header
+        data[:-8],                                          # the shape offsets are cut short
+        data[:64 + 8 * num_points],                         # the offsets are gone
+        corrupt(data, magic=b'NOTJOEM\x00'),
+        corrupt(data, version=2),
+        corrupt(data, num_points=num_points * 10),         # more coordinates than there are bytes
+        corrupt(data, num_points=num_points - 1),          # the ring offsets don't end at the number of points
+        corrupt(data, num_shapes=-1),
+        corrupt(data, rings_offset=len(data)),
+        corrupt(data, shapes_offset=8),                    # inside of the header
+        corrupt(data, coordinates_offset=67),
+        ]
+    for ind, data in enumerate(bad):
+        with pytest.raises(ValueError):
+            ColumnarReader(data)
+        path = tmp_path / f'bad{ind}.jcol'
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            ColumnarReader(path)
+        # appending to it doesn't touch it either
+        with pytest.raises(ValueError):
+            ColumnarWriter(path, append=True)
+        assert path.read_bytes() == data
+    assert sorted(os.listdir(tmp_path)) == sorted(f'bad{ind}.jcol' for ind in range(len(bad)))
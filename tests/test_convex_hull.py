@@ -0,0 +1,75 @@
+import random
+from math import cos, sin, pi
+import pytest
+from joemetry import PointArray
+from joemetry.convex_hull import monotone_chain, quickhull, chan, hulls_of_many
+
+
+def random_points(seed, n=300):
+    rng = random.Random(seed)
+    return [(rng.uniform(-10, 10), rng.uniform(-10, 10)) for _ in range(n)]
+
+
+def grid_points(seed, n=300):
+    # a small integer grid -> duplicates & lots of collinear points on the hull edges
+    rng = random.Random(seed)
+    return [(float(rng.randint(0, 6)), float(rng.randint(0, 6))) for _ in range(n)]
+
+
+def circle_points(seed, n=300):
+    rng = random.Random(seed)
+    angles = [2 * pi * ind / n for ind in range(n)]
+    rng.shuffle(angles)
+    return [(cos(angle), sin(angle)) for angle in angles]
+
+
+def collinear_points(seed, n=50):
+    rng = random.Random(seed)
+    xs = [rng.randint(-20, 20) for _ in range(n)]
+    return [(float(x), 2.0 * x + 1) for x in xs]
+
+
+POINT_SETS = {'random': random_points, 'grid': grid_points, 'circle': circle_points, 'collinear': collinear_points}
+
+
+def coordinates(points, hull):
+    return [points[ind] for ind in hull]
+
+
+@pytest.mark.parametrize('engine', [quickhull, chan])
+@pytest.mark.parametrize('kind', list(POINT_SETS))
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_monotone_chain(engine, kind, seed):
+    points = POINT_SETS[kind](seed)
+    assert coordinates(points, engine(points)) == coordinates(points, monotone_chain(points))
+
+
+@pytest.mark.parametrize('engine', [monotone_chain, quickhull, chan])
+def test_small_inputs(engine):
+    assert engine([]) == []
+    assert engine([(1.0, 2.0)]) == [0]
+    assert coordinates([(1.0, 2.0), (1.0, 2.0)], engine([(1.0, 2.0), (1.0, 2.0)])) == [(1.0, 2.0)]
+    assert coordinates([(3.0, 0.0), (0.0, 0.0)], engine([(3.0, 0.0), (0.0, 0.0)])) == [(0.0, 0.0), (3.0, 0.0)]
+    square = [(1.0, 1.0), (0.0, 0.0), (1.0, 0.0), (0.5, 0.5), (0.0, 1.0), (0.0, 1.0)]
+    assert coordinates(square, engine(square)) == [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+
+
+@pytest.mark.parametrize('engine', [monotone_chain, quickhull, chan])
+def test_point_array_input(engine):
+    points = random_points(0)
+    assert engine(PointArray(points)) == engine(points)
+
+
+@pytest.mark.parametrize('engine', ['monotone_chain', 'quickhull', 'chan'])
+@pytest.mark.parametrize('processes', [1, 2])
+def test_hulls_of_many(engine, processes):
+    point_sets = [POINT_SETS[kind](seed, 60) for kind in POINT_SETS for seed in range(3)]
+    hulls = hulls_of_many(point_sets, engine=engine, processes=processes)
+    assert [coordinates(points, hull) for points, hull in zip(point_sets, hulls)] == [
+        coordinates(points, monotone_chain(points)) for points in point_sets
+        ]
+
+
+def test_hulls_of_many_invalid_engine():
+    with pytest.raises(ValueError):
+        hulls_of_many([random_points(0)], engine='graham')
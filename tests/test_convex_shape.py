@@ -0,0 +1,88 @@
+import random
+from math import cos, sin, pi
+import pytest
+from joemetry import Polygon
+from joemetry.intersection import ConvexShape, GJK
+
+
+def regular(n, seed, center=(0.0, 0.0), radius=1.0):
+    offset = random.Random(seed).uniform(0, 2 * pi)
+    return [(center[0] + radius * cos(offset + 2 * pi * ind / n), center[1] + radius * sin(offset + 2 * pi * ind / n)) for ind in range(n)]
+
+
+def random_convex(seed, n=200):
+    # the hull of random points, given in random order & with the points inside of it
+    rng = random.Random(seed)
+    return [(rng.gauss(0, 1), rng.gauss(0, 3)) for _ in range(n)]
+
+
+def best_projection(vertices, direction):
+    return max(direction[0] * x + direction[1] * y for x, y in vertices)
+
+
+def check_support(shape, direction):
+    x, y = shape.support(direction)
+    assert (x, y) in shape.vertices
+    assert direction[0] * x + direction[1] * y == best_projection(shape.vertices, direction)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_support_matches_a_linear_scan(seed):
+    rng = random.Random(seed)
+    shape = ConvexShape(random_convex(seed))
+    # small turns (warm started climbs), then random jumps
+    angle = 0.0
+    for _ in range(200):
+        angle += rng.uniform(-0.2, 0.2) if rng.random() < 0.7 else rng.uniform(0, 2 * pi)
+        check_support(shape, (cos(angle), sin(angle)))
+    # along the edge normals -> 2 vertices tie
+    vertices = shape.vertices
+    for (x1, y1), (x2, y2) in zip(vertices, vertices[1:] + vertices[:1]):
+        check_support(shape, (y2 - y1, x1 - x2))
+
+
+def test_flipped_direction_falls_back_to_the_bisection(monkeypatch):
+    shape = ConvexShape(regular(1000, 0))
+    searched = []
+    search = ConvexShape._search
+    monkeypatch.setattr(ConvexShape, '_search', lambda self, dx, dy: searched.append((dx, dy)) or search(self, dx, dy))
+
+    rng = random.Random(0)
+    for _ in range(100):
+        angle = rng.uniform(0, 2 * pi)
+        check_support(shape, (cos(angle), sin(angle)))
+        check_support(shape, (-cos(angle), -sin(angle)))
+    assert searched
+    # a small turn from the last direction is a short climb again
+    count = len(searched)
+    check_support(shape, (-cos(angle + 0.01), -sin(angle + 0.01)))
+    assert len(searched) == count
+
+
+def test_prepared_shape():
+    points = random_convex(0)
+    shape = ConvexShape(points)
+    assert len(shape) == len(list(shape)) < len(points)
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    assert shape.bounds == (min(xs), min(ys), max(xs), max(ys))
+    assert ConvexShape(shape).vertices == shape.vertices
+
+    shape.translate_ip(2.0, -1.0)
+    assert shape.bounds == (min(xs) + 2.0, min(ys) - 1.0, max(xs) + 2.0, max(ys) - 1.0)
+    check_support(shape, (1.0, 0.3))
+
+
+def test_degenerate_shapes():
+    assert ConvexShape([(1.0, 2.0)]).support((1.0, 0.0)) == (1.0, 2.0)
+    segment = ConvexShape([(0.0, 0.0), (2.0, 1.0)])
+    assert segment.support((1.0, 0.0)) == (2.0, 1.0) and segment.support((-1.0, 0.0)) == (0.0, 0.0)
+    with pytest.raises(ValueError):
+        ConvexShape([])
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_gjk_with_prepared_shapes_matches_polygons(seed):
+    rng = random.Random(seed)
+    first = regular(rng.randint(3, 40), seed)
+    second = regular(rng.randint(3, 40), seed + 1, (rng.uniform(-2.5, 2.5), rng.uniform(-2.5, 2.5)))
+    assert GJK(ConvexShape(first), ConvexShape(second)) == GJK(Polygon(first), Polygon(second))
@@ -0,0 +1,70 @@
+import random
+import pytest
+from joemetry.predicates import orient2d, incircle
+from joemetry.triangulation import Delaunay, delaunay_triangulation
+
+
+def random_points(seed, n=150):
+    rng = random.Random(seed)
+    return [(rng.uniform(-10, 10), rng.uniform(-10, 10)) for _ in range(n)]
+
+
+def grid_points(seed, n=150):
+    # a small integer grid -> lots of duplicate, collinear & cocircular points
+    rng = random.Random(seed)
+    return [(float(rng.randint(0, 8)), float(rng.randint(0, 8))) for _ in range(n)]
+
+
+def hull_area(points):
+    points, hull = sorted(set(points)), []
+    for chain in (points, points[::-1]):
+        start = len(hull)
+        for point in chain:
+            while len(hull) >= start + 2 and orient2d(hull[-2], hull[-1], point) <= 0:
+                hull.pop()
+            hull.append(point)
+    return abs(sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(hull, hull[1:]))) / 2
+
+
+def check(points):
+    triangles = delaunay_triangulation(points)
+    total = 0.0
+    for a, b, c in triangles:
+        assert orient2d(points[a], points[b], points[c]) > 0
+        total += orient2d(points[a], points[b], points[c]) / 2
+        # no point strictly inside of any circumcircle, the ones on it are fine
+        assert not any(incircle(points[a], points[b], points[c], point) > 0 for point in points)
+    assert total == pytest.approx(hull_area(points), rel=1e-9)
+    return triangles
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_points(seed):
+    check(random_points(seed))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_integer_grid(seed):
+    points = grid_points(seed)
+    triangles = check(points)
+    # duplicates are only used once
+    used = {ind for triangle in triangles for ind in triangle}
+    assert len({points[ind] for ind in used}) == len(used)
+
+
+def test_hull_and_halfedges():
+    points = random_points(0)
+    triangulation = Delaunay(points)
+    triangles, halfedges = triangulation.triangles, triangulation.halfedges
+    for edge, twin in enumerate(halfedges):
+        if twin == -1:
+            continue
+        assert halfedges[twin] == edge
+        assert triangles[edge] == triangles[Delaunay.next_halfedge(twin)]
+    hull = [points[ind] for ind in triangulation.hull]
+    assert sum(twin == -1 for twin in halfedges) == len(hull)
+    assert abs(sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(hull, hull[1:] + hull[:1]))) / 2 == pytest.approx(hull_area(points))
+
+
+def test_collinear_points_have_no_triangles():
+    assert delaunay_triangulation([(float(ind), 2.0 * ind) for ind in range(10)]) == []
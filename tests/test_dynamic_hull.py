@@ -0,0 +1,95 @@
+import random
+import pytest
+from joemetry.convex_hull import DynamicConvexHull, monotone_chain
+from joemetry.convex_hull import dynamic
+
+
+def reference(points):
+    return [points[ind] for ind in monotone_chain(points)]
+
+
+def random_point(rng, grid):
+    # grid: small integer coordinates -> duplicates & lots of collinear points on the hull
+    if grid:
+        return (float(rng.randint(0, 8)), float(rng.randint(0, 8)))
+    return (rng.uniform(-10, 10), rng.uniform(-10, 10))
+
+
+@pytest.mark.parametrize('grid', [False, True])
+@pytest.mark.parametrize('seed', range(6))
+def test_mixed_inserts_and_removals(grid, seed):
+    rng = random.Random(seed)
+    points = [random_point(rng, grid) for _ in range(200)]
+    hull = DynamicConvexHull(points)
+    for step in range(600):
+        kind = rng.random()
+        if kind < 0.4 or not points:
+            point = random_point(rng, grid)
+            hull.insert(point)
+            points.append(point)
+        elif kind < 0.8:
+            # mostly hull vertices -> the chains have to be repaired
+            vertices = hull.hull()
+            point = rng.choice(vertices) if rng.random() < 0.8 else rng.choice(points)
+            hull.remove(point)
+            points.remove(point)
+        if step % 7 == 0 or kind >= 0.8:
+            assert hull.hull() == reference(points)
+            assert len(hull) == len(points)
+    while points:
+        point = rng.choice(hull.hull())
+        hull.remove(point)
+        points.remove(point)
+        assert hull.hull() == reference(points)
+
+
+def test_removals_before_the_first_query():
+    hull = DynamicConvexHull([(0, 0), (4, 0), (4, 4), (0, 4), (2, 2)])
+    hull.remove((4, 4))
+    assert hull.hull() == [(0.0, 0.0), (4.0, 0.0), (0.0, 4.0)]
+    hull.insert((4, 4))
+    hull.remove((0, 0))
+    assert hull.hull() == [(0.0, 4.0), (4.0, 0.0), (4.0, 4.0)]
+
+
+def test_queries():
+    rng = random.Random(0)
+    points = [random_point(rng, False) for _ in range(300)]
+    hull = DynamicConvexHull(points)
+    for point in hull.hull()[::3]:
+        hull.remove(point)
+        points.remove(point)
+    vertices = reference(points)
+
+    for _ in range(100):
+        dx, dy = rng.uniform(-1, 1), rng.uniform(-1, 1)
+        best = max(dx * x + dy * y for x, y in vertices)
+        x, y = hull.extreme((dx, dy))
+        assert dx * x + dy * y == pytest.approx(best)
+
+    assert all(hull.contains(point) for point in points)
+    assert not hull.contains((20.0, 0.0))
+    right, left = hull.tangent((30.0, 1.0))
+    assert right in vertices and left in vertices
+
+
+def test_removing_a_vertex_only_rebuilds_its_span(monkeypatch):
+    rng = random.Random(0)
+    points = [random_point(rng, False) for _ in range(5000)]
+    hull = DynamicConvexHull(points)
+    hull.hull()
+
+    built = []
+    build_chain = dynamic._build_chain
+    monkeypatch.setattr(dynamic, '_build_chain', lambda chain, side: built.append(len(chain)) or build_chain(chain, side))
+    for _ in range(50):
+        point = rng.choice(hull.hull())
+        hull.remove(point)
+        points.remove(point)
+    assert hull.hull() == reference(points)
+    assert sum(built) < len(points)
+
+
+def test_remove_missing_point():
+    with pytest.raises(ValueError):
+        DynamicConvexHull([(0, 0)]).remove((1, 1))
@@ -0,0 +1,99 @@
+import random
+from math import cos, sin, pi, sqrt
+import pytest
+from joemetry import Polygon
+from joemetry.intersection import ConvexShape, GJK, EPA, collide
+from joemetry.intersection import epa
+
+
+def regular(n, seed, center=(0.0, 0.0), radius=1.0):
+    rng = random.Random(seed)
+    offset = rng.uniform(0, 2 * pi)
+    return [(center[0] + radius * cos(offset + 2 * pi * ind / n), center[1] + radius * sin(offset + 2 * pi * ind / n)) for ind in range(n)]
+
+
+def edge_normals(ring):
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+        length = sqrt((y2 - y1) ** 2 + (x1 - x2) ** 2)
+        if length:
+            yield ((y2 - y1) / length, (x1 - x2) / length)
+
+
+def push_out(first, second, normal):
+    # how far the second shape has to move along the normal to stop overlapping the first one
+    return max(normal[0] * x + normal[1] * y for x, y in first) - min(normal[0] * x + normal[1] * y for x, y in second)
+
+
+def sat_depth(first, second):
+    # the separating axis theorem -> the smallest push out over the edge normals of both shapes, both ways
+    normals = list(edge_normals(first)) + list(edge_normals(second))
+    return min(push_out(first, second, normal) for nx, ny in normals for normal in [(nx, ny), (-nx, -ny)])
+
+
+def overlapping_pair(seed):
+    rng = random.Random(seed)
+    first = regular(rng.randint(3, 30), seed, radius=rng.uniform(0.5, 2.0))
+    second = regular(rng.randint(3, 30), seed + 1000, (rng.uniform(-1.2, 1.2), rng.uniform(-1.2, 1.2)), rng.uniform(0.5, 2.0))
+    return first, second
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_depth_matches_the_separating_axis_theorem(seed):
+    first, second = overlapping_pair(seed)
+    if not GJK(Polygon(first), Polygon(second)):
+        with pytest.raises(ValueError):
+            EPA(Polygon(first), Polygon(second))
+        assert not collide(Polygon(first), Polygon(second)).colliding
+        return
+
+    expected = sat_depth(first, second)
+    depth, normal = EPA(Polygon(first), Polygon(second))
+    assert depth == pytest.approx(expected, abs=1e-9)
+    assert push_out(first, second, normal) == pytest.approx(expected, abs=1e-9)
+
+    contact = collide(ConvexShape(first), ConvexShape(second))
+    assert contact.colliding
+    assert contact.distance == pytest.approx(expected, abs=1e-9)
+    assert push_out(first, second, contact.normal) == pytest.approx(expected, abs=1e-9)
+    # the witness points are depth apart along the normal
+    gap = (contact.point1[0] - contact.point2[0]) * contact.normal[0] + (contact.point1[1] - contact.point2[1]) * contact.normal[1]
+    assert gap == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_separated_distance(seed):
+    rng = random.Random(seed)
+    first = regular(rng.randint(3, 20), seed)
+    angle = rng.uniform(0, 2 * pi)
+    second = regular(rng.randint(3, 20), seed + 1, (3 * cos(angle), 3 * sin(angle)))
+    contact = collide(Polygon(first), Polygon(second))
+    assert not contact.colliding
+    # separated along -normal -> the gap is minus the push out & no axis has a bigger gap
+    assert -push_out(first, second, contact.normal) == pytest.approx(contact.distance, abs=1e-9)
+    assert contact.distance >= -sat_depth(first, second) - 1e-9
+
+
+def test_touching_shapes():
+    first = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+    second = [(1.0, 0.0), (2.0, 0.0), (2.0, 1.0), (1.0, 1.0)]
+    contact = collide(Polygon(first), Polygon(second))
+    assert contact.colliding and contact.distance == 0
+
+
+def test_out_of_iterations_uses_a_live_edge():
+    first, second = regular(64, 0), regular(64, 1, (0.3, 0.1))
+    shape1, shape2 = ConvexShape(first), ConvexShape(second)
+    _, simplex = GJK(shape1, shape2, return_simplex=True)
+    support = epa._support_function(shape1, shape2)
+    points = [(point, point, (0.0, 0.0)) for point in simplex]
+
+    depths = []
+    for iterations in range(12):
+        depth, normal, _, _ = epa._expand(support, list(points), iterations, 1e-9)
+        # the polygon stays inside of the minkowski difference -> its closest edge can't be further out than the real depth
+        assert depth <= push_out(first, second, normal) + 1e-12
+        depths.append(depth)
+    # every expansion pushes the closest live edge out, a removed one would repeat the depth of the run before
+    assert all(a < b for a, b in zip(depths, depths[1:4]))
+    assert depths == sorted(depths)
+    assert depths[-1] <= sat_depth(first, second) + 1e-12
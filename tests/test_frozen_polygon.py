@@ -0,0 +1,45 @@
+import pytest
+from dataclasses import FrozenInstanceError
+from joemetry import Point, Polygon, PointArray
+from joemetry.transform import Affine
+
+
+SQUARE = [(0, 0), (4, 0), (4, 2), (0, 2)]
+
+
+@pytest.mark.parametrize('vertex', [SQUARE, [Point(*point) for point in SQUARE], PointArray(SQUARE)])
+def test_vertices_of_a_frozen_polygon_cannot_change(vertex):
+    polygon = Polygon(vertex, frozen=True)
+    area, key = polygon.area, hash(polygon)
+
+    polygon.vertex[0].x = -10
+    with pytest.raises((TypeError, ValueError)):
+        polygon.vertex.buffer[0] = -10
+    with pytest.raises(FrozenInstanceError):
+        polygon[0] = (-10, 0)
+
+    assert polygon.vertex[0] == Point(0, 0)
+    assert polygon.area == area == Polygon(SQUARE).area
+    assert hash(polygon) == key == hash(Polygon(SQUARE, frozen=True))
+
+
+def test_frozen_polygon_does_not_share_the_given_buffer():
+    vertex = PointArray(SQUARE)
+    polygon = Polygon(vertex, frozen=True)
+    vertex[0] = (-10, 0)
+    assert polygon.vertex[0] == Point(0, 0)
+
+
+def test_equality_does_not_depend_on_how_vertices_are_kept():
+    assert Polygon(SQUARE, frozen=True) == Polygon(SQUARE)
+    assert Polygon(SQUARE) == Polygon(PointArray(SQUARE))
+    assert Polygon(SQUARE) != Polygon(SQUARE[1:] + SQUARE[:1])
+    assert {Polygon(SQUARE, frozen=True): 1}[Polygon(PointArray(SQUARE), frozen=True)] == 1
+
+
+def test_frozen_polygon_still_works():
+    polygon = Polygon(SQUARE, frozen=True)
+    assert polygon.area == 8.0 and polygon.is_convex and polygon.bounds == (0, 0, 4, 2)
+    assert Polygon(polygon.vertex).vertex.buffer is not polygon.vertex.buffer
+    moved = polygon.transform(Affine.translation(1, 1))
+    assert moved.bounds == (1, 1, 5, 3)
@@ -0,0 +1,106 @@
+import io
+import json
+import pytest
+from joemetry import Point, Polygon
+from joemetry.io import read_geojson, write_geojson, from_geojson, to_geojson
+
+
+RING = [(0.5, 0.25), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+CHUNK_SIZES = [1, 3, 7, 16, 64, 1 << 16]
+
+
+def polygons(count):
+    return [Polygon([(x + ind, y) for x, y in RING]) for ind in range(count)]
+
+
+def feature(ind, properties=None):
+    # through json -> the positions are lists like they are when read back
+    return json.loads(json.dumps({'type': 'Feature', 'geometry': to_geojson(Polygon([(x + ind, y) for x, y in RING])), 'properties': properties}))
+
+
+class CountingReader(io.StringIO):
+    # how much of the file has been read so far
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.total = getattr(self, 'total', 0) + len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_feature_collection_round_trip(chunk_size):
+    text = io.StringIO()
+    assert write_geojson(text, polygons(30), [{'ind': ind} for ind in range(30)]) == 30
+    shapes = list(read_geojson(io.StringIO(text.getvalue()), properties=True, chunk_size=chunk_size))
+    assert shapes == [(polygon, {'ind': ind}) for ind, polygon in enumerate(polygons(30))]
+    assert list(read_geojson(io.BytesIO(text.getvalue().encode()), chunk_size=chunk_size)) == polygons(30)
+
+
+def test_feature_collection_is_streamed():
+    text = io.StringIO()
+    write_geojson(text, polygons(2000))
+    file = CountingReader(text.getvalue())
+    shapes = read_geojson(file, chunk_size=1024)
+    assert next(shapes) == polygons(1)[0]
+    assert file.total < len(text.getvalue()) // 10
+    assert sum(1 for _ in shapes) == 1999
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_nested_features_key_is_not_a_collection(chunk_size):
+    # "features": [ inside of a Feature's properties, a string & a nested collection
+    values = [
+        {'type': 'Feature', 'properties': {'features': [1, 2, 3], 'note': '"features": [4]'}, 'geometry': to_geojson(Point(1, 2))},
+        {'type': 'Feature', 'properties': {'nested': {'type': 'FeatureCollection', 'features': [feature(0)]}}, 'geometry': to_geojson(Point(3, 4))},
+        {'properties': {'features': ['a']}, 'type': 'Feature', 'geometry': None},
+        ]
+    text = '\n'.join(json.dumps(value) for value in values)
+    shapes = list(read_geojson(io.StringIO(text), properties=True, chunk_size=chunk_size))
+    assert shapes == [(Point(1, 2), values[0]['properties']), (Point(3, 4), values[1]['properties']), (None, values[2]['properties'])]
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_collection_members_in_any_order(chunk_size):
+    features = [feature(ind, {'features': [ind]}) for ind in range(5)]
+    collections = [
+        {'type': 'FeatureCollection', 'features': features},
+        {'bbox': [0, 0, 1, 1], 'type': 'FeatureCollection', 'features': features, 'name': 'x'},
+        # the type comes after the features -> read all at once, still the same shapes
+        {'features': features, 'type': 'FeatureCollection'},
+        {'features': features, 'crs': {'features': []}, 'type': 'FeatureCollection'},
+        ]
+    for collection in collections:
+        text = json.dumps(collection, indent=2)
+        shapes = list(read_geojson(io.StringIO(text), properties=True, chunk_size=chunk_size))
+        assert shapes == [(polygon, {'features': [ind]}) for ind, polygon in enumerate(polygons(5))]
+    # an empty collection & several in a row
+    text = json.dumps({'type': 'FeatureCollection', 'features': []}) + '\n' + json.dumps(collections[1]) * 2
+    assert list(read_geojson(io.StringIO(text), chunk_size=chunk_size)) == polygons(5) * 2
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_sequences_of_geometries(chunk_size):
+    geometries = [to_geojson(polygon) for polygon in polygons(5)]
+    text = '\x1e' + '\n\x1e'.join(json.dumps(geometry) for geometry in geometries) + '\n'
+    assert list(read_geojson(io.StringIO(text), chunk_size=chunk_size)) == polygons(5)
+    assert list(read_geojson(io.StringIO(json.dumps(geometries)), chunk_size=chunk_size)) == polygons(5)
+    assert list(read_geojson(io.StringIO(' \n'), chunk_size=chunk_size)) == []
+
+
+@pytest.mark.parametrize('text', [
+    '{"type": "FeatureCollection", "features": [',
+    '{"type": "FeatureCollection", "features": [{"type": "Feature"',
+    '{"type": "Feature", "properties"',
+    '{"type" "Feature"}',
+    '{"type": "Feature" "geometry": null}',
+    '{1: 2}',
+    ])
+def test_truncated_or_invalid(text):
+    with pytest.raises(ValueError):
+        list(read_geojson(io.StringIO(text), chunk_size=4))
+
+
+def test_from_geojson():
+    collection = {'type': 'FeatureCollection', 'features': [feature(ind) for ind in range(3)]}
+    assert from_geojson(json.dumps(collection)) == polygons(3)
+    assert from_geojson(feature(0)) == polygons(1)[0]
+    assert from_geojson(to_geojson(Point(1, 2))) == Point(1, 2)
@@ -0,0 +1,125 @@
+import random
+from math import cos, sin, pi
+import pytest
+from joemetry import Point, instrument
+from joemetry.intersection import GJK, ConvexShape, CheckSegmentIntersection
+from joemetry.triangulation import ear_clipping
+
+
+INIT = Point.__init__
+
+
+def ngon(n, center=(0.0, 0.0), radius=1.0):
+    return [(center[0] + radius * cos(2 * pi * ind / n), center[1] + radius * sin(2 * pi * ind / n)) for ind in range(n)]
+
+
+class CountingShape(ConvexShape):
+    # how many support points it was asked for
+    calls = 0
+
+    def support(self, direction):
+        CountingShape.calls += 1
+        return super().support(direction)
+
+
+def check_off():
+    assert not instrument.enabled() and Point.__init__ is INIT
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_gjk_counts_every_support_call(seed):
+    rng = random.Random(seed)
+    first = CountingShape(ngon(rng.randint(3, 40)))
+    second = CountingShape(ngon(rng.randint(3, 40), (rng.uniform(-3, 3), rng.uniform(-3, 3)), rng.uniform(0.5, 2)))
+    overlapping = GJK(first, second)
+    CountingShape.calls = 0
+    with instrument.recording() as stats:
+        assert GJK(first, second) == overlapping
+    # 2 shapes asked once per support point
+    counts = stats.counts['gjk']
+    assert counts['support_calls'] * 2 == CountingShape.calls and stats.calls == {'gjk': 1}
+    assert counts['iterations'] <= counts['support_calls'] <= counts['iterations'] + 1
+    check_off()
+
+
+def test_gjk_same_center():
+    # done after the first support point, no iterations
+    shape = ngon(8)
+    with instrument.recording() as stats:
+        assert GJK(shape, shape)
+    assert stats.counts['gjk']['iterations'] == 0 and stats.counts['gjk']['support_calls'] == 1
+
+
+def test_other_algorithms():
+    rng = random.Random(0)
+    segments = [sorted([(x, y), (x + 0.3, y + rng.uniform(-0.3, 0.3))]) for x, y in ((rng.random(), rng.random()) for _ in range(30))]
+    with instrument.recording() as stats:
+        CheckSegmentIntersection(segments)
+        triangles = ear_clipping(ngon(12))
+    counts = stats.counts
+    assert counts['bentley_ottmann']['start_events'] == counts['bentley_ottmann']['end_events'] == 30
+    assert stats.peaks['bentley_ottmann']['active_queue'] >= 1
+    assert set(stats.timings['bentley_ottmann']) == {'setup', 'sweep', 'total'}
+    assert counts['ear_clipping']['ears'] == len(triangles) == 10 and counts['ear_clipping']['ear_tests'] >= 9
+    assert stats.per('ear_clipping', 'ear_tests', 'ears') >= 0.9 and stats.per('gjk', 'iterations', 'calls') == 0.0
+    check_off()
+
+
+def test_nested_recordings_count_points():
+    with instrument.recording() as outer:
+        Point(0, 0)
+        with instrument.recording() as inner:
+            Point(1, 1), Point(2, 2)
+            GJK(ngon(5), ngon(5, (0.5, 0.0)))
+            assert inner.points >= 2
+        assert instrument.enabled() and Point.__init__ is not INIT
+        inner_points = inner.points
+        Point(3, 3)
+    check_off()
+    # the inner one stopped counting when it was closed, the outer one got everything
+    assert inner.points == inner_points and outer.points == inner_points + 2
+    assert inner.calls == outer.calls == {'gjk': 1}
+    assert outer.counts['gjk'] == inner.counts['gjk']
+    Point(4, 4)
+    assert outer.points == inner_points + 2
+
+
+def test_hooks_and_callbacks():
+    reports, callbacks = [], []
+    instrument.add_hook(reports.append)
+    try:
+        assert instrument.enabled()
+        with instrument.recording(callbacks.append):
+            GJK(ngon(6), ngon(6, (5.0, 0.0)))
+        GJK(ngon(6), ngon(6, (0.5, 0.0)))
+    finally:
+        instrument.remove_hook(reports.append)
+    check_off()
+    GJK(ngon(6), ngon(6, (0.5, 0.0)))
+    assert len(reports) == 2 and callbacks == reports[:1]
+    report = reports[0]
+    assert report['name'] == 'gjk' and set(report) == {'name', 'counts', 'peaks', 'timings', 'points'}
+    assert report['timings']['total'] >= 0 and report['counts']['support_calls'] >= 1
+
+
+def test_turned_off_after_exceptions():
+    with pytest.raises(RuntimeError):
+        with instrument.recording():
+            with instrument.recording():
+                raise RuntimeError
+    check_off()
+
+    # a hook failing fails the call, removing it still turns everything off
+    def failing(report):
+        raise ValueError(report['name'])
+
+    instrument.add_hook(failing)
+    try:
+        with pytest.raises(ValueError):
+            with instrument.recording() as stats:
+                GJK(ngon(4), ngon(4, (0.5, 0.5)))
+        assert stats.calls == {'gjk': 1} and instrument.enabled()
+    finally:
+        instrument.remove_hook(failing)
+    check_off()
+    assert Point(1, 2).x == 1
@@ -0,0 +1,88 @@
+import random
+from math import sqrt
+import pytest
+from joemetry import PointArray
+from joemetry.index import KDTree, closest_pair
+
+
+def random_points(seed, n=400):
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 10), rng.uniform(0, 10)) for _ in range(n)]
+
+
+def grid_points(seed, n=400):
+    # a small integer grid -> duplicates & lots of ties at the median
+    rng = random.Random(seed)
+    return [(float(rng.randint(0, 9)), float(rng.randint(0, 4))) for _ in range(n)]
+
+
+def distance(first, second):
+    return sqrt((first[0] - second[0]) ** 2 + (first[1] - second[1]) ** 2)
+
+
+POINT_SETS = {'random': random_points, 'grid': grid_points}
+
+
+@pytest.mark.parametrize('leaf_size', [1, 3, 16, 1000])
+@pytest.mark.parametrize('kind', list(POINT_SETS))
+@pytest.mark.parametrize('seed', range(2))
+def test_queries_match_brute_force(leaf_size, kind, seed):
+    rng = random.Random(seed)
+    points = POINT_SETS[kind](seed)
+    tree = KDTree(points, leaf_size)
+    assert len(tree) == len(points) and sorted(tree.indices) == list(range(len(points)))
+
+    for _ in range(30):
+        center, radius = (rng.uniform(-1, 11), rng.uniform(-1, 11)), rng.choice([0.0, 0.5, 1.0, 2.0, 20.0])
+        # the distances are compared squared, the same way the tree does it
+        expected = [ind for ind, point in enumerate(points) if (point[0] - center[0]) ** 2 + (point[1] - center[1]) ** 2 <= radius * radius]
+        assert sorted(tree.query_radius(center, radius)) == expected
+
+        k = rng.choice([1, 5, 20])
+        distances = sorted(distance(point, center) for point in points)[:k]
+        found = tree.knn(center, k, return_distance=True)
+        assert [dist for _, dist in found] == pytest.approx(distances)
+        assert [distance(points[ind], center) for ind, _ in found] == pytest.approx(distances)
+        assert tree.knn(center, k) == [ind for ind, _ in found]
+
+    for radius in [0.0, 0.3, 1.0]:
+        expected = [
+            (i, j) for i in range(len(points)) for j in range(i + 1, len(points))
+            if (points[i][0] - points[j][0]) ** 2 + (points[i][1] - points[j][1]) ** 2 <= radius * radius
+            ]
+        assert sorted(tree.query_ball_pairs(radius)) == expected
+
+
+def test_many_queries():
+    points = random_points(0)
+    tree = KDTree(PointArray(points))
+    centers = random_points(1, 20)
+    assert tree.query_radius_many(centers, 1.0) == [tree.query_radius(center, 1.0) for center in centers]
+    assert tree.knn_many(PointArray(centers), 3) == [tree.knn(center, 3) for center in centers]
+
+
+def test_small_trees():
+    assert KDTree([]).knn((0, 0)) == [] and KDTree([]).query_radius((0, 0), 1) == []
+    assert KDTree([]).query_ball_pairs(1.0) == [] and len(KDTree([])) == 0
+    tree = KDTree([(1.0, 1.0)])
+    assert tree.knn((0, 0), 3, return_distance=True) == [(0, sqrt(2))]
+    assert tree.knn((0, 0), 0) == []
+    with pytest.raises(ValueError):
+        KDTree([(0, 0)], leaf_size=0)
+
+
+@pytest.mark.parametrize('kind', list(POINT_SETS))
+@pytest.mark.parametrize('seed', range(5))
+def test_closest_pair(kind, seed):
+    points = POINT_SETS[kind](seed, 300)
+    i, j, dist = closest_pair(points)
+    assert i < j
+    assert dist == distance(points[i], points[j])
+    assert dist == min(distance(points[a], points[b]) for a in range(len(points)) for b in range(a + 1, len(points)))
+
+
+def test_closest_pair_small_inputs():
+    assert closest_pair([(0, 0), (3, 4)]) == (0, 1, 5.0)
+    assert closest_pair([(0, 0), (5, 5), (1, 0)]) == (0, 2, 1.0)
+    with pytest.raises(ValueError):
+        closest_pair([(0, 0)])
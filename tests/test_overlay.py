@@ -0,0 +1,72 @@
+import random
+from math import cos, sin, pi
+import pytest
+from joemetry.clipping import overlay, clip_many
+from joemetry.utils import get_coordinates
+
+
+WINDOW = [(-5, -5), (5, -5), (5, 5), (-5, 5)]
+OPERATIONS = {
+    'intersection'        : lambda a, b: a and b,
+    'union'               : lambda a, b: a or b,
+    'difference'          : lambda a, b: a and not b,
+    'symmetric_difference': lambda a, b: a != b,
+    }
+
+
+def inside(point, ring):
+    x, y = point
+    result = False
+    for ind in range(len(ring)):
+        (x1, y1), (x2, y2) = ring[ind - 1], ring[ind]
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            result = not result
+    return result
+
+
+def inside_result(point, polygons):
+    # outer rings & their holes -> inside when inside of an odd number of rings
+    return sum(inside(point, get_coordinates(polygon)) for polygon in polygons) % 2 == 1
+
+
+def star(rng, n):
+    cx, cy = rng.uniform(-6, 6), rng.uniform(-6, 6)
+    ring = []
+    for ind in range(n):
+        radius = rng.uniform(1, 8)
+        ring.append((cx + radius * cos(2 * pi * ind / n), cy + radius * sin(2 * pi * ind / n)))
+    return ring
+
+
+def wrong_samples(subject, clip, polygons, keep, rng, samples=200):
+    wrong = 0
+    for _ in range(samples):
+        point = (rng.uniform(-15, 15), rng.uniform(-15, 15))
+        wrong += keep(inside(point, subject), inside(point, clip)) != inside_result(point, polygons)
+    return wrong
+
+
+def test_square_cut_across_both_vertical_sides():
+    square = [(-3, -3), (3, -3), (3, 3), (-3, 3)]
+    band = [(-4.7, 0.1), (4.9, -0.3), (4.1, 2.2), (-4.4, 2.6)]
+    result = overlay(square, band, 'difference')
+    assert len(result) == 2
+    assert sum(polygon.signed_area for polygon in result) == pytest.approx(36 - 2 * 6 - 6 * 0.4 * 0.5 - 6 * 0.4 * 0.5, abs=1)
+
+
+@pytest.mark.parametrize('seed', range(300))
+@pytest.mark.parametrize('operation', OPERATIONS)
+def test_axis_aligned_window(seed, operation):
+    rng = random.Random(seed)
+    polygon = star(rng, rng.randint(5, 14))
+    for subject, clip in ((WINDOW, polygon), (polygon, WINDOW)):
+        result = overlay(subject, clip, operation)
+        # a sample landing within an ulp of a boundary can go either way
+        assert wrong_samples(subject, clip, result, OPERATIONS[operation], rng) <= 1
+
+
+def test_clip_many_tiles_non_convex_polygons():
+    rng = random.Random(7)
+    polygons = [star(rng, rng.randint(5, 14)) for _ in range(40)]
+    for polygon, pieces in zip(polygons, clip_many(polygons, WINDOW)):
+        assert wrong_samples(polygon, WINDOW, pieces, OPERATIONS['intersection'], rng) <= 1
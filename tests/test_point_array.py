@@ -0,0 +1,194 @@
+import copy
+import pickle
+import random
+from array import array
+from math import isclose
+import pytest
+import joemetry.point_array as point_array
+from joemetry import Point, Polygon, PointArray
+
+
+COORDS = [(1.0, 2.0), (-3.5, 0.25), (0.0, 0.0), (4.0, -1.0), (2.5, 7.0)]
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def backend(request, monkeypatch):
+    # the same tests over both buffers, array('d') is what's used without numpy
+    if request.param == 'numpy':
+        if point_array.np is None:
+            pytest.skip("numpy isn't installed")
+        return point_array.np.ndarray
+    monkeypatch.setattr(point_array, 'np', None)
+    return array
+
+
+def coords(points):
+    return [(point.x, point.y) for point in points]
+
+
+def close(first, second):
+    return len(first) == len(second) and all(isclose(a, c, abs_tol=1e-9) and isclose(b, d, abs_tol=1e-9) for (a, b), (c, d) in zip(first, second))
+
+
+def test_construction(backend):
+    points = PointArray(COORDS)
+    assert isinstance(points.buffer, backend) and len(points) == len(COORDS)
+    assert list(points.buffer) == [value for point in COORDS for value in point]
+    assert list(points.coords()) == COORDS and coords(points) == COORDS
+    assert list(points.xs) == [x for x, _ in COORDS] and list(points.ys) == [y for _, y in COORDS]
+    assert PointArray([Point(*point) for point in COORDS]) == points == PointArray(points) == PointArray.convert(COORDS)
+    assert coords(points.to_points()) == COORDS and len(PointArray()) == 0
+    with pytest.raises(ValueError):
+        PointArray.from_buffer([1.0, 2.0, 3.0])
+    with pytest.raises(TypeError):
+        PointArray.convert([[1.0, 2.0]])
+
+
+def test_from_buffer(backend):
+    data = array('d', [value for point in COORDS for value in point])
+    copied, wrapped = PointArray.from_buffer(data), PointArray.from_buffer(data, copy=False)
+    data[0] = 100.0
+    # the copy doesn't see the change, the wrapped buffer is the same memory
+    assert copied[0] == Point(1.0, 2.0) and wrapped[0] == Point(100.0, 2.0)
+    assert isinstance(copied.buffer, backend)
+
+
+def test_indexing(backend):
+    points = PointArray(COORDS)
+    assert points[1] == Point(*COORDS[1]) and points[-1] == Point(*COORDS[-1])
+    assert coords(points[1:4]) == COORDS[1:4] and coords(points[::-2]) == COORDS[::-2]
+    with pytest.raises(IndexError):
+        points[len(COORDS)]
+    points[-1] = Point(9, 9)
+    points[0] = (8, 8)
+    assert coords(points) == [(8.0, 8.0)] + COORDS[1:-1] + [(9.0, 9.0)]
+    assert (9, 9) in points and (1.0, 2.0) not in points
+
+    # the Points given out are copies
+    point = points[0]
+    point.x += 1
+    assert points[0] == Point(8, 8)
+
+
+def test_insert_append_pop(backend):
+    points, expected = PointArray(COORDS), list(COORDS)
+    for index, point in [(0, (10.0, 10.0)), (-1, (11.0, 11.0)), (100, (12.0, 12.0)), (-100, (13.0, 13.0)), (3, (14.0, 14.0))]:
+        points.insert(index, point)
+        expected.insert(index, point)
+        assert coords(points) == expected
+    points.append((15, 15))
+    expected.append((15.0, 15.0))
+    for index in [-1, 0, 3, -2]:
+        assert points.pop(index).astuple() == expected.pop(index)
+        assert coords(points) == expected
+    with pytest.raises(IndexError):
+        PointArray().pop()
+
+
+def test_bounds_lengths_roll(backend):
+    points = PointArray(COORDS)
+    assert points.bounds() == (-3.5, -1.0, 4.0, 7.0)
+    assert [isclose(length, Point(*point)._length) for length, point in zip(points.lengths, COORDS)] == [True] * len(COORDS)
+    assert coords(points.roll(1)) == COORDS[-1:] + COORDS[:-1] and coords(points.roll(-2)) == COORDS[2:] + COORDS[:2]
+    assert coords(points.roll(len(COORDS))) == COORDS and len(PointArray().roll(3)) == 0
+    with pytest.raises(ValueError):
+        PointArray().bounds()
+
+
+def test_cross_and_dot_match_point(backend):
+    points, other = PointArray(COORDS), PointArray(COORDS[::-1])
+    origin = (0.5, -0.5)
+    for ind, point in enumerate(COORDS):
+        point = Point(*point)
+        assert isclose(points.cross((2, 3))[ind], point.cross((2, 3)))
+        assert isclose(points.dot((2, 3), origin)[ind], point.dot((2, 3), origin), abs_tol=1e-12)
+        assert isclose(points.cross(other, origin)[ind], point.cross(COORDS[::-1][ind], origin), abs_tol=1e-12)
+        assert isclose(points.dot(other)[ind], point.dot(COORDS[::-1][ind]))
+        # an array of origins, one per point
+        assert isclose(points.cross((2, 3), other)[ind], point.cross((2, 3), COORDS[::-1][ind]), abs_tol=1e-12)
+    with pytest.raises(ValueError):
+        points.cross(PointArray(COORDS[:2]))
+
+
+@pytest.mark.parametrize('clockwise', [True, False])
+def test_rotate_matches_point(backend, clockwise):
+    rng = random.Random(0)
+    for _ in range(10):
+        angle, origin = rng.uniform(0, 360), (rng.uniform(-5, 5), rng.uniform(-5, 5))
+        points = PointArray(COORDS)
+        expected = [Point(*point).rotate(angle, origin, clockwise).astuple() for point in COORDS]
+        assert close(list(points.rotate(angle, origin, clockwise).coords()), expected)
+        assert list(points.coords()) == COORDS
+        points.rotate_ip(angle, origin, clockwise)
+        assert close(list(points.coords()), expected)
+
+
+def test_point_rotates_clockwise():
+    # clockwise is the default, rotate & rotate_ip turn the same way
+    assert close([Point(1, 0).rotate(90).astuple()], [(0.0, -1.0)])
+    assert close([Point(1, 0).rotate(90, clockwise=False).astuple()], [(0.0, 1.0)])
+    assert close([Point(2, 1).rotate(180, origin=(1, 1)).astuple()], [(0.0, 1.0)])
+    assert close([Point(1, 1).rotate(45, origin=(1, 0)).astuple()], [(1 + 0.5 ** 0.5, 0.5 ** 0.5)])
+    rng = random.Random(0)
+    for _ in range(20):
+        point = Point(rng.uniform(-5, 5), rng.uniform(-5, 5))
+        angle, origin, clockwise = rng.uniform(0, 360), (rng.uniform(-5, 5), rng.uniform(-5, 5)), rng.random() < 0.5
+        rotated = point.rotate(angle, origin, clockwise)
+        # turning back the other way
+        assert close([rotated.rotate(angle, origin, not clockwise).astuple()], [point.astuple()])
+        point.rotate_ip(angle, origin, clockwise)
+        assert close([rotated.astuple()], [point.astuple()])
+
+
+def test_normalize_and_scale(backend):
+    points = PointArray(COORDS)
+    normalized = points.normalize()
+    assert list(points.coords()) == COORDS
+    for (x, y), point in zip(COORDS, normalized):
+        assert (point.x, point.y) == (0.0, 0.0) if (x, y) == (0.0, 0.0) else isclose(point._length, 1.0)
+    points.scale_to_length(3)
+    assert [isclose(point._length, 3.0) or point._length == 0 for point in points] == [True] * len(COORDS)
+
+
+def test_arithmetic(backend):
+    points, other = PointArray(COORDS), PointArray(COORDS[::-1])
+    assert coords(points + (1, 2)) == [(x + 1, y + 2) for x, y in COORDS]
+    assert coords(points - Point(1, 2)) == [(x - 1, y - 2) for x, y in COORDS]
+    assert coords(points + other) == [(x1 + x2, y1 + y2) for (x1, y1), (x2, y2) in zip(COORDS, COORDS[::-1])]
+    assert coords(points * 2) == [(x * 2, y * 2) for x, y in COORDS] and coords(-points) == [(-x, -y) for x, y in COORDS]
+    assert close(coords(points / 4), [(x / 4, y / 4) for x, y in COORDS])
+    assert coords(points // 2) == [(x // 2, y // 2) for x, y in COORDS]
+    assert isinstance((points * 2).buffer, backend) and isinstance((points + other).buffer, backend)
+    with pytest.raises(TypeError):
+        points * 'a'
+    with pytest.raises(TypeError):
+        points + [1, 2]
+    with pytest.raises(ValueError):
+        points + PointArray(COORDS[:2])
+
+
+def test_copies_and_pickling(backend):
+    points = PointArray(COORDS)
+    for other in (points.copy(), copy.copy(points), pickle.loads(pickle.dumps(points))):
+        assert other == points and other.buffer is not points.buffer
+        other[0] = (0, 0)
+        assert points[0] == Point(1, 2)
+    assert repr(PointArray(COORDS[:2])) == 'PointArray([(1.0, 2.0), (-3.5, 0.25)], length=2)'
+
+
+def test_polygon_vertices(backend):
+    square = [(0.0, 0.0), (4.0, 0.0), (4.0, 4.0), (0.0, 4.0)]
+    polygon = Polygon(PointArray(square))
+    assert isinstance(polygon.vertex, PointArray) and isinstance(polygon.vertex.buffer, backend)
+    assert polygon.area == Polygon(square).area == 16
+
+    # a write through the Point it hands out is dropped, setting the vertex goes through
+    polygon[1].x = 10
+    assert polygon[1] == Point(4, 0)
+    polygon[1] = (10, 0)
+    assert polygon[1] == Point(10, 0) and polygon.area == 28
+
+    # the Points of a Point-backed polygon are its own
+    polygon = Polygon(square)
+    polygon[1].x = 10
+    assert polygon[1] == Point(10, 0)
@@ -0,0 +1,100 @@
+import random
+from math import cos, sin, pi, log2
+import pytest
+from joemetry import Polygon, PointArray
+from joemetry.point_in_polygon import PreparedPolygon, point_in_polygon, point_in_convex_polygon, winding_number
+
+
+def star(n, seed):
+    rng, ring = random.Random(seed), []
+    for ind in range(n):
+        angle, radius = 2 * pi * ind / n, rng.uniform(0.5, 1.0)
+        ring.append((radius * cos(angle), radius * sin(angle)))
+    return ring
+
+
+def comb(teeth, seed):
+    # long thin teeth -> every tooth's edges span nearly every bucket
+    rng = random.Random(seed)
+    ring = [(4.0 * teeth, 0.0)]
+    for tooth in range(teeth - 1, -1, -1):
+        x, height = 4.0 * tooth, 100.0 * rng.uniform(0.9, 1.1)
+        ring.extend([(x + 3, 1.0), (x + 3, height), (x + 1, height), (x + 1, 1.0)])
+    ring.append((0.0, 0.0))
+    return ring
+
+
+def pentagram(seed):
+    # self-intersecting -> the middle is inside for 'nonzero' only
+    return [(cos(pi / 2 + 4 * pi * ind / 5), sin(pi / 2 + 4 * pi * ind / 5)) for ind in range(5)]
+
+
+def convex(seed):
+    return [(cos(2 * pi * ind / 40), sin(2 * pi * ind / 40)) for ind in range(40)]
+
+
+POLYGONS = {
+    'star'     : lambda seed: star(80, seed),
+    'comb'     : lambda seed: comb(20, seed),
+    'pentagram': pentagram,
+    'convex'   : convex,
+    }
+
+
+def query_points(ring, seed, n=400):
+    # random points in the box, the vertices, points on the edges & grid points lined up with the vertices
+    rng = random.Random(seed)
+    xs, ys = [x for x, _ in ring], [y for _, y in ring]
+    points = [(rng.uniform(min(xs) - 1, max(xs) + 1), rng.uniform(min(ys) - 1, max(ys) + 1)) for _ in range(n)]
+    points.extend(ring)
+    points.extend(((x1 + x2) / 2, (y1 + y2) / 2) for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]))
+    points.extend((rng.choice(xs), rng.choice(ys)) for _ in range(n // 4))
+    return points
+
+
+@pytest.mark.parametrize('rule', ['evenodd', 'nonzero'])
+@pytest.mark.parametrize('shape', list(POLYGONS))
+@pytest.mark.parametrize('seed', range(3))
+def test_prepared_matches_point_in_polygon(rule, shape, seed):
+    ring = POLYGONS[shape](seed)
+    points = query_points(ring, seed)
+    expected = [point_in_polygon(point, ring, rule) for point in points]
+    for coords in (ring, ring[::-1]):
+        prepared = PreparedPolygon(coords, rule)
+        assert [prepared.contains(point) for point in points] == expected
+        assert list(prepared.contains_many(points)) == expected
+        assert list(prepared.contains_many(PointArray(points))) == expected
+    assert list(Polygon(ring).contains_many(points, rule)) == expected
+
+
+def test_rules_differ_on_self_intersections():
+    ring = pentagram(0)
+    assert winding_number((0.0, 0.0), ring) in (-2, 2)
+    assert not point_in_polygon((0.0, 0.0), ring, 'evenodd') and point_in_polygon((0.0, 0.0), ring, 'nonzero')
+    assert not PreparedPolygon(ring).contains((0.0, 0.0)) and PreparedPolygon(ring, 'nonzero').contains((0.0, 0.0))
+
+
+def test_convex_fan_search():
+    ring = convex(0)
+    for point in query_points(ring, 0):
+        assert point_in_convex_polygon(point, ring) == point_in_polygon(point, ring)
+        assert point_in_convex_polygon(point, ring[::-1]) == point_in_polygon(point, ring)
+
+
+def test_long_edges_are_not_copied_into_every_bucket():
+    ring = comb(500, 0)
+    prepared = PreparedPolygon(ring)
+    total = len(ring)
+    # every edge lands in at most 2 nodes per level of the tree
+    assert sum(len(edges) for edges in prepared._nodes.values()) <= 2 * total * (log2(total) + 1)
+    points = query_points(ring, 0, 300)
+    assert [prepared.contains(point) for point in points] == [point_in_polygon(point, ring) for point in points]
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        PreparedPolygon([(0, 0), (1, 1)])
+    with pytest.raises(ValueError):
+        PreparedPolygon(convex(0), 'winding')
+    with pytest.raises(ValueError):
+        point_in_polygon((0, 0), convex(0), 'winding')
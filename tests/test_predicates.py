@@ -0,0 +1,85 @@
+import random
+from fractions import Fraction
+import pytest
+from joemetry import predicates
+from joemetry.predicates import orient2d, incircle
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+def exact_orient(a, b, c):
+    (ax, ay), (bx, by), (cx, cy) = [(Fraction(x), Fraction(y)) for x, y in (a, b, c)]
+    return sign((ax - cx) * (by - cy) - (ay - cy) * (bx - cx))
+
+
+def exact_incircle(a, b, c, d):
+    (ax, ay), (bx, by), (cx, cy), (dx, dy) = [(Fraction(x), Fraction(y)) for x, y in (a, b, c, d)]
+    adx, ady, bdx, bdy, cdx, cdy = ax - dx, ay - dy, bx - dx, by - dy, cx - dx, cy - dy
+    return sign(
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+        )
+
+
+def nudge(value, rng):
+    # move a coordinate by a few ulps
+    for _ in range(rng.randint(0, 3)):
+        value = value + abs(value) * 2.0 ** -52 * rng.choice((-1, 1)) if value else rng.choice((-1, 1)) * 5e-324
+    return value
+
+
+@pytest.mark.parametrize('scale', [1e-300, 1e-20, 1.0, 1e20, 1e150])
+@pytest.mark.parametrize('seed', range(5))
+def test_orient2d_near_collinear(scale, seed):
+    # points on a line, a few ulps off of it -> the plain float determinant gets the sign wrong for a lot of them
+    rng = random.Random(seed)
+    for _ in range(200):
+        t, u = rng.random(), rng.random()
+        a = (scale * 0.1, scale * 0.3)
+        b = (scale * 0.7, scale * 0.9)
+        c = (nudge(a[0] + (b[0] - a[0]) * t * 3, rng), nudge(a[1] + (b[1] - a[1]) * u * 3, rng))
+        c = (c[0], nudge(a[1] + (c[0] - a[0]) * (b[1] - a[1]) / (b[0] - a[0]), rng)) if rng.random() < 0.8 else c
+        assert sign(orient2d(a, b, c)) == exact_orient(a, b, c)
+        assert sign(orient2d(b, a, c)) == -exact_orient(a, b, c)
+
+
+def test_orient2d_keeps_the_sign_of_an_underflowing_determinant():
+    a, b, c = (0.0, 0.0), (5e-324, 5e-324), (5e-324, 1e-323)
+    assert orient2d(a, b, c) > 0
+    assert orient2d(a, c, b) < 0
+    assert orient2d(a, b, (1e-323, 1e-323)) == 0
+
+
+def test_orient2d_doesnt_overflow():
+    assert orient2d((0.0, 0.0), (1e300, 1e300), (-1e300, 1e300 + 1e290)) > 0
+
+
+@pytest.mark.parametrize('scale', [1e-100, 1.0, 1e50])
+@pytest.mark.parametrize('seed', range(5))
+def test_incircle_near_cocircular(scale, seed):
+    # points on the circle through (0, 0), (1, 0) & (0, 1), moved by a few ulps
+    rng = random.Random(seed)
+    a, b, c = (0.0, 0.0), (scale, 0.0), (0.0, scale)
+    for _ in range(100):
+        d = (nudge(scale, rng), nudge(scale, rng)) if rng.random() < 0.5 else (nudge(scale * rng.random(), rng), 0.0)
+        assert sign(incircle(a, b, c, d)) == exact_incircle(a, b, c, d)
+
+
+def test_incircle_keeps_the_sign_of_an_underflowing_determinant():
+    a, b, c = (0.0, 0.0), (1e-160, 0.0), (0.0, 1e-160)
+    assert incircle(a, b, c, (1e-161, 1e-161)) > 0
+    assert incircle(a, b, c, (2e-160, 2e-160)) < 0
+    assert incircle(a, b, c, (1e-160, 1e-160)) == 0
+
+
+def test_exact_fallbacks_are_counted():
+    predicates.reset_stats()
+    orient2d((0.0, 0.0), (1.0, 1.0), (2.0, 3.0))
+    assert predicates.exact_fallbacks['orient2d'] == 0
+    orient2d((0.1, 0.1), (0.3, 0.3), (0.7, 0.7))
+    assert predicates.exact_fallbacks['orient2d'] == 1
+    predicates.reset_stats()
+    assert predicates.exact_fallbacks == {'orient2d': 0, 'incircle': 0}
@@ -0,0 +1,91 @@
+import pickle
+import random
+from math import sqrt
+import pytest
+from joemetry import Polygon, PointArray
+from joemetry.index import RTree
+
+
+def random_boxes(seed, n=500):
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(n):
+        x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+        boxes.append((x, y, x + rng.expovariate(0.5), y + rng.expovariate(0.5)))
+    return boxes
+
+
+def overlaps(first, second):
+    return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
+
+
+def box_distance(box, point):
+    dx = max(box[0] - point[0], 0.0, point[0] - box[2])
+    dy = max(box[1] - point[1], 0.0, point[1] - box[3])
+    return sqrt(dx * dx + dy * dy)
+
+
+@pytest.mark.parametrize('node_capacity', [2, 4, 16])
+@pytest.mark.parametrize('seed', range(3))
+def test_queries_match_brute_force(node_capacity, seed):
+    rng = random.Random(seed)
+    boxes = random_boxes(seed)
+    tree = RTree(boxes, node_capacity)
+    assert len(tree) == len(boxes)
+    assert tree.bounds == (min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+    for query in random_boxes(seed + 100, 50) + boxes[:10]:
+        assert sorted(tree.query(query)) == [ind for ind, box in enumerate(boxes) if overlaps(box, query)]
+
+    for _ in range(50):
+        point = (rng.uniform(-10, 110), rng.uniform(-10, 110))
+        assert sorted(tree.query_point(point)) == [ind for ind, box in enumerate(boxes) if overlaps(box, point + point)]
+
+        expected = sorted(box_distance(box, point) for box in boxes)
+        found = tree.nearest(point, 10)
+        assert [box_distance(boxes[ind], point) for ind in found] == expected[:10]
+        assert [dist for _, dist in tree.iter_nearest(point)] == expected
+
+
+def test_nearest_with_an_exact_distance():
+    rng = random.Random(0)
+    points = [(rng.uniform(0, 10), rng.uniform(0, 10)) for _ in range(300)]
+    segments = [(point, (point[0] + rng.uniform(-1, 1), point[1] + rng.uniform(-1, 1))) for point in points]
+    tree = RTree(segments)
+    # distance to the start point of the segment -> never closer than the box
+    start_distance = lambda ind, point: sqrt((segments[ind][0][0] - point[0]) ** 2 + (segments[ind][0][1] - point[1]) ** 2)
+    for _ in range(20):
+        point = (rng.uniform(0, 10), rng.uniform(0, 10))
+        expected = sorted(range(len(segments)), key=lambda ind: start_distance(ind, point))[:5]
+        assert tree.nearest(point, 5, start_distance) == expected
+
+
+def test_mixed_items():
+    square = Polygon([(0, 0), (2, 0), (2, 2), (0, 2)])
+    items = [square, (5.0, 5.0), ((3.0, 3.0), (4.0, 1.0)), PointArray([(7, 7), (8, 9)]), (10.0, 10.0, 11.0, 11.0)]
+    tree = RTree(items)
+    assert sorted(tree.query((1.0, 1.0, 5.0, 5.0))) == [0, 1, 2]
+    assert tree.query_point((8.0, 8.0)) == [3]
+    assert tree.query(Polygon([(9, 9), (12, 9), (12, 12)])) == [4]
+
+
+def test_serialization_round_trip():
+    boxes = random_boxes(0)
+    tree = RTree(boxes, 8)
+    buffer = tree.to_bytes()
+    for copy in [RTree.from_buffer(buffer), RTree.from_buffer(bytearray(buffer)), pickle.loads(pickle.dumps(tree))]:
+        assert copy.node_capacity == 8 and len(copy) == len(tree) and copy.bounds == tree.bounds
+        assert list(copy.boxes) == list(tree.boxes) and list(copy.indices) == list(tree.indices)
+        for query in random_boxes(1, 20):
+            assert copy.query(query) == tree.query(query)
+        assert copy.nearest((50.0, 50.0), 5) == tree.nearest((50.0, 50.0), 5)
+    assert RTree.from_buffer(buffer).to_bytes() == buffer
+
+
+def test_empty_tree():
+    tree = RTree()
+    assert len(tree) == 0 and tree.bounds is None
+    assert tree.query((0, 0, 1, 1)) == [] and tree.nearest((0, 0)) == []
+    assert len(RTree.from_buffer(tree.to_bytes())) == 0
+    with pytest.raises(ValueError):
+        RTree([], node_capacity=1)
@@ -0,0 +1,151 @@
+import random
+from math import cos, sin, pi
+import pytest
+from joemetry import Polygon, PointArray
+from joemetry.predicates import orient2d
+from joemetry.simplify import douglas_peucker, visvalingam_whyatt, simplify, simplify_stream, _segment_distance_sq
+
+
+def random_walk(seed, n=3000):
+    rng, x, y, trace = random.Random(seed), 0.0, 0.0, []
+    for _ in range(n):
+        x, y = x + rng.uniform(-1, 1), y + rng.uniform(-1, 1)
+        trace.append((x, y))
+    return trace
+
+
+def periodic(seed, n=3000):
+    # a trace going back & forth -> DP keeps splitting near the ends of the spans
+    rng = random.Random(seed)
+    return [(ind * 0.1, 5 * sin(ind * 0.3) + rng.uniform(-0.2, 0.2)) for ind in range(n)]
+
+
+def straight(seed, n=3000):
+    # a long straight stretch doesn't fit in the buffer
+    rng = random.Random(seed)
+    return [(float(ind), rng.uniform(-0.01, 0.01)) for ind in range(n)]
+
+
+TRACES = {'random_walk': random_walk, 'periodic': periodic, 'straight': straight}
+
+
+def positions(trace, output):
+    # where the output points are in the trace, they have to come in order
+    found, start = [], 0
+    for point in output:
+        start = trace.index(point, start)
+        found.append(start)
+        start += 1
+    return found
+
+
+def star(n, seed, spread=0.9):
+    rng, ring = random.Random(seed), []
+    for ind in range(n):
+        angle, radius = 2 * pi * ind / n, rng.uniform(1 - spread, 1.0)
+        ring.append((radius * cos(angle), radius * sin(angle)))
+    return ring
+
+
+def band(seed, n=200):
+    # a thin wiggly strip -> its two long sides can end up crossing once they're simplified on their own
+    rng = random.Random(seed)
+    bottom = [(ind * 0.1, 0.4 * sin(ind * 0.13) + rng.uniform(-0.03, 0.03)) for ind in range(n)]
+    return bottom + [(x, y + 0.1) for x, y in bottom[::-1]]
+
+
+def notch(seed):
+    # the bottom dips under the tip of a notch coming down from the top, the dip is too shallow to be kept
+    # -> the straightened bottom edge goes right through the notch
+    return [(0.0, 0.0), (4.0, 0.0), (5.0, -0.3), (6.0, 0.0), (10.0, 0.0), (10.0, 2.0), (5.2, 2.0), (5.0, -0.1), (4.8, 2.0), (0.0, 2.0)]
+
+
+def crosses(ring):
+    # O(n²) -> any 2 edges touching, other than neighbours at the vertex they share
+    total = len(ring)
+    for i in range(total):
+        a, b = ring[i], ring[(i + 1) % total]
+        for j in range(i + 2, total if i else total - 1):
+            c, d = ring[j], ring[(j + 1) % total]
+            sides = orient2d(a, b, c), orient2d(a, b, d), orient2d(c, d, a), orient2d(c, d, b)
+            if sides[0] * sides[1] > 0 or sides[2] * sides[3] > 0:
+                continue
+            if any(sides) or (max(min(a[0], b[0]), min(c[0], d[0])) <= min(max(a[0], b[0]), max(c[0], d[0])) and
+                              max(min(a[1], b[1]), min(c[1], d[1])) <= min(max(a[1], b[1]), max(c[1], d[1]))):
+                return True
+    return False
+
+
+@pytest.mark.parametrize('buffer_size', [3, 10, 100, 1000])
+@pytest.mark.parametrize('kind', list(TRACES))
+@pytest.mark.parametrize('seed', range(2))
+def test_stream_keeps_dropped_points_within_tolerance(buffer_size, kind, seed):
+    trace = TRACES[kind](seed)
+    tolerance = 0.5
+    output = list(simplify_stream(iter(trace), tolerance, buffer_size=buffer_size))
+    kept = positions(trace, output)
+    assert kept[0] == 0 and kept[-1] == len(trace) - 1
+    for first, last in zip(kept, kept[1:]):
+        for ind in range(first + 1, last):
+            assert _segment_distance_sq(trace[ind], trace[first], trace[last]) <= tolerance * tolerance
+
+
+@pytest.mark.parametrize('kind', list(TRACES))
+def test_stream_with_room_for_the_whole_line(kind):
+    trace = TRACES[kind](0, 500)
+    for method, engine, tolerance in [('douglas_peucker', douglas_peucker, 0.5), ('visvalingam_whyatt', visvalingam_whyatt, 0.3)]:
+        expected = [trace[ind] for ind in engine(trace, tolerance)]
+        assert list(simplify_stream(trace, tolerance, method, buffer_size=len(trace) + 1)) == expected
+        # a smaller buffer still keeps both ends & the input order
+        output = list(simplify_stream(trace, tolerance, method, buffer_size=50))
+        assert output[0] == trace[0] and output[-1] == trace[-1]
+        assert len(positions(trace, output)) == len(output)
+
+
+def test_stream_arguments():
+    assert list(simplify_stream([], 1.0)) == []
+    assert list(simplify_stream([(0, 0), (1, 1)], 1.0)) == [(0.0, 0.0), (1.0, 1.0)]
+    with pytest.raises(ValueError):
+        list(simplify_stream([(0, 0)], 1.0, buffer_size=2))
+    with pytest.raises(ValueError):
+        list(simplify_stream([(0, 0)], 1.0, method='radial'))
+
+
+@pytest.mark.parametrize('kind', list(TRACES))
+def test_douglas_peucker_tolerance(kind):
+    trace = TRACES[kind](1)
+    kept = douglas_peucker(PointArray(trace), 0.5)
+    assert kept[0] == 0 and kept[-1] == len(trace) - 1
+    for first, last in zip(kept, kept[1:]):
+        assert all(_segment_distance_sq(trace[ind], trace[first], trace[last]) <= 0.25 for ind in range(first + 1, last))
+
+
+SHAPES = {'star': lambda seed: star(200, seed), 'band': band, 'notch': notch}
+
+
+@pytest.mark.parametrize('method, tolerance', [('douglas_peucker', 0.2), ('douglas_peucker', 0.4), ('visvalingam_whyatt', 0.05), ('visvalingam_whyatt', 0.35)])
+@pytest.mark.parametrize('shape', list(SHAPES))
+@pytest.mark.parametrize('seed', range(4))
+def test_preserve_topology_keeps_polygons_simple(method, tolerance, shape, seed):
+    polygon = Polygon(SHAPES[shape](seed))
+    assert not crosses(polygon.vertex)
+    simplified = simplify(polygon, tolerance, method)
+    assert isinstance(simplified, Polygon) and 3 <= len(simplified.vertex) <= len(polygon.vertex)
+    assert not crosses(simplified.vertex)
+    assert not crosses(polygon.simplify(tolerance, method).vertex)
+
+
+@pytest.mark.parametrize('method, tolerance', [('douglas_peucker', 0.4), ('visvalingam_whyatt', 0.35)])
+def test_simplifying_without_topology_can_cross(method, tolerance):
+    # what preserve_topology is there for
+    assert crosses(simplify(Polygon(notch(0)), tolerance, method, preserve_topology=False).vertex)
+    assert not crosses(simplify(Polygon(notch(0)), tolerance, method).vertex)
+
+
+def test_simplify_keeps_the_type():
+    trace = random_walk(0, 200)
+    assert isinstance(simplify(trace, 1.0), list)
+    assert isinstance(simplify(PointArray(trace), 1.0), PointArray)
+    assert [(point.x, point.y) for point in simplify(PointArray(trace), 1.0)] == simplify(trace, 1.0)
+    with pytest.raises(ValueError):
+        simplify(trace, 1.0, method='radial')
@@ -0,0 +1,114 @@
+import random
+from math import sqrt
+import pytest
+from joemetry import Point
+from joemetry.index import SpatialHash, auto_cell_size
+
+
+def random_box(rng):
+    x, y = rng.uniform(-50, 50), rng.uniform(-50, 50)
+    return (x, y, x + rng.expovariate(0.3), y + rng.expovariate(0.3))
+
+
+def overlaps(first, second):
+    return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
+
+
+def check_cells(grid):
+    # every item is in exactly the cells its box covers & no empty buckets are left behind
+    expected = {}
+    for handle, box in grid._boxes.items():
+        first_column, first_row, last_column, last_row = grid._cell_range(box)
+        assert grid._ranges[handle] == (first_column, first_row, last_column, last_row)
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                expected.setdefault((column, row), set()).add(handle)
+    assert grid._cells == expected
+
+
+@pytest.mark.parametrize('cell_size', [None, 0.5, 4.0, 100.0])
+@pytest.mark.parametrize('seed', range(3))
+def test_incremental_updates_match_brute_force(cell_size, seed):
+    rng = random.Random(seed)
+    boxes = [random_box(rng) for _ in range(200)]
+    grid = SpatialHash(boxes, cell_size)
+    items = dict(enumerate(boxes))
+
+    for step in range(400):
+        kind = rng.random()
+        if kind < 0.2:
+            box = random_box(rng)
+            items[grid.insert(box)] = box
+        elif kind < 0.35 and items:
+            handle = rng.choice(sorted(items))
+            grid.remove(handle)
+            del items[handle]
+        elif items:
+            # mostly small moves -> a lot of them stay in the same cells
+            handle = rng.choice(sorted(items))
+            min_x, min_y, max_x, max_y = items[handle]
+            dx, dy = (rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3)) if rng.random() < 0.8 else (rng.uniform(-30, 30), rng.uniform(-30, 30))
+            box = items[handle] = (min_x + dx, min_y + dy, max_x + dx, max_y + dy)
+            grid.move(handle, box)
+
+        if step % 20 == 0:
+            check_cells(grid)
+            assert len(grid) == len(items) and all(handle in grid and grid[handle] == box for handle, box in items.items())
+            query = random_box(rng)
+            assert sorted(grid.query_box(query)) == sorted(handle for handle, box in items.items() if overlaps(box, query))
+
+            center, radius = (rng.uniform(-50, 50), rng.uniform(-50, 50)), rng.uniform(0, 20)
+            expected = []
+            for handle, box in items.items():
+                dx = max(box[0] - center[0], 0.0, center[0] - box[2])
+                dy = max(box[1] - center[1], 0.0, center[1] - box[3])
+                if dx * dx + dy * dy <= radius * radius:
+                    expected.append(handle)
+            assert sorted(grid.query_radius(center, radius)) == sorted(expected)
+
+            handle = rng.choice(sorted(items))
+            assert sorted(grid.neighbours(handle)) == sorted(other for other, box in items.items() if other != handle and overlaps(box, items[handle]))
+
+    # a query covering far more cells than are occupied goes over the occupied ones
+    assert sorted(grid.query_box((-1e6, -1e6, 1e6, 1e6))) == sorted(items)
+    grid.rehash(7.0)
+    check_cells(grid)
+    assert sorted(grid.query_box((-1e6, -1e6, 1e6, 1e6))) == sorted(items)
+
+
+def test_moving_an_item_in_place():
+    point = Point(0.5, 0.5)
+    grid = SpatialHash([point, (3.0, 3.0)], cell_size=1.0)
+    assert grid.query_box((0, 0, 1, 1)) == [0]
+    point.x, point.y = 3.2, 3.4
+    grid.move(0)
+    check_cells(grid)
+    assert grid.query_box((0, 0, 1, 1)) == []
+    assert sorted(grid.query_radius((3.0, 3.0), 0.5)) == [0, 1]
+    with pytest.raises(KeyError):
+        grid.remove(5)
+
+
+def test_stats():
+    grid = SpatialHash([(0.5, 0.5), (0.6, 0.6), (0.7, 0.7), (5.5, 5.5), (0.0, 0.0, 1.5, 0.5)], cell_size=1.0)
+    stats = grid.stats()
+    assert (stats.items, stats.cells, stats.entries, stats.max_occupancy) == (5, 3, 6, 4)
+    assert (stats.shared_cells, stats.collisions) == (1, 6)
+    assert stats.mean_occupancy == 2.0
+    assert SpatialHash(cell_size=1.0).stats().cells == 0
+
+
+def test_auto_cell_size():
+    assert auto_cell_size([]) == 1.0
+    assert auto_cell_size([(2.0, 2.0, 2.0, 2.0)] * 3) == 1.0
+    # big boxes -> their median size
+    boxes = [(float(x), 0.0, x + 3.0, 3.0) for x in range(10)] + [(0.0, 0.0, 12.0, 1.0)]
+    assert auto_cell_size(boxes) == 3.0
+    # points spread evenly -> about one per cell
+    points = [(float(x), float(y), float(x), float(y)) for x in range(10) for y in range(10)]
+    assert auto_cell_size(points) == pytest.approx(sqrt(81 / 100))
+    # points on a line
+    assert auto_cell_size([(float(x), 0.0, float(x), 0.0) for x in range(11)]) == pytest.approx(10 / 11)
+    assert SpatialHash(points).cell_size == auto_cell_size(points)
+    with pytest.raises(ValueError):
+        SpatialHash(points, cell_size=0)
@@ -0,0 +1,98 @@
+import random
+from math import cos, sin, pi
+import pytest
+from joemetry import Polygon
+from joemetry.intersection import CollisionWorld, ConvexShape, GJK
+
+
+def random_shape(rng, size=1.0):
+    x, y, n = rng.uniform(0, 30), rng.uniform(0, 30), rng.randint(3, 8)
+    radius = rng.uniform(0.2, size)
+    return [(x + radius * cos(2 * pi * ind / n), y + radius * sin(2 * pi * ind / n)) for ind in range(n)]
+
+
+def boxes_overlap(first, second):
+    return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
+
+
+def bounds(body):
+    if isinstance(body, ConvexShape):
+        return body.bounds
+    bottomleft, topright = body.bounding_box
+    return (bottomleft[0], bottomleft[1], topright[0], topright[1])
+
+
+def brute_force(bodies):
+    handles = sorted(bodies)
+    return {
+        (first, second) for ind, first in enumerate(handles) for second in handles[ind + 1:]
+        if boxes_overlap(bounds(bodies[first]), bounds(bodies[second]))
+        }
+
+
+def colliding(bodies):
+    return {(first, second) for first, second in brute_force(bodies) if GJK(bodies[first], bodies[second])}
+
+
+@pytest.mark.parametrize('axis', ['x', 'y'])
+@pytest.mark.parametrize('seed', range(5))
+def test_pairs_match_brute_force_across_frames(axis, seed):
+    rng = random.Random(seed)
+    world, bodies = CollisionWorld(axis), {}
+    for _ in range(150):
+        shape = ConvexShape(random_shape(rng, 2.0))
+        bodies[world.add(shape)] = shape
+    # a few static polygons too
+    for _ in range(10):
+        polygon = Polygon(random_shape(rng, 2.0))
+        bodies[world.add(polygon)] = polygon
+
+    velocities = {handle: (rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3)) for handle, body in bodies.items() if isinstance(body, ConvexShape)}
+    for frame in range(20):
+        expected = brute_force(bodies)
+        assert set(world.candidate_pairs()) == expected
+        assert len(world.candidate_pairs()) == len(expected)
+
+        collisions = world.step(contacts=frame % 2 == 0)
+        assert {(first, second) for first, second, _ in collisions} == colliding(bodies)
+        assert world.stats.candidate_pairs == world.stats.narrow_phase_calls == len(expected)
+        assert world.stats.collisions == len(collisions) and world.stats.bodies == len(bodies)
+        if frame % 2 == 0:
+            assert all(contact.colliding and contact.distance >= 0 for _, _, contact in collisions)
+
+        for handle, (dx, dy) in velocities.items():
+            bodies[handle].translate_ip(dx, dy)
+
+
+def test_add_and_remove_between_frames():
+    rng = random.Random(0)
+    world, bodies = CollisionWorld(), {}
+    for frame in range(30):
+        for _ in range(rng.randint(0, 15)):
+            shape = ConvexShape(random_shape(rng, 3.0))
+            bodies[world.add(shape)] = shape
+        for handle in rng.sample(sorted(bodies), min(len(bodies), rng.randint(0, 10))):
+            world.remove(handle)
+            del bodies[handle]
+        for shape in bodies.values():
+            shape.translate_ip(rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5))
+
+        assert len(world) == len(bodies)
+        assert set(world.candidate_pairs()) == brute_force(bodies)
+
+    with pytest.raises(KeyError):
+        world.remove(10 ** 6)
+
+
+def test_touching_boxes_are_candidates():
+    world = CollisionWorld()
+    first = world.add(ConvexShape([(0, 0), (1, 0), (1, 1), (0, 1)]))
+    second = world.add(ConvexShape([(1, 1), (2, 1), (2, 2), (1, 2)]))
+    world.add(ConvexShape([(3, 3), (4, 3), (4, 4)]))
+    assert world.candidate_pairs() == [(first, second)]
+    assert [(a, b) for a, b, _ in world.step()] == [(first, second)]
+
+
+def test_invalid_axis():
+    with pytest.raises(ValueError):
+        CollisionWorld('z')
@@ -0,0 +1,125 @@
+import random
+import pytest
+from dataclasses import FrozenInstanceError
+from joemetry import Point, Segment, Polygon, PointArray
+from joemetry.transform import Affine
+
+
+SQUARE = [(0.0, 0.0), (4.0, 0.0), (4.0, 2.0), (0.0, 2.0)]
+
+
+def close(first, second):
+    return all(x1 == pytest.approx(x2, abs=1e-9) and y1 == pytest.approx(y2, abs=1e-9) for (x1, y1), (x2, y2) in zip(first, second))
+
+
+def random_affine(rng):
+    return Affine.rotation(rng.uniform(0, 360), (rng.uniform(-5, 5), rng.uniform(-5, 5))) \
+        .scale(rng.uniform(0.5, 2), rng.uniform(0.5, 2)).shear(rng.uniform(-1, 1)).translate(rng.uniform(-5, 5), rng.uniform(-5, 5))
+
+
+def test_chained_transforms_apply_in_order():
+    point = (1.0, 0.0)
+    # translate first, then scale -> (1 + 1) * 2
+    assert Affine.translation(1, 0).scale(2)(point) == (4.0, 0.0)
+    # scale first, then translate -> 1 * 2 + 1
+    assert Affine.scaling(2).translate(1, 0)(point) == (3.0, 0.0)
+    assert Affine.scaling(2).translate(1, 0) == Affine.translation(1, 0) @ Affine.scaling(2)
+
+    rng = random.Random(0)
+    for _ in range(20):
+        first, second, third = random_affine(rng), random_affine(rng), random_affine(rng)
+        x, y = rng.uniform(-10, 10), rng.uniform(-10, 10)
+        assert close([(third @ second @ first)((x, y))], [third(second(first((x, y))))])
+        assert close([((third @ second) @ first)((x, y))], [(third @ (second @ first))((x, y))])
+
+
+def test_rotation_matches_point_rotate():
+    rng = random.Random(0)
+    for _ in range(20):
+        angle, origin, clockwise = rng.uniform(0, 360), (rng.uniform(-5, 5), rng.uniform(-5, 5)), rng.random() < 0.5
+        point = Point(rng.uniform(-10, 10), rng.uniform(-10, 10))
+        rotated = point.rotate(angle, origin, clockwise)
+        assert close([Affine.rotation(angle, origin, clockwise)((point.x, point.y))], [(rotated.x, rotated.y)])
+    # clockwise by default
+    assert close([Affine.rotation(90)((1.0, 0.0))], [(0.0, -1.0)])
+    assert close([Affine.rotation(90, clockwise=False)((1.0, 0.0))], [(0.0, 1.0)])
+
+
+def test_scaling_and_shearing_about_an_origin():
+    assert Affine.scaling(2, 3, origin=(1, 1))((2.0, 2.0)) == (3.0, 4.0)
+    assert Affine.scaling(2, origin=(1, 1))((1.0, 1.0)) == (1.0, 1.0)
+    assert Affine.shearing(1, 0, origin=(0, 1))((0.0, 3.0)) == (2.0, 3.0)
+    assert Affine.shearing(0, 2)((1.0, 0.0)) == (1.0, 2.0)
+
+
+def test_inverse():
+    rng = random.Random(0)
+    for _ in range(20):
+        transform = random_affine(rng)
+        point = (rng.uniform(-10, 10), rng.uniform(-10, 10))
+        assert close([transform.inverse()(transform(point))], [point])
+        assert close([(transform @ transform.inverse())(point)], [point])
+        assert transform.inverse().determinant == pytest.approx(1 / transform.determinant)
+    assert Affine.identity().inverse() == Affine.identity() and Affine.identity().is_identity
+    with pytest.raises(ValueError):
+        Affine.scaling(1, 0).inverse()
+
+
+@pytest.mark.parametrize('vertex', [lambda: list(SQUARE), lambda: [Point(*point) for point in SQUARE], lambda: PointArray(SQUARE)])
+def test_polygon_copy_and_in_place(vertex):
+    transform = Affine.rotation(30, (2, 1)).scale(2).translate(1, -1)
+    expected = [transform(point) for point in SQUARE]
+
+    polygon = Polygon(vertex())
+    area = polygon.area
+    moved = polygon.transform(transform)
+    assert close([(point.x, point.y) for point in moved], expected)
+    # the copy leaves the polygon alone
+    assert close([(point.x, point.y) for point in polygon], SQUARE) and polygon.area == area
+    assert moved.area == pytest.approx(area * transform.determinant)
+
+    polygon.transform_ip(transform)
+    assert close([(point.x, point.y) for point in polygon], expected)
+    # the cached area is worked out again
+    assert polygon.area == pytest.approx(area * transform.determinant)
+    assert isinstance(moved.vertex, PointArray) == isinstance(polygon.vertex, PointArray)
+
+
+def test_other_shapes():
+    transform = Affine.translation(1, 2)
+    point = Point(1, 1)
+    assert transform(point) == Point(2, 3) and point == Point(1, 1)
+    assert transform(point, inplace=True) is None and point == Point(2, 3)
+
+    segment = Segment(Point(0, 0), Point(1, 1))
+    moved = transform(segment)
+    assert (moved.start, moved.end) == (Point(1, 2), Point(2, 3)) and segment.start == Point(0, 0)
+
+    points = PointArray(SQUARE)
+    assert close([(p.x, p.y) for p in transform(points)], [(x + 1, y + 2) for x, y in SQUARE])
+    assert close([(p.x, p.y) for p in points], SQUARE)
+
+    # tuples in a list are swapped for their transformed copies, a tuple of points comes back as a tuple
+    coords = list(SQUARE)
+    assert transform(coords, inplace=True) is None and coords == [(x + 1, y + 2) for x, y in SQUARE]
+    assert transform(((0.0, 0.0), (1.0, 1.0))) == ((1.0, 2.0), (2.0, 3.0))
+    assert Affine.identity().transform_columns([1.0, 2.0], [3.0, 4.0]) == ([1.0, 2.0], [3.0, 4.0])
+
+
+def test_frozen_polygons():
+    polygon = Polygon(SQUARE, frozen=True)
+    transform = Affine.rotation(45).translate(3, 3)
+    with pytest.raises(FrozenInstanceError):
+        polygon.transform_ip(transform)
+    with pytest.raises(FrozenInstanceError):
+        polygon.rotate_ip(90)
+    with pytest.raises(FrozenInstanceError):
+        transform(polygon, inplace=True)
+    assert close([(point.x, point.y) for point in polygon], SQUARE)
+
+    # copies are fine & aren't frozen
+    moved = polygon.transform(transform)
+    assert close([(point.x, point.y) for point in moved], [transform(point) for point in SQUARE])
+    moved.transform_ip(transform.inverse())
+    assert close([(point.x, point.y) for point in moved], SQUARE)
+    assert close([(point.x, point.y) for point in polygon.rotate(90)], [Affine.rotation(90)(point) for point in SQUARE])
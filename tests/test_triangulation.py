@@ -0,0 +1,81 @@
+import random
+from math import cos, sin, pi
+import pytest
+from joemetry.triangulation import ear_clipping, monotone_triangulation
+from joemetry.triangulation.monotone import _EdgeStatus
+
+
+def star(n, seed):
+    rng, ring = random.Random(seed), []
+    for ind in range(n):
+        angle, radius = 2 * pi * ind / n, rng.uniform(0.5, 1.0)
+        ring.append((radius * cos(angle), radius * sin(angle)))
+    return ring
+
+
+def comb(teeth, seed):
+    # long thin teeth -> nearly every vertex is reflex or blocks an ear
+    rng = random.Random(seed)
+    ring = [(4.0 * teeth, 0.0)]
+    for tooth in range(teeth - 1, -1, -1):
+        x, height = 4.0 * tooth, 100.0 * rng.uniform(0.9, 1.1)
+        ring.extend([(x + 3, 1.0), (x + 3, height), (x + 1, height), (x + 1, 1.0)])
+    ring.append((0.0, 0.0))
+    return ring
+
+
+def skyline(n, seed, collinear=False):
+    # an orthogonal polygon, the buildings share their heights -> horizontal edges & ties on the sweep line
+    # collinear: keep a vertex at every x, even between 2 buildings of the same height
+    rng = random.Random(seed)
+    heights = [rng.choice((1, 2, 3)) for _ in range(n)]
+    ring = [(0, 0), (n, 0)]
+    for x in range(n, 0, -1):
+        if x < n and heights[x] != heights[x - 1]:
+            ring.append((x, heights[x]))
+        if x == n or collinear or heights[x] != heights[x - 1]:
+            ring.append((x, heights[x - 1]))
+    ring.append((0, heights[0]))
+    return ring
+
+
+def doubled_area(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def ring_area(ring):
+    return abs(sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]))) / 2
+
+
+def check(ring, triangles):
+    assert len(triangles) == len(ring) - 2
+    assert all(doubled_area(ring[a], ring[b], ring[c]) >= 0 for a, b, c in triangles)
+    total = sum(doubled_area(ring[a], ring[b], ring[c]) for a, b, c in triangles) / 2
+    assert total == pytest.approx(ring_area(ring), rel=1e-9)
+
+
+POLYGONS = {
+    'star'             : lambda seed: star(60, seed),
+    'comb'             : lambda seed: comb(15, seed),
+    'skyline'          : lambda seed: skyline(30, seed),
+    'skyline_collinear': lambda seed: skyline(30, seed, collinear=True),
+    }
+
+
+@pytest.mark.parametrize('triangulate', [ear_clipping, monotone_triangulation])
+@pytest.mark.parametrize('shape', list(POLYGONS))
+@pytest.mark.parametrize('seed', range(5))
+def test_triangles_cover_the_polygon(triangulate, shape, seed):
+    ring = POLYGONS[shape](seed)
+    check(ring, triangulate(ring))
+    # clockwise input -> the triangles are still anti-clockwise & index the given vertices
+    check(ring[::-1], triangulate(ring[::-1]))
+
+
+def test_left_of_raises_without_an_edge_to_the_left():
+    status = _EdgeStatus([(0.0, 1.0), (1.0, 0.0), (2.0, 1.0)])
+    status.sweep_y = 0.5
+    status.insert(0)
+    with pytest.raises(ValueError):
+        status.left_of(0.0)
+    assert status.left_of(1.0) == 0
@@ -0,0 +1,145 @@
+import random
+from math import atan2
+import pytest
+from joemetry import Polygon, PointArray
+from joemetry.predicates import orient2d
+from joemetry.validity import is_simple, self_intersections, validate_many
+
+
+def random_ring(seed, n):
+    # small integer coordinates -> lots of crossings, touching vertices & collinear overlaps
+    rng = random.Random(seed)
+    return [(float(rng.randint(0, 6)), float(rng.randint(0, 6))) for _ in range(n)]
+
+
+def star_ring(seed, n):
+    # the points sorted around their center, mostly simple with the odd vertex touching an edge
+    rng = random.Random(seed)
+    points = list({(float(rng.randint(0, 20)), float(rng.randint(0, 20))) for _ in range(n)})
+    cx, cy = sum(x for x, _ in points) / len(points), sum(y for _, y in points) / len(points)
+    return sorted(points, key=lambda point: (atan2(point[1] - cy, point[0] - cx), point))
+
+
+def touch(p, q, r, s):
+    o1, o2, o3, o4 = orient2d(p, q, r), orient2d(p, q, s), orient2d(r, s, p), orient2d(r, s, q)
+    if o1 * o2 > 0 or o3 * o4 > 0:
+        return False
+    if o1 or o2 or o3 or o4:
+        return True
+    return max(min(p[0], q[0]), min(r[0], s[0])) <= min(max(p[0], q[0]), max(r[0], s[0])) and \
+           max(min(p[1], q[1]), min(r[1], s[1])) <= min(max(p[1], q[1]), max(r[1], s[1]))
+
+
+def brute_force(coords):
+    # O(n²) -> (i, j) for every 2 edges meeting other than neighbours at their shared vertex,
+    # edges are numbered by the vertex they start at, after skipping repeated vertices
+    total = len(coords)
+    kept = [ind for ind in range(total) if coords[ind] != coords[(ind + 1) % total]] or [0]
+    ring = [coords[ind] for ind in kept]
+    count = len(ring)
+    if count == 2:
+        # there & back again -> the 2 edges lie on top of each other
+        return {(kept[0], kept[1])}, count
+    pairs = set()
+    for i in range(count):
+        for j in range(i + 1, count):
+            p, q, r, s = ring[i], ring[(i + 1) % count], ring[j], ring[(j + 1) % count]
+            if j - i == 1 or (i == 0 and j == count - 1):
+                # neighbours only meet at their shared vertex, unless one folds back over the other
+                vertex, before, after = (q, p, s) if j - i == 1 else (p, r, q)
+                if count > 2 and orient2d(before, vertex, after) == 0 and \
+                   (before[0] - vertex[0]) * (after[0] - vertex[0]) + (before[1] - vertex[1]) * (after[1] - vertex[1]) > 0:
+                    pairs.add((kept[i], kept[j]))
+                continue
+            if touch(p, q, r, s):
+                pairs.add((kept[i], kept[j]))
+    return pairs, count
+
+
+def on_segment(point, start, end, slack=1e-9):
+    # within rounding of the segment
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length_sq = dx * dx + dy * dy
+    t = min(max(((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / length_sq, 0.0), 1.0) if length_sq else 0.0
+    return (start[0] + t * dx - point[0]) ** 2 + (start[1] + t * dy - point[1]) ** 2 <= slack
+
+
+def check(coords):
+    pairs, count = brute_force(coords)
+    simple = count >= 3 and not pairs
+    assert is_simple(coords) == simple
+    assert is_simple(PointArray(coords)) == simple
+    assert Polygon(coords).is_simple() == simple
+
+    found = self_intersections(coords)
+    assert {(i, j) for i, j, _ in found} == (set() if simple or count < 2 else pairs)
+    total = len(coords)
+    for i, j, point in found:
+        assert i < j
+        # the edges are the original ones, the repeated vertices only make them start later
+        for edge in (i, j):
+            end = next(coords[(edge + step) % total] for step in range(1, total + 1) if coords[(edge + step) % total] != coords[edge])
+            assert on_segment(point, coords[edge], end)
+    return simple
+
+
+@pytest.mark.parametrize('n', [3, 4, 5, 8, 12, 30])
+@pytest.mark.parametrize('seed', range(30))
+def test_random_integer_rings(n, seed):
+    check(random_ring(seed, n))
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_star_rings(seed):
+    check(star_ring(seed, 25))
+
+
+def test_both_kinds_come_up():
+    results = [check(random_ring(seed, 5)) for seed in range(30)] + [check(star_ring(seed, 25)) for seed in range(40)]
+    assert any(results) and not all(results)
+
+
+def test_spikes():
+    # zero width spike sticking out of a square
+    square = [(0.0, 0.0), (4.0, 0.0), (4.0, 2.0), (6.0, 2.0), (4.0, 2.0), (4.0, 4.0), (0.0, 4.0)]
+    assert not check(square)
+    assert (2, 3, (4.0, 2.0)) in self_intersections(square)
+    # a spike folding back inside
+    assert not check([(0.0, 0.0), (4.0, 0.0), (4.0, 4.0), (2.0, 2.0), (3.0, 3.0), (0.0, 4.0)])
+    # a flat ring is all spike
+    assert not check([(0.0, 0.0), (1.0, 0.0), (2.0, 0.0)])
+    # going straight on through a vertex is fine
+    assert check([(0.0, 0.0), (2.0, 0.0), (4.0, 0.0), (4.0, 4.0), (0.0, 4.0)])
+
+
+def test_repeated_vertices():
+    square = [(0.0, 0.0), (0.0, 0.0), (4.0, 0.0), (4.0, 4.0), (4.0, 4.0), (4.0, 4.0), (0.0, 4.0), (0.0, 0.0)]
+    assert check(square)
+    # the edge numbers are the ones of the given vertices
+    bowtie = [(0.0, 0.0), (4.0, 4.0), (4.0, 4.0), (4.0, 0.0), (0.0, 4.0)]
+    assert not check(bowtie)
+    assert [(i, j) for i, j, _ in self_intersections(bowtie)] == [(0, 3)]
+    assert self_intersections(bowtie)[0][2] == (2.0, 2.0)
+    assert not check([(1.0, 1.0)] * 4) and not check([(0.0, 0.0), (1.0, 1.0), (1.0, 1.0)])
+
+
+def test_touching_vertex():
+    # a vertex sitting on another edge
+    assert not check([(0.0, 0.0), (4.0, 0.0), (4.0, 4.0), (2.0, 0.0), (0.0, 4.0)])
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_validate_many(processes):
+    polygons = [random_ring(seed, 6) for seed in range(10)] + [star_ring(seed, 20) for seed in range(10)]
+    assert validate_many(polygons, processes=processes) == [is_simple(polygon) for polygon in polygons]
+
+
+@pytest.mark.parametrize('preserve_topology', [True, False])
+@pytest.mark.parametrize('seed', range(10))
+def test_simplified_polygons(preserve_topology, seed):
+    # simplify's topology check & is_simple have to agree
+    ring = star_ring(seed, 60)
+    if not check(ring):
+        return
+    simplified = Polygon(ring).simplify(3.0, preserve_topology=preserve_topology)
+    assert check(simplified.vertex) or not preserve_topology
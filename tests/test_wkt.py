@@ -0,0 +1,38 @@
+import io
+import pytest
+from joemetry import Polygon
+from joemetry.io import read_wkt, write_wkt, from_wkt
+
+
+RING = [(0.5, 0.25), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+
+
+def ewkt_lines(count):
+    text = io.StringIO()
+    write_wkt(text, [Polygon([(x + ind, y) for x, y in RING]) for ind in range(count)])
+    return ''.join(f"SRID=4326;{line}\n" for line in text.getvalue().splitlines())
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 10, 64, 1 << 16])
+def test_ewkt_streamed_in_small_chunks(chunk_size):
+    shapes = list(read_wkt(io.StringIO(ewkt_lines(50)), chunk_size=chunk_size))
+    assert shapes == [Polygon([(x + ind, y) for x, y in RING]) for ind in range(50)]
+
+
+def test_ewkt_split_at_every_position():
+    # every way the prefix can be cut by the end of the first chunk
+    text = ewkt_lines(2)
+    for cut in range(1, len(text)):
+        assert len(list(read_wkt(io.BytesIO(text.encode()), chunk_size=cut))) == 2
+
+
+def test_large_ewkt_file_with_default_chunks():
+    assert sum(1 for _ in read_wkt(io.StringIO(ewkt_lines(20000)))) == 20000
+
+
+def test_not_a_geometry():
+    with pytest.raises(ValueError):
+        list(read_wkt(io.StringIO('SRIDX=4326;POINT (1 2)\n'), chunk_size=4))
+    with pytest.raises(ValueError):
+        list(read_wkt(io.StringIO('CIRCLE (1 2)\n')))
+    assert from_wkt('SRID=4326;POINT (1 2)').x == 1